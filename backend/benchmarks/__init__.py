@@ -0,0 +1,5 @@
+"""
+Benchmark scripts for measuring backend performance.
+
+Run them from the backend directory, e.g. ``python -m benchmarks.db_roundtrip``.
+"""
@@ -0,0 +1,54 @@
+"""
+The API wired to benchmark doubles, for ``uvicorn benchmarks.bench_app:app``.
+
+Started by benchmarks.load_test, configured through the environment:
+
+- BENCH_FBREF_PROXY: proxy prefix of the fake FBref server (required)
+- BENCH_DB_LATENCY_MS: simulated round-trip per in-memory DB call (default 2)
+- BENCH_ITEMS: number of seeded items (default 1000)
+- BENCH_SCRAPER_CACHE: "0" disables the scraper's in-process caches
+- BENCH_STALE: "1" expires the football cache immediately, so reads keep
+  triggering background refreshes
+
+Players, fixtures and standings are seeded at startup through the real
+manual-load path (fake FBref -> scraper -> parser -> DB service).
+"""
+
+import os
+
+# Settings require Supabase credentials; the Supabase client is never created here
+os.environ.setdefault("SUPABASE_PROJECT_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_API_KEY", "benchmark")
+
+import dependencies
+from benchmarks.memory_db import InMemoryDatabaseService
+from controllers import scraper_controller
+from main import app
+
+db_service = InMemoryDatabaseService(latency=float(os.environ.get("BENCH_DB_LATENCY_MS", "2")) / 1000)
+db_service.seed("items", [
+    {"name": f"Item {i}", "price": round(1 + (i * 7.31) % 99, 2), "is_offer": i % 5 == 0}
+    for i in range(1, int(os.environ.get("BENCH_ITEMS", "1000")) + 1)
+])
+
+scraper_service = dependencies.get_scraper_service()
+scraper_service.proxies = [os.environ["BENCH_FBREF_PROXY"]]
+if os.environ.get("BENCH_SCRAPER_CACHE", "1") == "0":
+    for attribute in ("squad", "fixtures", "standings", "full", "page"):
+        setattr(scraper_service, f"{attribute}_cache_duration", 0)
+
+# Swap the singletons before the first request resolves them
+dependencies._db_service = db_service
+scraper_controller._scraper_service_instance = scraper_service
+
+
+@app.on_event("startup")
+async def seed_football_data():
+    football_service = dependencies.get_football_service()
+    for load in (football_service.manual_load_players, football_service.manual_load_fixtures,
+                 football_service.manual_load_standings):
+        result = await load()
+        if not result["success"]:
+            raise RuntimeError(f"Seeding failed: {result.get('error')}")
+    if os.environ.get("BENCH_STALE") == "1":
+        football_service.cache_durations = {data_type: 0 for data_type in football_service.cache_durations}
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Local HTTP server replaying corpus pages in place of FBref and its proxies.
+
+Every GET returns one page from the corpus (``?page=<name>`` picks a specific
+one, otherwise the default page is served), after a configurable latency, and
+fails with 503 for a configurable fraction of requests:
+
+    python -m benchmarks.fake_fbref --port 9410 --latency-ms 150 --jitter-ms 50 --error-rate 0.05
+
+Point the scraper at it by replacing its proxy list with
+``["http://127.0.0.1:9410/raw?url="]``.
+"""
+
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fbref_pages import load_corpus
+
+
+class FakeFBrefServer:
+    """Threaded page server with injected latency and errors"""
+
+    def __init__(
+        self,
+        pages: Dict[str, bytes],
+        default_page: str,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0
+    ):
+        if default_page not in pages:
+            raise ValueError(f"Unknown page {default_page!r}, corpus has: {', '.join(sorted(pages))}")
+        self.pages = pages
+        self.default_page = default_page
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def proxy_prefix(self) -> str:
+        """Drop-in replacement for an entry of FBrefScraperService.proxies"""
+        return f"{self.url}/raw?url="
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    delay = server.latency + server._rng.uniform(-server.jitter, server.jitter)
+                    fail = server._rng.random() < server.error_rate
+                    if fail:
+                        server.errors += 1
+                if delay > 0:
+                    time.sleep(delay)
+
+                if fail:
+                    body = b"Service Unavailable"
+                    self.send_response(503)
+                else:
+                    name = parse_qs(urlparse(self.path).query).get("page", [server.default_page])[0]
+                    body = server.pages.get(name)
+                    if body is None:
+                        body = b"Not Found"
+                        self.send_response(404)
+                    else:
+                        self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def handle(self):
+                # The scraper hangs up mid-body once it has the tables it needs
+                try:
+                    super().handle()
+                except ConnectionError:
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeFBrefServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-fbref", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeFBrefServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9410)
+    parser.add_argument("--page", default="synthetic_large", help="Default corpus page to serve")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeFBrefServer(
+        load_corpus(),
+        args.page,
+        host=args.host,
+        port=args.port,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+    )
+    print(f"Serving {args.page} on {server.url} (proxy prefix {server.proxy_prefix})")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
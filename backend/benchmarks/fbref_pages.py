@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Corpus of FBref squad pages for the benchmarks.
+
+Recorded pages live in ``benchmarks/pages/`` as ``*.html``. Record the live
+page (through the scraper's proxies) with:
+
+    python -m benchmarks.fbref_pages record --name racing_2024_25
+
+When no recorded pages are present - or alongside them - deterministic
+synthetic pages are generated in three sizes. They follow the structure the
+extractors rely on: the ``#meta`` record line, ``stats_standard_17``, the
+``matchlogs_for`` table, the league table, and the extra stats tables FBref
+ships inside HTML comments.
+
+    python -m benchmarks.fbref_pages generate
+"""
+
+import argparse
+import asyncio
+import codecs
+import os
+import random
+from typing import Dict, List
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+TEAMS = [
+    ("dee3bbc8", "Racing Santander"), ("9800b6a1", "Levante"), ("6c8b07df", "Elche"),
+    ("3640715c", "Mirandés"), ("ab358912", "Oviedo"), ("78ecf4bb", "Almería"),
+    ("c6c493e6", "Huesca"), ("a0435291", "Granada"), ("7f0aadd9", "Córdoba"),
+    ("ee7c297c", "Cádiz"), ("2aa5ee6a", "Sporting Gijón"), ("2a8183b3", "Deportivo La Coruña"),
+    ("e46d3f2e", "Burgos"), ("bea5c710", "Eibar"), ("5bef5b3d", "Castellón"),
+    ("ab0bb9a8", "Albacete"), ("0ba2d1e9", "Zaragoza"), ("1c896955", "Málaga"),
+    ("47ee1b0a", "Eldense"), ("c2c0e9a9", "Tenerife"), ("3e4d3ba3", "Racing Ferrol"),
+    ("3d6a9a87", "Cartagena"),
+]
+NATIONS = ["es ESP", "ar ARG", "fr FRA", "pt POR", "uy URU", "ma MAR", "ng NGA", "co COL"]
+POSITIONS = ["GK", "DF", "DF,MF", "MF", "MF,FW", "FW", "FW,MF"]
+FIRST_NAMES = ["Jokin", "Iñigo", "Pablo", "Andrés", "Íñigo", "Juan Carlos", "Aritz", "Unai", "Jon", "Marco",
+               "Lucas", "Javi", "Sergio", "Álvaro", "Mario", "Diego", "Iván", "Peio", "Maguette", "Yeray"]
+LAST_NAMES = ["Ezkieta", "Vicente", "Rodríguez", "Martín", "Sangalli", "Arana", "Canales", "Aldasoro", "Mantilla",
+              "Saro", "Ekain", "Villa", "Castro", "Montero", "Hernández", "Sánchez", "Gueye", "Gómez", "Romo", "Karrikaburu"]
+
+# stats_standard columns in FBref order (after the player <th>)
+STANDARD_STATS = [
+    "nationality", "position", "age", "games", "games_starts", "minutes", "minutes_90s",
+    "goals", "assists", "goals_assists", "goals_pens", "pens_made", "pens_att",
+    "cards_yellow", "cards_red", "xg", "npxg", "xg_assist", "npxg_xg_assist",
+    "progressive_carries", "progressive_passes", "progressive_passes_received",
+    "goals_per90", "assists_per90", "goals_assists_per90", "goals_pens_per90",
+    "goals_assists_pens_per90", "xg_per90", "xg_assist_per90", "xg_xg_assist_per90",
+    "npxg_per90", "npxg_xg_assist_per90", "matches",
+]
+# Tables FBref renders inside <!-- --> comments, with a representative column set
+COMMENTED_TABLES = {
+    "stats_shooting_17": ["minutes_90s", "goals", "shots", "shots_on_target", "shots_on_target_pct",
+                          "shots_per90", "shots_on_target_per90", "goals_per_shot", "goals_per_shot_on_target",
+                          "average_shot_distance", "shots_free_kicks", "pens_made", "pens_att", "xg", "npxg",
+                          "npxg_per_shot", "xg_net", "npxg_net"],
+    "stats_passing_17": ["minutes_90s", "passes_completed", "passes", "passes_pct", "passes_total_distance",
+                         "passes_progressive_distance", "passes_completed_short", "passes_short",
+                         "passes_pct_short", "passes_completed_medium", "passes_medium", "passes_pct_medium",
+                         "passes_completed_long", "passes_long", "passes_pct_long", "assists", "xg_assist",
+                         "pass_xa", "xg_assist_net", "assisted_shots", "passes_into_final_third",
+                         "passes_into_penalty_area", "crosses_into_penalty_area", "progressive_passes"],
+    "stats_keeper_17": ["games_gk", "games_starts_gk", "minutes_gk", "minutes_90s", "gk_goals_against",
+                        "gk_goals_against_per90", "gk_shots_on_target_against", "gk_saves", "gk_save_pct",
+                        "gk_wins", "gk_ties", "gk_losses", "gk_clean_sheets", "gk_clean_sheets_pct",
+                        "gk_pens_att", "gk_pens_allowed", "gk_pens_saved", "gk_pens_missed", "gk_pens_save_pct"],
+    "stats_gca_17": ["minutes_90s", "sca", "sca_per90", "sca_passes_live", "sca_passes_dead", "sca_take_ons",
+                     "sca_shots", "sca_fouled", "sca_defense", "gca", "gca_per90", "gca_passes_live",
+                     "gca_passes_dead", "gca_take_ons", "gca_shots", "gca_fouled", "gca_defense"],
+    "stats_defense_17": ["minutes_90s", "tackles", "tackles_won", "tackles_def_3rd", "tackles_mid_3rd",
+                         "tackles_att_3rd", "challenge_tackles", "challenges", "challenge_tackles_pct",
+                         "challenges_lost", "blocks", "blocked_shots", "blocked_passes", "interceptions",
+                         "tackles_interceptions", "clearances", "errors"],
+    "stats_possession_17": ["minutes_90s", "touches", "touches_def_pen_area", "touches_def_3rd", "touches_mid_3rd",
+                            "touches_att_3rd", "touches_att_pen_area", "touches_live_ball", "take_ons",
+                            "take_ons_won", "take_ons_won_pct", "take_ons_tackled", "carries",
+                            "carries_distance", "carries_progressive_distance", "progressive_carries",
+                            "carries_into_final_third", "carries_into_penalty_area", "miscontrols",
+                            "dispossessed", "passes_received", "progressive_passes_received"],
+    "stats_playing_time_17": ["games", "minutes", "minutes_per_game", "minutes_pct", "minutes_90s",
+                              "games_starts", "minutes_per_start", "games_complete", "games_subs",
+                              "minutes_per_sub", "unused_subs", "points_per_game", "on_goals_for",
+                              "on_goals_against", "plus_minus", "plus_minus_per90", "on_xg_for",
+                              "on_xg_against", "xg_plus_minus", "xg_plus_minus_per90"],
+    "stats_misc_17": ["minutes_90s", "cards_yellow", "cards_red", "cards_yellow_red", "fouls", "fouled",
+                      "offsides", "crosses", "interceptions", "tackles_won", "pens_won", "pens_conceded",
+                      "own_goals", "ball_recoveries", "aerials_won", "aerials_lost", "aerials_won_pct"],
+}
+
+SIZES = {
+    # name: (players, fixtures, commented tables, filler paragraphs)
+    "small": (24, 10, 0, 0),
+    "medium": (30, 42, 4, 40),
+    "large": (40, 60, len(COMMENTED_TABLES), 1500),
+}
+
+
+def _player_name(rng: random.Random, used: set) -> str:
+    while True:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        if name not in used:
+            used.add(name)
+            return name
+
+
+def _player_row(rng: random.Random, name: str) -> Dict[str, str]:
+    games = rng.randint(0, 40)
+    minutes = games * rng.randint(20, 90)
+    nineties = minutes / 90
+    goals = rng.randint(0, max(games // 3, 0))
+    assists = rng.randint(0, max(games // 4, 0))
+    values = {
+        "nationality": rng.choice(NATIONS),
+        "position": rng.choice(POSITIONS),
+        "age": f"{rng.randint(18, 36)}-{rng.randint(0, 364):03d}",
+        "games": str(games),
+        "games_starts": str(rng.randint(0, games)),
+        "minutes": f"{minutes:,}",
+        "minutes_90s": f"{nineties:.1f}",
+        "goals": str(goals),
+        "assists": str(assists),
+        "goals_assists": str(goals + assists),
+        "matches": "Matches",
+    }
+    for column in STANDARD_STATS:
+        if column not in values:
+            values[column] = f"{rng.random() * 5:.2f}" if "per90" in column or "xg" in column else str(rng.randint(0, 60))
+    return values
+
+
+def _stats_table(table_id: str, columns: List[str], players: List[Dict], rng: random.Random, caption: str) -> str:
+    parts = [
+        f'<table class="stats_table sortable min_width" id="{table_id}" data-cols-to-freeze=",1">',
+        f"<caption>{caption} Table</caption>",
+        "<thead><tr>",
+        '<th aria-label="Player" data-stat="player" scope="col" class="poptip sort_default_asc">Player</th>',
+    ]
+    parts.extend(f'<th data-stat="{c}" scope="col" class="poptip center">{c}</th>' for c in columns)
+    parts.append("</tr></thead><tbody>")
+    for player in players:
+        parts.append(
+            f'<tr><th scope="row" class="left" data-append-csv="{player["id"]}" data-stat="player" csk="{player["name"]}">'
+            f'<a href="/en/players/{player["id"]}/{player["name"].replace(" ", "-")}">{player["name"]}</a></th>'
+        )
+        for column in columns:
+            if column in player["stats"]:
+                value = player["stats"][column]
+            else:
+                value = f"{rng.random() * 100:.1f}" if column.endswith(("pct", "per90", "distance")) else str(rng.randint(0, 80))
+            if column == "nationality":
+                code, label = value.split()
+                cell = f'<a href="/en/country/{label}/"><span style="white-space: nowrap"><span class="f-i f-{code}">{code}</span> {label}</span></a>'
+            elif column == "matches":
+                cell = f'<a href="/en/players/{player["id"]}/matchlogs/2024-2025/">Matches</a>'
+            else:
+                cell = value
+            parts.append(f'<td class="right " data-stat="{column}" >{cell}</td>')
+        parts.append("</tr>")
+    parts.append('</tbody><tfoot><tr><th scope="row" class="left " data-stat="player" >Squad Total</th></tr></tfoot></table>')
+    return "".join(parts)
+
+
+def _matchlogs_table(rng: random.Random, fixtures: int) -> str:
+    opponents = [team for team in TEAMS if team[0] != "dee3bbc8"]
+    parts = [
+        '<table class="stats_table sortable min_width" id="matchlogs_for" data-cols-to-freeze=",1">',
+        "<caption>Scores &amp; Fixtures Table</caption><thead><tr>",
+    ]
+    columns = ["date", "start_time", "comp", "round", "dayofweek", "venue", "result", "goals_for",
+               "goals_against", "opponent", "xg_for", "xg_against", "possession", "attendance",
+               "captain", "formation", "opp_formation", "referee", "match_report", "notes"]
+    parts.extend(f'<th data-stat="{c}" scope="col">{c}</th>' for c in columns)
+    parts.append("</tr></thead><tbody>")
+    day = 0
+    for i in range(fixtures):
+        if i and i % 21 == 0:
+            parts.append('<tr class="thead"><th data-stat="date">Date</th></tr>')
+        day += 7
+        month = 8 + day // 30
+        year = 2024 + (month - 1) // 12
+        date = f"{year}-{(month - 1) % 12 + 1:02d}-{day % 28 + 1:02d}"
+        team_id, team = opponents[i % len(opponents)]
+        venue = "Home" if i % 2 == 0 else "Away"
+        gf, ga = rng.randint(0, 4), rng.randint(0, 3)
+        result = "W" if gf > ga else "L" if gf < ga else "D"
+        parts.append(
+            f'<tr><th scope="row" class="left" data-stat="date" csk="{date.replace("-", "")}"><a href="/en/matches/{date}">{date}</a></th>'
+            f'<td class="center" data-stat="start_time">{rng.randint(14, 21)}:00</td>'
+            f'<td class="left" data-stat="comp"><a href="/en/comps/17/Segunda-Division-Stats">Segunda División</a></td>'
+            f'<td class="left" data-stat="round"><a href="/en/matches/{date}">Matchweek {i + 1}</a></td>'
+            f'<td class="left" data-stat="dayofweek">Sat</td>'
+            f'<td class="left" data-stat="venue">{venue}</td>'
+            f'<td class="center" data-stat="result">{result}</td>'
+            f'<td class="right" data-stat="goals_for">{gf}</td>'
+            f'<td class="right" data-stat="goals_against">{ga}</td>'
+            f'<td class="left" data-stat="opponent"><a href="/en/squads/{team_id}/{team.replace(" ", "-")}-Stats">{team}</a></td>'
+            f'<td class="right" data-stat="xg_for">{rng.random() * 3:.1f}</td>'
+            f'<td class="right" data-stat="xg_against">{rng.random() * 3:.1f}</td>'
+            f'<td class="right" data-stat="possession">{rng.randint(30, 70)}</td>'
+            f'<td class="right" data-stat="attendance">{rng.randint(5, 22)},{rng.randint(100, 999)}</td>'
+            f'<td class="left" data-stat="captain"><a href="/en/players/0f7dbaf6/Jokin-Ezkieta">Jokin Ezkieta</a></td>'
+            f'<td class="left" data-stat="formation">4-2-3-1</td>'
+            f'<td class="left" data-stat="opp_formation">4-4-2</td>'
+            f'<td class="left" data-stat="referee">Referee {i % 17}</td>'
+            f'<td class="left" data-stat="match_report"><a href="/en/matches/{date}">Match Report</a></td>'
+            f'<td class="left" data-stat="notes"></td></tr>'
+        )
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+
+def _league_table(rng: random.Random) -> str:
+    parts = [
+        '<table class="stats_table sortable min_width force_mobilize" id="results2024-2025171_overall">',
+        "<caption>Segunda División Table</caption><thead><tr>",
+    ]
+    columns = ["rank", "team", "games", "wins", "ties", "losses", "goals_for", "goals_against",
+               "goal_diff", "points", "points_avg", "xg_for", "xg_against", "last_5", "attendance_per_g"]
+    parts.extend(f'<th data-stat="{c}" scope="col">{c}</th>' for c in columns)
+    parts.append("</tr></thead><tbody>")
+    for rank, (team_id, team) in enumerate(TEAMS, start=1):
+        wins, ties = rng.randint(8, 24), rng.randint(5, 15)
+        losses = 42 - wins - ties
+        gf, ga = rng.randint(35, 70), rng.randint(30, 65)
+        parts.append(
+            f'<tr><th scope="row" class="right" data-stat="rank">{rank}</th>'
+            f'<td class="left" data-stat="team"><a href="/en/squads/{team_id}/{team.replace(" ", "-")}-Stats">{team}</a></td>'
+            f'<td class="right" data-stat="games">42</td><td class="right" data-stat="wins">{wins}</td>'
+            f'<td class="right" data-stat="ties">{ties}</td><td class="right" data-stat="losses">{losses}</td>'
+            f'<td class="right" data-stat="goals_for">{gf}</td><td class="right" data-stat="goals_against">{ga}</td>'
+            f'<td class="right" data-stat="goal_diff">{gf - ga:+d}</td>'
+            f'<td class="right" data-stat="points">{wins * 3 + ties}</td>'
+            f'<td class="right" data-stat="points_avg">{(wins * 3 + ties) / 42:.2f}</td>'
+            f'<td class="right" data-stat="xg_for">{rng.random() * 60:.1f}</td>'
+            f'<td class="right" data-stat="xg_against">{rng.random() * 60:.1f}</td>'
+            f'<td class="left" data-stat="last_5">W D L W W</td>'
+            f'<td class="right" data-stat="attendance_per_g">{rng.randint(4, 25)},{rng.randint(100, 999)}</td></tr>'
+        )
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+
+def build_page(size: str = "medium", seed: int = 17) -> str:
+    """Build a synthetic FBref squad page of the given size"""
+    players_count, fixtures, commented_tables, filler = SIZES[size]
+    rng = random.Random(f"{size}-{seed}")
+    used: set = set()
+    players = []
+    for _ in range(players_count):
+        name = _player_name(rng, used)
+        players.append({"id": f"{rng.getrandbits(32):08x}", "name": name, "stats": _player_row(rng, name)})
+
+    html = [
+        "<!DOCTYPE html><html data-version=\"klecko-\" lang=\"en\"><head><meta charset=\"utf-8\">",
+        "<title>2024-2025 Racing Santander Stats, Segunda División | FBref.com</title></head><body>",
+        '<div id="wrap"><div id="meta"><div><h1><span>2024-2025</span> <span>Racing Santander Stats</span></h1>',
+        "<p><strong>Record:</strong> 20-11-11, 71 points (1.69 per game), 5th in Segunda División</p>",
+        "<p><strong>Goals:</strong> 62 (1.48 per game), <strong>Goals Against:</strong> 48 (1.14 per game)</p>",
+        "<p><strong>Goal Diff:</strong> +14 &bull; Diff: +14</p>",
+        "<p><strong>Manager:</strong> José Alberto López</p></div></div>",
+        '<div id="content" role="main">',
+    ]
+    html.extend(f"<p class=\"filler\">{'FBref navigation and glossary text. ' * 8}</p>" for _ in range(filler))
+    html.append('<div class="table_wrapper" id="all_results2024-2025171"><div class="table_container">')
+    html.append(_league_table(rng))
+    html.append('</div></div><div class="table_wrapper" id="all_stats_standard"><div class="table_container" id="div_stats_standard_17">')
+    html.append(_stats_table("stats_standard_17", STANDARD_STATS, players, rng, "Standard Stats"))
+    html.append('</div></div><div class="table_wrapper" id="all_matchlogs"><div class="table_container">')
+    html.append(_matchlogs_table(rng, fixtures))
+    html.append("</div></div>")
+    for table_id, columns in list(COMMENTED_TABLES.items())[:commented_tables]:
+        table_players = [p for p in players if p["stats"]["position"] == "GK"] if "keeper" in table_id else players
+        html.append(
+            f'<div class="table_wrapper" id="all_{table_id[:-3]}"><div class="placeholder"></div>\n<!--\n'
+            f'<div class="table_container" id="div_{table_id}">'
+            f"{_stats_table(table_id, columns, table_players, rng, table_id)}</div>\n-->\n</div>"
+        )
+    html.append("</div></div></body></html>")
+    return "".join(html)
+
+
+def synthetic_path(size: str) -> str:
+    return os.path.join(PAGES_DIR, f"synthetic_{size}.html")
+
+
+def ensure_corpus() -> Dict[str, str]:
+    """Write any missing synthetic pages and return {name: path} for every page in the corpus"""
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    for size in SIZES:
+        path = synthetic_path(size)
+        if not os.path.exists(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(build_page(size))
+    return {
+        os.path.splitext(name)[0]: os.path.join(PAGES_DIR, name)
+        for name in sorted(os.listdir(PAGES_DIR))
+        if name.endswith(".html")
+    }
+
+
+def load_corpus() -> Dict[str, bytes]:
+    """{page name: raw bytes} for every page in the corpus"""
+    pages = {}
+    for name, path in ensure_corpus().items():
+        with open(path, "rb") as f:
+            pages[name] = f.read()
+    return pages
+
+
+async def _record(name: str) -> None:
+    from services.scraper_service import FBrefScraperService
+
+    # Record the whole page, not just the part the scraper needs
+    page = await FBrefScraperService()._fetch_page(required_tables=())
+    if not page:
+        raise SystemExit("All proxies failed - nothing recorded")
+    body = page.body
+    if codecs.lookup(page.encoding).name != "utf-8":
+        # The corpus is read as UTF-8
+        body = body.decode(page.encoding).encode("utf-8")
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    path = os.path.join(PAGES_DIR, f"{name}.html")
+    with open(path, "wb") as f:
+        f.write(body)
+    print(f"Recorded {len(body):,} bytes to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="Save the live FBref page into the corpus")
+    record_parser.add_argument("--name", default="recorded")
+    commands.add_parser("generate", help="(Re)generate the synthetic pages")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(_record(args.name))
+    else:
+        for size in SIZES:
+            path = synthetic_path(size)
+            if os.path.exists(path):
+                os.remove(path)
+        for name, path in ensure_corpus().items():
+            print(f"{name:<24}{os.path.getsize(path):>12,} bytes  {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Concurrent load test against the API, with FBref and the database replaced by
+local doubles (benchmarks.fake_fbref and benchmarks.memory_db).
+
+Starts the fake FBref server in-process and the API under uvicorn in a
+subprocess, then drives each scenario for a fixed duration and reports
+throughput and p50/p95/p99 latency:
+
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --scenario football --concurrency 64 --duration 20
+    python -m benchmarks.load_test --stale --fbref-latency-ms 300 --fbref-error-rate 0.1
+
+Baselines (benchmarks/baselines/load_test.json) are per machine. Record one
+with --save-baseline; --check exits non-zero when throughput drops or p95/p99
+grow by more than --tolerance compared to it.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.fake_fbref import FakeFBrefServer
+from benchmarks.fbref_pages import load_corpus
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "load_test.json")
+
+SCENARIOS: Dict[str, List[str]] = {
+    "football": [
+        "/api/v1/football/players",
+        "/api/v1/football/fixtures",
+        "/api/v1/football/standings",
+        "/api/v1/football/status",
+    ],
+    "scraper": [
+        "/api/v1/scrape/players",
+        "/api/v1/scrape/fixtures",
+        "/api/v1/scrape/standings",
+    ],
+    "items": [
+        "/api/v1/items/?limit=20",
+        "/api/v1/items/{item_id}",
+        "/api/v1/items/search/?q=Item%201",
+        "/api/v1/items/search/price-range/?min_price=10&max_price=50&limit=50",
+    ],
+}
+SCENARIOS["mixed"] = [path for paths in SCENARIOS.values() for path in paths]
+
+# Metrics compared against the baseline: (key, higher is better)
+CHECKED_METRICS = [("rps", True), ("p95_ms", False), ("p99_ms", False)]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+    }
+
+
+async def run_scenario(
+    base_url: str, paths: List[str], concurrency: int, duration: float, warmup: float, items: int
+) -> Tuple[Dict[str, float], Dict[str, Dict[str, float]]]:
+    """Drive `concurrency` closed-loop workers over `paths`; return overall and per-endpoint stats"""
+    per_endpoint: Dict[str, List[float]] = {path: [] for path in paths}
+    endpoint_errors: Dict[str, int] = {path: 0 for path in paths}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop_at = measure_from + duration
+
+        async def worker(worker_id: int) -> None:
+            i = worker_id
+            while True:
+                now = time.perf_counter()
+                if now >= stop_at:
+                    return
+                path = paths[i % len(paths)]
+                url = path.format(item_id=i % items + 1)
+                i += concurrency
+                sent = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    ok = response.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                received = time.perf_counter()
+                if sent >= measure_from:
+                    per_endpoint[path].append(received - sent)
+                    if not ok:
+                        endpoint_errors[path] += 1
+
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+
+    all_latencies = [value for values in per_endpoint.values() for value in values]
+    overall = summarize(all_latencies, sum(endpoint_errors.values()), duration)
+    endpoints = {path: summarize(per_endpoint[path], endpoint_errors[path], duration) for path in paths}
+    return overall, endpoints
+
+
+def start_api(port: int, fbref: FakeFBrefServer, args) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        BENCH_FBREF_PROXY=fbref.proxy_prefix,
+        BENCH_DB_LATENCY_MS=str(args.db_latency_ms),
+        BENCH_ITEMS=str(args.items),
+        BENCH_SCRAPER_CACHE="0" if args.no_scraper_cache else "1",
+        BENCH_STALE="1" if args.stale else "0",
+    )
+    log = open(args.server_log, "w") if args.server_log else subprocess.DEVNULL
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.bench_app:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"API exited during startup (code {process.returncode}); rerun with --server-log")
+        try:
+            if httpx.get(f"{base_url}/api/v1/health/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit("API did not become ready in time")
+
+
+def config_of(args) -> Dict[str, object]:
+    """Settings that must match for results to be comparable with a baseline"""
+    return {
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "page": args.page,
+        "fbref_latency_ms": args.fbref_latency_ms,
+        "fbref_error_rate": args.fbref_error_rate,
+        "db_latency_ms": args.db_latency_ms,
+        "scraper_cache": not args.no_scraper_cache,
+        "stale": args.stale,
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Return a description of every metric that regressed beyond the tolerance"""
+    regressions = []
+    for scenario, stats in results.items():
+        reference = baseline.get("scenarios", {}).get(scenario)
+        if not reference:
+            continue
+        for key, higher_is_better in CHECKED_METRICS:
+            old, new = reference["overall"][key], stats["overall"][key]
+            if not old:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{scenario} {key}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def print_report(results: Dict[str, Dict]) -> None:
+    header = f"{'scenario / endpoint':<72}{'reqs':>8}{'err':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for scenario, stats in results.items():
+        rows = [(scenario, stats["overall"])] + [(f"  {path}", s) for path, s in stats["endpoints"].items()]
+        for label, s in rows:
+            print(f"{label:<72}{s['requests']:>8}{s['errors']:>6}{s['rps']:>9.1f}"
+                  f"{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--page", default="synthetic_large", help="Corpus page served as the FBref squad page")
+    parser.add_argument("--fbref-latency-ms", type=float, default=150.0)
+    parser.add_argument("--fbref-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--fbref-error-rate", type=float, default=0.0)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--no-scraper-cache", action="store_true", help="Fetch and parse on every scraper request")
+    parser.add_argument("--stale", action="store_true", help="Expire the football cache so reads trigger refreshes")
+    parser.add_argument("--server-log", help="Write the API's output to this file")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="Fail on regressions against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    scenarios = args.scenario or ["football", "scraper", "items", "mixed"]
+    fbref = FakeFBrefServer(
+        load_corpus(),
+        args.page,
+        latency=args.fbref_latency_ms / 1000,
+        jitter=args.fbref_jitter_ms / 1000,
+    ).start()
+    base_url = f"http://127.0.0.1:{args.port}"
+    api = start_api(args.port, fbref, args)
+    try:
+        wait_until_ready(base_url, api)
+        # Seeding ran error-free; inject errors only for the measured traffic
+        fbref.error_rate = args.fbref_error_rate
+
+        results = {}
+        for scenario in scenarios:
+            overall, endpoints = await run_scenario(
+                base_url, SCENARIOS[scenario], args.concurrency, args.duration, args.warmup, args.items
+            )
+            results[scenario] = {"overall": overall, "endpoints": endpoints}
+    finally:
+        api.terminate()
+        api.wait(timeout=10)
+        fbref.stop()
+
+    print_report(results)
+    print(f"\nFBref requests: {fbref.requests} ({fbref.errors} injected errors)")
+
+    report = {
+        "config": config_of(args),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scenarios": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        # Keep scenarios that weren't run this time
+        baseline.setdefault("scenarios", {}).update(results)
+        baseline.update({k: report[k] for k in ("config", "machine", "recorded_at")})
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            raise SystemExit(f"No baseline at {args.baseline}; record one with --save-baseline")
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            print("Warning: baseline was recorded with different settings:", baseline.get("config"))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions beyond tolerance:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print("\nNo regressions beyond tolerance")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,229 @@
+"""
+In-memory stand-in for DatabaseService.
+
+Implements the same methods and result dicts as the Supabase and asyncpg
+backends (filters, projection, ordering, counts, keyset pages - see
+services/query.py), with an optional simulated round-trip latency, so the
+API can be load-tested without a database.
+"""
+
+import asyncio
+import copy
+import re
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from monitoring.metrics import timed_db_call
+from services.pagination import decode_cursor, keyset_terms, page_result
+from services.query import Filters, check_count, normalize_filters, parse_order
+
+
+def _like(pattern: str, flags: int = 0) -> "re.Pattern":
+    regex = "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern)
+    return re.compile(f"^{regex}$", flags | re.DOTALL)
+
+
+def _compare(operator: str, value: Any, target: Any) -> bool:
+    if operator == "is":
+        return value is target
+    if operator == "not_is":
+        return value is not target
+    if operator == "in":
+        return value in target
+    if value is None:
+        # SQL comparisons against NULL are never true
+        return False
+    if operator == "eq":
+        return value == target
+    if operator == "neq":
+        return value != target
+    if operator == "gt":
+        return value > target
+    if operator == "gte":
+        return value >= target
+    if operator == "lt":
+        return value < target
+    if operator == "lte":
+        return value <= target
+    if operator == "like":
+        return bool(_like(target).match(str(value)))
+    if operator == "ilike":
+        return bool(_like(target, re.IGNORECASE).match(str(value)))
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def _sort(rows: List[Dict[str, Any]], order_by: Optional[List[str]]) -> List[Dict[str, Any]]:
+    # Stable sorts from the last key to the first; NULLs sort last like Postgres ASC
+    for column, descending in reversed(parse_order(order_by)):
+        rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=descending)
+    return rows
+
+
+class InMemoryDatabaseService:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._ids: Dict[str, int] = {}
+
+    async def _roundtrip(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def close(self):
+        pass
+
+    def seed(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        """Insert rows synchronously (before the server starts)"""
+        for row in rows:
+            self._insert(table, row)
+
+    def _insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        rows = self.tables.setdefault(table, {})
+        row = dict(data)
+        if "id" not in row:
+            self._ids[table] = self._ids.get(table, 0) + 1
+            row["id"] = self._ids[table]
+        else:
+            self._ids[table] = max(self._ids.get(table, 0), row["id"])
+        now = datetime.now(timezone.utc).isoformat()
+        row.setdefault("created_at", now)
+        row.setdefault("updated_at", now)
+        rows[row["id"]] = row
+        return row
+
+    def _matching(self, table: str, predicates) -> List[Dict[str, Any]]:
+        return [
+            row for row in self.tables.get(table, {}).values()
+            if all(_compare(op, row.get(column), value) for column, op, value in predicates)
+        ]
+
+    @staticmethod
+    def _project(rows: List[Dict[str, Any]], columns: Optional[List[str]]) -> List[Dict[str, Any]]:
+        if not columns:
+            return [copy.copy(row) for row in rows]
+        return [{column: row.get(column) for column in columns} for row in rows]
+
+    @timed_db_call
+    async def create_record(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        await self._roundtrip()
+        return {"success": True, "data": copy.copy(self._insert(table, data))}
+
+    @timed_db_call
+    async def get_record(self, table: str, record_id: int) -> Dict[str, Any]:
+        await self._roundtrip()
+        row = self.tables.get(table, {}).get(record_id)
+        if row is None:
+            return {"success": False, "error": "Record not found"}
+        return {"success": True, "data": copy.copy(row)}
+
+    @timed_db_call
+    async def get_records(
+        self,
+        table: str,
+        filters: Optional[Filters] = None,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+        count: Optional[str] = None
+    ) -> Dict[str, Any]:
+        try:
+            predicates = normalize_filters(filters)
+            count_method = check_count(count)
+            await self._roundtrip()
+            rows = _sort(self._matching(table, predicates), order_by)
+            page = self._project(rows[skip:skip + limit], columns)
+            result = {"success": True, "data": page, "count": len(page)}
+            if count_method:
+                result["total"] = len(rows)
+            return result
+        except Exception as e:
+            return {"success": False, "error": str(e), "data": []}
+
+    @timed_db_call
+    async def get_page(
+        self,
+        table: str,
+        order_by: List[str],
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[Filters] = None,
+        columns: Optional[List[str]] = None,
+        count: Optional[str] = None
+    ) -> Dict[str, Any]:
+        after = decode_cursor(order_by, cursor)
+        try:
+            predicates = normalize_filters(filters)
+            count_method = check_count(count)
+            await self._roundtrip()
+            rows = _sort(self._matching(table, predicates), order_by)
+            total = len(rows)
+            if after is not None:
+                terms = keyset_terms(order_by, after)
+                rows = [
+                    row for row in rows
+                    if any(all(_compare(op, row.get(c), v) for c, op, v in term) for term in terms)
+                ]
+            if columns:
+                columns = list(columns) + [c for c, _ in parse_order(order_by) if c not in columns]
+            rows, next_cursor = page_result(self._project(rows[:limit + 1], columns), order_by, limit)
+            result = {"success": True, "data": rows, "count": len(rows), "next_cursor": next_cursor}
+            if count_method:
+                result["total"] = total
+            return result
+        except Exception as e:
+            return {"success": False, "error": str(e), "data": [], "next_cursor": None}
+
+    async def iter_records(
+        self,
+        table: str,
+        page_size: int = 500,
+        filters: Optional[Filters] = None,
+        columns: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        order_by = order_by or ["id"]
+        cursor = None
+        while True:
+            page = await self.get_page(
+                table, order_by, cursor=cursor, limit=page_size, filters=filters, columns=columns
+            )
+            if not page["success"]:
+                raise RuntimeError(f"Failed to stream {table}: {page['error']}")
+            if page["data"]:
+                yield page["data"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+    @timed_db_call
+    async def update_record(self, table: str, record_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        await self._roundtrip()
+        row = self.tables.get(table, {}).get(record_id)
+        if row is None:
+            return {"success": False, "error": "Record not found or no changes made"}
+        row.update(data)
+        row["updated_at"] = datetime.now(timezone.utc).isoformat()
+        return {"success": True, "data": copy.copy(row)}
+
+    @timed_db_call
+    async def delete_record(self, table: str, record_id: int) -> Dict[str, Any]:
+        await self._roundtrip()
+        if self.tables.get(table, {}).pop(record_id, None) is None:
+            return {"success": False, "error": "Record not found"}
+        return {"success": True, "deleted": 1}
+
+    @timed_db_call
+    async def delete_records(self, table: str, filters: Filters) -> Dict[str, Any]:
+        try:
+            predicates = normalize_filters(filters)
+            if not predicates:
+                return {"success": False, "error": "Refusing to delete without filters"}
+            await self._roundtrip()
+            doomed = [row["id"] for row in self._matching(table, predicates)]
+            rows = self.tables.get(table, {})
+            for record_id in doomed:
+                del rows[record_id]
+            return {"success": True, "deleted": len(doomed)}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Per-request overhead of the logging middleware, before and after the pure-ASGI rewrite.
+
+Drives a trivial FastAPI route directly through the ASGI interface (no sockets),
+so the numbers isolate middleware cost:
+
+    python -m benchmarks.middleware_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from typing import Callable
+
+from fastapi import FastAPI, Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from middleware.logging import DeferredQueueHandler, LoggingMiddleware, logger, _log_listener
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation this benchmark measures against."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        start_time = time.time()
+        method = request.method
+        url = str(request.url)
+        client_ip = request.client.host if request.client else "unknown"
+        user_agent = request.headers.get("user-agent", "unknown")
+        logger.info(f"Request: {method} {url} - IP: {client_ip} - User-Agent: {user_agent}")
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logger.info(
+            f"Response: {method} {url} - Status: {response.status_code} - "
+            f"Time: {process_time:.4f}s"
+        )
+        response.headers["X-Process-Time"] = str(process_time)
+        return response
+
+
+def _build_app(middleware_class=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if middleware_class is not None:
+        app.add_middleware(middleware_class)
+    return app
+
+
+async def _drive(app: FastAPI, requests: int) -> float:
+    """Send `requests` GET /ping calls through the ASGI app, return seconds elapsed"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"user-agent", b"benchmark/1.0")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - start
+
+
+def _use_handler(handler: logging.Handler):
+    """Route the middleware logger to a single handler (no propagation)"""
+    logger.handlers = [handler]
+    logger.propagate = False
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    direct_handler = logging.StreamHandler(devnull)
+    # The listener thread writes to its own handlers; point them at /dev/null too
+    _log_listener.handlers = (logging.StreamHandler(devnull),)
+
+    scenarios = [
+        ("no middleware", None, direct_handler),
+        ("BaseHTTPMiddleware (before)", LegacyLoggingMiddleware, direct_handler),
+        ("pure ASGI + queue (after)", LoggingMiddleware, DeferredQueueHandler(_log_listener.queue)),
+    ]
+
+    results = []
+    for name, middleware_class, handler in scenarios:
+        _use_handler(handler)
+        app = _build_app(middleware_class)
+        await _drive(app, min(1000, args.requests))  # warm-up
+        elapsed = await _drive(app, args.requests)
+        results.append((name, elapsed / args.requests * 1e6))
+
+    baseline = results[0][1]
+    print(f"{'scenario':<32}{'us/request':>12}{'overhead us':>14}")
+    for name, per_request in results:
+        print(f"{name:<32}{per_request:>12.1f}{per_request - baseline:>14.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Parser micro-benchmark over the FBref page corpus.
+
+Times ``parse_fbref_data`` and each extractor on every page in
+``benchmarks/pages/`` and reports, per page:
+
+- wall time (median and best of --repeat runs; regressions are judged on the median)
+- peak Python allocations while the call runs (tracemalloc)
+- peak RSS growth of a full ``parse_fbref_data`` in a fresh process
+
+Outputs are compared with the recorded ones so an optimization can't silently
+change results, and timings/memory with the baseline thresholds:
+
+    python -m benchmarks.parser_bench
+    python -m benchmarks.parser_bench --check           # exit 1 on mismatch or regression
+    python -m benchmarks.parser_bench --save-baseline   # record timings and outputs
+
+Each page is also cut where the streaming download would stop
+(services/html_stream.py) and the prefix must parse to the same output.
+
+Trees for the individual extractors are built outside the timed region;
+``parse_fbref_data`` includes building its own.
+"""
+
+import argparse
+import contextlib
+import gc
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.fbref_pages import load_corpus
+from lxml import html as lxml_html
+
+from services.html_stream import TableScanner, make_tree
+from services.scraper_service import FBrefScraperService
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+BASELINE_PATH = os.path.join(BASELINE_DIR, "parser_bench.json")
+OUTPUTS_PATH = os.path.join(BASELINE_DIR, "parser_outputs.json")
+
+# Allowed relative growth before --check fails; stored with the baseline so CI and
+# developers share them, overridable per run
+# Slowdowns smaller than this are scheduler noise on a shared machine, not regressions:
+# the median of a 5-10 ms target moves by 2-3 ms between clean runs here
+MIN_WALL_DELTA_MS = 5.0
+DEFAULT_THRESHOLDS = {"wall_time": 0.20, "min_wall_delta_ms": MIN_WALL_DELTA_MS, "peak_alloc": 0.25, "peak_rss": 0.30}
+
+# Pages are handed over as raw UTF-8 bytes, the way the scraper passes them on
+Target = Callable[[FBrefScraperService, bytes, lxml_html.HtmlElement], Any]
+TARGETS: Dict[str, Target] = {
+    "parse_fbref_data": lambda scraper, html, tree: scraper.parse_fbref_data(html, "utf-8"),
+    "extract_squad_data": lambda scraper, html, tree: scraper.extract_squad_data(tree),
+    "extract_past_fixtures": lambda scraper, html, tree: scraper.extract_past_fixtures(tree),
+    "extract_league_position": lambda scraper, html, tree: scraper.extract_league_position(tree),
+    # Schema-compiled tables outside parse_fbref_data, mostly inside HTML comments
+    "stats_table[shooting]": lambda scraper, html, tree: scraper.extract_stats_table(tree, "shooting"),
+    "stats_table[passing]": lambda scraper, html, tree: scraper.extract_stats_table(tree, "passing"),
+    "stats_table[keeper]": lambda scraper, html, tree: scraper.extract_stats_table(tree, "keeper"),
+}
+# Which part of the parse_fbref_data result each extractor produces
+OUTPUT_KEYS = {
+    "extract_squad_data": "squad",
+    "extract_past_fixtures": "pastFixtures",
+    "extract_league_position": "leaguePosition",
+}
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence extractor logging and debug prints (their formatting cost is still paid)"""
+    logging.disable(logging.CRITICAL)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            yield
+        finally:
+            logging.disable(logging.NOTSET)
+
+
+def digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def time_target(target: Target, scraper, html: bytes, tree, repeat: int) -> Tuple[List[float], Any]:
+    target(scraper, html, tree)  # warm-up
+    timings = []
+    result = None
+    # Like timeit: a collection landing in some runs and not others swamps small targets
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = target(scraper, html, tree)
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return timings, result
+
+
+def peak_allocations(target: Target, scraper, html: bytes, tree) -> int:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        target(scraper, html, tree)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+
+def _read_status_kib(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def _rss_child(html: bytes, connection) -> None:
+    """Runs in a fresh process: peak RSS growth of one full parse"""
+    scraper = FBrefScraperService()
+    try:
+        # Linux: reset the high-water mark so it only covers the parse
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        before = _read_status_kib("VmRSS")
+        measure = lambda: _read_status_kib("VmHWM")
+    except OSError:
+        # Elsewhere fall back to the lifetime peak (KiB on Linux, bytes on macOS)
+        scale = 1024 if sys.platform == "darwin" else 1
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale
+        measure = lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale
+    with quiet():
+        scraper.parse_fbref_data(html, "utf-8")
+    connection.send(max(measure() - before, 0))
+    connection.close()
+
+
+def peak_rss_kib(html: bytes) -> int:
+    context = multiprocessing.get_context("spawn")
+    parent, child = context.Pipe(duplex=False)
+    process = context.Process(target=_rss_child, args=(html, child))
+    process.start()
+    value = parent.recv()
+    process.join()
+    return value
+
+
+def streamed_prefix(scraper: FBrefScraperService, raw: bytes) -> bytes:
+    """The part of the page the streaming download keeps before stopping early"""
+    scanner = TableScanner(scraper.required_tables)
+    for end in range(scraper.download_chunk_size, len(raw) + scraper.download_chunk_size, scraper.download_chunk_size):
+        if scanner.scan(raw[:end]):
+            return raw[:end]
+    return raw
+
+
+def run(pages: Dict[str, bytes], repeat: int, measure_rss: bool) -> Tuple[Dict, Dict]:
+    scraper = FBrefScraperService()
+    results: Dict[str, Dict] = {}
+    outputs: Dict[str, Any] = {}
+    for name, raw in pages.items():
+        html = raw
+        tree = make_tree(raw, "utf-8")
+        page_result: Dict[str, Any] = {"bytes": len(raw), "targets": {}}
+        with quiet():
+            for target_name, target in TARGETS.items():
+                timings, output = time_target(target, scraper, html, tree, repeat)
+                page_result["targets"][target_name] = {
+                    "median_ms": round(statistics.median(timings) * 1000, 3),
+                    "best_ms": round(min(timings) * 1000, 3),
+                    "peak_alloc_kib": round(peak_allocations(target, scraper, html, tree) / 1024, 1),
+                    "output_sha256": digest(output),
+                }
+                if target_name == "parse_fbref_data":
+                    outputs[name] = output
+                elif target_name in OUTPUT_KEYS:
+                    # Extractors must agree with the combined parse
+                    page_result["targets"][target_name]["matches_full_parse"] = (
+                        digest(output) == digest(outputs[name][OUTPUT_KEYS[target_name]])
+                    )
+        prefix = streamed_prefix(scraper, raw)
+        with quiet():
+            streamed_output = scraper.parse_fbref_data(prefix, "utf-8")
+        page_result["streamed_bytes"] = len(prefix)
+        page_result["streamed_matches_full"] = digest(streamed_output) == digest(outputs[name])
+        if measure_rss:
+            page_result["peak_rss_kib"] = peak_rss_kib(html)
+        results[name] = page_result
+    return results, outputs
+
+
+def compare(results: Dict, outputs: Dict, baseline: Dict, recorded_outputs: Dict, thresholds: Dict) -> List[str]:
+    """Return every output mismatch and threshold breach against the baseline"""
+    problems = []
+    for page, page_result in results.items():
+        for target_name, stats in page_result["targets"].items():
+            if stats.get("matches_full_parse") is False:
+                problems.append(f"{page} {target_name}: output differs from parse_fbref_data")
+        if page_result.get("streamed_matches_full") is False:
+            problems.append(f"{page}: parsing the early-stopped download differs from the full page")
+
+        if page in recorded_outputs and digest(outputs[page]) != digest(recorded_outputs[page]):
+            for key in outputs[page]:
+                if digest(outputs[page][key]) != digest(recorded_outputs[page].get(key)):
+                    problems.append(f"{page}: '{key}' output changed from the recorded output")
+
+        reference = baseline.get("pages", {}).get(page)
+        if not reference:
+            continue
+        for target_name, stats in page_result["targets"].items():
+            old = reference["targets"].get(target_name)
+            if not old:
+                continue
+            if target_name not in OUTPUT_KEYS and target_name != "parse_fbref_data" \
+                    and stats["output_sha256"] != old["output_sha256"]:
+                problems.append(f"{page} {target_name}: output changed from the baseline")
+            # The median of many runs moves far less between clean reruns than the best,
+            # which a single lucky or descheduled run decides
+            delta_ms = stats["median_ms"] - old["median_ms"]
+            if delta_ms > thresholds["min_wall_delta_ms"] and delta_ms / old["median_ms"] > thresholds["wall_time"]:
+                problems.append(
+                    f"{page} {target_name}: median {old['median_ms']}ms -> {stats['median_ms']}ms"
+                    f" (+{delta_ms / old['median_ms']:.0%}, limit {thresholds['wall_time']:.0%}"
+                    f" and {thresholds['min_wall_delta_ms']}ms)"
+                )
+            if old["peak_alloc_kib"] and stats["peak_alloc_kib"] / old["peak_alloc_kib"] - 1 > thresholds["peak_alloc"]:
+                problems.append(
+                    f"{page} {target_name}: peak allocations {old['peak_alloc_kib']}KiB -> {stats['peak_alloc_kib']}KiB"
+                )
+        old_rss, new_rss = reference.get("peak_rss_kib"), page_result.get("peak_rss_kib")
+        # RSS growth is page-granular, so only judge it when it is big enough to be meaningful
+        if old_rss and new_rss is not None and old_rss >= 1024 and new_rss / old_rss - 1 > thresholds["peak_rss"]:
+            problems.append(f"{page}: peak RSS growth {old_rss}KiB -> {new_rss}KiB")
+    return problems
+
+
+def print_report(results: Dict) -> None:
+    header = f"{'page / target':<36}{'KiB':>8}{'median ms':>11}{'best ms':>10}{'peak alloc KiB':>16}{'peak RSS KiB':>14}"
+    print(header)
+    print("-" * len(header))
+    for page, page_result in results.items():
+        rss = page_result.get("peak_rss_kib")
+        print(f"{page:<36}{page_result['bytes'] / 1024:>8.0f}{'':>11}{'':>10}{'':>16}{rss if rss is not None else '-':>14}")
+        print(f"  {'streamed download':<34}{page_result['streamed_bytes'] / 1024:>8.0f}"
+              f"  {'matches full parse' if page_result['streamed_matches_full'] else 'DIFFERS from full parse'}")
+        for target_name, stats in page_result["targets"].items():
+            print(f"  {target_name:<34}{'':>8}{stats['median_ms']:>11.2f}{stats['best_ms']:>10.2f}"
+                  f"{stats['peak_alloc_kib']:>16.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", action="append", help="Only benchmark this corpus page (repeatable)")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--no-rss", action="store_true", help="Skip the per-page subprocess RSS measurement")
+    parser.add_argument("--max-slowdown", type=float, help="Override the wall-time threshold (e.g. 0.1 = 10%%)")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--save-baseline", action="store_true", help="Record timings and outputs as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on output changes or threshold breaches")
+    args = parser.parse_args()
+
+    pages = load_corpus()
+    if args.page:
+        missing = set(args.page) - set(pages)
+        if missing:
+            raise SystemExit(f"Unknown pages: {', '.join(sorted(missing))}")
+        pages = {name: pages[name] for name in args.page}
+
+    results, outputs = run(pages, args.repeat, measure_rss=not args.no_rss)
+    print_report(results)
+
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+    recorded_outputs: Dict[str, Any] = {}
+    if os.path.exists(OUTPUTS_PATH):
+        with open(OUTPUTS_PATH) as f:
+            recorded_outputs = json.load(f)
+    thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {})}
+    if args.max_slowdown is not None:
+        thresholds["wall_time"] = args.max_slowdown
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"pages": results}, f, indent=2)
+
+    # Compare before saving so a deliberate output change is still reported once
+    problems = compare(results, outputs, baseline, recorded_outputs, thresholds)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        baseline.setdefault("pages", {}).update(results)
+        baseline["thresholds"] = thresholds
+        baseline["machine"] = {"python": platform.python_version(), "platform": platform.platform()}
+        baseline["recorded_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2)
+        recorded_outputs.update(json.loads(json.dumps(outputs, default=str)))
+        with open(OUTPUTS_PATH, "w") as f:
+            json.dump(recorded_outputs, f, indent=1, ensure_ascii=False, sort_keys=True)
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+
+    if problems:
+        print("\nProblems:")
+        for line in problems:
+            print(f"  {line}")
+        if args.check:
+            raise SystemExit(1)
+    elif args.check:
+        print("\nOutputs match and no threshold was crossed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Local webhook receiver for testing change event delivery.
+
+Accepts POSTed event batches, checks their signature when given a secret,
+and records them. It can answer slowly and fail a configurable fraction of
+requests with 503, to exercise the dispatcher's retries:
+
+    python -m benchmarks.webhook_receiver --port 9420 --error-rate 0.2 --secret s3cret
+
+Then register it, with WEBHOOK_ALLOWED_HOSTS=127.0.0.1 set on the server:
+
+    curl -X POST localhost:8000/api/v1/webhooks/ -H 'Content-Type: application/json' \\
+         -H "X-Admin-Key: $WEBHOOK_ADMIN_KEY" \\
+         -d '{"url": "http://127.0.0.1:9420/events", "secret": "s3cret"}'
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+class WebhookReceiver:
+    """Threaded receiver recording every accepted batch"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        secret: Optional[str] = None,
+        seed: int = 0,
+        verbose: bool = False
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.secret = secret
+        self.verbose = verbose
+        self.batches: List[List[Dict[str, Any]]] = []
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/events"
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """Every accepted event, by id (batches can arrive out of order)"""
+        with self._lock:
+            return sorted((event for batch in self.batches for event in batch), key=lambda event: event["id"])
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status: int, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with server._lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    fail = server._rng.random() < server.error_rate
+                    if fail:
+                        server.errors += 1
+                try:
+                    if server.latency > 0:
+                        time.sleep(server.latency)
+                    if server.secret is not None:
+                        expected = "sha256=" + hmac.new(server.secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+                        if not hmac.compare_digest(expected, self.headers.get("X-Webhook-Signature", "")):
+                            with server._lock:
+                                server.rejected += 1
+                            return self._reply(401, b"Bad signature")
+                    if fail:
+                        return self._reply(503, b"Service Unavailable")
+                    events = json.loads(body)["events"]
+                    with server._lock:
+                        server.batches.append(events)
+                    if server.verbose:
+                        for event in events:
+                            print(f"#{event['id']} {event['type']} v{event['version']}: "
+                                  f"{json.dumps(event.get('record') or event.get('key'))}")
+                    self._reply(204, b"")
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "WebhookReceiver":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="webhook-receiver", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "WebhookReceiver":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9420)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--secret", default=None, help="Reject batches without a matching X-Webhook-Signature")
+    args = parser.parse_args()
+
+    receiver = WebhookReceiver(
+        host=args.host,
+        port=args.port,
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+        secret=args.secret,
+        verbose=True,
+    )
+    print(f"Receiving change events on {receiver.url}")
+    try:
+        receiver._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,48 @@ class Settings(BaseSettings):
     supabase_url: str = Field(alias='SUPABASE_PROJECT_URL')
     supabase_key: str = Field(alias='SUPABASE_API_KEY')
     supabase_password: Optional[str] = Field(default=None, alias='SUPABASE_PW')
-    
+
+    # Dedicated thread pool for the Supabase client (keeps DB calls off the default executor)
+    db_executor_workers: int = Field(default=16, alias='DB_EXECUTOR_WORKERS')
+
+    # Direct Postgres connection - when set, the asyncpg pool replaces the Supabase client
+    database_url: Optional[str] = Field(default=None, alias='DATABASE_URL')
+    db_pool_min_size: int = Field(default=2, alias='DB_POOL_MIN_SIZE')
+    db_pool_max_size: int = Field(default=10, alias='DB_POOL_MAX_SIZE')
+    db_statement_cache_size: int = Field(default=100, alias='DB_STATEMENT_CACHE_SIZE')  # 0 behind pgbouncer (transaction mode)
+    db_command_timeout: float = Field(default=10.0, alias='DB_COMMAND_TIMEOUT')
+
+    # Season projection: process pool for large simulation runs (0 = one worker per CPU, up to 4)
+    projection_workers: int = Field(default=0, alias='PROJECTION_WORKERS')
+
+    # Team ratings state, saved after every batch of new results, e.g. "data/team_ratings.json"
+    # ("" keeps the ratings in memory, rebuilt from the fixtures table on first use)
+    ratings_state_file: str = Field(default="", alias='RATINGS_STATE_FILE')
+
+    # Append-only columnar archive of every scrape, e.g. "data/archive" ("" disables it)
+    archive_dir: str = Field(default="", alias='ARCHIVE_DIR')
+
+    # Change-only time series of standings and player stats, e.g. "data/history" ("" disables them)
+    history_dir: str = Field(default="", alias='HISTORY_DIR')
+
+    # Change events: durable SQLite queue delivered to registered webhooks, e.g. "data/events.sqlite3" ("" disables them)
+    events_db: str = Field(default="", alias='EVENTS_DB')
+    webhook_batch_size: int = Field(default=100, alias='WEBHOOK_BATCH_SIZE')
+    webhook_concurrency: int = Field(default=2, alias='WEBHOOK_CONCURRENCY')  # requests in flight per webhook
+    webhook_max_attempts: int = Field(default=10, alias='WEBHOOK_MAX_ATTEMPTS')
+    # Sent as X-Admin-Key to manage webhooks ("" disables the webhooks API)
+    webhook_admin_key: str = Field(default="", alias='WEBHOOK_ADMIN_KEY')
+    # Comma-separated hosts allowed to resolve to loopback / private addresses (e.g. "127.0.0.1,receiver.internal")
+    webhook_allowed_hosts: str = Field(default="", alias='WEBHOOK_ALLOWED_HOSTS')
+
+    # Tracing spans: "none", "jsonl" (TRACE_FILE) or "collector" (POST to TRACE_COLLECTOR_URL)
+    trace_exporter: str = Field(default="none", alias='TRACE_EXPORTER')
+    trace_file: str = Field(default="", alias='TRACE_FILE')  # required by "jsonl", e.g. "data/traces.jsonl"
+    trace_collector_url: str = Field(default="http://127.0.0.1:9412/spans", alias='TRACE_COLLECTOR_URL')
+
     class Config:
         env_file = ".env"
 
 
 # Global settings instance
-settings = Settings() 
\ No newline at end of file
+settings = Settings()
\ No newline at end of file
@@ -0,0 +1,347 @@
+import logging
+from datetime import date
+from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from services.player_stats import METRICS, PlayerStatsService
+from services.player_similarity import PlayerSimilarityService
+from services.season_projection import SeasonProjectionService
+from services.team_ratings import TeamRatingsService
+from services.form_analytics import FormAnalyticsService
+from services.standings_engine import StandingsService
+from services.head_to_head import HeadToHeadService
+from services.leaderboards import LeaderboardService
+from services.scrape_archive import ArchiveService
+from services.snapshot_history import SnapshotHistoryService
+from services.snapshot_diff import SnapshotDiffService
+from dependencies import (
+    get_archive_service, get_form_analytics_service, get_head_to_head_service, get_leaderboard_service, get_player_similarity_service,
+    get_player_stats_service, get_season_projection_service, get_snapshot_diff_service, get_snapshot_history_service,
+    get_standings_service, get_team_ratings_service
+)
+from monitoring.tracing import resolve_request_id
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Create router
+analytics_router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
+
+def _get_request_id(request: Request) -> str:
+    """Request ID bound by the request context middleware (client-supplied or generated)."""
+    return resolve_request_id(request)
+
+def _split(values: Optional[List[str]]) -> List[str]:
+    """Accept both ?stat=a&stat=b and ?stat=a,b"""
+    return [part.strip() for value in values or [] for part in value.split(",") if part.strip()]
+
+def _respond(result: Dict[str, Any], request_id: str, message: str) -> Dict[str, Any]:
+    """Map a service result dict to a response or the matching HTTP error"""
+    if result["success"]:
+        return {"success": True, "data": result["data"], "message": message, "request_id": request_id}
+    if result.get("bad_request"):
+        status_code = 400
+    elif result.get("not_found"):
+        status_code = 404
+    else:
+        status_code = 503
+    raise HTTPException(status_code=status_code, detail={"error": result["error"], "request_id": request_id})
+
+@analytics_router.get("/player-stats/columns")
+async def get_player_stat_columns(
+    request: Request,
+    player_stats: PlayerStatsService = Depends(get_player_stats_service)
+) -> Dict[str, Any]:
+    """
+    List the stats in the columnar player stats store and the derived metrics available for each.
+
+    Returns:
+        - stats: Stat name, source table and NumPy dtype
+        - metrics: Stats covered by each derived metric
+        - version: Page version the store was built from
+    """
+    request_id = _get_request_id(request)
+    result = await player_stats.get_columns()
+    return _respond(result, request_id, "Player stat columns retrieved")
+
+@analytics_router.get("/player-stats")
+async def get_player_stats(
+    request: Request,
+    stat: Optional[List[str]] = Query(None, description="Stats to return (repeat or comma-separate; default all)"),
+    metric: Optional[List[str]] = Query(None, description=f"Derived metrics to add: {', '.join(METRICS)}"),
+    min_90s: float = Query(0.0, ge=0, description="Minimum 90-minute units to be ranked in percentiles"),
+    player_stats: PlayerStatsService = Depends(get_player_stats_service)
+) -> Dict[str, Any]:
+    """
+    Squad player stats in columnar form.
+
+    Every list is in the order of `players`: `stats[stat][i]` belongs to
+    `players[i]`, and so do `per90[stat][i]`, `share[stat][i]`, etc.
+    Values missing for a player (e.g. keeper stats for outfielders) are null.
+    """
+    request_id = _get_request_id(request)
+    logger.info("Getting columnar player stats")
+    result = await player_stats.get_stats(_split(stat) or None, _split(metric), min_90s)
+    return _respond(result, request_id, "Player stats retrieved")
+
+@analytics_router.get("/leaderboards/{stat}")
+async def get_leaderboard(
+    stat: str,
+    request: Request,
+    value: str = Query("total", description="total or per90"),
+    position: Optional[str] = Query(None, description="GK, DF, MF or FW"),
+    age_band: Optional[str] = Query(None, description="u21, u23, 23-29 or 30+"),
+    min_90s: float = Query(0.0, ge=0, description="Minimum 90-minute units to be ranked"),
+    offset: int = Query(0, ge=0, description="Number of leaders to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Number of leaders to return"),
+    leaderboards: LeaderboardService = Depends(get_leaderboard_service)
+) -> Dict[str, Any]:
+    """
+    Players ranked by one stat across every indexed squad, e.g. goals, or
+    assists among under-23s. `total` is the number of ranked players.
+    """
+    request_id = _get_request_id(request)
+    result = await leaderboards.get_leaderboard(stat, value, position, age_band, min_90s, offset, limit)
+    return _respond(result, request_id, "Leaderboard retrieved")
+
+@analytics_router.get("/player-stats/{player_id}/similar")
+async def get_similar_players(
+    player_id: str,
+    request: Request,
+    k: int = Query(10, ge=1, le=100, description="Number of similar players to return"),
+    similarity: PlayerSimilarityService = Depends(get_player_similarity_service)
+) -> Dict[str, Any]:
+    """
+    The k players most like one player (FBref player id), by cosine similarity
+    of their normalized per-90 and rate stats.
+
+    Only players with enough minutes are indexed; `similarity` is in [-1, 1].
+    """
+    request_id = _get_request_id(request)
+    result = await similarity.get_similar(player_id, k)
+    return _respond(result, request_id, "Similar players retrieved")
+
+@analytics_router.get("/player-stats/{player_id}")
+async def get_player_stat_profile(
+    player_id: str,
+    request: Request,
+    min_90s: float = Query(0.0, ge=0, description="Minimum 90-minute units to be ranked in percentiles"),
+    player_stats: PlayerStatsService = Depends(get_player_stats_service)
+) -> Dict[str, Any]:
+    """
+    Every stat and derived metric for one player (FBref player id).
+    """
+    request_id = _get_request_id(request)
+    result = await player_stats.get_player(player_id, min_90s)
+    return _respond(result, request_id, "Player stats retrieved")
+
+@analytics_router.get("/season-projection")
+async def get_season_projection(
+    request: Request,
+    simulations: int = Query(10000, ge=1000, le=500000, description="Number of simulated seasons"),
+    projection: SeasonProjectionService = Depends(get_season_projection_service)
+) -> Dict[str, Any]:
+    """
+    Monte Carlo projection of the rest of the league season.
+
+    Returns Racing's final position distribution, expected points and
+    promotion / play-off / relegation odds, plus every team's odds.
+    Cached per scraped page version and simulation count.
+    """
+    request_id = _get_request_id(request)
+    logger.info(f"Projecting season over {simulations} simulations")
+    result = await projection.get_projection(simulations)
+    return _respond(result, request_id, "Season projection computed")
+
+@analytics_router.get("/ratings")
+async def get_team_ratings(
+    request: Request,
+    ratings: TeamRatingsService = Depends(get_team_ratings_service)
+) -> Dict[str, Any]:
+    """
+    Current Elo-style strength rating of every club in the fixture history, strongest first.
+    """
+    request_id = _get_request_id(request)
+    result = await ratings.get_ratings()
+    return _respond(result, request_id, "Team ratings retrieved")
+
+@analytics_router.get("/ratings/{team}/history")
+async def get_team_rating_history(
+    team: str,
+    request: Request,
+    ratings: TeamRatingsService = Depends(get_team_ratings_service)
+) -> Dict[str, Any]:
+    """
+    A club's rating after each of its matches (team name as in the fixtures, e.g. "Racing de Santander").
+    """
+    request_id = _get_request_id(request)
+    result = await ratings.get_history(team)
+    return _respond(result, request_id, "Team rating history retrieved")
+
+@analytics_router.post("/ratings/rebuild")
+async def rebuild_team_ratings(
+    request: Request,
+    ratings: TeamRatingsService = Depends(get_team_ratings_service)
+) -> Dict[str, Any]:
+    """
+    Backfill: recompute every rating by replaying all stored fixtures.
+    """
+    request_id = _get_request_id(request)
+    logger.info("Rebuilding team ratings from stored fixtures")
+    result = await ratings.rebuild()
+    return _respond(result, request_id, "Team ratings rebuilt")
+
+@analytics_router.get("/form")
+async def get_form_table(
+    request: Request,
+    window: int = Query(5, ge=1, le=50, description="Number of most recent matches in the form window"),
+    form: FormAnalyticsService = Depends(get_form_analytics_service)
+) -> Dict[str, Any]:
+    """
+    Form table of every club in the stored fixtures: results, points per game
+    and goals over the last `window` matches, plus totals and home/away split.
+    """
+    request_id = _get_request_id(request)
+    result = await form.get_form_table(window)
+    return _respond(result, request_id, "Form table retrieved")
+
+@analytics_router.get("/form/{team}")
+async def get_team_form(
+    team: str,
+    request: Request,
+    window: int = Query(5, ge=1, le=50, description="Number of matches in the rolling window"),
+    form: FormAnalyticsService = Depends(get_form_analytics_service)
+) -> Dict[str, Any]:
+    """
+    A club's matches in date order with rolling points per game and goal
+    difference over `window` matches (columnar: one list per field).
+    """
+    request_id = _get_request_id(request)
+    result = await form.get_team_form(team, window)
+    return _respond(result, request_id, "Team form retrieved")
+
+@analytics_router.get("/standings")
+async def get_derived_standings(
+    request: Request,
+    as_of: Optional[date] = Query(None, description="Table after the last match day on or before this date"),
+    season: Optional[str] = Query(None, pattern=r"^\d{4}-\d{4}$", description="Season, e.g. 2024-2025 (default: that of as_of, else the latest)"),
+    standings: StandingsService = Depends(get_standings_service)
+) -> Dict[str, Any]:
+    """
+    League table of one season computed from the stored results (points,
+    W/D/L, goals, head-to-head tie-breaks), now or as of a past date.
+    """
+    request_id = _get_request_id(request)
+    result = await standings.get_table(as_of.isoformat() if as_of else None, season)
+    return _respond(result, request_id, "Derived standings retrieved")
+
+@analytics_router.get("/standings/check")
+async def check_derived_standings(
+    request: Request,
+    standings: StandingsService = Depends(get_standings_service)
+) -> Dict[str, Any]:
+    """
+    Cross-check Racing's derived row against the scraped standings and league
+    table; lists every field that disagrees.
+    """
+    request_id = _get_request_id(request)
+    result = await standings.cross_check()
+    return _respond(result, request_id, "Derived standings checked")
+
+@analytics_router.get("/head-to-head/{team}/{opponent}")
+async def get_head_to_head(
+    team: str,
+    opponent: str,
+    request: Request,
+    head_to_head: HeadToHeadService = Depends(get_head_to_head_service)
+) -> Dict[str, Any]:
+    """
+    Every stored match between two clubs (newest first) with `team`'s record
+    against `opponent` overall, at home and away.
+    """
+    request_id = _get_request_id(request)
+    result = await head_to_head.get_head_to_head(team, opponent)
+    return _respond(result, request_id, "Head-to-head retrieved")
+
+@analytics_router.get("/opponents/{team}")
+async def get_opponent_records(
+    team: str,
+    request: Request,
+    venue: str = Query("all", description="all, home or away"),
+    top: Optional[int] = Query(None, ge=1, le=42, description="Only opponents currently in the league table's top N"),
+    head_to_head: HeadToHeadService = Depends(get_head_to_head_service)
+) -> Dict[str, Any]:
+    """
+    A club's record against each opponent, e.g. ?venue=home&top=6 for the
+    record at home against the current top six, with the combined total.
+    """
+    request_id = _get_request_id(request)
+    result = await head_to_head.get_opponents(team, venue, top)
+    return _respond(result, request_id, "Opponent records retrieved")
+
+# The archive and history routes read files and memory-mapped arrays, so they are plain
+# functions: FastAPI runs them in its threadpool instead of on the event loop.
+@analytics_router.get("/archive/{data_type}")
+def get_archive_partitions(
+    data_type: str,
+    request: Request,
+    season: Optional[str] = Query(None, description="Season, e.g. 2024-2025"),
+    archive: ArchiveService = Depends(get_archive_service)
+) -> Dict[str, Any]:
+    """
+    Archived scrapes of one data type (players, fixtures, standings), oldest
+    first, with each partition's row count and column dtypes.
+    """
+    request_id = _get_request_id(request)
+    result = archive.get_partitions(data_type, season)
+    return _respond(result, request_id, "Archive partitions retrieved")
+
+@analytics_router.get("/archive/{data_type}/diff")
+def get_snapshot_diff(
+    data_type: str,
+    request: Request,
+    since: int = Query(..., description="Base version: a scrape time or any timestamp (ms since epoch)"),
+    until: Optional[int] = Query(None, description="Target version (ms since epoch; default the latest scrape)"),
+    diffs: SnapshotDiffService = Depends(get_snapshot_diff_service)
+) -> Dict[str, Any]:
+    """
+    What changed between two archived scrapes: added and removed records, and
+    changed records with only their changed fields. Timestamps resolve to
+    the latest scrape at or before them.
+    """
+    request_id = _get_request_id(request)
+    result = diffs.get_diff(data_type, since, until)
+    return _respond(result, request_id, "Snapshot diff computed")
+
+@analytics_router.get("/history/standings")
+def get_standings_history(
+    request: Request,
+    since: Optional[int] = Query(None, description="Start of the range (ms since epoch)"),
+    until: Optional[int] = Query(None, description="End of the range (ms since epoch)"),
+    points: int = Query(200, ge=2, le=5000, description="Maximum points returned (downsampled on the server)"),
+    history: SnapshotHistoryService = Depends(get_snapshot_history_service)
+) -> Dict[str, Any]:
+    """
+    Racing's league position, points and record over time (columnar: `times`
+    plus one list per field). Only changes are stored, so each point is the
+    first scrape showing a new value.
+    """
+    request_id = _get_request_id(request)
+    result = history.get_standings(since, until, points)
+    return _respond(result, request_id, "Standings history retrieved")
+
+@analytics_router.get("/history/players/{name}")
+def get_player_history(
+    name: str,
+    request: Request,
+    since: Optional[int] = Query(None, description="Start of the range (ms since epoch)"),
+    until: Optional[int] = Query(None, description="End of the range (ms since epoch)"),
+    points: int = Query(200, ge=2, le=5000, description="Maximum points returned (downsampled on the server)"),
+    history: SnapshotHistoryService = Depends(get_snapshot_history_service)
+) -> Dict[str, Any]:
+    """
+    A player's matches, goals and assists over time (columnar), e.g. their
+    goal progression through the season.
+    """
+    request_id = _get_request_id(request)
+    result = history.get_player(name, since, until, points)
+    return _respond(result, request_id, "Player history retrieved")
@@ -1,8 +1,9 @@
 import logging
-from typing import Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Query, Response
 from services.football_service import FootballDataService
 from dependencies import get_football_service
+from monitoring.tracing import resolve_request_id
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -11,13 +12,35 @@ logger = logging.getLogger(__name__)
 football_router = APIRouter(prefix="/api/v1/football", tags=["football"])
 
 def _get_request_id(request: Request) -> str:
-    """Extract request ID from headers"""
-    return request.headers.get("X-Request-ID", "unknown")
+    """Request ID bound by the request context middleware (client-supplied or generated)."""
+    return resolve_request_id(request)
+
+async def _changes_response(football_service: FootballDataService, data_type: str, since: int,
+                            request_id: str):
+    """Delta-sync reply: 204 when the client's version is current, else the changed records"""
+    result = await football_service.get_changes(data_type, since)
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail={"error": result["error"], "request_id": request_id})
+    if result.get("not_modified"):
+        return Response(status_code=204, headers={"X-Data-Version": str(result["data"]["version"])})
+    data = result["data"]
+    logger.info(f"Returned {len(data['upserted'])} changed {data_type} since version {since}"
+                f"{' (reset)' if data['reset'] else ''}")
+    return {
+        "success": True,
+        "data": data,
+        "message": f"{data_type.capitalize()} changes since version {since}",
+        "request_id": request_id,
+        "updating": result["updating"]
+    }
 
 @football_router.get("/players")
 async def get_players_instant(
     request: Request,
     force_update: bool = Query(False, description="Force async update regardless of cache status"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's nextCursor"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of players to return"),
+    since: Optional[int] = Query(None, description="Version from a previous response: return only what changed since"),
     football_service: FootballDataService = Depends(get_football_service)
 ) -> Dict[str, Any]:
     """
@@ -30,21 +53,33 @@ async def get_players_instant(
     
     Args:
         force_update: Force an async update regardless of cache expiration
+        cursor: Cursor for the next page (from `nextCursor`)
+        limit: Page size
+        since: Version from a previous response; only the players changed since
+            then are returned (204 when nothing changed)
         
     Returns:
         - squad: List of players with stats, positions, ages, etc.
+        - nextCursor: Cursor for the next page, or null on the last page
+        - version: For `since`; null unless the response holds every player (no cursor, no nextCursor)
         - metadata: Cache info, source, and update status
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Getting instant players data from database")
+        logger.info("Getting instant players data from database")
+        
+        if since is not None:
+            return await _changes_response(football_service, "players", since, request_id)
         
         # Get data from database instantly (with optional async update trigger)
-        result = await football_service.get_players_data(force_update=force_update)
+        result = await football_service.get_players_data(force_update=force_update, cursor=cursor, limit=limit)
+        
+        if result.get("bad_request"):
+            raise HTTPException(status_code=400, detail={"error": result["error"], "request_id": request_id})
         
         if result["success"]:
-            logger.info(f"[{request_id}] Returned {len(result['data']['squad'])} players from database")
-            logger.info(f"[{request_id}] Needs update: {result['needs_update']}, Currently updating: {result['updating']}")
+            logger.info(f"Returned {len(result['data']['squad'])} players from database")
+            logger.info(f"Needs update: {result['needs_update']}, Currently updating: {result['updating']}")
             
             return {
                 "success": True,
@@ -56,7 +91,7 @@ async def get_players_instant(
                 "updating": result["updating"]
             }
         else:
-            logger.warning(f"[{request_id}] Failed to get players data: {result.get('error')}")
+            logger.warning(f"Failed to get players data: {result.get('error')}")
             return {
                 "success": False,
                 "data": result["data"],
@@ -65,9 +100,11 @@ async def get_players_instant(
                 "from_cache": False
             }
         
+    except HTTPException:
+        raise
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.exception(f"[{request_id}] Error in get_players_instant")
+        logger.exception("Error in get_players_instant")
         raise HTTPException(
             status_code=500,
             detail={
@@ -81,6 +118,9 @@ async def get_players_instant(
 async def get_fixtures_instant(
     request: Request,
     force_update: bool = Query(False, description="Force async update regardless of cache status"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's nextCursor"),
+    limit: int = Query(20, ge=1, le=200, description="Maximum number of fixtures to return"),
+    since: Optional[int] = Query(None, description="Version from a previous response: return only what changed since"),
     football_service: FootballDataService = Depends(get_football_service)
 ) -> Dict[str, Any]:
     """
@@ -90,17 +130,26 @@ async def get_fixtures_instant(
     - Returns cached data from database immediately (instant loading)
     - Triggers async update from FBref.com if data is stale
     - Provides cache status and update information
+    - Pages newest-first; pass `nextCursor` back as `cursor` for older fixtures
+    - With `since` (a previous response's `version`), returns only the changed fixtures, or 204.
+      Only a response holding every fixture (no cursor, no nextCursor) has a `version`
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Getting instant fixtures data from database")
+        logger.info("Getting instant fixtures data from database")
+        
+        if since is not None:
+            return await _changes_response(football_service, "fixtures", since, request_id)
         
         # Get data from database instantly (with optional async update trigger)
-        result = await football_service.get_fixtures_data(force_update=force_update)
+        result = await football_service.get_fixtures_data(force_update=force_update, cursor=cursor, limit=limit)
+        
+        if result.get("bad_request"):
+            raise HTTPException(status_code=400, detail={"error": result["error"], "request_id": request_id})
         
         if result["success"]:
-            logger.info(f"[{request_id}] Returned {len(result['data']['pastFixtures'])} fixtures from database")
-            logger.info(f"[{request_id}] Needs update: {result['needs_update']}, Currently updating: {result['updating']}")
+            logger.info(f"Returned {len(result['data']['pastFixtures'])} fixtures from database")
+            logger.info(f"Needs update: {result['needs_update']}, Currently updating: {result['updating']}")
             
             return {
                 "success": True,
@@ -112,7 +161,7 @@ async def get_fixtures_instant(
                 "updating": result["updating"]
             }
         else:
-            logger.warning(f"[{request_id}] Failed to get fixtures data: {result.get('error')}")
+            logger.warning(f"Failed to get fixtures data: {result.get('error')}")
             return {
                 "success": False,
                 "data": result["data"],
@@ -121,9 +170,11 @@ async def get_fixtures_instant(
                 "from_cache": False
             }
         
+    except HTTPException:
+        raise
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.exception(f"[{request_id}] Error in get_fixtures_instant")
+        logger.exception("Error in get_fixtures_instant")
         raise HTTPException(
             status_code=500,
             detail={
@@ -137,6 +188,7 @@ async def get_fixtures_instant(
 async def get_standings_instant(
     request: Request,
     force_update: bool = Query(False, description="Force async update regardless of cache status"),
+    since: Optional[int] = Query(None, description="Version from a previous response: return only what changed since"),
     football_service: FootballDataService = Depends(get_football_service)
 ) -> Dict[str, Any]:
     """
@@ -146,17 +198,21 @@ async def get_standings_instant(
     - Returns cached data from database immediately (instant loading)
     - Triggers async update from FBref.com if data is stale
     - Provides cache status and update information
+    - With `since` (a previous response's `version`), returns the standings only if they changed, or 204
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Getting instant standings data from database")
+        logger.info("Getting instant standings data from database")
+        
+        if since is not None:
+            return await _changes_response(football_service, "standings", since, request_id)
         
         # Get data from database instantly (with optional async update trigger)
         result = await football_service.get_standings_data(force_update=force_update)
         
         if result["success"]:
-            logger.info(f"[{request_id}] Returned standings from database")
-            logger.info(f"[{request_id}] Needs update: {result['needs_update']}, Currently updating: {result['updating']}")
+            logger.info("Returned standings from database")
+            logger.info(f"Needs update: {result['needs_update']}, Currently updating: {result['updating']}")
             
             return {
                 "success": True,
@@ -168,7 +224,7 @@ async def get_standings_instant(
                 "updating": result["updating"]
             }
         else:
-            logger.warning(f"[{request_id}] Failed to get standings data: {result.get('error')}")
+            logger.warning(f"Failed to get standings data: {result.get('error')}")
             return {
                 "success": False,
                 "data": result["data"],
@@ -177,9 +233,11 @@ async def get_standings_instant(
                 "from_cache": False
             }
         
+    except HTTPException:
+        raise
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.exception(f"[{request_id}] Error in get_standings_instant")
+        logger.exception("Error in get_standings_instant")
         raise HTTPException(
             status_code=500,
             detail={
@@ -206,13 +264,13 @@ async def force_refresh_all_data(
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Force refresh all football data requested")
+        logger.info("Force refresh all football data requested")
         
         # Trigger force refresh of all data
         result = await football_service.force_refresh_all()
         
         if result["success"]:
-            logger.info(f"[{request_id}] Force refresh initiated successfully")
+            logger.info("Force refresh initiated successfully")
             return {
                 "success": True,
                 "message": "Force refresh of all football data has been initiated",
@@ -220,7 +278,7 @@ async def force_refresh_all_data(
                 "note": "Data will be updated in the background. Check individual endpoints for updated data."
             }
         else:
-            logger.warning(f"[{request_id}] Force refresh failed: {result.get('error')}")
+            logger.warning(f"Force refresh failed: {result.get('error')}")
             return {
                 "success": False,
                 "message": f"Force refresh failed: {result.get('error')}",
@@ -229,7 +287,7 @@ async def force_refresh_all_data(
         
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.exception(f"[{request_id}] Error in force_refresh_all_data")
+        logger.exception("Error in force_refresh_all_data")
         raise HTTPException(
             status_code=500,
             detail={
@@ -255,7 +313,7 @@ async def get_cache_status(
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Getting cache status for all football data")
+        logger.info("Getting cache status for all football data")
         
         # Get cache info for all data types
         players_cache = await football_service._get_cache_info("players")
@@ -290,7 +348,7 @@ async def get_cache_status(
             "standings": format_cache_info(standings_cache, "standings")
         }
         
-        logger.info(f"[{request_id}] Cache status retrieved successfully")
+        logger.info("Cache status retrieved successfully")
         return {
             "success": True,
             "data": status_data,
@@ -300,7 +358,7 @@ async def get_cache_status(
         
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.exception(f"[{request_id}] Error getting cache status")
+        logger.exception("Error getting cache status")
         raise HTTPException(
             status_code=500,
             detail={
@@ -325,7 +383,7 @@ async def test_populate_data(
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Test populate data requested")
+        logger.info("Test populate data requested")
         
         # Force all updates and wait for completion
         await football_service._async_update_players()
@@ -343,7 +401,7 @@ async def test_populate_data(
             "standings_populated": standings_result["success"] and standings_result["data"]["leaguePosition"] is not None
         }
         
-        logger.info(f"[{request_id}] Test populate completed: {response_data}")
+        logger.info(f"Test populate completed: {response_data}")
         return {
             "success": True,
             "message": "Database populated with scraped data",
@@ -353,7 +411,7 @@ async def test_populate_data(
         
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.exception(f"[{request_id}] Error in test_populate_data")
+        logger.exception("Error in test_populate_data")
         raise HTTPException(
             status_code=500,
             detail={
@@ -379,13 +437,13 @@ async def load_players_to_database(
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Manual players data load to database requested")
+        logger.info("Manual players data load to database requested")
         
         # Load data to database with validation
         result = await football_service.manual_load_players()
         
         if result["success"]:
-            logger.info(f"[{request_id}] Successfully loaded {result.get('count', 0)} players to database")
+            logger.info(f"Successfully loaded {result.get('count', 0)} players to database")
             return {
                 "success": True,
                 "message": f"Successfully loaded {result.get('count', 0)} players to database",
@@ -393,7 +451,7 @@ async def load_players_to_database(
                 "data_count": result.get('count', 0)
             }
         else:
-            logger.warning(f"[{request_id}] Failed to load players data: {result.get('error')}")
+            logger.warning(f"Failed to load players data: {result.get('error')}")
             return {
                 "success": False,
                 "message": f"Failed to load players data: {result.get('error')}",
@@ -402,7 +460,7 @@ async def load_players_to_database(
         
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.exception(f"[{request_id}] Error in load_players_to_database")
+        logger.exception("Error in load_players_to_database")
         raise HTTPException(
             status_code=500,
             detail={
@@ -428,13 +486,13 @@ async def load_fixtures_to_database(
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Manual fixtures data load to database requested")
+        logger.info("Manual fixtures data load to database requested")
         
         # Load data to database with validation
         result = await football_service.manual_load_fixtures()
         
         if result["success"]:
-            logger.info(f"[{request_id}] Successfully loaded {result.get('count', 0)} fixtures to database")
+            logger.info(f"Successfully loaded {result.get('count', 0)} fixtures to database")
             return {
                 "success": True,
                 "message": f"Successfully loaded {result.get('count', 0)} fixtures to database",
@@ -442,7 +500,7 @@ async def load_fixtures_to_database(
                 "data_count": result.get('count', 0)
             }
         else:
-            logger.warning(f"[{request_id}] Failed to load fixtures data: {result.get('error')}")
+            logger.warning(f"Failed to load fixtures data: {result.get('error')}")
             return {
                 "success": False,
                 "message": f"Failed to load fixtures data: {result.get('error')}",
@@ -451,7 +509,7 @@ async def load_fixtures_to_database(
         
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.exception(f"[{request_id}] Error in load_fixtures_to_database")
+        logger.exception("Error in load_fixtures_to_database")
         raise HTTPException(
             status_code=500,
             detail={
@@ -477,20 +535,20 @@ async def load_standings_to_database(
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Manual standings data load to database requested")
+        logger.info("Manual standings data load to database requested")
         
         # Load data to database with validation
         result = await football_service.manual_load_standings()
         
         if result["success"]:
-            logger.info(f"[{request_id}] Successfully loaded standings to database")
+            logger.info("Successfully loaded standings to database")
             return {
                 "success": True,
                 "message": "Successfully loaded standings data to database",
                 "request_id": request_id
             }
         else:
-            logger.warning(f"[{request_id}] Failed to load standings data: {result.get('error')}")
+            logger.warning(f"Failed to load standings data: {result.get('error')}")
             return {
                 "success": False,
                 "message": f"Failed to load standings data: {result.get('error')}",
@@ -499,7 +557,7 @@ async def load_standings_to_database(
         
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.exception(f"[{request_id}] Error in load_standings_to_database")
+        logger.exception("Error in load_standings_to_database")
         raise HTTPException(
             status_code=500,
             detail={
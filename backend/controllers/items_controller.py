@@ -2,12 +2,13 @@
 Items controller for managing item resources.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, Query, status, Request
 from fastapi.responses import JSONResponse
 
 from models import Item, ItemCreate, ItemUpdate
 from dependencies import ItemsServiceDep
+from monitoring.tracing import resolve_request_id
 
 items_router = APIRouter(
     prefix="/items",
@@ -20,8 +21,8 @@ items_router = APIRouter(
 
 
 def _get_request_id(request: Request) -> str:
-    """Extract request ID from headers for traceability."""
-    return request.headers.get("X-Request-ID", "unknown")
+    """Request ID bound by the request context middleware (client-supplied or generated)."""
+    return resolve_request_id(request)
 
 
 def _create_error_response(request: Request, status_code: int, detail: str) -> JSONResponse:
@@ -42,26 +43,36 @@ async def get_items(
     request: Request,
     items_service: ItemsServiceDep,
     skip: int = Query(0, ge=0, description="Number of items to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor")
 ):
     """
     Get all items with pagination.
     
-    - **skip**: Number of items to skip (for pagination)
+    - **cursor**: Cursor returned by the previous page (preferred - stable and fast at any depth)
+    - **skip**: Number of items to skip (offset pagination, ignored when a cursor is given)
     - **limit**: Maximum number of items to return (1-1000)
     """
     try:
-        result = await items_service.get_items(skip=skip, limit=limit)
+        result = await items_service.get_items(skip=skip, limit=limit, cursor=cursor)
         if result["success"]:
             return {
                 "success": True,
                 "data": result["data"],
                 "count": result["count"],
+                "total": result["total"],
                 "pagination": {
                     "skip": result["skip"],
-                    "limit": result["limit"]
+                    "limit": result["limit"],
+                    "next_cursor": result["next_cursor"]
                 }
             }
+        elif result.get("bad_request"):
+            return _create_error_response(
+                request,
+                status.HTTP_400_BAD_REQUEST,
+                result["error"]
+            )
         else:
             return _create_error_response(
                 request, 
@@ -0,0 +1,25 @@
+"""
+Metrics controller exposing the Prometheus scrape endpoint.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from monitoring import registry
+
+metrics_router = APIRouter(tags=["metrics"])
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus metrics in the text exposition format.
+
+    Includes route latency, proxy fetch latency, parse time per extractor,
+    DB round-trip time per operation, cache hit/miss/stale counters and
+    refresh outcomes.
+    """
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
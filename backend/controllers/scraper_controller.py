@@ -2,6 +2,8 @@ from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import Dict, Any, List
 import logging
 from services.scraper_service import FBrefScraperService
+from services.table_schema import STATS_TABLES
+from monitoring.tracing import resolve_request_id
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +21,8 @@ def get_scraper_service() -> FBrefScraperService:
     return _scraper_service_instance
 
 def _get_request_id(request: Request) -> str:
-    """Extract request ID from headers for traceability."""
-    return request.headers.get("X-Request-ID", "unknown")
+    """Request ID bound by the request context middleware (client-supplied or generated)."""
+    return resolve_request_id(request)
 
 @scraper_router.get("/players")
 async def scrape_players_data(
@@ -36,13 +38,13 @@ async def scrape_players_data(
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Starting FBref players scraping request")
+        logger.info("Starting FBref players scraping request")
         
         # Fetch only player data using the scraper service
         squad_data = await scraper_service.fetch_squad_data()
         
-        logger.info(f"[{request_id}] Successfully scraped FBref players data")
-        logger.info(f"[{request_id}] Squad size: {len(squad_data.get('squad', []))}")
+        logger.info("Successfully scraped FBref players data")
+        logger.info(f"Squad size: {len(squad_data.get('squad', []))}")
         
         return {
             "success": True,
@@ -53,7 +55,7 @@ async def scrape_players_data(
         
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.error(f"[{request_id}] Error scraping FBref players data: {str(error)}")
+        logger.error(f"Error scraping FBref players data: {str(error)}")
         raise HTTPException(
             status_code=500,
             detail={
@@ -77,13 +79,13 @@ async def scrape_fixtures_data(
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Starting FBref fixtures scraping request")
+        logger.info("Starting FBref fixtures scraping request")
         
         # Fetch only fixtures data using the scraper service
         fixtures_data = await scraper_service.fetch_fixtures_data()
         
-        logger.info(f"[{request_id}] Successfully scraped FBref fixtures data")
-        logger.info(f"[{request_id}] Fixtures count: {len(fixtures_data.get('pastFixtures', []))}")
+        logger.info("Successfully scraped FBref fixtures data")
+        logger.info(f"Fixtures count: {len(fixtures_data.get('pastFixtures', []))}")
         
         return {
             "success": True,
@@ -94,7 +96,7 @@ async def scrape_fixtures_data(
         
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.error(f"[{request_id}] Error scraping FBref fixtures data: {str(error)}")
+        logger.error(f"Error scraping FBref fixtures data: {str(error)}")
         raise HTTPException(
             status_code=500,
             detail={
@@ -118,13 +120,13 @@ async def scrape_standings_data(
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Starting FBref standings scraping request")
+        logger.info("Starting FBref standings scraping request")
         
         # Fetch only standings data using the scraper service
         standings_data = await scraper_service.fetch_standings_data()
         
-        logger.info(f"[{request_id}] Successfully scraped FBref standings data")
-        logger.info(f"[{request_id}] League position: {standings_data.get('leaguePosition', {}).get('position', 'Unknown')}")
+        logger.info("Successfully scraped FBref standings data")
+        logger.info(f"League position: {standings_data.get('leaguePosition', {}).get('position', 'Unknown')}")
         
         return {
             "success": True,
@@ -135,7 +137,7 @@ async def scrape_standings_data(
         
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.error(f"[{request_id}] Error scraping FBref standings data: {str(error)}")
+        logger.error(f"Error scraping FBref standings data: {str(error)}")
         raise HTTPException(
             status_code=500,
             detail={
@@ -145,6 +147,58 @@ async def scrape_standings_data(
             }
         )
 
+@scraper_router.get("/stats/{table}")
+async def scrape_stats_table(
+    table: str,
+    request: Request,
+    scraper_service: FBrefScraperService = Depends(get_scraper_service)
+) -> Dict[str, Any]:
+    """
+    Scrape one Racing Santander player stats table from FBref.com
+    
+    Tables: standard, shooting, passing, keeper
+    
+    Returns:
+        - rows: One entry per player with that table's columns
+        - metadata: Source info and timestamps
+    """
+    if table not in STATS_TABLES:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": f"Unknown stats table '{table}'",
+                "available": list(STATS_TABLES),
+                "request_id": _get_request_id(request),
+            }
+        )
+
+    try:
+        request_id = _get_request_id(request)
+        logger.info(f"Starting FBref {table} stats scraping request")
+        
+        stats_data = await scraper_service.fetch_stats_table(table)
+        
+        logger.info(f"Successfully scraped FBref {table} stats ({len(stats_data.get('rows', []))} rows)")
+        
+        return {
+            "success": True,
+            "data": stats_data,
+            "message": f"Successfully scraped Racing Santander {table} stats from FBref",
+            "request_id": request_id,
+        }
+        
+    except Exception as error:
+        request_id = _get_request_id(request)
+        logger.error(f"Error scraping FBref {table} stats: {str(error)}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": f"Failed to scrape FBref {table} stats",
+                "message": str(error),
+                "request_id": request_id,
+            }
+        )
+
 # Keep the original endpoint for backward compatibility (marked as deprecated)
 @scraper_router.get("/fbref")
 async def scrape_fbref_data(
@@ -164,17 +218,17 @@ async def scrape_fbref_data(
     """
     try:
         request_id = _get_request_id(request)
-        logger.info(f"[{request_id}] Starting FBref scraping request (DEPRECATED ENDPOINT)")
-        logger.warning(f"[{request_id}] Using deprecated /fbref endpoint. Consider using /players, /fixtures, or /standings instead")
+        logger.info("Starting FBref scraping request (DEPRECATED ENDPOINT)")
+        logger.warning("Using deprecated /fbref endpoint. Consider using /players, /fixtures, or /standings instead")
         
         # Fetch data using the scraper service
         data = await scraper_service.fetch_live_data()
         
-        logger.info(f"[{request_id}] Successfully scraped FBref data")
-        logger.info(f"[{request_id}] Data source: {data.get('source', 'Unknown')}")
-        logger.info(f"[{request_id}] Is live: {data.get('isLive', False)}")
-        logger.info(f"[{request_id}] Squad size: {len(data.get('squad', []))}")
-        logger.info(f"[{request_id}] Fixtures count: {len(data.get('pastFixtures', []))}")
+        logger.info("Successfully scraped FBref data")
+        logger.info(f"Data source: {data.get('source', 'Unknown')}")
+        logger.info(f"Is live: {data.get('isLive', False)}")
+        logger.info(f"Squad size: {len(data.get('squad', []))}")
+        logger.info(f"Fixtures count: {len(data.get('pastFixtures', []))}")
         
         return {
             "success": True,
@@ -191,7 +245,7 @@ async def scrape_fbref_data(
         
     except Exception as error:
         request_id = _get_request_id(request)
-        logger.error(f"[{request_id}] Error scraping FBref data: {str(error)}")
+        logger.error(f"Error scraping FBref data: {str(error)}")
         raise HTTPException(
             status_code=500,
             detail={
@@ -0,0 +1,102 @@
+import hmac
+import logging
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from config import settings
+from models.webhook import WebhookCreate
+from services.change_events import WebhookService
+from dependencies import get_webhook_service
+from monitoring.tracing import resolve_request_id
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+def _get_request_id(request: Request) -> str:
+    """Request ID bound by the request context middleware (client-supplied or generated)."""
+    return resolve_request_id(request)
+
+def _require_admin_key(request: Request, x_admin_key: Optional[str] = Header(None)) -> None:
+    """Every webhook route needs X-Admin-Key to match WEBHOOK_ADMIN_KEY; without a key configured they are disabled"""
+    if not settings.webhook_admin_key:
+        raise HTTPException(status_code=503, detail={
+            "error": "Webhook management is disabled (set WEBHOOK_ADMIN_KEY)", "request_id": _get_request_id(request)
+        })
+    if not x_admin_key or not hmac.compare_digest(x_admin_key.encode("utf-8"), settings.webhook_admin_key.encode("utf-8")):
+        raise HTTPException(status_code=401, detail={
+            "error": "Missing or invalid X-Admin-Key", "request_id": _get_request_id(request)
+        })
+
+# Create router
+webhooks_router = APIRouter(prefix="/api/v1/webhooks", tags=["webhooks"], dependencies=[Depends(_require_admin_key)])
+
+def _respond(result: Dict[str, Any], request_id: str, message: str) -> Dict[str, Any]:
+    """Map a service result dict to a response or the matching HTTP error"""
+    if result["success"]:
+        return {"success": True, "data": result["data"], "message": message, "request_id": request_id}
+    if result.get("bad_request"):
+        status_code = 400
+    elif result.get("not_found"):
+        status_code = 404
+    else:
+        status_code = 503
+    raise HTTPException(status_code=status_code, detail={"error": result["error"], "request_id": request_id})
+
+@webhooks_router.post("/", status_code=status.HTTP_201_CREATED)
+async def register_webhook(
+    request: Request,
+    webhook: WebhookCreate,
+    webhooks: WebhookService = Depends(get_webhook_service)
+) -> Dict[str, Any]:
+    """
+    Subscribe a URL to change events of the scraped data.
+
+    Every refresh that changes a player, fixture or standings record queues one
+    event per changed record. Events are POSTed in batches as
+    `{"events": [{"id", "type", "dataType", "version", "record" | "key", "occurredAt"}]}`;
+    any 2xx acknowledges the batch, anything else is retried with backoff.
+
+    - **url**: http(s) endpoint
+    - **data_types**: players, fixtures and/or standings (all when omitted)
+    - **secret**: Optional; each batch is then signed with `X-Webhook-Signature: sha256=<HMAC-SHA256 of the body>`
+    """
+    request_id = _get_request_id(request)
+    result = await webhooks.register(webhook.url, webhook.data_types, webhook.secret)
+    return _respond(result, request_id, "Webhook registered")
+
+@webhooks_router.get("/")
+async def list_webhooks(
+    request: Request,
+    webhooks: WebhookService = Depends(get_webhook_service)
+) -> Dict[str, Any]:
+    """
+    Registered webhooks with their pending and failed deliveries.
+    """
+    request_id = _get_request_id(request)
+    result = await webhooks.list_webhooks()
+    return _respond(result, request_id, "Webhooks retrieved")
+
+@webhooks_router.delete("/{webhook_id}")
+async def remove_webhook(
+    request: Request,
+    webhook_id: int,
+    webhooks: WebhookService = Depends(get_webhook_service)
+) -> Dict[str, Any]:
+    """
+    Unsubscribe a webhook; its undelivered events are dropped.
+    """
+    request_id = _get_request_id(request)
+    result = await webhooks.remove(webhook_id)
+    return _respond(result, request_id, "Webhook removed")
+
+@webhooks_router.post("/{webhook_id}/retry")
+async def retry_failed_deliveries(
+    request: Request,
+    webhook_id: int,
+    webhooks: WebhookService = Depends(get_webhook_service)
+) -> Dict[str, Any]:
+    """
+    Requeue the deliveries that ran out of attempts (e.g. after the receiver was down for hours).
+    """
+    request_id = _get_request_id(request)
+    result = await webhooks.retry_failed(webhook_id)
+    return _respond(result, request_id, "Failed deliveries requeued")
@@ -2,21 +2,40 @@
 Dependency injection for FastAPI services.
 """
 
-from typing import Annotated
+import os
+from typing import Annotated, List, Optional, Union
 from fastapi import Depends
 
+from config import settings
 from services.db_service import DatabaseService
+from services.pg_service import PostgresDatabaseService
 from services.items_service import ItemsService
 from services.scraper_service import FBrefScraperService
 from services.football_service import FootballDataService
+from services.player_stats import PlayerStatsService
+from services.player_similarity import PlayerSimilarityService
+from services.season_projection import SeasonProjectionService
+from services.team_ratings import TeamRatingsService
+from services.form_analytics import FormAnalyticsService
+from services.standings_engine import StandingsService
+from services.head_to_head import HeadToHeadService
+from services.leaderboards import LeaderboardService
+from services.scrape_archive import ArchiveService, ScrapeArchive
+from services.snapshot_history import SnapshotHistory, SnapshotHistoryService
+from services.snapshot_diff import SnapshotDiffService
+from services.change_events import EventQueue, WebhookDispatcher, WebhookService
 
 # Database service - single instance
+# Uses the native asyncpg pool when DATABASE_URL is set, otherwise the Supabase client
 _db_service = None
 
-def get_db_service() -> DatabaseService:
+def get_db_service() -> Union[DatabaseService, PostgresDatabaseService]:
     global _db_service
     if _db_service is None:
-        _db_service = DatabaseService()
+        if settings.database_url:
+            _db_service = PostgresDatabaseService()
+        else:
+            _db_service = DatabaseService()
     return _db_service
 
 # Items service
@@ -38,10 +57,143 @@ _football_service = None
 def get_football_service() -> FootballDataService:
     global _football_service
     if _football_service is None:
-        _football_service = FootballDataService(get_db_service(), get_scraper_service())
+        _football_service = FootballDataService(
+            get_db_service(), get_scraper_service(),
+            fixture_listeners=[get_team_ratings_service(), get_standings_service(), get_head_to_head_service()],
+            archive=get_scrape_archive(),
+            history=get_snapshot_history(),
+            events=get_webhook_dispatcher()
+        )
     return _football_service
 
+# Player stats store - single instance, rebuilt when the scraped page changes
+_player_stats_service = None
+
+def get_player_stats_service() -> PlayerStatsService:
+    global _player_stats_service
+    if _player_stats_service is None:
+        _player_stats_service = PlayerStatsService(get_scraper_service())
+    return _player_stats_service
+
+# Similarity index over the player stats store, re-indexed per squad when the store changes
+_player_similarity_service = None
+
+def get_player_similarity_service() -> PlayerSimilarityService:
+    global _player_similarity_service
+    if _player_similarity_service is None:
+        _player_similarity_service = PlayerSimilarityService(get_player_stats_service())
+    return _player_similarity_service
+
+# Season projection - single instance, owns the simulation process pool
+_season_projection_service = None
+
+def get_season_projection_service() -> SeasonProjectionService:
+    global _season_projection_service
+    if _season_projection_service is None:
+        workers = settings.projection_workers or min(4, os.cpu_count() or 1)
+        _season_projection_service = SeasonProjectionService(get_scraper_service(), workers=workers)
+    return _season_projection_service
+
+# Team ratings - single instance, state loaded from RATINGS_STATE_FILE
+_team_ratings_service = None
+
+def get_team_ratings_service() -> TeamRatingsService:
+    global _team_ratings_service
+    if _team_ratings_service is None:
+        _team_ratings_service = TeamRatingsService(get_db_service(), settings.ratings_state_file)
+    return _team_ratings_service
+
+# Form analytics - single instance, arrays rebuilt when the fixtures table changes
+_form_analytics_service = None
+
+def get_form_analytics_service() -> FormAnalyticsService:
+    global _form_analytics_service
+    if _form_analytics_service is None:
+        _form_analytics_service = FormAnalyticsService(get_db_service())
+    return _form_analytics_service
+
+# Derived standings - single instance, built from the fixtures table on first use
+_standings_service = None
+
+def get_standings_service() -> StandingsService:
+    global _standings_service
+    if _standings_service is None:
+        _standings_service = StandingsService(get_db_service(), get_scraper_service())
+    return _standings_service
+
+# Opponent index - single instance, built from the fixtures table on first use
+_head_to_head_service = None
+
+def get_head_to_head_service() -> HeadToHeadService:
+    global _head_to_head_service
+    if _head_to_head_service is None:
+        _head_to_head_service = HeadToHeadService(get_db_service(), get_scraper_service())
+    return _head_to_head_service
+
+# Leaderboards over the player stats store, re-sorted per squad when the store changes
+_leaderboard_service = None
+
+def get_leaderboard_service() -> LeaderboardService:
+    global _leaderboard_service
+    if _leaderboard_service is None:
+        _leaderboard_service = LeaderboardService(get_player_stats_service())
+    return _leaderboard_service
+
+# Scrape archive - None when ARCHIVE_DIR is empty
+_scrape_archive = None
+
+def get_scrape_archive() -> Optional[ScrapeArchive]:
+    global _scrape_archive
+    if _scrape_archive is None and settings.archive_dir:
+        _scrape_archive = ScrapeArchive(settings.archive_dir)
+    return _scrape_archive
+
+def get_archive_service() -> ArchiveService:
+    return ArchiveService(get_scrape_archive(), get_scraper_service().team_id)
+
+# Snapshot diffs - single instance, keeps the diff cache
+_snapshot_diff_service = None
+
+def get_snapshot_diff_service() -> SnapshotDiffService:
+    global _snapshot_diff_service
+    if _snapshot_diff_service is None:
+        _snapshot_diff_service = SnapshotDiffService(get_scrape_archive(), get_scraper_service().team_id)
+    return _snapshot_diff_service
+
+# Standings / player stats time series - None when HISTORY_DIR is empty
+_snapshot_history = None
+
+def get_snapshot_history() -> Optional[SnapshotHistory]:
+    global _snapshot_history
+    if _snapshot_history is None and settings.history_dir:
+        _snapshot_history = SnapshotHistory(settings.history_dir)
+    return _snapshot_history
+
+def get_snapshot_history_service() -> SnapshotHistoryService:
+    return SnapshotHistoryService(get_snapshot_history())
+
+# Change event queue and webhook dispatcher - None when EVENTS_DB is empty
+_webhook_dispatcher = None
+
+def get_webhook_dispatcher() -> Optional[WebhookDispatcher]:
+    global _webhook_dispatcher
+    if _webhook_dispatcher is None and settings.events_db:
+        _webhook_dispatcher = WebhookDispatcher(
+            EventQueue(settings.events_db),
+            batch_size=settings.webhook_batch_size,
+            concurrency=settings.webhook_concurrency,
+            max_attempts=settings.webhook_max_attempts,
+            allowed_hosts=_webhook_allowed_hosts()
+        )
+    return _webhook_dispatcher
+
+def _webhook_allowed_hosts() -> List[str]:
+    return [host.strip() for host in settings.webhook_allowed_hosts.split(",") if host.strip()]
+
+def get_webhook_service() -> WebhookService:
+    return WebhookService(get_webhook_dispatcher(), _webhook_allowed_hosts())
+
 
 # Type aliases for cleaner controller code
-DatabaseServiceDep = Annotated[DatabaseService, Depends(get_db_service)]
+DatabaseServiceDep = Annotated[Union[DatabaseService, PostgresDatabaseService], Depends(get_db_service)]
 ItemsServiceDep = Annotated[ItemsService, Depends(get_items_service)] 
\ No newline at end of file
@@ -15,7 +15,13 @@ load_dotenv()
 from controllers import items_router, health_router
 from controllers.scraper_controller import scraper_router
 from controllers.football_controller import football_router
-from middleware import setup_cors, setup_logging, setup_error_handling
+from controllers.metrics_controller import metrics_router
+from controllers.analytics_controller import analytics_router
+from controllers.webhooks_controller import webhooks_router
+from dependencies import (get_db_service, get_football_service, get_season_projection_service,
+                          get_team_ratings_service, get_webhook_dispatcher)
+from monitoring.tracing import shutdown_tracing
+from middleware import setup_cors, setup_logging, setup_metrics, setup_tracing, setup_error_handling
 
 # Create FastAPI app
 app = FastAPI(
@@ -30,6 +36,8 @@ app = FastAPI(
 # Setup middleware (order matters!)
 setup_cors(app)           # CORS should be first
 setup_logging(app)        # Logging should be early
+setup_metrics(app)        # Route latency histograms
+setup_tracing(app)        # Request IDs + root span; wraps logging so access logs carry the ID
 setup_error_handling(app) # Error handling should be last
 
 # Include routers
@@ -37,6 +45,9 @@ app.include_router(health_router, prefix="/api/v1")
 app.include_router(items_router, prefix="/api/v1")
 app.include_router(scraper_router, prefix="/api/v1")
 app.include_router(football_router)  # Football router already has prefix
+app.include_router(analytics_router)  # Analytics router already has prefix
+app.include_router(webhooks_router)  # Webhooks router already has prefix
+app.include_router(metrics_router)   # Prometheus scrape endpoint at /metrics
 
 # Root endpoint
 @app.get("/", tags=["root"])
@@ -74,6 +85,14 @@ app.openapi_tags = [
     {
         "name": "football",
         "description": "Instant-load football data from database with async updates - optimized for performance with Supabase integration"
+    },
+    {
+        "name": "webhooks",
+        "description": "Change event webhooks: registered URLs receive batched events when scraped records change"
+    },
+    {
+        "name": "metrics",
+        "description": "Prometheus metrics: route, scrape, parse and database latency plus cache and refresh counters"
     }
 ]
 
@@ -87,6 +106,11 @@ async def startup_event():
     print("📚 Documentation available at: /docs")
     print("🔍 Alternative docs at: /redoc")
     print("💚 Health check at: /api/v1/health")
+    dispatcher = get_webhook_dispatcher()
+    if dispatcher is not None:
+        # Baseline the change logs so the first refresh already emits events
+        await get_football_service().seed_change_logs()
+        dispatcher.start()
 
 
 # Shutdown event
@@ -96,6 +120,14 @@ async def shutdown_event():
     Application shutdown event handler.
     """
     print("👋 Items API is shutting down...")
+    dispatcher = get_webhook_dispatcher()
+    if dispatcher is not None:
+        await dispatcher.stop()
+    get_football_service().close()
+    await get_db_service().close()
+    get_season_projection_service().close()
+    get_team_ratings_service().close()
+    shutdown_tracing()
 
 
 if __name__ == "__main__":
@@ -4,10 +4,14 @@ Middleware package for FastAPI middleware configurations.
 
 from .cors import setup_cors
 from .logging import setup_logging
+from .metrics import setup_metrics
+from .tracing import setup_tracing
 from .error_handling import setup_error_handling
 
 __all__ = [
     "setup_cors",
     "setup_logging", 
+    "setup_metrics",
+    "setup_tracing",
     "setup_error_handling"
 ] 
\ No newline at end of file
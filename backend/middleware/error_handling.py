@@ -10,6 +10,8 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from typing import Union
 import traceback
 
+from monitoring.tracing import resolve_request_id
+
 logger = logging.getLogger("fast-api-playground")
 
 
@@ -17,7 +19,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     """
     Handle HTTP exceptions with consistent error format.
     """
-    request_id = request.headers.get("X-Request-ID", "unknown")
+    request_id = resolve_request_id(request)
     
     logger.warning(
         f"HTTP Exception: {exc.status_code} - {exc.detail} - URL: {request.url} - Request ID: {request_id}"
@@ -40,7 +42,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     """
     Handle validation errors with detailed error information.
     """
-    request_id = request.headers.get("X-Request-ID", "unknown")
+    request_id = resolve_request_id(request)
     
     logger.warning(
         f"Validation Error: {exc.errors()} - URL: {request.url} - Request ID: {request_id}"
@@ -64,7 +66,7 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
     """
     Handle general exceptions with error logging.
     """
-    request_id = request.headers.get("X-Request-ID", "unknown")
+    request_id = resolve_request_id(request)
     
     logger.error(
         f"Unhandled Exception: {str(exc)} - URL: {request.url} - Request ID: {request_id}\n"
@@ -88,7 +90,7 @@ async def starlette_http_exception_handler(request: Request, exc: StarletteHTTPE
     """
     Handle Starlette HTTP exceptions (like 404 for unknown routes).
     """
-    request_id = request.headers.get("X-Request-ID", "unknown")
+    request_id = resolve_request_id(request)
     
     logger.warning(
         f"Starlette HTTP Exception: {exc.status_code} - {exc.detail} - URL: {request.url} - Request ID: {request_id}"
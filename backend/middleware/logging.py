@@ -2,71 +2,131 @@
 Logging middleware for request/response logging and performance monitoring.
 """
 
-import time
+import atexit
 import logging
-from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from monitoring.tracing import request_id_var
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that hands the raw record to the listener thread.
+
+    The stock QueueHandler formats the message before enqueueing (so records
+    can be pickled for multiprocessing queues). Our queue is in-process, so
+    message formatting and stream I/O both happen on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamp records with the current request ID.
+
+    Attached to the queue handler so it runs in the logging thread's context;
+    the listener thread formatting the record has no request context.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+# Configure logging: callers only enqueue records, a background thread writes them out
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s")
+)
+_queue_handler = DeferredQueueHandler(_log_queue)
+_queue_handler.addFilter(RequestIdFilter())
 
-# Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[
-        logging.StreamHandler(),
-        # You can add file handler here if needed
-        # logging.FileHandler("app.log")
+        _queue_handler,
     ]
 )
 
+_log_listener = QueueListener(
+    _log_queue,
+    _console_handler,
+    # You can add file handler here if needed
+    # logging.FileHandler("app.log")
+    respect_handler_level=True
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger("fast-api-playground")
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """
-    Middleware for logging HTTP requests and responses.
+    Pure ASGI middleware for logging HTTP requests and responses.
+
+    Adds an X-Process-Time header (time to response start) and logs one
+    access line when the response body has been sent. Response bodies are
+    passed through untouched, so streaming responses keep streaming.
     """
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Log request
-        start_time = time.time()
-        
-        # Extract request info
-        method = request.method
-        url = str(request.url)
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
-        
-        logger.info(
-            f"Request: {method} {url} - IP: {client_ip} - User-Agent: {user_agent}"
-        )
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate processing time
-        process_time = time.time() - start_time
-        
-        # Log response
-        logger.info(
-            f"Response: {method} {url} - Status: {response.status_code} - "
-            f"Time: {process_time:.4f}s"
-        )
-        
-        # Add custom header with processing time
-        response.headers["X-Process-Time"] = str(process_time)
-        
-        return response
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add custom header with processing time
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", f"{time.perf_counter() - start_time:.6f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if logger.isEnabledFor(logging.INFO):
+                client = scope.get("client")
+                logger.info(
+                    "%s %s - Status: %d - Time: %.4fs - IP: %s",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    time.perf_counter() - start_time,
+                    client[0] if client else "unknown",
+                )
+            if logger.isEnabledFor(logging.DEBUG):
+                user_agent = next(
+                    (value for key, value in scope["headers"] if key == b"user-agent"), b"unknown"
+                )
+                logger.debug("User-Agent for %s %s: %s", scope["method"], scope["path"], user_agent.decode("latin-1"))
 
 
 def setup_logging(app: FastAPI) -> None:
     """
     Configure logging middleware for the FastAPI application.
-    
+
     Args:
         app: The FastAPI application instance
     """
     app.add_middleware(LoggingMiddleware)
-    
+
     # Log application startup
-    logger.info("FastAPI application started with logging middleware") 
\ No newline at end of file
+    logger.info("FastAPI application started with logging middleware")
@@ -0,0 +1,69 @@
+"""
+Metrics middleware recording per-route request latency.
+"""
+
+import time
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from monitoring.metrics import HTTP_REQUEST_SECONDS
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the matched route, e.g. ``/api/v1/items/{item_id}``"""
+    # The router stores the matched route on the (shared) scope
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # Newer FastAPI versions match included routers in place: the route keeps its
+    # own path and the include_router() prefix lives on the include context
+    included = scope.get("fastapi", {}).get("included_router")
+    prefix = getattr(getattr(included, "include_context", None), "prefix", "")
+    return prefix + route.path
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware observing request latency by route template.
+
+    Routes are labelled with their path template (``/api/v1/items/{item_id}``),
+    not the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start_time,
+                scope["method"],
+                route_template(scope),
+                str(status_code),
+            )
+
+
+def setup_metrics(app: FastAPI) -> None:
+    """
+    Configure request metrics for the FastAPI application.
+
+    Args:
+        app: The FastAPI application instance
+    """
+    app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,66 @@
+"""
+Request context middleware: request IDs and the root tracing span.
+"""
+
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from middleware.metrics import route_template
+from monitoring.tracing import configure_tracing, new_request_id, request_id_var, span
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware binding a request ID to the request's context.
+
+    Uses the client's X-Request-ID when present, otherwise generates one, and
+    echoes it back in the response headers. Everything downstream - log
+    records, spans, background tasks created by the endpoint - picks the ID
+    up from the contextvar.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = next(
+            (value.decode("latin-1") for key, value in scope["headers"] if key == b"x-request-id"), None
+        ) or new_request_id()
+        # Also kept on request.state for exception handlers that run outside this middleware
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_var.set(request_id)
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        try:
+            with span("http.request", method=scope["method"], path=scope["path"]) as root:
+                try:
+                    await self.app(scope, receive, send_with_request_id)
+                finally:
+                    root.set("status", status_code)
+                    root.set("route", route_template(scope))
+        finally:
+            request_id_var.reset(token)
+
+
+def setup_tracing(app: FastAPI) -> None:
+    """
+    Configure request IDs and span export for the FastAPI application.
+
+    Args:
+        app: The FastAPI application instance
+    """
+    configure_tracing(settings.trace_exporter, path=settings.trace_file, url=settings.trace_collector_url)
+    app.add_middleware(RequestContextMiddleware)
@@ -10,6 +10,7 @@ from .football import (
     DataCache, DataCacheCreate, DataCacheUpdate, DataCacheBase,
     FootballDataResponse
 )
+from .webhook import WebhookCreate
 
 __all__ = [
     # Item models
@@ -22,5 +23,7 @@ __all__ = [
     "Fixture", "FixtureCreate", "FixtureUpdate", "FixtureBase", 
     "Standing", "StandingCreate", "StandingUpdate", "StandingBase",
     "DataCache", "DataCacheCreate", "DataCacheUpdate", "DataCacheBase",
-    "FootballDataResponse"
+    "FootballDataResponse",
+    # Webhook models
+    "WebhookCreate"
 ] 
\ No newline at end of file
@@ -0,0 +1,9 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class WebhookCreate(BaseModel):
+    """Model for registering a change event webhook"""
+    url: str = Field(..., max_length=500, description="http(s) endpoint receiving POSTed event batches")
+    data_types: Optional[List[str]] = Field(None, description="players, fixtures and/or standings (all when omitted)")
+    secret: Optional[str] = Field(None, max_length=255, description="Signs each batch: X-Webhook-Signature: sha256=<HMAC>")
@@ -0,0 +1,16 @@
+"""
+Monitoring package for metrics and request instrumentation.
+"""
+
+from .metrics import registry, timed, timed_db_call
+from .tracing import configure_tracing, get_request_id, span, traced
+
+__all__ = [
+    "registry",
+    "timed",
+    "timed_db_call",
+    "configure_tracing",
+    "get_request_id",
+    "span",
+    "traced"
+]
@@ -0,0 +1,207 @@
+"""
+In-process metrics registry rendered in the Prometheus text format.
+
+Recording is a dict lookup plus a couple of integer increments, with no locks:
+everything we measure (routes, scrapes, parses, DB calls) is recorded from the
+event loop thread, and a lost increment from a stray worker thread would only
+make a counter a hair low. That keeps it cheap enough to leave on in production.
+"""
+
+import functools
+import inspect
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from .tracing import span
+
+# Latency buckets in seconds: 1ms .. 30s
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in list(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram with optional labels"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count], and labels -> sum
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        counts = self._counts.get(labelvalues)
+        if counts is None:
+            counts = self._counts[labelvalues] = [0] * (len(self.buckets) + 1)
+            self._sums[labelvalues] = 0.0
+        # Counts are stored per bucket and made cumulative when rendering
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labelvalues] += value
+
+    @contextmanager
+    def time(self, *labelvalues: str) -> Iterator[None]:
+        """Observe the wall time of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def count(self, *labelvalues: str) -> int:
+        return sum(self._counts.get(labelvalues, ()))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labelvalues, counts in list(self._counts.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), list(counts)):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, le)} {cumulative}"
+                )
+            label_str = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(self._sums[labelvalues])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric and renders them for the /metrics endpoint"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry and the application's metrics
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route", "status"]
+)
+SCRAPE_FETCH_SECONDS = registry.histogram(
+    "scrape_fetch_duration_seconds", "FBref page fetch latency per proxy", ["proxy", "outcome"]
+)
+PARSE_SECONDS = registry.histogram(
+    "parse_duration_seconds", "HTML extraction time per extractor", ["extractor"]
+)
+ANALYTICS_QUERY_SECONDS = registry.histogram(
+    "analytics_query_duration_seconds", "Analytics query time (index lookups, excluding store rebuilds)", ["query"]
+)
+DB_CALL_SECONDS = registry.histogram(
+    "db_call_duration_seconds", "Database round-trip time per operation", ["operation", "table"]
+)
+CACHE_EVENTS = registry.counter(
+    "cache_events_total", "Cache lookups by result (hit, miss, stale)", ["cache", "data_type", "result"]
+)
+REFRESH_OUTCOMES = registry.counter(
+    "refresh_total", "Background/manual data refreshes by outcome", ["data_type", "outcome"]
+)
+WEBHOOK_DELIVERIES = registry.counter(
+    "webhook_deliveries_total", "Webhook batch deliveries by outcome (delivered, retry, failed)", ["outcome"]
+)
+
+
+def timed(histogram: Histogram, *labelvalues: str) -> Callable:
+    """Decorator observing the duration of a sync or async function"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with histogram.time(*labelvalues):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(*labelvalues):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_db_call(func: Callable) -> Callable:
+    """Time and trace DB service methods whose first argument is the table name"""
+    operation = func.__name__
+    span_name = f"db.{operation}"
+
+    @functools.wraps(func)
+    async def wrapper(self, table: str, *args, **kwargs):
+        with DB_CALL_SECONDS.time(operation, table), span(span_name, table=table):
+            return await func(self, table, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Local span collector and trace viewer.
+
+Run a collector that appends POSTed spans to a JSONL file (point the API at it
+with TRACE_EXPORTER=collector):
+
+    python -m monitoring.trace_tools collect --port 9412 --out traces.jsonl
+
+Show the slowest traces in a JSONL file as indented span trees:
+
+    python -m monitoring.trace_tools show traces.jsonl --top 5
+    python -m monitoring.trace_tools show traces.jsonl --trace <request id>
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock
+from typing import Any, Dict, List
+
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                spans.append(json.loads(line))
+    return spans
+
+
+def format_trace(spans: List[Dict[str, Any]]) -> List[str]:
+    """Render one trace as a tree, children ordered by start time"""
+    by_id = {s["span_id"]: s for s in spans}
+    children = defaultdict(list)
+    roots = []
+    for s in spans:
+        # Parents may be missing, e.g. the request span of a refresh task that ended first
+        if s["parent_id"] in by_id:
+            children[s["parent_id"]].append(s)
+        else:
+            roots.append(s)
+
+    trace_start = min(s["start"] for s in spans)
+    lines = []
+
+    def walk(s: Dict[str, Any], depth: int) -> None:
+        offset_ms = (s["start"] - trace_start) * 1000
+        attrs = " ".join(f"{k}={v}" for k, v in s["attributes"].items())
+        status = "" if s["status"] == "ok" else f"  !! {s['error']}"
+        lines.append(
+            f"{offset_ms:>9.1f}ms {s['duration_ms']:>10.1f}ms  {'  ' * depth}{s['name']}  {attrs}{status}"
+        )
+        for child in sorted(children[s["span_id"]], key=lambda c: c["start"]):
+            walk(child, depth + 1)
+
+    for root in sorted(roots, key=lambda r: r["start"]):
+        walk(root, 0)
+    return lines
+
+
+def show(args) -> None:
+    traces = defaultdict(list)
+    for s in load_spans(args.path):
+        traces[s["trace_id"]].append(s)
+
+    if args.trace:
+        selected = [args.trace] if args.trace in traces else []
+    else:
+        # A trace's wall time runs from its first span start to its last span end
+        def wall_time(trace_id: str) -> float:
+            spans = traces[trace_id]
+            return max(s["start"] + s["duration_ms"] / 1000 for s in spans) - min(s["start"] for s in spans)
+        selected = sorted(traces, key=wall_time, reverse=True)[:args.top]
+
+    if not selected:
+        print("No matching traces")
+    for trace_id in selected:
+        print(f"trace {trace_id} ({len(traces[trace_id])} spans)")
+        print(f"{'offset':>11} {'duration':>12}  span")
+        for line in format_trace(traces[trace_id]):
+            print(line)
+        print()
+
+
+def collect(args) -> None:
+    write_lock = Lock()
+
+    class CollectorHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            try:
+                spans = json.loads(body)
+            except ValueError:
+                self.send_response(400)
+                self.end_headers()
+                return
+            with write_lock, open(args.out, "a", encoding="utf-8") as f:
+                for s in spans:
+                    f.write(json.dumps(s) + "\n")
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *log_args):
+            pass
+
+    server = ThreadingHTTPServer((args.host, args.port), CollectorHandler)
+    print(f"Collecting spans on http://{args.host}:{args.port}/spans -> {args.out}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    collect_parser = commands.add_parser("collect", help="Receive spans over HTTP and append them to a JSONL file")
+    collect_parser.add_argument("--host", default="127.0.0.1")
+    collect_parser.add_argument("--port", type=int, default=9412)
+    collect_parser.add_argument("--out", default="traces.jsonl")
+    collect_parser.set_defaults(func=collect)
+
+    show_parser = commands.add_parser("show", help="Print span trees from a JSONL file")
+    show_parser.add_argument("path")
+    show_parser.add_argument("--top", type=int, default=5, help="Number of slowest traces to show")
+    show_parser.add_argument("--trace", help="Show a single trace (request ID)")
+    show_parser.set_defaults(func=show)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
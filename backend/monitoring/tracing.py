@@ -0,0 +1,255 @@
+"""
+Request IDs and lightweight tracing spans.
+
+The request ID lives in a contextvar set by the request context middleware.
+asyncio copies the current context into every task created while handling a
+request, so a background refresh started by an endpoint keeps the ID (and the
+parent span) of the request that triggered it.
+
+Spans nest through a second contextvar. Finished spans are queued to a
+background thread that writes them to a JSONL file or POSTs batches to a local
+collector, so exporting never blocks the event loop. With no exporter
+configured, ``span()`` costs a global lookup and nothing else.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def get_request_id() -> Optional[str]:
+    """Request ID of the current context (None outside a request)"""
+    return request_id_var.get()
+
+
+def resolve_request_id(request) -> str:
+    """
+    Request ID for a Starlette request.
+
+    Exception handlers for unhandled errors run outside our middleware, so
+    fall back to the ID the middleware stored on the request state.
+    """
+    return (
+        request_id_var.get()
+        or getattr(request.state, "request_id", None)
+        or request.headers.get("X-Request-ID")
+        or "unknown"
+    )
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start", "_start_perf", "duration", "status", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else (request_id_var.get() or self.span_id)
+        self.name = name
+        self.attributes = attributes
+        self.start = time.time()
+        self._start_perf = time.perf_counter()
+        self.duration = 0.0
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Returned by span() while tracing is disabled"""
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class JsonlSpanExporter:
+    """Appends one JSON object per span to a file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span_data in spans:
+                f.write(json.dumps(span_data, default=str) + "\n")
+
+
+class CollectorSpanExporter:
+    """POSTs batches of spans as a JSON array to a collector endpoint"""
+
+    def __init__(self, url: str, timeout: float = 2.0):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        self.session.post(
+            self.url,
+            data=json.dumps(spans, default=str),
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout,
+        )
+
+
+class SpanProcessor:
+    """Batches finished spans and exports them from a daemon thread"""
+
+    def __init__(self, exporter, max_batch: int = 256, flush_interval: float = 1.0):
+        self.exporter = exporter
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        self._queue.put(span.to_dict())
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        stopping = False
+        while not stopping:
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.001))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                try:
+                    self.exporter.export(batch)
+                except Exception as e:
+                    logger.warning(f"Dropping {len(batch)} spans, export failed: {e}")
+                batch = []
+
+    def shutdown(self) -> None:
+        """Export whatever is still queued and stop the thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+
+_processor: Optional[SpanProcessor] = None
+
+
+def configure_tracing(exporter: str = "none", path: Optional[str] = None, url: Optional[str] = None) -> None:
+    """
+    Select where spans go: "none", "jsonl" (append to `path`) or
+    "collector" (POST batches to `url`).
+    """
+    global _processor
+    shutdown_tracing()
+    if exporter == "jsonl":
+        if not path:
+            raise ValueError("The jsonl trace exporter needs a file (TRACE_FILE)")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        _processor = SpanProcessor(JsonlSpanExporter(path))
+    elif exporter == "collector":
+        _processor = SpanProcessor(CollectorSpanExporter(url))
+    elif exporter != "none":
+        raise ValueError(f"Unknown trace exporter: {exporter}")
+
+
+def shutdown_tracing() -> None:
+    global _processor
+    if _processor is not None:
+        _processor.shutdown()
+        _processor = None
+
+
+def tracing_enabled() -> bool:
+    return _processor is not None
+
+
+atexit.register(shutdown_tracing)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Time the enclosed block as a child of the current span.
+
+    Yields the span so callers can attach attributes discovered on the way
+    (status codes, row counts). Exceptions mark the span as failed and
+    propagate unchanged.
+    """
+    processor = _processor
+    if processor is None:
+        yield _NOOP_SPAN
+        return
+
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.duration = time.perf_counter() - current._start_perf
+        _current_span.reset(token)
+        processor.on_end(current)
+
+
+def traced(name: str) -> Callable:
+    """Decorator wrapping a sync or async function in a span"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
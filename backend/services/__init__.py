@@ -3,9 +3,11 @@ Services package for database operations and business logic.
 """
 
 from .db_service import DatabaseService
+from .pg_service import PostgresDatabaseService
 from .items_service import ItemsService
 
 __all__ = [
     "DatabaseService", 
+    "PostgresDatabaseService",
     "ItemsService"
 ] 
\ No newline at end of file
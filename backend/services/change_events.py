@@ -0,0 +1,537 @@
+"""
+Change events for the scraped data, delivered to registered webhooks.
+
+When a refresh changes a synced record (the change logs behind ?since=
+delta sync), one event per upserted record or removed key is written to a
+local SQLite queue, fanned out to every webhook subscribed to that data type:
+
+    webhooks    (id, url, data types, secret)
+    events      (id, data type, JSON body)
+    deliveries  (webhook, event, attempts, next attempt, failed)
+
+The queue is durable: events survive restarts until every subscriber has
+acknowledged them. The dispatcher wakes when events are published (and
+every `poll_interval` for retries), takes the due deliveries of each webhook
+and POSTs them in batches of up to `batch_size` events, at most
+`concurrency` requests in flight per webhook. Each webhook's batches are sent
+by a task of their own, and a webhook is skipped while one is running, so a
+slow or dead endpoint doesn't hold up delivery to the others. A 2xx deletes
+the batch's deliveries. Anything else is retried with exponential backoff
+and jitter, and after `max_attempts` the deliveries are marked failed (kept
+until the webhook is retried or removed). Batches can arrive out of order: consumers
+order events by `id`.
+
+Webhook URLs must resolve to public addresses: loopback, private,
+link-local and other non-global hosts are refused unless allow-listed, and
+redirects are not followed, so the dispatcher can't be pointed at internal
+services. The check is repeated for every delivery, and the request goes to
+the address that was checked, so a host that resolves differently later (DNS
+rebinding) can't redirect deliveries either: they are marked failed instead.
+"""
+
+import asyncio
+import functools
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from monitoring.metrics import WEBHOOK_DELIVERIES
+from services.scrape_archive import DATA_TYPES
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhooks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    data_types TEXT NOT NULL,
+    secret TEXT,
+    created_at INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data_type TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deliveries (
+    webhook_id INTEGER NOT NULL,
+    event_id INTEGER NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at INTEGER NOT NULL,
+    failed INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    PRIMARY KEY (webhook_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS idx_deliveries_due ON deliveries (failed, next_attempt_at);
+"""
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def change_events(data_type: str, changes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One event per record a change log version upserted or removed"""
+    occurred_at = _now_ms()
+    events = [
+        {"type": f"{data_type}.changed", "dataType": data_type, "version": changes["version"],
+         "record": record, "occurredAt": occurred_at}
+        for record in changes["upserted"]
+    ]
+    events.extend(
+        {"type": f"{data_type}.removed", "dataType": data_type, "version": changes["version"],
+         "key": key, "occurredAt": occurred_at}
+        for key in changes["removed"]
+    )
+    return events
+
+
+class EventQueue:
+    """SQLite-backed webhook registry and delivery queue (blocking; call it off the event loop)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _webhook(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "url": row["url"],
+            "dataTypes": row["data_types"].split(",") if row["data_types"] else list(DATA_TYPES),
+            "signed": bool(row["secret"]),
+            "createdAt": row["created_at"],
+        }
+
+    def add_webhook(self, url: str, data_types: Sequence[str] = (), secret: Optional[str] = None) -> Dict[str, Any]:
+        """Subscribe `url` to events of `data_types` (all when empty)"""
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT INTO webhooks (url, data_types, secret, created_at) VALUES (?, ?, ?, ?)",
+                (url, ",".join(data_types), secret or None, _now_ms())
+            )
+            row = self._db.execute("SELECT * FROM webhooks WHERE id = ?", (cursor.lastrowid,)).fetchone()
+        return self._webhook(row)
+
+    def webhooks(self) -> List[Dict[str, Any]]:
+        """Every webhook with its pending and failed delivery counts"""
+        with self._lock:
+            rows = self._db.execute("SELECT * FROM webhooks ORDER BY id").fetchall()
+            counts = {
+                row["webhook_id"]: row
+                for row in self._db.execute(
+                    "SELECT webhook_id, SUM(failed = 0) AS pending, SUM(failed) AS failed "
+                    "FROM deliveries GROUP BY webhook_id"
+                )
+            }
+        webhooks = []
+        for row in rows:
+            count = counts.get(row["id"])
+            webhooks.append({
+                **self._webhook(row),
+                "pending": count["pending"] if count else 0,
+                "failed": count["failed"] if count else 0,
+            })
+        return webhooks
+
+    def remove_webhook(self, webhook_id: int) -> bool:
+        """Unsubscribe a webhook and drop its undelivered events"""
+        with self._lock, self._db:
+            deleted = self._db.execute("DELETE FROM webhooks WHERE id = ?", (webhook_id,)).rowcount
+            self._db.execute("DELETE FROM deliveries WHERE webhook_id = ?", (webhook_id,))
+            self._db.execute("DELETE FROM events WHERE id NOT IN (SELECT event_id FROM deliveries)")
+        return bool(deleted)
+
+    def enqueue(self, events: Sequence[Dict[str, Any]]) -> int:
+        """Store events for every subscribed webhook in one transaction; returns the deliveries queued"""
+        if not events:
+            return 0
+        now = _now_ms()
+        queued = 0
+        with self._lock, self._db:
+            subscribers = self._db.execute("SELECT id, data_types FROM webhooks").fetchall()
+            for event in events:
+                targets = [
+                    row["id"] for row in subscribers
+                    if not row["data_types"] or event["dataType"] in row["data_types"].split(",")
+                ]
+                if not targets:
+                    continue
+                event_id = self._db.execute(
+                    "INSERT INTO events (data_type, body, created_at) VALUES (?, ?, ?)",
+                    (event["dataType"], json.dumps(event, default=str), now)
+                ).lastrowid
+                self._db.executemany(
+                    "INSERT INTO deliveries (webhook_id, event_id, next_attempt_at) VALUES (?, ?, ?)",
+                    [(webhook_id, event_id, now) for webhook_id in targets]
+                )
+                queued += len(targets)
+        return queued
+
+    def due(self, now: int, per_webhook: int) -> List[Tuple[Dict[str, Any], List[Tuple[Dict[str, Any], int]]]]:
+        """
+        Up to `per_webhook` due deliveries of each webhook, oldest event first:
+        [(webhook with its secret, [(event, attempts)])]
+        """
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT webhook_id, event_id, attempts, body FROM (
+                    SELECT d.webhook_id, d.event_id, d.attempts, e.body,
+                           ROW_NUMBER() OVER (PARTITION BY d.webhook_id ORDER BY d.event_id) AS position
+                    FROM deliveries d JOIN events e ON e.id = d.event_id
+                    WHERE d.failed = 0 AND d.next_attempt_at <= ?
+                ) WHERE position <= ?
+                ORDER BY webhook_id, event_id
+                """,
+                (now, per_webhook)
+            ).fetchall()
+            webhooks = {row["id"]: row for row in self._db.execute("SELECT * FROM webhooks")}
+        grouped: Dict[int, List[Tuple[Dict[str, Any], int]]] = {}
+        for row in rows:
+            grouped.setdefault(row["webhook_id"], []).append(
+                ({"id": row["event_id"], **json.loads(row["body"])}, row["attempts"])
+            )
+        return [
+            ({"id": webhook_id, "url": webhooks[webhook_id]["url"], "secret": webhooks[webhook_id]["secret"]}, deliveries)
+            for webhook_id, deliveries in grouped.items() if webhook_id in webhooks
+        ]
+
+    def ack(self, webhook_id: int, event_ids: Sequence[int]) -> None:
+        """Delivered: drop the deliveries, and the events nobody else is waiting for"""
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM deliveries WHERE webhook_id = ? AND event_id = ?",
+                [(webhook_id, event_id) for event_id in event_ids]
+            )
+            self._db.executemany(
+                "DELETE FROM events WHERE id = ? AND NOT EXISTS (SELECT 1 FROM deliveries WHERE event_id = ?)",
+                [(event_id, event_id) for event_id in event_ids]
+            )
+
+    def retry(self, webhook_id: int, event_ids: Sequence[int], error: str, next_attempt_at: int,
+              max_attempts: int) -> None:
+        """Failed attempt: schedule the next one, or mark failed after `max_attempts`"""
+        with self._lock, self._db:
+            self._db.executemany(
+                "UPDATE deliveries SET attempts = attempts + 1, next_attempt_at = ?, last_error = ?, "
+                "failed = (attempts + 1 >= ?) WHERE webhook_id = ? AND event_id = ?",
+                [(next_attempt_at, error, max_attempts, webhook_id, event_id) for event_id in event_ids]
+            )
+
+    def requeue_failed(self, webhook_id: int) -> Optional[int]:
+        """Give a webhook's failed deliveries a fresh set of attempts; returns how many (None: no such webhook)"""
+        with self._lock, self._db:
+            if self._db.execute("SELECT 1 FROM webhooks WHERE id = ?", (webhook_id,)).fetchone() is None:
+                return None
+            return self._db.execute(
+                "UPDATE deliveries SET failed = 0, attempts = 0, next_attempt_at = ? WHERE webhook_id = ? AND failed = 1",
+                (_now_ms(), webhook_id)
+            ).rowcount
+
+
+def resolve(host: str) -> List[str]:
+    """Every address `host` resolves to, in resolver order"""
+    return [sockaddr[0].split("%")[0] for *_, sockaddr in socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)]
+
+
+def _is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address)
+    return ip.is_global and not ip.is_multicast
+
+
+def non_public_address(host: str) -> Optional[str]:
+    """The first address `host` resolves to that isn't publicly routable, None if all are"""
+    return next((address for address in resolve(host) if not _is_public(address)), None)
+
+
+class NonPublicAddressError(requests.ConnectionError):
+    """A webhook host resolved to an address deliveries must not reach"""
+
+
+class PinnedAddressAdapter(HTTPAdapter):
+    """
+    Resolves the host of each request, refuses non-public addresses (unless
+    the host is allow-listed) and connects to the checked address, keeping
+    the hostname for the Host header, SNI and certificate checks.
+    """
+
+    def __init__(self, allowed_hosts: Sequence[str] = (), **kwargs):
+        self.allowed_hosts = {host.lower() for host in allowed_hosts}
+        super().__init__(**kwargs)
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        host = host_params["host"]
+        try:
+            addresses = resolve(host)
+        except (OSError, UnicodeError) as error:
+            raise requests.ConnectionError(f"Cannot resolve host '{host}': {error}", request=request)
+        if host.lower() not in self.allowed_hosts:
+            blocked = next((address for address in addresses if not _is_public(address)), None)
+            if blocked is not None:
+                raise NonPublicAddressError(f"'{host}' resolves to non-public address {blocked}", request=request)
+        # Connections are pooled per address and hostname
+        host_params["host"] = addresses[0]
+        if host_params["scheme"] == "https":
+            pool_kwargs["server_hostname"] = host
+            pool_kwargs["assert_hostname"] = host
+        return host_params, pool_kwargs
+
+    def add_headers(self, request, **kwargs):
+        # The connection's host is the address now: name the original host explicitly
+        request.headers["Host"] = urlparse(request.url).netloc.rsplit("@", 1)[-1]
+
+
+class WebhookDispatcher:
+    """Background task delivering queued events in batches, with per-webhook concurrency and retries"""
+
+    def __init__(self, queue: EventQueue, batch_size: int = 100, concurrency: int = 2, max_attempts: int = 10,
+                 backoff: float = 2.0, max_backoff: float = 600.0, timeout: float = 5.0,
+                 poll_interval: float = 1.0, http_workers: int = 8, allowed_hosts: Sequence[str] = ()):
+        self.queue = queue
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.session = requests.Session()
+        # Every delivery re-checks where the webhook host resolves and connects to that address
+        adapter = PinnedAddressAdapter(allowed_hosts)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Own threads: one for the SQLite queue (its calls are serialized by the queue lock anyway),
+        # a pool for webhook requests, so neither waits behind other work on the default executor
+        self._queue_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-queue")
+        self._http_executor = ThreadPoolExecutor(max_workers=http_workers, thread_name_prefix="webhook-http")
+        self._limits: Dict[int, asyncio.Semaphore] = {}
+        # Webhook id -> the task sending its batches
+        self._in_flight: Dict[int, asyncio.Task] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"📬 Webhook dispatcher started ({self.queue.path})")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in self._in_flight.values():
+            task.cancel()
+        await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+        self._http_executor.shutdown(wait=False, cancel_futures=True)
+        self._queue_executor.shutdown(wait=True)
+        self.session.close()
+        self.queue.close()
+
+    async def in_queue_thread(self, method, *args):
+        """Run a blocking EventQueue call on the queue thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._queue_executor, method, *args)
+
+    async def in_http_thread(self, method, *args):
+        """Run blocking network I/O (requests, DNS lookups) on the HTTP threads"""
+        return await asyncio.get_running_loop().run_in_executor(self._http_executor, method, *args)
+
+    def wake(self) -> None:
+        """Run a dispatch pass now rather than at the next poll"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def publish(self, events: List[Dict[str, Any]]) -> int:
+        """Queue events durably and wake the dispatcher; returns the deliveries queued"""
+        queued = await self.in_queue_thread(self.queue.enqueue, events)
+        if queued:
+            logger.info(f"📨 Queued {len(events)} change events ({queued} deliveries)")
+            self.wake()
+        return queued
+
+    async def _run(self) -> None:
+        while True:
+            # Cleared before the pass, so events published during it trigger another one
+            self._wake.clear()
+            try:
+                await self._dispatch()
+            except Exception:
+                logger.exception("Webhook dispatch pass failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _dispatch(self) -> List[asyncio.Task]:
+        """Start sending the due batches of every webhook that has no delivery running; returns the tasks"""
+        due = await self.in_queue_thread(self.queue.due, _now_ms(), self.batch_size * self.concurrency)
+        started = []
+        for webhook, deliveries in due:
+            # Its running deliveries are still due: sending them again would duplicate them
+            if webhook["id"] in self._in_flight:
+                continue
+            task = asyncio.create_task(self._deliver_webhook(webhook, deliveries))
+            self._in_flight[webhook["id"]] = task
+            task.add_done_callback(functools.partial(self._delivered, webhook["id"]))
+            started.append(task)
+        return started
+
+    def _delivered(self, webhook_id: int, task: asyncio.Task) -> None:
+        self._in_flight.pop(webhook_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Delivery to webhook {webhook_id} failed", exc_info=task.exception())
+        # Its next batches may be due already
+        self.wake()
+
+    async def _deliver_webhook(self, webhook: Dict[str, Any], deliveries: List[Tuple[Dict[str, Any], int]]) -> int:
+        batches = [
+            self._deliver(webhook, deliveries[start:start + self.batch_size])
+            for start in range(0, len(deliveries), self.batch_size)
+        ]
+        return sum(await asyncio.gather(*batches))
+
+    async def deliver_due(self) -> int:
+        """One pass, waiting for it: send every due batch; returns the events delivered"""
+        tasks = await self._dispatch()
+        return sum(await asyncio.gather(*tasks))
+
+    def _post(self, webhook: Dict[str, Any], body: bytes) -> requests.Response:
+        headers = {"Content-Type": "application/json"}
+        if webhook["secret"]:
+            signature = hmac.new(webhook["secret"].encode("utf-8"), body, hashlib.sha256).hexdigest()
+            headers["X-Webhook-Signature"] = f"sha256={signature}"
+        # Redirects could lead to hosts registration would have refused
+        return self.session.post(webhook["url"], data=body, headers=headers, timeout=self.timeout,
+                                 allow_redirects=False)
+
+    async def _deliver(self, webhook: Dict[str, Any], deliveries: List[Tuple[Dict[str, Any], int]]) -> int:
+        events = [event for event, _ in deliveries]
+        event_ids = [event["id"] for event in events]
+        body = json.dumps({"events": events}, default=str).encode("utf-8")
+        limit = self._limits.setdefault(webhook["id"], asyncio.Semaphore(self.concurrency))
+        async with limit:
+            refused = False
+            try:
+                response = await self.in_http_thread(self._post, webhook, body)
+                error = None if 200 <= response.status_code < 300 else f"HTTP {response.status_code}"
+            except NonPublicAddressError as e:
+                error, refused = str(e), True
+            except requests.RequestException as e:
+                error = str(e)
+
+        if error is None:
+            await self.in_queue_thread(self.queue.ack, webhook["id"], event_ids)
+            WEBHOOK_DELIVERIES.inc("delivered")
+            return len(events)
+
+        if refused:
+            # Nothing was sent; retrying would only ask the same resolver again
+            await self.in_queue_thread(self.queue.retry, webhook["id"], event_ids, error, _now_ms(), 0)
+            WEBHOOK_DELIVERIES.inc("failed")
+            logger.warning(f"Refused {len(events)} events for webhook {webhook['id']}: {error}")
+            return 0
+
+        attempts = max(attempts for _, attempts in deliveries) + 1
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+        await self.in_queue_thread(
+            self.queue.retry, webhook["id"], event_ids, error, _now_ms() + int(delay * 1000), self.max_attempts
+        )
+        if attempts >= self.max_attempts:
+            WEBHOOK_DELIVERIES.inc("failed")
+            logger.warning(f"Giving up on {len(events)} events for webhook {webhook['id']} after {attempts} attempts: {error}")
+        else:
+            WEBHOOK_DELIVERIES.inc("retry")
+            logger.warning(f"Webhook {webhook['id']} delivery failed ({error}), retrying in {delay:.1f}s")
+        return 0
+
+
+class WebhookService:
+    """Webhook registration for the change event stream"""
+
+    def __init__(self, dispatcher: Optional[WebhookDispatcher], allowed_hosts: Sequence[str] = ()):
+        self.dispatcher = dispatcher
+        # Hosts accepted even when they resolve to non-public addresses (e.g. a local receiver)
+        self.allowed_hosts = {host.lower() for host in allowed_hosts}
+
+    def _unavailable(self) -> Dict[str, Any]:
+        return {"success": False, "error": "Change events are disabled (set EVENTS_DB)"}
+
+    async def _call(self, method, *args):
+        return await self.dispatcher.in_queue_thread(method, *args)
+
+    async def register(self, url: str, data_types: Optional[List[str]] = None,
+                       secret: Optional[str] = None) -> Dict[str, Any]:
+        if self.dispatcher is None:
+            return self._unavailable()
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            return {"success": False, "bad_request": True, "error": f"Not an http(s) URL: '{url}'"}
+        host = parsed.hostname or ""
+        if host.lower() not in self.allowed_hosts:
+            try:
+                address = await self.dispatcher.in_http_thread(non_public_address, host)
+            except (OSError, UnicodeError, ValueError):
+                return {"success": False, "bad_request": True, "error": f"Cannot resolve host '{host}'"}
+            if address is not None:
+                return {"success": False, "bad_request": True,
+                        "error": f"'{host}' resolves to non-public address {address} (see WEBHOOK_ALLOWED_HOSTS)"}
+        unknown = [data_type for data_type in data_types or [] if data_type not in DATA_TYPES]
+        if unknown:
+            return {"success": False, "bad_request": True,
+                    "error": f"Unknown data type '{unknown[0]}' ({', '.join(DATA_TYPES)})"}
+        webhook = await self._call(self.dispatcher.queue.add_webhook, url, data_types or [], secret)
+        logger.info(f"🪝 Registered webhook {webhook['id']} for {', '.join(webhook['dataTypes'])}: {url}")
+        return {"success": True, "data": webhook}
+
+    async def list_webhooks(self) -> Dict[str, Any]:
+        if self.dispatcher is None:
+            return self._unavailable()
+        return {"success": True, "data": {"webhooks": await self._call(self.dispatcher.queue.webhooks)}}
+
+    async def remove(self, webhook_id: int) -> Dict[str, Any]:
+        if self.dispatcher is None:
+            return self._unavailable()
+        if not await self._call(self.dispatcher.queue.remove_webhook, webhook_id):
+            return {"success": False, "not_found": True, "error": f"No webhook {webhook_id}"}
+        return {"success": True, "data": {"id": webhook_id}}
+
+    async def retry_failed(self, webhook_id: int) -> Dict[str, Any]:
+        if self.dispatcher is None:
+            return self._unavailable()
+        requeued = await self._call(self.dispatcher.queue.requeue_failed, webhook_id)
+        if requeued is None:
+            return {"success": False, "not_found": True, "error": f"No webhook {webhook_id}"}
+        if requeued:
+            self.dispatcher.wake()
+        return {"success": True, "data": {"id": webhook_id, "requeued": requeued}}
@@ -0,0 +1,103 @@
+"""
+Versioned change log of a dataset, for "changes since version N" polling.
+
+Each publish compares the dataset with the previous one, keyed by its
+natural key. When something changed, the version goes up by one and the
+upserted records and removed keys are logged. A client that sends the
+version it holds gets back only the records that changed since then. It
+gets nothing at all when it is up to date, and a reset (refetch everything)
+when its version is older than the log reaches or unknown.
+
+Versions start at the process start time in ms, so they keep increasing
+across restarts and a version from before a restart is never mistaken for
+a current one. The log keeps the last `size` changes, so a poll costs a
+few bytes however large the dataset.
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CHANGE_LOG_SIZE = 256
+
+Key = Tuple[Any, ...]
+
+
+class ChangeLog:
+    """Current snapshot of one dataset plus the bounded log of its changes"""
+
+    def __init__(self, key_fields: Sequence[str], ignore: Sequence[str] = ("id",), size: int = CHANGE_LOG_SIZE):
+        self.key_fields = tuple(key_fields)
+        # Fields that change on every reload without the record changing (database ids)
+        self.ignore = frozenset(ignore)
+        self.version = int(time.time() * 1000)
+        self.seeded = False
+        self._snapshot: Dict[Key, Dict[str, Any]] = {}
+        # (version, upserted records, removed keys)
+        self._log: Deque[Tuple[int, List[Dict[str, Any]], List[Key]]] = deque(maxlen=size)
+
+    def _key(self, record: Dict[str, Any]) -> Key:
+        return tuple(record.get(field) for field in self.key_fields)
+
+    def _comparable(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {name: value for name, value in record.items() if name not in self.ignore}
+
+    def publish(self, records: Iterable[Dict[str, Any]]) -> bool:
+        """Replace the snapshot with `records`; logs a new version and returns True if anything changed"""
+        current = {self._key(record): record for record in records}
+        upserted = [
+            record for key, record in current.items()
+            if key not in self._snapshot or self._comparable(self._snapshot[key]) != self._comparable(record)
+        ]
+        removed = [key for key in self._snapshot if key not in current]
+        self._snapshot = current
+        if not self.seeded:
+            # The first snapshot is the baseline, not a change
+            self.seeded = True
+            return False
+        if not upserted and not removed:
+            return False
+        self.version += 1
+        self._log.append((self.version, upserted, removed))
+        return True
+
+    def rebase(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Start over from `records` under a new version: every client resets"""
+        self._snapshot = {self._key(record): record for record in records}
+        self._log.clear()
+        self.version += 1
+        self.seeded = True
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return list(self._snapshot.values())
+
+    def changes_since(self, since: int) -> Optional[Dict[str, Any]]:
+        """
+        Changes after version `since`: None when up to date, a reset with the
+        full snapshot when the log no longer reaches back that far (or the
+        version is unknown), else the merged upserts and removals.
+        """
+        if since == self.version:
+            return None
+        oldest = self._log[0][0] - 1 if self._log else self.version
+        if since < oldest or since > self.version:
+            return {"version": self.version, "reset": True, "upserted": self.snapshot(), "removed": []}
+
+        upserted: Dict[Key, Dict[str, Any]] = {}
+        removed: Dict[Key, None] = {}
+        for version, records, keys in self._log:
+            if version <= since:
+                continue
+            for record in records:
+                key = self._key(record)
+                removed.pop(key, None)
+                upserted[key] = record
+            for key in keys:
+                upserted.pop(key, None)
+                removed[key] = None
+        return {
+            "version": self.version,
+            "reset": False,
+            "upserted": list(upserted.values()),
+            "removed": [dict(zip(self.key_fields, key)) for key in removed],
+        }
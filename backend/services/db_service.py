@@ -1,8 +1,13 @@
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Any
 from supabase import create_client, Client
+from postgrest import CountMethod, ReturnMethod
 from config import settings
+from monitoring.metrics import timed_db_call
+from services.query import Filters, normalize_filters, parse_order, check_count
+from services.pagination import decode_cursor, keyset_terms, page_result
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -13,12 +18,22 @@ class DatabaseService:
             settings.supabase_url,
             settings.supabase_key
         )
+        # Own pool so DB calls don't queue behind unrelated work on the default executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.db_executor_workers,
+            thread_name_prefix="supabase"
+        )
     
     async def _execute_sync(self, func):
         """Execute synchronous Supabase operations in thread pool"""
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, func)
+        return await loop.run_in_executor(self._executor, func)
+    
+    async def close(self):
+        """Shut down the Supabase worker threads"""
+        self._executor.shutdown(wait=False)
     
+    @timed_db_call
     async def create_record(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new record in the specified table"""
         try:
@@ -37,6 +52,7 @@ class DatabaseService:
             logger.exception(f"Error creating record in {table}")
             return {"success": False, "error": str(e)}
     
+    @timed_db_call
     async def get_record(self, table: str, record_id: int) -> Dict[str, Any]:
         """Get a single record by ID"""
         try:
@@ -53,41 +69,121 @@ class DatabaseService:
             logger.exception(f"Error getting record from {table}")
             return {"success": False, "error": str(e)}
     
+    @timed_db_call
     async def get_records(
         self, 
         table: str, 
-        filters: Optional[Dict[str, Union[Any, Tuple[str, Any]]]] = None,
+        filters: Optional[Filters] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        columns: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+        count: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get multiple records with optional filters and pagination"""
+        """
+        Get multiple records with optional filters and pagination.
+        
+        Filtering, projection, ordering and counting all run server-side -
+        see services/query.py for the query spec.
+        """
         try:
+            predicates = normalize_filters(filters)
+            orders = parse_order(order_by)
+            count_method = check_count(count)
+            
             def _get_records():
-                query = self.supabase.table(table).select("*")
-                
-                if filters:
-                    for key, value in filters.items():
-                        if isinstance(value, tuple) and len(value) == 2:
-                            # Handle operator filters like ("ilike", "%search%")
-                            operator, filter_value = value
-                            query = getattr(query, operator)(key, filter_value)
-                        else:
-                            # Handle simple equality filters
-                            query = query.eq(key, value)
+                query = self._select(table, predicates, columns, orders, count_method)
                 
                 # Apply pagination at database level
                 query = query.range(skip, skip + limit - 1)
                 
                 response = query.execute()
-                return response.data or []
+                return response.data or [], response.count
             
-            results = await self._execute_sync(_get_records)
+            results, total = await self._execute_sync(_get_records)
             logger.info(f"Retrieved {len(results)} records from {table}")
-            return {"success": True, "data": results, "count": len(results)}
+            result = {"success": True, "data": results, "count": len(results)}
+            if count_method:
+                result["total"] = total
+            return result
         except Exception as e:
             logger.exception(f"Error getting records from {table}")
             return {"success": False, "error": str(e), "data": []}
     
+    @timed_db_call
+    async def get_page(
+        self,
+        table: str,
+        order_by: List[str],
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[Filters] = None,
+        columns: Optional[List[str]] = None,
+        count: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one page of records using keyset (cursor) pagination.
+        
+        Returns the page plus `next_cursor` (None on the last page). An invalid
+        cursor raises ValueError so controllers can answer 400.
+        """
+        after = decode_cursor(order_by, cursor)
+        try:
+            predicates = normalize_filters(filters)
+            orders = parse_order(order_by)
+            count_method = check_count(count)
+            if columns:
+                # The cursor is built from the sort keys, so they must be selected
+                columns = list(columns) + [c for c, _ in orders if c not in columns]
+            
+            def _get_page():
+                query = self._select(table, predicates, columns, orders, count_method)
+                if after is not None:
+                    query = query.or_(_keyset_filter(order_by, after))
+                response = query.limit(limit + 1).execute()
+                return response.data or [], response.count
+            
+            rows, total = await self._execute_sync(_get_page)
+            rows, next_cursor = page_result(rows, order_by, limit)
+            logger.info(f"Retrieved page of {len(rows)} records from {table}")
+            result = {"success": True, "data": rows, "count": len(rows), "next_cursor": next_cursor}
+            if count_method:
+                result["total"] = total
+            return result
+        except Exception as e:
+            logger.exception(f"Error getting page from {table}")
+            return {"success": False, "error": str(e), "data": [], "next_cursor": None}
+    
+    async def iter_records(
+        self,
+        table: str,
+        page_size: int = 500,
+        filters: Optional[Filters] = None,
+        columns: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream a whole table as fixed-size pages.
+        
+        Only one page is held at a time, so memory stays constant however big
+        the table is. Raises RuntimeError if a page can't be fetched, so an
+        export never silently stops half way.
+        """
+        order_by = order_by or ["id"]
+        cursor = None
+        while True:
+            page = await self.get_page(
+                table, order_by, cursor=cursor, limit=page_size, filters=filters, columns=columns
+            )
+            if not page["success"]:
+                raise RuntimeError(f"Failed to stream {table}: {page['error']}")
+            if page["data"]:
+                yield page["data"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+    
+    @timed_db_call
     async def update_record(self, table: str, record_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a record by ID"""
         try:
@@ -106,6 +202,7 @@ class DatabaseService:
             logger.exception(f"Error updating record in {table}")
             return {"success": False, "error": str(e)}
     
+    @timed_db_call
     async def delete_record(self, table: str, record_id: int) -> Dict[str, Any]:
         """Delete a record by ID"""
         try:
@@ -123,6 +220,76 @@ class DatabaseService:
         except Exception as e:
             logger.exception(f"Error deleting record from {table}")
             return {"success": False, "error": str(e)}
+    
+    @timed_db_call
+    async def delete_records(self, table: str, filters: Filters) -> Dict[str, Any]:
+        """Delete every record matching the filters in a single request"""
+        try:
+            predicates = normalize_filters(filters)
+            if not predicates:
+                return {"success": False, "error": "Refusing to delete without filters"}
+            
+            def _delete():
+                query = self.supabase.table(table).delete(
+                    count=CountMethod.exact,
+                    returning=ReturnMethod.minimal
+                )
+                response = _apply_predicates(query, predicates).execute()
+                return response.count or 0
+            
+            deleted = await self._execute_sync(_delete)
+            logger.info(f"Deleted {deleted} records from {table}")
+            return {"success": True, "deleted": deleted}
+        except Exception as e:
+            logger.exception(f"Error deleting records from {table}")
+            return {"success": False, "error": str(e)}
+    
+    def _select(self, table, predicates, columns, orders, count_method):
+        """Build a filtered, ordered PostgREST select"""
+        select_columns = ",".join(columns) if columns else "*"
+        query = self.supabase.table(table).select(
+            select_columns,
+            count=CountMethod(count_method) if count_method else None
+        )
+        query = _apply_predicates(query, predicates)
+        for column, descending in orders:
+            query = query.order(column, desc=descending)
+        return query
+
+
+def _postgrest_value(value: Any) -> str:
+    """Format a value for a PostgREST logic filter, quoting strings"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    return str(value)
+
+
+def _keyset_filter(order_by: List[str], values: List[Any]) -> str:
+    """Render the keyset condition as a PostgREST `or` filter"""
+    terms = []
+    for term in keyset_terms(order_by, values):
+        parts = [f"{column}.{operator}.{_postgrest_value(value)}" for column, operator, value in term]
+        terms.append(parts[0] if len(parts) == 1 else f"and({','.join(parts)})")
+    return ",".join(terms)
+
+
+def _apply_predicates(query, predicates):
+    """Apply normalized (column, operator, value) predicates to a PostgREST query"""
+    for column, operator, value in predicates:
+        if operator == "in":
+            query = query.in_(column, list(value))
+        elif operator == "is":
+            query = query.is_(column, value)
+        elif operator == "not_is":
+            query = query.not_.is_(column, value)
+        else:
+            query = getattr(query, operator)(column, value)
+    return query
 
 
 # Note: Global instance removed - now using dependency injection 
\ No newline at end of file
@@ -1,19 +1,128 @@
 import logging
 import asyncio
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Dict, Any, Sequence, Tuple
+from datetime import date, datetime, timedelta
 from services.db_service import DatabaseService
 from services.scraper_service import FBrefScraperService
+from services.scrape_archive import ScrapeArchive
+from services.snapshot_history import SnapshotHistory
+from services.change_log import ChangeLog
+from services.change_events import WebhookDispatcher, change_events
+from services.pagination import cursor_order, encode_cursor
+from monitoring.metrics import CACHE_EVENTS, REFRESH_OUTCOMES
+from monitoring.tracing import traced
 from models.football import (
-    Player, PlayerCreate, PlayerUpdate, PlayerBase,
-    Fixture, FixtureCreate, FixtureUpdate, FixtureBase,
-    Standing, StandingCreate, StandingUpdate, StandingBase,
+    PlayerCreate, PlayerUpdate, PlayerBase,
+    FixtureCreate, FixtureUpdate, FixtureBase,
+    StandingCreate, StandingUpdate, StandingBase,
     DataCache, DataCacheCreate, DataCacheUpdate, DataCacheBase
 )
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Columns each endpoint actually serves - bookkeeping columns stay in the database
+PLAYER_COLUMNS = [
+    "id", "name", "position", "age", "nationality", "photo",
+    "number", "matches", "goals", "assists"
+]
+FIXTURE_COLUMNS = [
+    "id", "fixture_date", "home_team", "away_team", "home_logo", "away_logo",
+    "competition", "round", "venue", "home_score", "away_score",
+    "result", "attendance", "referee"
+]
+# Keyset sort keys for the paginated listings (unique, non-null, index-backed)
+PLAYER_ORDER = ["id"]
+FIXTURE_ORDER = ["fixture_date.desc", "id.desc"]
+# Undated fixtures follow the dated ones, by id (a NULL date can't be a keyset value)
+UNDATED_FIXTURE_ORDER = ["id"]
+# Stored results this many days before the newest one are re-read on every refresh (late score corrections)
+FIXTURE_RESYNC_DAYS = 14
+STANDING_COLUMNS = ["position", "points", "played", "won", "drawn", "lost", "goal_difference"]
+CACHE_COLUMNS = ["id", "last_scraped", "last_updated", "is_updating", "error_message"]
+
+
+def _isoformat(value: Any) -> Optional[str]:
+    """Dates come back as strings from Supabase and as date objects from asyncpg"""
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()
+
+
+def _score(value: Any) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+def _stored_result(row: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Tuple[Optional[int], Optional[int]]]:
+    """((date, home, away), (home score, away score)) of a fixtures row"""
+    key = (_isoformat(row["fixture_date"])[:10], row["home_team"], row["away_team"])
+    return key, (_score(row["home_score"]), _score(row["away_score"]))
+
+
+def _scraped_result(fixture: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Tuple[Optional[int], Optional[int]]]:
+    """((date, home, away), (home score, away score)) of a scraped fixture (pastFixtures format)"""
+    key = ((fixture.get("date") or "")[:10], fixture.get("homeTeam"), fixture.get("awayTeam"))
+    return key, (_score(fixture.get("homeScore")), _score(fixture.get("awayScore")))
+
+
+def _whole_listing(cursor: Optional[str], page: Dict[str, Any]) -> bool:
+    """
+    Whether a page read holds every stored record. Only such a response gets
+    a delta sync version: changes and resets cover the whole table, so merged
+    into one page of it they would add records the page never held.
+    """
+    return cursor is None and page["success"] and page.get("next_cursor") is None
+
+
+def _player_response(player: Dict[str, Any]) -> Dict[str, Any]:
+    """A players row in the format the API serves (like the scraper's squad entries)"""
+    return {
+        "id": player["id"],
+        "name": player["name"],
+        "position": player["position"],
+        "age": player["age"],
+        "nationality": player["nationality"],
+        "photo": player["photo"],
+        "number": player["number"],
+        "matches": player["matches"],
+        "goals": player["goals"],
+        "assists": player["assists"]
+    }
+
+
+def _fixture_response(fixture: Dict[str, Any]) -> Dict[str, Any]:
+    """A fixtures row in the format the API serves (like the scraper's pastFixtures entries)"""
+    return {
+        "id": fixture["id"],
+        "date": _isoformat(fixture["fixture_date"]),
+        "homeTeam": fixture["home_team"],
+        "awayTeam": fixture["away_team"],
+        "homeLogo": fixture["home_logo"],
+        "awayLogo": fixture["away_logo"],
+        "competition": fixture["competition"],
+        "round": fixture["round"],
+        "venue": fixture["venue"],
+        "homeScore": fixture["home_score"],
+        "awayScore": fixture["away_score"],
+        "result": fixture["result"],
+        "attendance": fixture["attendance"],
+        "referee": fixture["referee"]
+    }
+
+
+def _standing_response(standing: Dict[str, Any]) -> Dict[str, Any]:
+    """The standings row in the format the API serves (leaguePosition)"""
+    return {
+        "position": standing["position"],
+        "points": standing["points"],
+        "played": standing["played"],
+        "won": standing["won"],
+        "drawn": standing["drawn"],
+        "lost": standing["lost"],
+        "goalDifference": standing["goal_difference"]
+    }
+
 class FootballDataService:
     """
     Service for managing football data with database persistence and async updates.
@@ -24,9 +133,28 @@ class FootballDataService:
     - Cache management and expiration
     """
     
-    def __init__(self, db_service: DatabaseService, scraper_service: FBrefScraperService):
+    def __init__(self, db_service: DatabaseService, scraper_service: FBrefScraperService,
+                 fixture_listeners: Sequence[Any] = (), archive: Optional[ScrapeArchive] = None,
+                 history: Optional[SnapshotHistory] = None, events: Optional[WebhookDispatcher] = None):
         self.db_service = db_service
         self.scraper_service = scraper_service
+        # Every live extraction is also appended to the columnar archive (optional)
+        self.archive = archive
+        # Standings and player stats kept as change-only time series (optional)
+        self.history = history
+        # Archive and history appends run on their own thread, one at a time and in scrape order
+        self._snapshot_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshots")
+        # Versioned change logs behind the ?since= delta sync of each dataset
+        self.change_logs = {
+            "players": ChangeLog(("name",)),
+            "fixtures": ChangeLog(("date", "homeTeam", "awayTeam")),
+            "standings": ChangeLog(()),
+        }
+        # Change events for webhooks, queued whenever a change log version is published (optional)
+        self.events = events
+        # Derived views of the results (team ratings, standings) fed with every fixture stored:
+        # record(new_fixtures) after an incremental refresh, rebuild_from(all_fixtures) after a full load
+        self.fixture_listeners = list(fixture_listeners)
         
         # Cache expiration times (in minutes)
         self.cache_durations = {
@@ -42,31 +170,43 @@ class FootballDataService:
             "standings": False
         }
 
-    async def get_players_data(self, force_update: bool = False) -> Dict[str, Any]:
+    async def get_players_data(self, force_update: bool = False, cursor: Optional[str] = None,
+                               limit: int = 100) -> Dict[str, Any]:
         """
         Get players data from database immediately, optionally trigger async update.
         
         Args:
             force_update: If True, force an async update regardless of cache status
+            cursor: Opaque cursor from a previous page's nextCursor
+            limit: Page size
             
         Returns:
             Dict with players data, cache info, and metadata
         """
         try:
+            # Version of the data about to be read (a refresh during the read shows up as a change)
+            version = self.change_logs["players"].version
             # Always return database data first for instant loading
-            db_result = await self.db_service.get_records("players", limit=100)
+            db_result = await self.db_service.get_page(
+                "players",
+                order_by=PLAYER_ORDER,
+                cursor=cursor,
+                limit=limit,
+                columns=PLAYER_COLUMNS
+            )
             
             if not db_result["success"]:
                 logger.warning("Failed to get players from database, using empty data")
                 players_data = []
             else:
-                players_data = [Player(**player) for player in db_result["data"]]
+                players_data = db_result["data"]
             
             # Get cache status
             cache_info = await self._get_cache_info("players")
             
             # Determine if we need to update
             needs_update = force_update or self._should_update_cache("players", cache_info)
+            self._record_cache_lookup("players", cache_info, needs_update)
             
             # Trigger async update if needed (non-blocking)
             if needs_update and not self._updating_lock["players"]:
@@ -74,23 +214,12 @@ class FootballDataService:
             
             # Format response similar to scraper service
             response_data = {
-                "squad": [
-                    {
-                        "id": player.id,
-                        "name": player.name,
-                        "position": player.position,
-                        "age": player.age,
-                        "nationality": player.nationality,
-                        "photo": player.photo,
-                        "number": player.number,
-                        "matches": player.matches,
-                        "goals": player.goals,
-                        "assists": player.assists
-                    } for player in players_data
-                ],
+                "squad": [_player_response(player) for player in players_data],
+                "nextCursor": db_result.get("next_cursor"),
                 "isLive": not needs_update,  # Live if we don't need update
                 "lastUpdated": cache_info.get("last_updated") if cache_info else None,
-                "source": f"Database (last scraped: {cache_info.get('last_scraped') if cache_info else 'unknown'})"
+                "source": f"Database (last scraped: {cache_info.get('last_scraped') if cache_info else 'unknown'})",
+                "version": version if _whole_listing(cursor, db_result) else None
             }
             
             logger.info(f"Retrieved {len(players_data)} players from database")
@@ -102,31 +231,33 @@ class FootballDataService:
                 "updating": self._updating_lock["players"]
             }
             
+        except ValueError as e:
+            return {"success": False, "error": str(e), "bad_request": True, "data": {"squad": []}}
         except Exception as e:
             logger.exception("Error getting players data")
             return {"success": False, "error": str(e), "data": {"squad": []}}
 
-    async def get_fixtures_data(self, force_update: bool = False) -> Dict[str, Any]:
+    async def get_fixtures_data(self, force_update: bool = False, cursor: Optional[str] = None,
+                                limit: int = 20) -> Dict[str, Any]:
         """Get fixtures data from database immediately, optionally trigger async update."""
         try:
-            # Get recent fixtures (last 20)
-            db_result = await self.db_service.get_records(
-                "fixtures", 
-                limit=20,
-                # Could add ordering here, but keeping simple for now
-            )
+            # Version of the data about to be read (a refresh during the read shows up as a change)
+            version = self.change_logs["fixtures"].version
+            # Get recent fixtures, newest first; older (then undated) pages via the cursor
+            db_result = await self._fixtures_page(cursor, limit)
             
             if not db_result["success"]:
                 logger.warning("Failed to get fixtures from database, using empty data")
                 fixtures_data = []
             else:
-                fixtures_data = [Fixture(**fixture) for fixture in db_result["data"]]
+                fixtures_data = db_result["data"]
             
             # Get cache status
             cache_info = await self._get_cache_info("fixtures")
             
             # Determine if we need to update
             needs_update = force_update or self._should_update_cache("fixtures", cache_info)
+            self._record_cache_lookup("fixtures", cache_info, needs_update)
             
             # Trigger async update if needed (non-blocking)
             if needs_update and not self._updating_lock["fixtures"]:
@@ -134,27 +265,12 @@ class FootballDataService:
             
             # Format response similar to scraper service
             response_data = {
-                "pastFixtures": [
-                    {
-                        "id": fixture.id,
-                        "date": fixture.fixture_date.isoformat() if fixture.fixture_date else None,
-                        "homeTeam": fixture.home_team,
-                        "awayTeam": fixture.away_team,
-                        "homeLogo": fixture.home_logo,
-                        "awayLogo": fixture.away_logo,
-                        "competition": fixture.competition,
-                        "round": fixture.round,
-                        "venue": fixture.venue,
-                        "homeScore": fixture.home_score,
-                        "awayScore": fixture.away_score,
-                        "result": fixture.result,
-                        "attendance": fixture.attendance,
-                        "referee": fixture.referee
-                    } for fixture in fixtures_data
-                ],
+                "pastFixtures": [_fixture_response(fixture) for fixture in fixtures_data],
+                "nextCursor": db_result.get("next_cursor"),
                 "isLive": not needs_update,
                 "lastUpdated": cache_info.get("last_updated") if cache_info else None,
-                "source": f"Database (last scraped: {cache_info.get('last_scraped') if cache_info else 'unknown'})"
+                "source": f"Database (last scraped: {cache_info.get('last_scraped') if cache_info else 'unknown'})",
+                "version": version if _whole_listing(cursor, db_result) else None
             }
             
             logger.info(f"Retrieved {len(fixtures_data)} fixtures from database")
@@ -166,27 +282,74 @@ class FootballDataService:
                 "updating": self._updating_lock["fixtures"]
             }
             
+        except ValueError as e:
+            return {"success": False, "error": str(e), "bad_request": True, "data": {"pastFixtures": []}}
         except Exception as e:
             logger.exception("Error getting fixtures data")
             return {"success": False, "error": str(e), "data": {"pastFixtures": []}}
 
+    async def _fixtures_page(self, cursor: Optional[str], limit: int) -> Dict[str, Any]:
+        """
+        A page of fixtures: the dated ones newest first, then the undated ones.
+        The two parts are separate keysets; the sort keys in the cursor say
+        which one a page continues.
+        """
+        rows: List[Dict[str, Any]] = []
+        if cursor_order(cursor) != UNDATED_FIXTURE_ORDER:
+            result = await self.db_service.get_page(
+                "fixtures",
+                order_by=FIXTURE_ORDER,
+                cursor=cursor,
+                limit=limit,
+                filters={"fixture_date": ("not_is", None)},
+                columns=FIXTURE_COLUMNS
+            )
+            if not result["success"] or result["next_cursor"] is not None:
+                return result
+            rows = result["data"]
+            # Dated fixtures exhausted: continue with the undated ones from the start (ids are positive)
+            cursor = encode_cursor(UNDATED_FIXTURE_ORDER, {"id": 0})
+
+        result = await self.db_service.get_page(
+            "fixtures",
+            order_by=UNDATED_FIXTURE_ORDER,
+            cursor=cursor,
+            limit=max(limit - len(rows), 1),
+            filters={"fixture_date": ("is", None)},
+            columns=FIXTURE_COLUMNS
+        )
+        if not result["success"]:
+            return result
+        if len(rows) == limit:
+            # The page is full already: only point at the undated fixtures if there are any
+            return {"success": True, "data": rows, "next_cursor": cursor if result["data"] else None}
+        return {"success": True, "data": rows + result["data"], "next_cursor": result["next_cursor"]}
+
     async def get_standings_data(self, force_update: bool = False) -> Dict[str, Any]:
         """Get standings data from database immediately, optionally trigger async update."""
         try:
+            # Version of the data about to be read (a refresh during the read shows up as a change)
+            version = self.change_logs["standings"].version
             # Get latest standings (should be just one record)
-            db_result = await self.db_service.get_records("standings", limit=1)
+            db_result = await self.db_service.get_records(
+                "standings",
+                limit=1,
+                columns=STANDING_COLUMNS,
+                order_by=["id.desc"]
+            )
             
             if not db_result["success"] or not db_result["data"]:
                 logger.warning("Failed to get standings from database, using empty data")
                 standings_data = None
             else:
-                standings_data = Standing(**db_result["data"][0])
+                standings_data = db_result["data"][0]
             
             # Get cache status
             cache_info = await self._get_cache_info("standings")
             
             # Determine if we need to update
             needs_update = force_update or self._should_update_cache("standings", cache_info)
+            self._record_cache_lookup("standings", cache_info, needs_update)
             
             # Trigger async update if needed (non-blocking)
             if needs_update and not self._updating_lock["standings"]:
@@ -194,18 +357,11 @@ class FootballDataService:
             
             # Format response similar to scraper service
             response_data = {
-                "leaguePosition": {
-                    "position": standings_data.position if standings_data else None,
-                    "points": standings_data.points if standings_data else None,
-                    "played": standings_data.played if standings_data else None,
-                    "won": standings_data.won if standings_data else None,
-                    "drawn": standings_data.drawn if standings_data else None,
-                    "lost": standings_data.lost if standings_data else None,
-                    "goalDifference": standings_data.goal_difference if standings_data else None
-                } if standings_data else None,
+                "leaguePosition": _standing_response(standings_data) if standings_data else None,
                 "isLive": not needs_update,
                 "lastUpdated": cache_info.get("last_updated") if cache_info else None,
-                "source": f"Database (last scraped: {cache_info.get('last_scraped') if cache_info else 'unknown'})"
+                "source": f"Database (last scraped: {cache_info.get('last_scraped') if cache_info else 'unknown'})",
+                "version": version
             }
             
             logger.info(f"Retrieved standings from database")
@@ -227,7 +383,8 @@ class FootballDataService:
             result = await self.db_service.get_records(
                 "data_cache", 
                 filters={"data_type": data_type},
-                limit=1
+                limit=1,
+                columns=CACHE_COLUMNS
             )
             if result["success"] and result["data"]:
                 return result["data"][0]
@@ -258,23 +415,150 @@ class FootballDataService:
         
         return datetime.now(last_scraped.tzinfo) > expiry_time
 
+    def _record_cache_lookup(self, data_type: str, cache_info: Optional[Dict[str, Any]], needs_update: bool):
+        """Count a database cache lookup as a miss (never scraped), stale, or hit."""
+        if not cache_info or not cache_info.get("last_scraped"):
+            result = "miss"
+        else:
+            result = "stale" if needs_update else "hit"
+        CACHE_EVENTS.inc("database", data_type, result)
+
+    def close(self):
+        """Finish the pending archive and history appends"""
+        self._snapshot_executor.shutdown(wait=True)
+
+    @traced("archive.append")
+    async def _archive(self, data_type: str, rows: List[Dict[str, Any]], scraped: Dict[str, Any]):
+        """Append a live extraction to the archive (off the event loop); fallback data is never archived"""
+        if self.archive is None or not scraped.get("isLive") or not rows:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self._snapshot_executor, self.archive.append, data_type, self.scraper_service.team_id, rows,
+                scraped["lastUpdated"]
+            )
+        except OSError as error:
+            # The archive is a history, not the source of truth: a full disk mustn't fail the refresh
+            logger.warning(f"Could not archive {data_type}: {error}")
+
+    async def _record_history(self, data_type: str, data: Any, scraped: Dict[str, Any]):
+        """Append a live players / standings snapshot to the time series (stored only if values changed)"""
+        if self.history is None or not scraped.get("isLive"):
+            return
+        record = self.history.record_players if data_type == "players" else self.history.record_standings
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._snapshot_executor, record, data, scraped["lastUpdated"])
+        except OSError as error:
+            logger.warning(f"Could not record {data_type} history: {error}")
+
+    async def _current_records(self, data_type: str) -> List[Dict[str, Any]]:
+        """Every stored record of a dataset, in the format the API serves"""
+        if data_type == "standings":
+            result = await self.db_service.get_records(
+                "standings", limit=1, columns=STANDING_COLUMNS, order_by=["id.desc"]
+            )
+            if not result["success"]:
+                raise RuntimeError(f"Could not read standings: {result.get('error')}")
+            return [_standing_response(row) for row in result["data"]]
+        if data_type == "players":
+            table, columns, formatter = "players", PLAYER_COLUMNS, _player_response
+            parts = [(None, PLAYER_ORDER)]
+        else:
+            table, columns, formatter = "fixtures", FIXTURE_COLUMNS, _fixture_response
+            parts = [({"fixture_date": ("not_is", None)}, FIXTURE_ORDER),
+                     ({"fixture_date": ("is", None)}, UNDATED_FIXTURE_ORDER)]
+        records = []
+        for filters, order in parts:
+            async for page in self.db_service.iter_records(table, filters=filters, columns=columns, order_by=order):
+                records.extend(formatter(row) for row in page)
+        return records
+
+    async def _publish_changes(self, data_type: str):
+        """Diff the stored dataset against the change log after a refresh (a new version if anything changed)"""
+        try:
+            change_log = self.change_logs[data_type]
+            records = await self._current_records(data_type)
+            previous = change_log.version
+            if not change_log.seeded:
+                # What clients saw before this refresh is unknown, so nobody gets a partial delta
+                change_log.rebase(records)
+            elif change_log.publish(records):
+                logger.info(f"🔁 {data_type} changed: version {change_log.version}")
+                if self.events is not None:
+                    await self.events.publish(change_events(data_type, change_log.changes_since(previous)))
+        except Exception as error:
+            # Clients then get the change with the next refresh that publishes
+            logger.warning(f"Could not publish {data_type} changes: {error}")
+
+    async def seed_change_logs(self):
+        """Baseline every change log from the stored data, so the first refresh already publishes a diff"""
+        for data_type, change_log in self.change_logs.items():
+            if change_log.seeded:
+                continue
+            try:
+                change_log.publish(await self._current_records(data_type))
+            except Exception as error:
+                logger.warning(f"Could not load the {data_type} baseline: {error}")
+
+    async def get_changes(self, data_type: str, since: int) -> Dict[str, Any]:
+        """
+        Records of a dataset changed after version `since` (the version of a
+        previous response). not_modified when the client is up to date; a
+        reset with every record when `since` is too old or unknown.
+        """
+        try:
+            change_log = self.change_logs[data_type]
+            if not change_log.seeded:
+                # First delta request since startup: the stored data is the baseline
+                change_log.publish(await self._current_records(data_type))
+            cache_info = await self._get_cache_info(data_type)
+            needs_update = self._should_update_cache(data_type, cache_info)
+            self._record_cache_lookup(data_type, cache_info, needs_update)
+            if needs_update and not self._updating_lock[data_type]:
+                refresh = {
+                    "players": self._async_update_players,
+                    "fixtures": self._async_update_fixtures,
+                    "standings": self._async_update_standings,
+                }[data_type]
+                asyncio.create_task(refresh())
+
+            changes = change_log.changes_since(since)
+            if changes is None:
+                return {"success": True, "not_modified": True, "data": {"version": change_log.version}}
+            return {
+                "success": True,
+                "data": {
+                    **changes,
+                    "isLive": not needs_update,
+                    "lastUpdated": cache_info.get("last_updated") if cache_info else None,
+                },
+                "updating": self._updating_lock[data_type]
+            }
+        except Exception as e:
+            logger.exception(f"Error getting {data_type} changes")
+            return {"success": False, "error": str(e)}
+
+    @traced("clear_table")
     async def _clear_table_data(self, table_name: str):
         """Clear all data from a table using the database service."""
         try:
-            # Get all records first to get their IDs
-            records_result = await self.db_service.get_records(table_name, limit=1000)
-            if records_result["success"] and records_result["data"]:
-                # Delete each record by ID
-                for record in records_result["data"]:
-                    await self.db_service.delete_record(table_name, record["id"])
-                logger.info(f"Cleared {len(records_result['data'])} records from {table_name}")
+            # One server-side delete instead of fetching every row and deleting by ID
+            result = await self.db_service.delete_records(table_name, {"id": ("not_is", None)})
+            if result["success"]:
+                logger.info(f"Cleared {result['deleted']} records from {table_name}")
+            else:
+                logger.warning(f"Failed to clear table {table_name}: {result.get('error')}")
         except Exception as e:
             logger.exception(f"Error clearing table {table_name}")
 
+    @traced("refresh.players")
     async def _async_update_players(self):
         """Background task to update players data from scraping."""
         if self._updating_lock["players"]:
             logger.info("Players update already in progress, skipping")
+            REFRESH_OUTCOMES.inc("players", "skipped")
             return
             
         self._updating_lock["players"] = True
@@ -288,6 +572,9 @@ class FootballDataService:
             scraped_data = await self.scraper_service.fetch_squad_data()
             
             if scraped_data and "squad" in scraped_data:
+                await self._archive("players", scraped_data["squad"], scraped_data)
+                await self._record_history("players", scraped_data["squad"], scraped_data)
+                
                 # Clear existing players data
                 await self._clear_table_data("players")
                 
@@ -312,21 +599,169 @@ class FootballDataService:
                 logger.info(f"Updated {len(scraped_data['squad'])} players in database")
                 
                 # Update cache status
+                await self._publish_changes("players")
                 await self._update_cache_status("players", is_updating=False, last_scraped=datetime.now())
+                REFRESH_OUTCOMES.inc("players", "success")
             else:
                 logger.warning("No players data returned from scraper")
                 await self._update_cache_status("players", is_updating=False, error_message="No data from scraper")
+                REFRESH_OUTCOMES.inc("players", "no_data")
                 
         except Exception as e:
             logger.exception("Error in async players update")
             await self._update_cache_status("players", is_updating=False, error_message=str(e))
+            REFRESH_OUTCOMES.inc("players", "error")
         finally:
             self._updating_lock["players"] = False
 
+    async def _fixture_date(self, order_by: List[str], filters: Optional[Dict[str, Any]] = None) -> Optional[date]:
+        """Date of the first dated fixture in `order_by` order (the fixtures date index makes this a one-row read), None if none"""
+        result = await self.db_service.get_records(
+            "fixtures",
+            filters={"fixture_date": ("not_is", None), **(filters or {})},
+            limit=1,
+            columns=["fixture_date"],
+            order_by=order_by
+        )
+        if not result["success"]:
+            raise RuntimeError(f"Could not read the fixtures: {result.get('error')}")
+        if not result["data"]:
+            return None
+        return date.fromisoformat(_isoformat(result["data"][0]["fixture_date"]))
+
+    async def _latest_fixture_date(self) -> Optional[date]:
+        """Date of the newest stored fixture, None if none"""
+        return await self._fixture_date(FIXTURE_ORDER)
+
+    async def _fixture_sync_start(self, after: Optional[date]) -> Optional[date]:
+        """
+        Date after which the stored fixtures are re-read from the page, or None
+        for a full season load: nothing is stored yet, or the stored history
+        starts after the season's first match (e.g. a table that only ever
+        held the last few results). Otherwise the FIXTURE_RESYNC_DAYS before
+        the newest stored match are re-checked, reaching back to the oldest
+        stored match of the season still without a score.
+        """
+        if after is None:
+            return None
+        season = await self.scraper_service.fetch_fixture_history()
+        # Oldest first and lazy: only the season's first match is converted
+        first = next(iter(season["fixtures"]), None)
+        season_start = date.fromisoformat(first["date"][:10]) if first and first.get("date") else None
+        earliest = await self._fixture_date(["fixture_date", "id"])
+        if season_start is not None and season_start < earliest:
+            logger.info(f"Stored fixtures start on {earliest.isoformat()}, the season on {season_start.isoformat()}: "
+                        f"reloading the whole season")
+            return None
+
+        since = after - timedelta(days=FIXTURE_RESYNC_DAYS)
+        unscored = await self._fixture_date(["fixture_date", "id"], {"home_score": ("is", None)})
+        if unscored is not None and unscored <= since:
+            since = unscored - timedelta(days=1)
+        if season_start is not None:
+            # Older seasons are no longer on the page, so there is nothing to compare them with
+            since = max(since, season_start - timedelta(days=1))
+        return since
+
+    async def _stored_fixtures(self, since: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Stored dated fixtures, all or those dated after `since`, oldest first"""
+        filters = {"fixture_date": ("gt", since.isoformat()) if since else ("not_is", None)}
+        fixtures = []
+        async for page in self.db_service.iter_records(
+            "fixtures", filters=filters, columns=FIXTURE_COLUMNS, order_by=["fixture_date", "id"]
+        ):
+            fixtures.extend(page)
+        return fixtures
+
+    async def _sync_fixtures(self, since: date, fixtures: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Bring the stored fixtures dated after `since` in line with the page's:
+        new matches are appended, and stored ones the page now scores
+        differently (a corrected score, a result for a match stored without
+        one) are replaced. Stored matches the page doesn't list are kept.
+        Returns the fixtures stored and whether the history changed before its
+        end: a stored fixture was replaced, or a match dated on or before the
+        newest stored one was added (a postponed match scored late), which the
+        date-ordered listeners can only take in by replaying.
+        """
+        stored = {}
+        for row in await self._stored_fixtures(since):
+            key, score = _stored_result(row)
+            stored[key] = (row["id"], score)
+        newest = max((key[0] for key in stored), default=None)
+        scraped = list(fixtures)
+        results = dict(map(_scraped_result, scraped))
+        stale = {
+            key: record_id for key, (record_id, score) in stored.items()
+            if key in results and results[key] != score
+        }
+        if stale:
+            logger.info(f"Replacing {len(stale)} stored fixtures since {since.isoformat()} that changed on the page")
+            result = await self.db_service.delete_records("fixtures", {"id": ("in", list(stale.values()))})
+            if not result["success"]:
+                raise RuntimeError(f"Could not delete the changed fixtures: {result.get('error')}")
+        inserted = await self._insert_fixtures(
+            fixture for fixture in scraped
+            if (key := _scraped_result(fixture)[0]) not in stored or key in stale
+        )
+        late = newest is not None and any(
+            played_on and played_on <= newest
+            for played_on in (_scraped_result(fixture)[0][0] for fixture in inserted)
+        )
+        return inserted, bool(stale) or late
+
+    def _fixture_record(self, fixture_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Database row for a scraped fixture (pastFixtures format), validated through FixtureCreate"""
+        # Parse date if it exists
+        fixture_date = None
+        if fixture_data.get("date"):
+            try:
+                fixture_date = datetime.fromisoformat(fixture_data["date"].replace('Z', '+00:00')).date()
+            except ValueError:
+                logger.warning(f"Could not parse date: {fixture_data.get('date')}")
+        
+        fixture_create = FixtureCreate(
+            fixture_date=fixture_date,
+            home_team=fixture_data.get("homeTeam"),
+            away_team=fixture_data.get("awayTeam"),
+            home_logo=fixture_data.get("homeLogo"),
+            away_logo=fixture_data.get("awayLogo"),
+            competition=fixture_data.get("competition"),
+            round=fixture_data.get("round"),
+            venue=fixture_data.get("venue"),
+            home_score=fixture_data.get("homeScore"),
+            away_score=fixture_data.get("awayScore"),
+            result=fixture_data.get("result"),
+            attendance=fixture_data.get("attendance"),
+            referee=fixture_data.get("referee")
+        )
+        
+        # Convert date objects to strings for JSON serialization
+        fixture_dict = fixture_create.model_dump()
+        if fixture_dict.get('fixture_date'):
+            fixture_dict['fixture_date'] = fixture_dict['fixture_date'].isoformat()
+        return fixture_dict
+
+    async def _insert_fixtures(self, fixtures: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert scraped fixtures as they are produced; returns the ones stored"""
+        inserted = []
+        for fixture_data in fixtures:
+            try:
+                result = await self.db_service.create_record("fixtures", self._fixture_record(fixture_data))
+                if result["success"]:
+                    inserted.append(fixture_data)
+                else:
+                    logger.warning(f"Failed to insert fixture {fixture_data.get('homeTeam')} vs {fixture_data.get('awayTeam')}: {result.get('error')}")
+            except Exception as e:
+                logger.warning(f"Error creating fixture record: {e}")
+        return inserted
+
+    @traced("refresh.fixtures")
     async def _async_update_fixtures(self):
         """Background task to update fixtures data from scraping."""
         if self._updating_lock["fixtures"]:
             logger.info("Fixtures update already in progress, skipping")
+            REFRESH_OUTCOMES.inc("fixtures", "skipped")
             return
             
         self._updating_lock["fixtures"] = True
@@ -336,66 +771,52 @@ class FootballDataService:
             # Update cache status to indicate we're updating
             await self._update_cache_status("fixtures", is_updating=True)
             
-            # Fetch fresh data from scraper
-            scraped_data = await self.scraper_service.fetch_fixtures_data()
-            
-            if scraped_data and "pastFixtures" in scraped_data:
-                # Clear existing fixtures data
-                await self._clear_table_data("fixtures")
-                
-                # Insert new fixtures data
-                for fixture_data in scraped_data["pastFixtures"]:
-                    # Parse date if it exists
-                    fixture_date = None
-                    if fixture_data.get("date"):
-                        try:
-                            fixture_date = datetime.fromisoformat(fixture_data["date"].replace('Z', '+00:00')).date()
-                        except:
-                            logger.warning(f"Could not parse date: {fixture_data.get('date')}")
-                    
-                    fixture_create = FixtureCreate(
-                        fixture_date=fixture_date,
-                        home_team=fixture_data.get("homeTeam"),
-                        away_team=fixture_data.get("awayTeam"),
-                        home_logo=fixture_data.get("homeLogo"),
-                        away_logo=fixture_data.get("awayLogo"),
-                        competition=fixture_data.get("competition"),
-                        round=fixture_data.get("round"),
-                        venue=fixture_data.get("venue"),
-                        home_score=fixture_data.get("homeScore"),
-                        away_score=fixture_data.get("awayScore"),
-                        result=fixture_data.get("result"),
-                        attendance=fixture_data.get("attendance"),
-                        referee=fixture_data.get("referee")
-                    )
-                    
-                    # Convert date objects to strings for JSON serialization
-                    fixture_dict = fixture_create.model_dump()
-                    if fixture_dict.get('fixture_date'):
-                        fixture_dict['fixture_date'] = fixture_dict['fixture_date'].isoformat()
-                    
-                    result = await self.db_service.create_record("fixtures", fixture_dict)
-                    if not result["success"]:
-                        logger.warning(f"Failed to insert fixture {fixture_data.get('homeTeam')} vs {fixture_data.get('awayTeam')}: {result.get('error')}")
+            # Only the matches of the re-checked window are parsed; everything older is kept as stored
+            since = await self._fixture_sync_start(await self._latest_fixture_date())
+            history = await self.scraper_service.fetch_fixture_history(since)
+            
+            if history["isLive"]:
+                if since is None:
+                    # Nothing or only part of the season stored: load the whole season
+                    await self._clear_table_data("fixtures")
+                    inserted = await self._insert_fixtures(history["fixtures"])
+                    corrected = True
+                    logger.info(f"Loaded {len(inserted)} fixtures of the season to database")
+                else:
+                    inserted, corrected = await self._sync_fixtures(since, history["fixtures"])
+                    logger.info(f"Stored {len(inserted)} fixtures since {since.isoformat()} to database")
+                await self._archive("fixtures", inserted, history)
                 
-                logger.info(f"Updated {len(scraped_data['pastFixtures'])} fixtures in database")
+                # New results update the derived views one by one; changed ones make them replay everything stored
+                replay = (inserted if since is None else await self._stored_fixtures()) if corrected else None
+                for listener in self.fixture_listeners:
+                    if replay is not None:
+                        listener.rebuild_from(replay)
+                    else:
+                        listener.record(inserted)
                 
                 # Update cache status
+                await self._publish_changes("fixtures")
                 await self._update_cache_status("fixtures", is_updating=False, last_scraped=datetime.now())
+                REFRESH_OUTCOMES.inc("fixtures", "success")
             else:
                 logger.warning("No fixtures data returned from scraper")
                 await self._update_cache_status("fixtures", is_updating=False, error_message="No data from scraper")
+                REFRESH_OUTCOMES.inc("fixtures", "no_data")
                 
         except Exception as e:
             logger.exception("Error in async fixtures update")
             await self._update_cache_status("fixtures", is_updating=False, error_message=str(e))
+            REFRESH_OUTCOMES.inc("fixtures", "error")
         finally:
             self._updating_lock["fixtures"] = False
 
+    @traced("refresh.standings")
     async def _async_update_standings(self):
         """Background task to update standings data from scraping."""
         if self._updating_lock["standings"]:
             logger.info("Standings update already in progress, skipping")
+            REFRESH_OUTCOMES.inc("standings", "skipped")
             return
             
         self._updating_lock["standings"] = True
@@ -410,6 +831,9 @@ class FootballDataService:
             
             if scraped_data and "leaguePosition" in scraped_data:
                 league_pos = scraped_data["leaguePosition"]
+                if league_pos:
+                    await self._archive("standings", [league_pos], scraped_data)
+                    await self._record_history("standings", league_pos, scraped_data)
                 
                 # Clear existing standings data
                 await self._clear_table_data("standings")
@@ -433,14 +857,18 @@ class FootballDataService:
                     logger.warning(f"Failed to insert standings: {result.get('error')}")
                 
                 # Update cache status
+                await self._publish_changes("standings")
                 await self._update_cache_status("standings", is_updating=False, last_scraped=datetime.now())
+                REFRESH_OUTCOMES.inc("standings", "success")
             else:
                 logger.warning("No standings data returned from scraper")
                 await self._update_cache_status("standings", is_updating=False, error_message="No data from scraper")
+                REFRESH_OUTCOMES.inc("standings", "no_data")
                 
         except Exception as e:
             logger.exception("Error in async standings update")
             await self._update_cache_status("standings", is_updating=False, error_message=str(e))
+            REFRESH_OUTCOMES.inc("standings", "error")
         finally:
             self._updating_lock["standings"] = False
 
@@ -498,6 +926,7 @@ class FootballDataService:
             logger.exception("Error in force refresh all")
             return {"success": False, "error": str(e)}
 
+    @traced("manual_load.players")
     async def manual_load_players(self) -> Dict[str, Any]:
         """
         Manually load fresh players data to database with validation.
@@ -549,6 +978,8 @@ class FootballDataService:
                 }
             
             logger.info(f"Validated {len(valid_players)} players from scraper")
+            await self._archive("players", valid_players, scraped_data)
+            await self._record_history("players", valid_players, scraped_data)
             
             # Data is valid, now proceed with database update
             # Clear existing players data
@@ -579,9 +1010,11 @@ class FootballDataService:
                     logger.warning(f"Error creating player record for {player_data.get('name')}: {e}")
             
             # Update cache status
+            await self._publish_changes("players")
             await self._update_cache_status("players", is_updating=False, last_scraped=datetime.now())
             
             logger.info(f"Successfully loaded {inserted_count} players to database")
+            REFRESH_OUTCOMES.inc("players", "manual_success")
             return {
                 "success": True,
                 "count": inserted_count,
@@ -590,30 +1023,32 @@ class FootballDataService:
             
         except Exception as e:
             logger.exception("Error in manual players load")
+            REFRESH_OUTCOMES.inc("players", "manual_error")
             return {
                 "success": False,
                 "error": f"Database load failed: {str(e)}"
             }
 
+    @traced("manual_load.fixtures")
     async def manual_load_fixtures(self) -> Dict[str, Any]:
         """
-        Manually load fresh fixtures data to database with validation.
+        Manually load the season's full fixture history to database with validation.
         """
         logger.info("Starting manual fixtures data load with validation")
         
         try:
-            # First, fetch fresh data from scraper without touching the database
-            scraped_data = await self.scraper_service.fetch_fixtures_data()
+            # First, fetch the whole season from the scraper without touching the database
+            history = await self.scraper_service.fetch_fixture_history()
             
             # Validate the scraped data
-            if not scraped_data or "pastFixtures" not in scraped_data:
+            if not history["isLive"]:
                 return {
                     "success": False,
                     "error": "No fixtures data returned from scraper"
                 }
             
-            fixtures_data = scraped_data["pastFixtures"]
-            if not isinstance(fixtures_data, list) or len(fixtures_data) == 0:
+            fixtures_data = list(history["fixtures"])
+            if len(fixtures_data) == 0:
                 return {
                     "success": False,
                     "error": "Invalid or empty fixtures data from scraper"
@@ -622,10 +1057,6 @@ class FootballDataService:
             # Validate individual fixture records
             valid_fixtures = []
             for fixture_data in fixtures_data:
-                if not isinstance(fixture_data, dict):
-                    logger.warning(f"Skipping invalid fixture data: {fixture_data}")
-                    continue
-                    
                 # Check required fields
                 if not fixture_data.get("homeTeam") or not fixture_data.get("awayTeam"):
                     logger.warning(f"Skipping fixture without teams: {fixture_data}")
@@ -646,50 +1077,18 @@ class FootballDataService:
             await self._clear_table_data("fixtures")
             
             # Insert new validated fixtures data
-            inserted_count = 0
-            for fixture_data in valid_fixtures:
-                try:
-                    # Parse date if it exists
-                    fixture_date = None
-                    if fixture_data.get("date"):
-                        try:
-                            fixture_date = datetime.fromisoformat(fixture_data["date"].replace('Z', '+00:00')).date()
-                        except:
-                            logger.warning(f"Could not parse date: {fixture_data.get('date')}")
-                    
-                    fixture_create = FixtureCreate(
-                        fixture_date=fixture_date,
-                        home_team=fixture_data.get("homeTeam"),
-                        away_team=fixture_data.get("awayTeam"),
-                        home_logo=fixture_data.get("homeLogo"),
-                        away_logo=fixture_data.get("awayLogo"),
-                        competition=fixture_data.get("competition"),
-                        round=fixture_data.get("round"),
-                        venue=fixture_data.get("venue"),
-                        home_score=fixture_data.get("homeScore"),
-                        away_score=fixture_data.get("awayScore"),
-                        result=fixture_data.get("result"),
-                        attendance=fixture_data.get("attendance"),
-                        referee=fixture_data.get("referee")
-                    )
-                    
-                    # Convert date objects to strings for JSON serialization
-                    fixture_dict = fixture_create.model_dump()
-                    if fixture_dict.get('fixture_date'):
-                        fixture_dict['fixture_date'] = fixture_dict['fixture_date'].isoformat()
-                    
-                    result = await self.db_service.create_record("fixtures", fixture_dict)
-                    if result["success"]:
-                        inserted_count += 1
-                    else:
-                        logger.warning(f"Failed to insert fixture {fixture_data.get('homeTeam')} vs {fixture_data.get('awayTeam')}: {result.get('error')}")
-                except Exception as e:
-                    logger.warning(f"Error creating fixture record: {e}")
+            inserted = await self._insert_fixtures(valid_fixtures)
+            inserted_count = len(inserted)
+            await self._archive("fixtures", inserted, history)
+            for listener in self.fixture_listeners:
+                listener.rebuild_from(inserted)
             
             # Update cache status
+            await self._publish_changes("fixtures")
             await self._update_cache_status("fixtures", is_updating=False, last_scraped=datetime.now())
             
             logger.info(f"Successfully loaded {inserted_count} fixtures to database")
+            REFRESH_OUTCOMES.inc("fixtures", "manual_success")
             return {
                 "success": True,
                 "count": inserted_count,
@@ -698,11 +1097,13 @@ class FootballDataService:
             
         except Exception as e:
             logger.exception("Error in manual fixtures load")
+            REFRESH_OUTCOMES.inc("fixtures", "manual_error")
             return {
                 "success": False,
                 "error": f"Database load failed: {str(e)}"
             }
 
+    @traced("manual_load.standings")
     async def manual_load_standings(self) -> Dict[str, Any]:
         """
         Manually load fresh standings data to database with validation.
@@ -737,6 +1138,8 @@ class FootballDataService:
                     }
             
             logger.info("Validated standings data from scraper")
+            await self._archive("standings", [league_pos], scraped_data)
+            await self._record_history("standings", league_pos, scraped_data)
             
             # Data is valid, now proceed with database update
             # Clear existing standings data
@@ -768,9 +1171,11 @@ class FootballDataService:
                 }
             
             # Update cache status
+            await self._publish_changes("standings")
             await self._update_cache_status("standings", is_updating=False, last_scraped=datetime.now())
             
             logger.info("Successfully loaded standings to database")
+            REFRESH_OUTCOMES.inc("standings", "manual_success")
             return {
                 "success": True,
                 "message": "Loaded standings data to database"
@@ -778,6 +1183,7 @@ class FootballDataService:
             
         except Exception as e:
             logger.exception("Error in manual standings load")
+            REFRESH_OUTCOMES.inc("standings", "manual_error")
             return {
                 "success": False,
                 "error": f"Database load failed: {str(e)}"
@@ -0,0 +1,206 @@
+"""
+Form and trend analytics over the stored fixture history.
+
+Every fixture is split into one row per side (the club's goals for and
+against, home or away), and the rows are sorted by club and date into flat
+NumPy arrays. Rolling-window aggregates over the last N matches come from
+cumulative sums: the sum over a window ending at row i is cs[i + 1] - cs[start],
+where the start is clamped to the club's first row, so every club and every
+window position is computed in one vectorized pass whatever the number of
+clubs and seasons loaded.
+
+The arrays are rebuilt only when the fixtures table changes (its version is
+the newest fixture id plus the row count), and results are cached per window.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from monitoring.metrics import ANALYTICS_QUERY_SECONDS
+from services.team_ratings import result_from_fixture
+
+logger = logging.getLogger(__name__)
+
+RESULT_LETTERS = np.array(["L", "D", "W"])
+FIXTURE_FIELDS = ["id", "fixture_date", "home_team", "away_team", "home_score", "away_score"]
+
+
+def _per_match(total: np.ndarray, matches: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(matches > 0, total / np.maximum(matches, 1), np.nan)
+
+
+def _round(values: np.ndarray, digits: int = 2) -> List[Any]:
+    rounded = np.round(values.astype(np.float64), digits)
+    return np.where(np.isnan(rounded), None, rounded).tolist()
+
+
+class ClubMatches:
+    """One row per club per match, sorted by club then date"""
+
+    def __init__(self, fixtures: List[Dict[str, Any]]):
+        results = [result for result in map(result_from_fixture, fixtures) if result is not None]
+        clubs = sorted({club for result in results for club in (result.home, result.away)})
+        self.clubs = clubs
+        self.index = {club: position for position, club in enumerate(clubs)}
+
+        home = np.fromiter((self.index[r.home] for r in results), dtype=np.intp, count=len(results))
+        away = np.fromiter((self.index[r.away] for r in results), dtype=np.intp, count=len(results))
+        home_goals = np.fromiter((r.home_goals for r in results), dtype=np.int64, count=len(results))
+        away_goals = np.fromiter((r.away_goals for r in results), dtype=np.int64, count=len(results))
+        dates = np.array([r.played_on for r in results], dtype="datetime64[D]")
+
+        club = np.concatenate([home, away])
+        order = np.lexsort((np.concatenate([dates, dates]), club))
+        self.club = club[order]
+        self.opponent = np.concatenate([away, home])[order]
+        self.dates = np.concatenate([dates, dates])[order]
+        self.is_home = np.concatenate([np.ones(len(results), bool), np.zeros(len(results), bool)])[order]
+        self.goals_for = np.concatenate([home_goals, away_goals])[order]
+        self.goals_against = np.concatenate([away_goals, home_goals])[order]
+        self.outcome = np.sign(self.goals_for - self.goals_against) + 1  # 0 loss, 1 draw, 2 win
+        self.points = np.array([0, 1, 3])[self.outcome]
+
+        # Row range of each club: starts[c]:ends[c]
+        counts = np.bincount(self.club, minlength=len(clubs))
+        self.ends = np.cumsum(counts)
+        self.starts = self.ends - counts
+        self.group_start = self.starts[self.club]
+
+    def __len__(self) -> int:
+        return len(self.club)
+
+    def rolling(self, values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(sum, number of matches) over each club's last `window` matches, at every row"""
+        cumulative = np.concatenate(([0], np.cumsum(values)))
+        rows = np.arange(len(values))
+        start = np.maximum(rows - window + 1, self.group_start)
+        return cumulative[rows + 1] - cumulative[start], rows + 1 - start
+
+    def split(self, values: np.ndarray) -> np.ndarray:
+        """Totals per club and venue: [club, 0 = away / 1 = home]"""
+        keys = self.club * 2 + self.is_home
+        return np.bincount(keys, weights=values, minlength=len(self.clubs) * 2).reshape(-1, 2)
+
+    def form_table(self, window: int) -> List[Dict[str, Any]]:
+        """Every club's latest form over `window` matches plus season totals and home/away split, best form first"""
+        last = self.ends - 1
+        window_points, window_matches = self.rolling(self.points, window)
+        window_for, _ = self.rolling(self.goals_for, window)
+        window_against, _ = self.rolling(self.goals_against, window)
+
+        matches = np.bincount(self.club, minlength=len(self.clubs))
+        points = np.bincount(self.club, weights=self.points, minlength=len(self.clubs))
+        venue_matches = self.split(np.ones(len(self)))
+        venue_points = self.split(self.points)
+        venue_for = self.split(self.goals_for)
+        venue_against = self.split(self.goals_against)
+        letters = RESULT_LETTERS[self.outcome]
+
+        rows = []
+        for club, name in enumerate(self.clubs):
+            end = last[club]
+            split = {}
+            for venue, key in ((1, "home"), (0, "away")):
+                split[key] = {
+                    "matches": int(venue_matches[club, venue]),
+                    "ppg": _round(_per_match(venue_points[club, venue], venue_matches[club, venue])),
+                    "goalsFor": int(venue_for[club, venue]),
+                    "goalsAgainst": int(venue_against[club, venue]),
+                }
+            rows.append({
+                "team": name,
+                "matches": int(matches[club]),
+                "points": int(points[club]),
+                "ppg": _round(_per_match(points[club], matches[club])),
+                "form": "".join(letters[max(end - window + 1, self.starts[club]):end + 1]),
+                "window": {
+                    "matches": int(window_matches[end]),
+                    "points": int(window_points[end]),
+                    "ppg": _round(_per_match(window_points[end], window_matches[end])),
+                    "goalsFor": int(window_for[end]),
+                    "goalsAgainst": int(window_against[end]),
+                    "goalDifference": int(window_for[end] - window_against[end]),
+                },
+                **split,
+            })
+        rows.sort(key=lambda row: (row["window"]["ppg"] or 0, row["window"]["goalDifference"]), reverse=True)
+        return rows
+
+    def club_series(self, club: int, window: int) -> Dict[str, Any]:
+        """One club's matches in date order with rolling points-per-game and goal difference (columnar)"""
+        rows = slice(self.starts[club], self.ends[club])
+        window_points, window_matches = self.rolling(self.points, window)
+        window_difference, _ = self.rolling(self.goals_for - self.goals_against, window)
+        return {
+            "dates": self.dates[rows].astype(str).tolist(),
+            "opponents": [self.clubs[opponent] for opponent in self.opponent[rows]],
+            "venues": np.where(self.is_home[rows], "home", "away").tolist(),
+            "results": RESULT_LETTERS[self.outcome[rows]].tolist(),
+            "goalsFor": self.goals_for[rows].tolist(),
+            "goalsAgainst": self.goals_against[rows].tolist(),
+            "points": self.points[rows].tolist(),
+            "cumulativePoints": np.cumsum(self.points[rows]).tolist(),
+            "rollingPpg": _round(_per_match(window_points[rows], window_matches[rows])),
+            "rollingGoalDifference": window_difference[rows].tolist(),
+        }
+
+
+class FormAnalyticsService:
+    """Form tables and trends from the fixtures table, rebuilt when it changes"""
+
+    def __init__(self, db_service):
+        self.db_service = db_service
+        self._version: Optional[Tuple[Any, Any]] = None
+        self._matches: Optional[ClubMatches] = None
+        self._tables: Dict[int, List[Dict[str, Any]]] = {}
+
+    async def _current_version(self) -> Tuple[Any, Any]:
+        """(newest fixture id, row count): every insert raises the id, every delete the count"""
+        result = await self.db_service.get_records(
+            "fixtures", limit=1, columns=["id"], order_by=["id.desc"], count="exact"
+        )
+        if not result["success"]:
+            raise RuntimeError(f"Could not read the fixtures version: {result.get('error')}")
+        newest = result["data"][0]["id"] if result["data"] else None
+        return newest, result.get("total")
+
+    async def get_matches(self) -> ClubMatches:
+        version = await self._current_version()
+        if self._matches is None or version != self._version:
+            fixtures = []
+            async for page in self.db_service.iter_records(
+                "fixtures",
+                filters={"fixture_date": ("not_is", None)},
+                columns=FIXTURE_FIELDS,
+                order_by=["fixture_date", "id"]
+            ):
+                fixtures.extend(page)
+            self._matches = ClubMatches(fixtures)
+            self._version = version
+            self._tables = {}
+            logger.info(f"📈 Rebuilt form arrays: {len(self._matches)} club matches, {len(self._matches.clubs)} clubs")
+        return self._matches
+
+    async def get_form_table(self, window: int = 5) -> Dict[str, Any]:
+        try:
+            matches = await self.get_matches()
+        except RuntimeError as error:
+            return {"success": False, "error": str(error)}
+        if window not in self._tables:
+            with ANALYTICS_QUERY_SECONDS.time("form_table"):
+                self._tables[window] = matches.form_table(window)
+        return {"success": True, "data": {"window": window, "table": self._tables[window]}}
+
+    async def get_team_form(self, team: str, window: int = 5) -> Dict[str, Any]:
+        try:
+            matches = await self.get_matches()
+        except RuntimeError as error:
+            return {"success": False, "error": str(error)}
+        if team not in matches.index:
+            return {"success": False, "not_found": True, "error": f"No stored fixtures for {team}"}
+        with ANALYTICS_QUERY_SECONDS.time("team_form"):
+            series = matches.club_series(matches.index[team], window)
+        return {"success": True, "data": {"team": team, "window": window, **series}}
@@ -0,0 +1,205 @@
+"""
+Opponent-keyed index over the stored fixture history.
+
+Every result is filed twice, once under each club, as club -> opponent ->
+matches in date order, and the W/D/L and goals record of each (club,
+opponent) pair is kept precomputed overall and per venue. "All matches vs
+Real Zaragoza" is two dict lookups; "record at home vs the top six" sums
+six precomputed records. New fixtures are folded in as the refresh stores
+them, each result exactly once.
+"""
+
+import logging
+from bisect import insort
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from monitoring.metrics import ANALYTICS_QUERY_SECONDS
+from services.team_ratings import Result, result_from_fixture
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_FIELDS = ["id", "fixture_date", "home_team", "away_team", "home_score", "away_score", "competition"]
+VENUES = ("home", "away")
+
+
+@dataclass
+class Record:
+    """W/D/L and goals over a set of matches"""
+
+    played: int = 0
+    won: int = 0
+    drawn: int = 0
+    lost: int = 0
+    goalsFor: int = 0
+    goalsAgainst: int = 0
+
+    def add(self, goals_for: int, goals_against: int):
+        self.played += 1
+        if goals_for > goals_against:
+            self.won += 1
+        elif goals_for == goals_against:
+            self.drawn += 1
+        else:
+            self.lost += 1
+        self.goalsFor += goals_for
+        self.goalsAgainst += goals_against
+
+    def merge(self, other: "Record"):
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "goalDifference": self.goalsFor - self.goalsAgainst,
+                "points": self.won * 3 + self.drawn}
+
+
+class OpponentIndex:
+    """club -> opponent -> matches, with the pair records kept up to date"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # club -> opponent -> [(date, venue, goals for, goals against, competition)] in date order
+        self.matches: Dict[str, Dict[str, List[Tuple[str, str, int, int, Optional[str]]]]] = {}
+        # (club, opponent) -> venue ("all", "home", "away") -> record
+        self.records: Dict[Tuple[str, str], Dict[str, Record]] = {}
+        self._applied: Set[Tuple[str, str, str]] = set()
+
+    def __len__(self) -> int:
+        return len(self._applied)
+
+    def apply(self, result: Result) -> bool:
+        """File one result under both clubs; False if it was already indexed"""
+        if result.key in self._applied:
+            return False
+        self._applied.add(result.key)
+        for club, opponent, venue, goals_for, goals_against in (
+            (result.home, result.away, "home", result.home_goals, result.away_goals),
+            (result.away, result.home, "away", result.away_goals, result.home_goals),
+        ):
+            insort(self.matches.setdefault(club, {}).setdefault(opponent, []),
+                   (result.played_on, venue, goals_for, goals_against, result.competition or ""))
+            records = self.records.setdefault((club, opponent), {"all": Record(), "home": Record(), "away": Record()})
+            records["all"].add(goals_for, goals_against)
+            records[venue].add(goals_for, goals_against)
+        return True
+
+    def apply_all(self, results: Iterable[Result]) -> int:
+        return sum(self.apply(result) for result in results)
+
+    def rebuild(self, results: Iterable[Result]) -> int:
+        self.reset()
+        return self.apply_all(results)
+
+    def head_to_head(self, club: str, opponent: str) -> Dict[str, Any]:
+        """Every match between two clubs from `club`'s side, newest first, with the pair's records"""
+        records = self.records.get((club, opponent))
+        matches = [
+            {
+                "date": played_on,
+                "venue": venue,
+                "goalsFor": goals_for,
+                "goalsAgainst": goals_against,
+                "result": "W" if goals_for > goals_against else "D" if goals_for == goals_against else "L",
+                "competition": competition or None,
+            }
+            for played_on, venue, goals_for, goals_against, competition
+            in reversed(self.matches.get(club, {}).get(opponent, []))
+        ]
+        return {
+            "team": club,
+            "opponent": opponent,
+            "record": {venue: record.to_dict() for venue, record in records.items()} if records else None,
+            "matches": matches,
+        }
+
+    def opponents(self, club: str, venue: str = "all", only: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """`club`'s record per opponent (optionally only some opponents) at a venue, plus their total"""
+        selected = set(only) if only is not None else None
+        total = Record()
+        rows = []
+        for opponent in self.matches.get(club, {}):
+            if selected is not None and opponent not in selected:
+                continue
+            record = self.records[(club, opponent)][venue]
+            if not record.played:
+                continue
+            total.merge(record)
+            rows.append({"opponent": opponent, **record.to_dict()})
+        rows.sort(key=lambda row: (-row["points"] / row["played"], row["opponent"]))
+        return {"team": club, "venue": venue, "total": total.to_dict(), "opponents": rows}
+
+
+class HeadToHeadService:
+    """Serves the opponent index from memory, fed by the fixture refresh and built lazily from the fixtures table"""
+
+    def __init__(self, db_service, scraper_service, index: Optional[OpponentIndex] = None):
+        self.db_service = db_service
+        self.scraper_service = scraper_service
+        self.index = index or OpponentIndex()
+        self._loaded = False
+
+    def record(self, fixtures: Iterable[Dict[str, Any]]) -> int:
+        """Index newly stored fixtures; before the first build they're left for the build to read"""
+        if not self._loaded:
+            return 0
+        applied = self.index.apply_all(result for result in map(result_from_fixture, fixtures) if result is not None)
+        if applied:
+            logger.info(f"🤝 Indexed {applied} new results by opponent")
+        return applied
+
+    def rebuild_from(self, fixtures: Iterable[Dict[str, Any]]) -> int:
+        applied = self.index.rebuild(result for result in map(result_from_fixture, fixtures) if result is not None)
+        self._loaded = True
+        logger.info(f"🤝 Rebuilt the opponent index from {applied} results")
+        return applied
+
+    async def _ensure_loaded(self) -> Optional[Dict[str, Any]]:
+        """None once the index is built, or the error result of reading the fixtures"""
+        if self._loaded:
+            return None
+        try:
+            fixtures = []
+            async for page in self.db_service.iter_records(
+                "fixtures",
+                filters={"fixture_date": ("not_is", None)},
+                columns=FIXTURE_FIELDS,
+                order_by=["fixture_date", "id"]
+            ):
+                fixtures.extend(page)
+        except RuntimeError as error:
+            return {"success": False, "error": str(error)}
+        self.rebuild_from(fixtures)
+        return None
+
+    async def get_head_to_head(self, team: str, opponent: str) -> Dict[str, Any]:
+        error = await self._ensure_loaded()
+        if error:
+            return error
+        with ANALYTICS_QUERY_SECONDS.time("head_to_head"):
+            data = self.index.head_to_head(team, opponent)
+        if data["record"] is None:
+            return {"success": False, "not_found": True, "error": f"No stored matches between {team} and {opponent}"}
+        return {"success": True, "data": data}
+
+    async def get_opponents(self, team: str, venue: str = "all", top: Optional[int] = None) -> Dict[str, Any]:
+        """`team`'s record per opponent; `top` keeps the clubs currently in the league table's top N"""
+        if venue not in ("all", *VENUES):
+            return {"success": False, "bad_request": True, "error": f"Unknown venue '{venue}' (all, home or away)"}
+        error = await self._ensure_loaded()
+        if error:
+            return error
+        if team not in self.index.matches:
+            return {"success": False, "not_found": True, "error": f"No stored matches for {team}"}
+
+        only = None
+        if top is not None:
+            season = await self.scraper_service.fetch_season_state()
+            if not season.get("table"):
+                return {"success": False, "error": "The league table is unavailable"}
+            only = [row["team"] for row in season["table"] if row["rank"] is not None and row["rank"] <= top]
+        with ANALYTICS_QUERY_SECONDS.time("opponent_records"):
+            data = self.index.opponents(team, venue, only)
+        return {"success": True, "data": {**data, "top": top, "opponentsFilter": only}}
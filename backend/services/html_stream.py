@@ -0,0 +1,167 @@
+"""
+Bounded, incremental download of FBref pages.
+
+The body is read in chunks with a hard byte cap, and each chunk is fed to a
+cheap byte-level scanner that notices when every table the extractors need
+has been closed, so the rest of the page (footer, dozens of commented-out
+stats tables) is never transferred. Everything before that point is kept, so
+the page text the league-position regexes search is unchanged.
+
+A downloaded page is kept as raw bytes plus its declared encoding
+(`PageSnapshot`) and handed to lxml as bytes, so the document is never
+materialized as a Python str; only the cell values the extractors read are.
+"""
+
+import codecs
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from lxml import html as lxml_html
+
+# FBref tables are never nested, so the first </table> after a table's id closes it
+_TABLE_END = b"</table>"
+# Longest id attribute a marker split across chunks is searched for
+_MAX_ID_LENGTH = 128
+
+# A table id, or (id, *id substrings) for a table whose real id varies (see TableSchema.alternates)
+TableId = Union[str, Tuple[str, ...]]
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_-]+)""", re.IGNORECASE)
+
+
+class ResponseTooLarge(Exception):
+    """The response body exceeded the configured byte cap"""
+
+
+def _id_marker(table_id: TableId) -> "re.Pattern[bytes]":
+    """The id attribute of the table: exactly `id`, or containing one of the substrings of a tuple"""
+    if isinstance(table_id, str):
+        table_id = (table_id,)
+    exact, fragments = re.escape(table_id[0].encode()), [re.escape(f.encode()) for f in table_id[1:]]
+    choices = [exact] + [rb"[^\"'<>]*" + fragment + rb"[^\"'<>]*" for fragment in fragments]
+    return re.compile(rb"""id=(["'])(?:""" + b"|".join(choices) + rb")\1")
+
+
+class TableScanner:
+    """
+    Incremental scan for the end of a set of tables, identified by id (or by
+    id substrings, see TableId).
+
+    Call `scan()` with the growing buffer after each chunk; only the newly
+    appended bytes (plus a small overlap for markers split across chunks)
+    are searched.
+    """
+
+    def __init__(self, table_ids: Iterable[TableId]):
+        self._markers = {table_id: _id_marker(table_id) for table_id in table_ids}
+        # table id -> offset of its id attribute once seen
+        self._starts: Dict[TableId, Optional[int]] = {table_id: None for table_id in self._markers}
+        self._overlap = _MAX_ID_LENGTH
+        self._scanned = 0
+
+    @property
+    def complete(self) -> bool:
+        return not self._starts
+
+    def scan(self, buffer: bytes) -> bool:
+        """Return True once every table has been opened and closed within `buffer`"""
+        search_from = max(self._scanned - self._overlap, 0)
+        for table_id in list(self._starts):
+            start = self._starts[table_id]
+            if start is None:
+                found = self._markers[table_id].search(buffer, search_from)
+                if not found:
+                    continue
+                start = self._starts[table_id] = found.start()
+            if buffer.find(_TABLE_END, max(start, search_from)) >= 0:
+                del self._starts[table_id]
+        self._scanned = len(buffer)
+        return self.complete
+
+
+def read_body(response, max_bytes: int, chunk_size: int, scanner: Optional[TableScanner] = None) -> Tuple[bytes, bool]:
+    """
+    Read a streamed `requests` response.
+
+    Returns (body, stopped_early). Raises ResponseTooLarge as soon as more
+    than `max_bytes` (after content decoding) have arrived. The caller is
+    responsible for closing the response, which drops the connection when
+    reading stopped early.
+    """
+    declared = response.headers.get("Content-Length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise ResponseTooLarge(f"Content-Length {declared} exceeds the {max_bytes} byte cap")
+
+    buffer = bytearray()
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            raise ResponseTooLarge(f"Body exceeds the {max_bytes} byte cap")
+        if scanner is not None and scanner.scan(buffer):
+            return bytes(buffer), True
+    return bytes(buffer), False
+
+
+def declared_encoding(content_type: Optional[str], body: bytes, default: str = "utf-8") -> str:
+    """
+    Encoding from the Content-Type charset, else a <meta charset> near the top
+    of the document, else `default`. Never guesses from the content.
+    """
+    candidates = []
+    if content_type:
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "charset":
+                candidates.append(value.strip("\"' "))
+    match = _META_CHARSET.search(body[:4096])
+    if match:
+        candidates.append(match.group(1).decode("ascii"))
+    for candidate in candidates:
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return default
+
+
+def make_tree(markup, encoding: Optional[str] = None) -> lxml_html.HtmlElement:
+    """
+    Parse a page with lxml. Bytes are decoded by libxml2 using `encoding`
+    (UTF-8 if None), str is accepted for callers that already have text.
+    """
+    if isinstance(markup, (bytes, bytearray)):
+        parser = lxml_html.HTMLParser(encoding=encoding or "utf-8")
+        return lxml_html.document_fromstring(bytes(markup), parser=parser)
+    return lxml_html.document_fromstring(markup)
+
+
+@dataclass
+class PageSnapshot:
+    """One downloaded FBref page, shared by every extractor until it expires"""
+
+    body: bytes
+    encoding: str
+    fetched_at: float = field(default_factory=time.time)
+    stopped_early: bool = False
+    _tree: Optional[lxml_html.HtmlElement] = field(default=None, repr=False, compare=False)
+    _extracted: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    def tree(self) -> lxml_html.HtmlElement:
+        """The parsed page, built on first use"""
+        if self._tree is None:
+            self._tree = make_tree(self.body, self.encoding)
+        return self._tree
+
+    def extracted(self, key: str, extract: Callable[[], Any]) -> Any:
+        """`extract()` computed once per snapshot and shared (callers must not mutate it)"""
+        if key not in self._extracted:
+            self._extracted[key] = extract()
+        return self._extracted[key]
+
+    def covers(self, tables: Iterable[TableId]) -> bool:
+        """Whether the body holds every table in `tables` that the page has (a full body always does)"""
+        return not self.stopped_early or TableScanner(tables).scan(self.body)
+
+    def age_ms(self) -> float:
+        return (time.time() - self.fetched_at) * 1000
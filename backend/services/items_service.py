@@ -1,11 +1,15 @@
 import logging
 from typing import List, Optional, Dict, Any
 from services.db_service import DatabaseService
+from services.pagination import encode_cursor
 from models.item import Item, ItemCreate, ItemUpdate
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Columns backing the Item model - everything else stays in the database
+ITEM_COLUMNS = ["id", "name", "price", "is_offer"]
+
 class ItemsService:
     def __init__(self, db_service: DatabaseService):
         self.db_service = db_service
@@ -42,27 +46,53 @@ class ItemsService:
             logger.exception(f"Error getting item {item_id}")
             return {"success": False, "error": str(e)}
     
-    async def get_items(self, skip: int = 0, limit: int = 100) -> Dict[str, Any]:
-        """Get all items with pagination"""
+    async def get_items(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get all items with pagination.
+        
+        Uses keyset pagination on id (pass the previous page's next_cursor);
+        a non-zero skip without a cursor falls back to offset pagination.
+        """
         try:
-            result = await self.db_service.get_records(
-                self.table_name, 
-                skip=skip, 
-                limit=limit
-            )
+            if skip and cursor is None:
+                result = await self.db_service.get_records(
+                    self.table_name, 
+                    skip=skip, 
+                    limit=limit,
+                    columns=ITEM_COLUMNS,
+                    order_by=["id"],
+                    count="exact"
+                )
+                if result["success"]:
+                    full_page = len(result["data"]) == limit
+                    result["next_cursor"] = encode_cursor(["id"], result["data"][-1]) if full_page else None
+            else:
+                result = await self.db_service.get_page(
+                    self.table_name,
+                    order_by=["id"],
+                    cursor=cursor,
+                    limit=limit,
+                    columns=ITEM_COLUMNS,
+                    # Total only on the first page - later pages reuse the client's copy
+                    count="exact" if cursor is None else None
+                )
             
             if result["success"]:
                 items = [Item(**item) for item in result["data"]]
-                logger.info(f"Retrieved {len(items)} items (skip={skip}, limit={limit})")
+                logger.info(f"Retrieved {len(items)} items (skip={skip}, limit={limit}, cursor={cursor is not None})")
                 return {
                     "success": True, 
                     "data": items, 
                     "count": result["count"],
+                    "total": result.get("total"),
                     "skip": skip,
-                    "limit": limit
+                    "limit": limit,
+                    "next_cursor": result["next_cursor"]
                 }
             else:
                 return {"success": False, "error": result.get("error", "Failed to retrieve items")}
+        except ValueError as e:
+            return {"success": False, "error": str(e), "bad_request": True}
         except Exception as e:
             logger.exception("Error in get_items")
             return {"success": False, "error": str(e)}
@@ -76,7 +106,12 @@ class ItemsService:
                 # Use ilike for case-insensitive partial matching
                 filters = {"name": ("ilike", f"%{name}%")}
             
-            result = await self.db_service.get_records(self.table_name, filters=filters)
+            result = await self.db_service.get_records(
+                self.table_name,
+                filters=filters,
+                columns=ITEM_COLUMNS,
+                order_by=["id"]
+            )
             
             if result["success"]:
                 items = [Item(**item) for item in result["data"]]
@@ -129,7 +164,9 @@ class ItemsService:
                 self.table_name, 
                 filters={"is_offer": True},
                 skip=skip,
-                limit=limit
+                limit=limit,
+                columns=ITEM_COLUMNS,
+                order_by=["id"]
             )
             
             if result["success"]:
@@ -152,7 +189,9 @@ class ItemsService:
                 self.table_name, 
                 filters=filters,
                 skip=skip,
-                limit=limit
+                limit=limit,
+                columns=ITEM_COLUMNS,
+                order_by=["id"]
             )
             
             if result["success"]:
@@ -168,24 +207,22 @@ class ItemsService:
     async def get_items_by_price_range(self, min_price: float, max_price: float, skip: int = 0, limit: int = 100) -> Dict[str, Any]:
         """Get items within a price range"""
         try:
-            # Use gte and lte for range filtering
+            # Both bounds are applied by the database, so skip/limit page over matching rows only
             filters = {
-                "price": ("gte", min_price),
-                # Note: For multiple conditions on the same field, you might need to modify the db_service
-                # This is a simplified version - in practice, you'd want to handle multiple conditions better
+                "price": [("gte", min_price), ("lte", max_price)],
             }
             
             result = await self.db_service.get_records(
                 self.table_name, 
                 filters=filters,
                 skip=skip,
-                limit=limit
+                limit=limit,
+                columns=ITEM_COLUMNS,
+                order_by=["price", "id"]
             )
             
             if result["success"]:
-                # Filter max price in Python for now (could be improved at DB level)
-                filtered_items = [item for item in result["data"] if item.get("price", 0) <= max_price]
-                items = [Item(**item) for item in filtered_items]
+                items = [Item(**item) for item in result["data"]]
                 logger.info(f"Found {len(items)} items in price range ${min_price}-${max_price}")
                 return {"success": True, "data": items, "count": len(items)}
             else:
@@ -0,0 +1,156 @@
+"""
+Top-k player leaderboards across every scraped squad.
+
+Like the similarity index, the leaderboards are split into segments, one
+per squad, so a squad refresh replaces only its own segment. Within a
+segment each leaderboard (a stat, raw or per 90, under a position / age
+band filter) is sorted once, the first time it is asked for, and kept until
+the squad's store changes. A query merges the per-squad sorted lists with a
+heap (heapq.merge) and stops after offset + limit entries, so serving a page
+costs O((offset + k) log squads) whatever the number of players.
+"""
+
+import heapq
+import logging
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from monitoring.metrics import ANALYTICS_QUERY_SECONDS
+from services.player_stats import PlayerStatsStore, is_total
+
+logger = logging.getLogger(__name__)
+
+POSITIONS = ("GK", "DF", "MF", "FW")
+# Age bands, by age in years at scrape time: [low, high)
+AGE_BANDS: Dict[str, Tuple[int, int]] = {
+    "u21": (0, 21),
+    "u23": (0, 23),
+    "23-29": (23, 30),
+    "30+": (30, 200),
+}
+VALUES = ("total", "per90")
+# Sorted leaderboards kept per segment (keys include the free-form min_90s threshold)
+BOARD_CACHE_SIZE = 256
+
+# (stat, total / per90, position, age band, minimum 90s)
+BoardKey = Tuple[str, str, Optional[str], Optional[str], float]
+# Sort key first: (-value, name, player id, value, squad)
+Entry = Tuple[float, str, str, float, str]
+
+
+@dataclass
+class _Segment:
+    store: PlayerStatsStore
+    boards: Dict[BoardKey, List[Entry]] = field(default_factory=dict)
+
+
+class LeaderboardIndex:
+    """Per-squad sorted leaderboards, merged across squads on query"""
+
+    def __init__(self):
+        self._segments: Dict[str, _Segment] = {}
+
+    def __len__(self) -> int:
+        return sum(len(segment.store) for segment in self._segments.values())
+
+    def version(self, segment: str) -> Optional[int]:
+        return self._segments[segment].store.version if segment in self._segments else None
+
+    def update_segment(self, segment: str, store: PlayerStatsStore) -> None:
+        """Replace one squad's players; its leaderboards are re-sorted on their next query"""
+        self._segments[segment] = _Segment(store)
+        logger.info(f"🏅 Leaderboard segment '{segment}': {len(store)} players")
+
+    def has_stat(self, stat: str) -> bool:
+        return any(stat in segment.store.columns for segment in self._segments.values())
+
+    @staticmethod
+    def _build(squad: str, store: PlayerStatsStore, key: BoardKey) -> List[Entry]:
+        stat, value, position, band, min_90s = key
+        if stat not in store.columns:
+            return []
+        values = store.derived()["per90"][stat] if value == "per90" else store.column_values(stat)
+        keep = ~np.isnan(values)
+        if min_90s and "minutes_90s" in store.columns:
+            keep &= np.nan_to_num(store.column_values("minutes_90s")) >= min_90s
+        if position:
+            keep &= np.array([position in codes.split(",") for codes in store.positions], dtype=bool)
+        if band:
+            low, high = AGE_BANDS[band]
+            keep &= (store.ages >= low) & (store.ages < high)
+        # Highest first, ties by name
+        return sorted(
+            (-float(values[row]), store.names[row], store.player_ids[row], float(values[row]), squad)
+            for row in np.flatnonzero(keep).tolist()
+        )
+
+    def _board(self, squad: str, segment: _Segment, key: BoardKey) -> List[Entry]:
+        if key not in segment.boards:
+            if len(segment.boards) >= BOARD_CACHE_SIZE:
+                # Oldest board first (dicts keep insertion order)
+                del segment.boards[next(iter(segment.boards))]
+            segment.boards[key] = self._build(squad, segment.store, key)
+        return segment.boards[key]
+
+    def top(self, key: BoardKey, offset: int = 0, limit: int = 20) -> Tuple[List[Dict[str, Any]], int]:
+        """One page of the merged leaderboard and the number of ranked players"""
+        boards = [self._board(squad, segment, key) for squad, segment in self._segments.items()]
+        page = islice(heapq.merge(*boards), offset, offset + limit)
+        rows = [
+            {"rank": rank, "id": player_id, "name": name, "squad": squad, "value": round(value, 4)}
+            for rank, (_, name, player_id, value, squad) in enumerate(page, start=offset + 1)
+        ]
+        return rows, sum(len(board) for board in boards)
+
+
+class LeaderboardService:
+    """Keeps the leaderboards in step with the player stats store of each squad"""
+
+    def __init__(self, player_stats_service, index: Optional[LeaderboardIndex] = None):
+        self.player_stats = player_stats_service
+        self.index = index or LeaderboardIndex()
+        self.squad = player_stats_service.scraper_service.team_id
+
+    async def refresh(self) -> bool:
+        """Re-index this squad when its store was rebuilt; False when no stats are available"""
+        store = await self.player_stats.get_store()
+        if store is None:
+            return False
+        if self.index.version(self.squad) != store.version:
+            self.index.update_segment(self.squad, store)
+        return True
+
+    async def get_leaderboard(self, stat: str, value: str = "total", position: Optional[str] = None,
+                              age_band: Optional[str] = None, min_90s: float = 0.0,
+                              offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        if value not in VALUES:
+            return {"success": False, "bad_request": True, "error": f"Unknown value '{value}' (total or per90)"}
+        if position is not None and position not in POSITIONS:
+            return {"success": False, "bad_request": True, "error": f"Unknown position '{position}' ({', '.join(POSITIONS)})"}
+        if age_band is not None and age_band not in AGE_BANDS:
+            return {"success": False, "bad_request": True, "error": f"Unknown age band '{age_band}' ({', '.join(AGE_BANDS)})"}
+        if not await self.refresh():
+            return {"success": False, "error": "Player stats are unavailable"}
+        if not self.index.has_stat(stat):
+            return {"success": False, "bad_request": True, "error": f"Unknown stat '{stat}'"}
+        if value == "per90" and not is_total(stat):
+            return {"success": False, "bad_request": True, "error": f"'{stat}' is not a total, so has no per-90 value"}
+
+        with ANALYTICS_QUERY_SECONDS.time("leaderboard"):
+            rows, total = self.index.top((stat, value, position, age_band, min_90s), offset, limit)
+        return {
+            "success": True,
+            "data": {
+                "stat": stat,
+                "value": value,
+                "position": position,
+                "ageBand": age_band,
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+                "leaders": rows,
+            },
+        }
@@ -0,0 +1,85 @@
+"""
+Keyset (cursor) pagination helpers shared by the database backends.
+
+A page is defined by its sort keys (e.g. ``["fixture_date.desc", "id.desc"]``)
+and the key values of the last row the client has seen. The next page is
+"rows strictly after those values in sort order", which the database answers
+from the index regardless of how deep the client has paged, and which doesn't
+shift when rows are inserted or deleted elsewhere in the table.
+
+The sort keys must be non-null and end with a unique column (normally ``id``).
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from services.query import parse_order
+
+
+def encode_cursor(order_by: Sequence[str], row: Dict[str, Any]) -> str:
+    """Build an opaque cursor pointing just after `row`"""
+    values = []
+    for column, _ in parse_order(order_by):
+        value = row[column]
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        values.append(value)
+    payload = json.dumps({"o": ",".join(order_by), "k": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _payload(cursor: str) -> Dict[str, Any]:
+    """The {"o": sort keys, "k": key values} behind a cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict) or not isinstance(payload.get("o"), str) or not isinstance(payload.get("k"), list):
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+def cursor_order(cursor: Optional[str]) -> Optional[List[str]]:
+    """The sort keys a cursor was issued for (None without a cursor), for listings made of several keysets"""
+    if not cursor:
+        return None
+    return _payload(cursor)["o"].split(",")
+
+
+def decode_cursor(order_by: Sequence[str], cursor: Optional[str]) -> Optional[List[Any]]:
+    """Return the key values stored in a cursor, or raise ValueError if it is invalid"""
+    if not cursor:
+        return None
+    payload = _payload(cursor)
+    values = payload["k"]
+    if payload["o"] != ",".join(order_by) or len(values) != len(order_by):
+        raise ValueError("Cursor does not belong to this listing")
+    return values
+
+
+def keyset_terms(order_by: Sequence[str], values: Sequence[Any]) -> List[List[Tuple[str, str, Any]]]:
+    """
+    Expand "after (v1, v2, ...)" into OR-ed terms of AND-ed predicates:
+
+        (a > v1) OR (a = v1 AND b > v2) OR ...
+
+    using lt instead of gt for descending keys.
+    """
+    orders = parse_order(order_by)
+    terms = []
+    for i, (column, descending) in enumerate(orders):
+        term = [(orders[j][0], "eq", values[j]) for j in range(i)]
+        term.append((column, "lt" if descending else "gt", values[i]))
+        terms.append(term)
+    return terms
+
+
+def page_result(rows: List[Dict[str, Any]], order_by: Sequence[str], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Trim the look-ahead row (fetched as limit + 1) and build the next cursor"""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(order_by, rows[-1])
+    return rows, None
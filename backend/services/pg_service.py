@@ -0,0 +1,420 @@
+import asyncio
+import json
+import logging
+import re
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, List, Optional, Any
+
+import asyncpg
+
+from config import settings
+from monitoring.metrics import timed_db_call
+from services.query import Filters, normalize_filters, parse_order, check_count
+from services.pagination import decode_cursor, keyset_terms, page_result
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Supabase filter operators -> SQL comparison operators
+_OPERATORS = {
+    "eq": "=",
+    "neq": "<>",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+    "like": "LIKE",
+    "ilike": "ILIKE",
+}
+
+_IS_VALUES = {None: "NULL", True: "TRUE", False: "FALSE"}
+
+
+def _quote_ident(name: str) -> str:
+    """Quote a table/column name, rejecting anything that isn't a plain identifier"""
+    if not _IDENTIFIER_RE.match(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return f'"{name}"'
+
+
+class PostgresDatabaseService:
+    """
+    Native async Postgres access through an asyncpg connection pool.
+
+    Drop-in replacement for DatabaseService: same methods, same result dicts.
+    Queries go straight to Postgres without a thread hop, and asyncpg keeps
+    a per-connection cache of prepared statements so repeated queries skip
+    the parse/plan step.
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        statement_cache_size: Optional[int] = None,
+        command_timeout: Optional[float] = None
+    ):
+        self.dsn = dsn or settings.database_url
+        self.min_size = min_size if min_size is not None else settings.db_pool_min_size
+        self.max_size = max_size if max_size is not None else settings.db_pool_max_size
+        self.statement_cache_size = (
+            statement_cache_size if statement_cache_size is not None else settings.db_statement_cache_size
+        )
+        self.command_timeout = command_timeout if command_timeout is not None else settings.db_command_timeout
+
+        self._pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
+        # Column name -> Postgres type name, per table (used to coerce ISO strings)
+        self._column_types: Dict[str, Dict[str, str]] = {}
+
+    async def connect(self) -> asyncpg.Pool:
+        """Create the connection pool on first use"""
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        dsn=self.dsn,
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        statement_cache_size=self.statement_cache_size,
+                        command_timeout=self.command_timeout,
+                    )
+                    logger.info(f"Postgres pool ready (min={self.min_size}, max={self.max_size})")
+        return self._pool
+
+    async def close(self):
+        """Close all pooled connections"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+            logger.info("Postgres pool closed")
+
+    async def _fetch(self, sql: str, *args) -> List[Dict[str, Any]]:
+        """Run a query on a pooled connection and return rows as dicts"""
+        pool = await self.connect()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(sql, *args)
+        return [dict(row) for row in rows]
+
+    async def _get_column_types(self, table: str) -> Dict[str, str]:
+        """Look up (and cache) the column types of a table"""
+        if table not in self._column_types:
+            rows = await self._fetch(
+                "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = $1",
+                table
+            )
+            self._column_types[table] = {row["column_name"]: row["data_type"] for row in rows}
+        return self._column_types[table]
+
+    async def _coerce(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert ISO date strings to date/datetime objects.
+
+        Callers build payloads for the Supabase REST API, which takes dates as
+        strings; asyncpg's binary protocol needs the real Python types.
+        """
+        column_types = await self._get_column_types(table)
+        return {key: _coerce_value(column_types.get(key, ""), value) for key, value in data.items()}
+
+    async def _build_where(self, table: str, filters: Optional[Filters], args: List[Any]) -> str:
+        """Translate the filter spec into a WHERE clause, appending bind values to args"""
+        predicates = normalize_filters(filters)
+        if not predicates:
+            return ""
+
+        column_types = await self._get_column_types(table)
+        conditions = []
+        for column, operator, value in predicates:
+            quoted = _quote_ident(column)
+            data_type = column_types.get(column, "")
+
+            if operator == "is":
+                conditions.append(f"{quoted} IS {_IS_VALUES[value]}")
+            elif operator == "not_is":
+                conditions.append(f"{quoted} IS NOT {_IS_VALUES[value]}")
+            elif operator == "in":
+                args.append([_coerce_value(data_type, item) for item in value])
+                conditions.append(f"{quoted} = ANY(${len(args)})")
+            else:
+                args.append(_coerce_value(data_type, value))
+                conditions.append(f"{quoted} {_OPERATORS[operator]} ${len(args)}")
+
+        return " WHERE " + " AND ".join(conditions)
+
+    async def _build_keyset(self, table: str, order_by: List[str], values: List[Any], args: List[Any]) -> str:
+        """SQL for "rows after `values` in sort order", appending bind values to args"""
+        column_types = await self._get_column_types(table)
+        orders = parse_order(order_by)
+        values = [_coerce_value(column_types.get(column, ""), value) for (column, _), value in zip(orders, values)]
+
+        directions = {descending for _, descending in orders}
+        if len(directions) == 1:
+            # Uniform direction: a row comparison the planner can answer with one index range scan
+            columns = ", ".join(_quote_ident(column) for column, _ in orders)
+            placeholders = []
+            for value in values:
+                args.append(value)
+                placeholders.append(f"${len(args)}")
+            operator = "<" if directions.pop() else ">"
+            return f"({columns}) {operator} ({', '.join(placeholders)})"
+
+        terms = []
+        for term in keyset_terms(order_by, values):
+            parts = []
+            for column, operator, value in term:
+                args.append(value)
+                parts.append(f"{_quote_ident(column)} {_OPERATORS[operator]} ${len(args)}")
+            terms.append("(" + " AND ".join(parts) + ")")
+        return "(" + " OR ".join(terms) + ")"
+
+    async def _count(self, table: str, where: str, args: List[Any], method: str) -> int:
+        """Exact count, or the planner's row estimate (no table scan)"""
+        if method == "exact":
+            rows = await self._fetch(f"SELECT count(*) AS total FROM {_quote_ident(table)}{where}", *args)
+            return rows[0]["total"]
+
+        rows = await self._fetch(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {_quote_ident(table)}{where}", *args)
+        plan = rows[0]["QUERY PLAN"]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @timed_db_call
+    async def create_record(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new record in the specified table"""
+        try:
+            data = await self._coerce(table, data)
+            columns = ", ".join(_quote_ident(key) for key in data)
+            placeholders = ", ".join(f"${i}" for i in range(1, len(data) + 1))
+            sql = f"INSERT INTO {_quote_ident(table)} ({columns}) VALUES ({placeholders}) RETURNING *"
+
+            rows = await self._fetch(sql, *data.values())
+            result = rows[0] if rows else None
+            if result:
+                logger.info(f"Created record in {table} with ID: {result.get('id', 'unknown')}")
+                return {"success": True, "data": result}
+            else:
+                logger.warning(f"Failed to create record in {table} - no data returned")
+                return {"success": False, "error": "No data returned from insert"}
+        except Exception as e:
+            logger.exception(f"Error creating record in {table}")
+            return {"success": False, "error": str(e)}
+
+    @timed_db_call
+    async def get_record(self, table: str, record_id: int) -> Dict[str, Any]:
+        """Get a single record by ID"""
+        try:
+            rows = await self._fetch(f"SELECT * FROM {_quote_ident(table)} WHERE id = $1", record_id)
+            if rows:
+                return {"success": True, "data": rows[0]}
+            else:
+                return {"success": False, "error": "Record not found"}
+        except Exception as e:
+            logger.exception(f"Error getting record from {table}")
+            return {"success": False, "error": str(e)}
+
+    @timed_db_call
+    async def get_records(
+        self,
+        table: str,
+        filters: Optional[Filters] = None,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None,
+        count: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get multiple records with optional filters, projection, ordering and pagination"""
+        try:
+            count_method = check_count(count)
+            select_columns = ", ".join(_quote_ident(column) for column in columns) if columns else "*"
+            order_clause = ", ".join(
+                f"{_quote_ident(column)} {'DESC' if descending else 'ASC'}"
+                for column, descending in parse_order(order_by)
+            )
+
+            args: List[Any] = []
+            where = await self._build_where(table, filters, args)
+            filter_args = list(args)
+            args.extend([skip, limit])
+            sql = (
+                f"SELECT {select_columns} FROM {_quote_ident(table)}{where}"
+                f"{' ORDER BY ' + order_clause if order_clause else ''} "
+                f"OFFSET ${len(args) - 1} LIMIT ${len(args)}"
+            )
+
+            if count_method:
+                results, total = await asyncio.gather(
+                    self._fetch(sql, *args),
+                    self._count(table, where, filter_args, count_method)
+                )
+            else:
+                results = await self._fetch(sql, *args)
+
+            logger.info(f"Retrieved {len(results)} records from {table}")
+            result = {"success": True, "data": results, "count": len(results)}
+            if count_method:
+                result["total"] = total
+            return result
+        except Exception as e:
+            logger.exception(f"Error getting records from {table}")
+            return {"success": False, "error": str(e), "data": []}
+
+    @timed_db_call
+    async def get_page(
+        self,
+        table: str,
+        order_by: List[str],
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[Filters] = None,
+        columns: Optional[List[str]] = None,
+        count: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one page of records using keyset (cursor) pagination.
+
+        Returns the page plus `next_cursor` (None on the last page). An invalid
+        cursor raises ValueError so controllers can answer 400.
+        """
+        after = decode_cursor(order_by, cursor)
+        try:
+            orders = parse_order(order_by)
+            count_method = check_count(count)
+            if columns:
+                # The cursor is built from the sort keys, so they must be selected
+                columns = list(columns) + [c for c, _ in orders if c not in columns]
+            select_columns = ", ".join(_quote_ident(column) for column in columns) if columns else "*"
+            order_clause = ", ".join(
+                f"{_quote_ident(column)} {'DESC' if descending else 'ASC'}" for column, descending in orders
+            )
+
+            args: List[Any] = []
+            where = await self._build_where(table, filters, args)
+            filter_where, filter_args = where, list(args)
+            if after is not None:
+                keyset = await self._build_keyset(table, order_by, after, args)
+                where = f"{where} AND {keyset}" if where else f" WHERE {keyset}"
+            args.append(limit + 1)
+            sql = (
+                f"SELECT {select_columns} FROM {_quote_ident(table)}{where} "
+                f"ORDER BY {order_clause} LIMIT ${len(args)}"
+            )
+
+            if count_method:
+                rows, total = await asyncio.gather(
+                    self._fetch(sql, *args),
+                    self._count(table, filter_where, filter_args, count_method)
+                )
+            else:
+                rows = await self._fetch(sql, *args)
+
+            rows, next_cursor = page_result(rows, order_by, limit)
+            logger.info(f"Retrieved page of {len(rows)} records from {table}")
+            result = {"success": True, "data": rows, "count": len(rows), "next_cursor": next_cursor}
+            if count_method:
+                result["total"] = total
+            return result
+        except Exception as e:
+            logger.exception(f"Error getting page from {table}")
+            return {"success": False, "error": str(e), "data": [], "next_cursor": None}
+
+    async def iter_records(
+        self,
+        table: str,
+        page_size: int = 500,
+        filters: Optional[Filters] = None,
+        columns: Optional[List[str]] = None,
+        order_by: Optional[List[str]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream a whole table as fixed-size pages.
+
+        Only one page is held at a time, so memory stays constant however big
+        the table is. Raises RuntimeError if a page can't be fetched, so an
+        export never silently stops half way.
+        """
+        order_by = order_by or ["id"]
+        cursor = None
+        while True:
+            page = await self.get_page(
+                table, order_by, cursor=cursor, limit=page_size, filters=filters, columns=columns
+            )
+            if not page["success"]:
+                raise RuntimeError(f"Failed to stream {table}: {page['error']}")
+            if page["data"]:
+                yield page["data"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+    @timed_db_call
+    async def update_record(self, table: str, record_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update a record by ID"""
+        try:
+            data = await self._coerce(table, data)
+            assignments = ", ".join(
+                f"{_quote_ident(key)} = ${i}" for i, key in enumerate(data, start=1)
+            )
+            sql = (
+                f"UPDATE {_quote_ident(table)} SET {assignments} "
+                f"WHERE id = ${len(data) + 1} RETURNING *"
+            )
+
+            rows = await self._fetch(sql, *data.values(), record_id)
+            if rows:
+                logger.info(f"Updated record {record_id} in {table}")
+                return {"success": True, "data": rows[0]}
+            else:
+                logger.warning(f"Failed to update record {record_id} in {table} - no data returned")
+                return {"success": False, "error": "Record not found or no changes made"}
+        except Exception as e:
+            logger.exception(f"Error updating record in {table}")
+            return {"success": False, "error": str(e)}
+
+    @timed_db_call
+    async def delete_record(self, table: str, record_id: int) -> Dict[str, Any]:
+        """Delete a record by ID"""
+        try:
+            rows = await self._fetch(f"DELETE FROM {_quote_ident(table)} WHERE id = $1 RETURNING id", record_id)
+            if rows:
+                logger.info(f"Deleted record {record_id} from {table}")
+                return {"success": True, "deleted": len(rows)}
+            else:
+                logger.warning(f"Failed to delete record {record_id} from {table} - record not found")
+                return {"success": False, "error": "Record not found"}
+        except Exception as e:
+            logger.exception(f"Error deleting record from {table}")
+            return {"success": False, "error": str(e)}
+
+    @timed_db_call
+    async def delete_records(self, table: str, filters: Filters) -> Dict[str, Any]:
+        """Delete every record matching the filters in a single statement"""
+        try:
+            args: List[Any] = []
+            where = await self._build_where(table, filters, args)
+            if not where:
+                return {"success": False, "error": "Refusing to delete without filters"}
+
+            pool = await self.connect()
+            async with pool.acquire() as conn:
+                status = await conn.execute(f"DELETE FROM {_quote_ident(table)}{where}", *args)
+            deleted = int(status.split()[-1])
+            logger.info(f"Deleted {deleted} records from {table}")
+            return {"success": True, "deleted": deleted}
+        except Exception as e:
+            logger.exception(f"Error deleting records from {table}")
+            return {"success": False, "error": str(e)}
+
+
+def _coerce_value(data_type: str, value: Any) -> Any:
+    """Parse an ISO string for date/timestamp columns, pass anything else through"""
+    if isinstance(value, str):
+        if data_type == "date":
+            return date.fromisoformat(value[:10])
+        if data_type.startswith("timestamp"):
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value
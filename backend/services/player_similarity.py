@@ -0,0 +1,194 @@
+"""
+"Players most like X": nearest-neighbour search over normalized stat vectors.
+
+Each player becomes one vector of per-90 totals and rate stats taken from the
+columnar store (services/player_stats.py). Vectors are z-scored per feature
+across every indexed player (missing values land on the mean) and scaled to
+unit length, so cosine similarity is a single matrix-vector product.
+
+The index is split into segments, one per scraped squad. A squad refresh
+replaces only its own segment's raw vectors; the normalized matrix is
+re-stacked lazily on the next query. Neighbour search goes through a backend
+object (`build(matrix)` / `query(vector, k)`), brute force by default, so an
+approximate index can be swapped in once the player pool outgrows it.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from monitoring.metrics import ANALYTICS_QUERY_SECONDS
+from services.player_stats import PlayerStatsStore, is_total
+
+logger = logging.getLogger(__name__)
+
+# Rate stats compared as they are; every total is compared per 90 minutes
+_RATE_STATS = ("average_shot_distance", "goals_per_shot", "goals_per_shot_on_target", "npxg_per_shot")
+
+# Players with fewer 90-minute units have per-90 values too noisy to compare
+DEFAULT_MIN_90S = 2.0
+
+
+def player_features(store: PlayerStatsStore) -> Tuple[List[str], np.ndarray]:
+    """(feature names, players x features matrix) with NaN where a stat doesn't apply"""
+    per90 = store.derived()["per90"]
+    names = [f"{stat}_per90" for stat in per90]
+    columns = list(per90.values())
+    for stat in store.columns:
+        if not is_total(stat) and (stat.endswith("_pct") or stat in _RATE_STATS):
+            names.append(stat)
+            columns.append(store.column_values(stat))
+    matrix = np.column_stack(columns) if columns else np.empty((len(store), 0))
+    return names, matrix
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """Z-score each column (NaN becomes the column mean, constant columns drop out), then unit-length rows"""
+    with np.errstate(invalid="ignore"):
+        means = np.nanmean(matrix, axis=0) if len(matrix) else np.zeros(matrix.shape[1])
+        stds = np.nanstd(matrix, axis=0) if len(matrix) else np.zeros(matrix.shape[1])
+    means = np.nan_to_num(means)
+    stds = np.where(np.nan_to_num(stds) > 0, stds, np.inf)
+    scaled = np.nan_to_num((matrix - means) / stds)
+    norms = np.linalg.norm(scaled, axis=1, keepdims=True)
+    return scaled / np.where(norms > 0, norms, 1.0)
+
+
+class BruteForceBackend:
+    """Exact cosine search: one matrix-vector product and a partial sort"""
+
+    def build(self, matrix: np.ndarray) -> None:
+        self.matrix = matrix
+
+    def query(self, vector: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions and scores of the k rows most similar to `vector`, best first"""
+        scores = self.matrix @ vector
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return top, scores[top]
+
+
+@dataclass
+class _Segment:
+    player_ids: List[str]
+    names: List[str]
+    features: List[str]
+    matrix: np.ndarray
+    version: int
+
+
+class SimilarityIndex:
+    """Nearest-neighbour index over every indexed squad's players"""
+
+    def __init__(self, backend_factory: Callable[[], Any] = BruteForceBackend, min_90s: float = DEFAULT_MIN_90S):
+        self.backend_factory = backend_factory
+        self.min_90s = min_90s
+        self._segments: Dict[str, _Segment] = {}
+        self._backend = None
+        # (segment, player id, name) per row of the stacked matrix
+        self._rows: List[Tuple[str, str, str]] = []
+        # FBref player ids are site-wide, so one id finds a player in any segment
+        self._positions: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return sum(len(segment.player_ids) for segment in self._segments.values())
+
+    def version(self, segment: str) -> Optional[int]:
+        return self._segments[segment].version if segment in self._segments else None
+
+    def update_segment(self, segment: str, store: PlayerStatsStore) -> None:
+        """Replace one squad's vectors; the other segments are left as they are"""
+        features, matrix = player_features(store)
+        if "minutes_90s" in store.columns:
+            eligible = np.nan_to_num(store.column_values("minutes_90s")) >= self.min_90s
+        else:
+            eligible = np.ones(len(store), dtype=bool)
+        positions = np.flatnonzero(eligible)
+        self._segments[segment] = _Segment(
+            [store.player_ids[i] for i in positions],
+            [store.names[i] for i in positions],
+            features,
+            matrix[positions],
+            store.version,
+        )
+        self._backend = None
+        logger.info(f"🔎 Similarity segment '{segment}': {len(positions)} players x {len(features)} features")
+
+    def _ensure_built(self) -> None:
+        if self._backend is not None:
+            return
+        # Align segments on the union of their features (a missing feature is NaN, i.e. the mean)
+        features = sorted({name for segment in self._segments.values() for name in segment.features})
+        column = {name: position for position, name in enumerate(features)}
+        blocks, rows = [], []
+        for key, segment in self._segments.items():
+            block = np.full((len(segment.player_ids), len(features)), np.nan)
+            block[:, [column[name] for name in segment.features]] = segment.matrix
+            blocks.append(block)
+            rows.extend((key, player_id, name) for player_id, name in zip(segment.player_ids, segment.names))
+        stacked = np.vstack(blocks) if blocks else np.empty((0, len(features)))
+
+        self._vectors = normalize(stacked)
+        self._rows = rows
+        self._positions = {player_id: position for position, (_, player_id, _) in enumerate(rows)}
+        backend = self.backend_factory()
+        backend.build(self._vectors)
+        self._backend = backend
+
+    def __contains__(self, player_id: str) -> bool:
+        self._ensure_built()
+        return player_id in self._positions
+
+    def similar(self, player_id: str, k: int = 10) -> List[Dict[str, Any]]:
+        """The k indexed players most similar to one player (not including them), best first"""
+        self._ensure_built()
+        position = self._positions[player_id]
+        # One extra neighbour, since the player matches itself
+        top, scores = self._backend.query(self._vectors[position], k + 1)
+        results = []
+        for row, score in zip(top.tolist(), scores.tolist()):
+            if row == position:
+                continue
+            key, other_id, name = self._rows[row]
+            results.append({"id": other_id, "name": name, "squad": key, "similarity": round(score, 4)})
+        return results[:k]
+
+
+class PlayerSimilarityService:
+    """Keeps the similarity index in step with the player stats store of each squad"""
+
+    def __init__(self, player_stats_service, index: Optional[SimilarityIndex] = None):
+        self.player_stats = player_stats_service
+        self.index = index or SimilarityIndex()
+        self.squad = player_stats_service.scraper_service.team_id
+
+    async def refresh(self) -> bool:
+        """Re-index this squad when its store was rebuilt; False when no stats are available"""
+        store = await self.player_stats.get_store()
+        if store is None:
+            return False
+        if self.index.version(self.squad) != store.version:
+            self.index.update_segment(self.squad, store)
+        return True
+
+    async def get_similar(self, player_id: str, k: int = 10) -> Dict[str, Any]:
+        if not await self.refresh():
+            return {"success": False, "error": "Player stats are unavailable"}
+        with ANALYTICS_QUERY_SECONDS.time("similar_players"):
+            if player_id not in self.index:
+                return {
+                    "success": False,
+                    "not_found": True,
+                    "error": f"Player {player_id} not found or under {self.index.min_90s} 90-minute units",
+                }
+            similar = self.index.similar(player_id, k)
+        return {
+            "success": True,
+            "data": {"player": player_id, "indexed": len(self.index), "similar": similar},
+        }
@@ -0,0 +1,328 @@
+"""
+Columnar store of the squad's FBref player stats, with vectorized derived metrics.
+
+Every numeric column of the player stats tables (services/table_schema.py,
+STATS_TABLES) becomes one typed NumPy array indexed by player, keyed by its
+FBref ``data-stat`` name. Derived metrics are computed for all players and
+stats at once:
+
+- per-90: totals divided by the player's 90-minute units
+- share: the player's part of the squad total
+- percentile / percentile_per90: mean-rank percentile of the raw and per-90
+  values among eligible players (like scipy.stats.percentileofscore with
+  kind="mean")
+
+The store is rebuilt only when the extracted tables change (its version is a
+hash of their content, so re-downloading an unchanged page keeps the store)
+and serialized column by column, never player by player. A stale store keeps
+being served while a background task checks the page again.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from services.table_schema import NUMERIC_PARSERS, STATS_TABLES, numeric_columns
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("per90", "share", "percentile", "percentile_per90")
+# Derived metric sets kept per store, one per min_90s threshold
+DERIVED_CACHE_SIZE = 8
+
+# Columns that are already rates, averages or playing time; everything else is a total
+_NOT_TOTALS = {"minutes", "minutes_90s", "minutes_gk", "games", "games_starts", "games_gk", "games_starts_gk",
+               "average_shot_distance", "goals_per_shot", "goals_per_shot_on_target", "npxg_per_shot"}
+
+
+def is_total(stat: str) -> bool:
+    """Whether per-90 values and squad shares make sense for a stat"""
+    return stat not in _NOT_TOTALS and not stat.endswith(("_per90", "_pct"))
+
+
+def content_version(tables: Dict[str, List[Dict[str, Any]]]) -> int:
+    """Version of extracted table rows: a hash of their content, small enough for a JSON number"""
+    digest = hashlib.blake2b(json.dumps(tables, sort_keys=True, default=str).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 12
+
+
+def player_key(row: Dict[str, Any]) -> str:
+    """FBref player id from the row's link, else the name"""
+    match = re.search(r"/en/players/([a-f0-9]+)/", row.get("player_href") or "")
+    return match.group(1) if match else row["name"]
+
+
+def _as_json(values: np.ndarray, digits: int = 4) -> List[Any]:
+    """A column as a JSON-ready list, NaN as null"""
+    if values.dtype.kind == "f":
+        rounded = np.round(values, digits)
+        return np.where(np.isnan(rounded), None, rounded).tolist()
+    return values.tolist()
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = numerator / denominator
+    result[~np.isfinite(result)] = np.nan
+    return result
+
+
+def percentile_ranks(matrix: np.ndarray) -> np.ndarray:
+    """
+    Mean-rank percentile of every value within its column; NaN values are
+    neither ranked nor counted. Pairwise comparison is O(players^2 x stats),
+    which for a squad (tens of players) is far cheaper than sorting per column.
+    """
+    below = (matrix[None, :, :] < matrix[:, None, :]).sum(axis=1)
+    equal = (matrix[None, :, :] == matrix[:, None, :]).sum(axis=1)
+    valid = (~np.isnan(matrix)).sum(axis=0)
+    ranks = _safe_divide((below + 0.5 * equal) * 100.0, valid[None, :].astype(np.float64))
+    ranks[np.isnan(matrix)] = np.nan
+    return ranks
+
+
+class PlayerStatsStore:
+    """
+    One array per stat, rows in player order (`player_ids` / `names`).
+
+    `present[table]` marks the players listed in each table (keeper stats
+    only cover goalkeepers); int columns hold 0 and float columns NaN for
+    everyone else. `positions` (FBref codes, e.g. "DF,MF") and `ages` (-1
+    when unknown) come from the first table listing them.
+    """
+
+    def __init__(self, player_ids: List[str], names: List[str], columns: Dict[str, np.ndarray],
+                 sources: Dict[str, str], present: Dict[str, np.ndarray], version: int,
+                 positions: Optional[List[str]] = None, ages: Optional[np.ndarray] = None):
+        self.player_ids = player_ids
+        self.names = names
+        self.positions = positions if positions is not None else [""] * len(player_ids)
+        self.ages = ages if ages is not None else np.full(len(player_ids), -1, dtype=np.int64)
+        self.index = {player_id: position for position, player_id in enumerate(player_ids)}
+        self.columns = columns
+        self.sources = sources
+        self.present = present
+        self.version = version
+        self._derived: Dict[float, Dict[str, Dict[str, np.ndarray]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    @classmethod
+    def from_tables(cls, rows_by_table: Dict[str, List[Dict[str, Any]]], version: int) -> "PlayerStatsStore":
+        """Build the store from extracted STATS_TABLES rows; a stat found in several tables is taken from the first"""
+        index: Dict[str, int] = {}
+        names: List[str] = []
+        profiles: List[Dict[str, Any]] = []
+        keys_by_table = {}
+        for table, rows in rows_by_table.items():
+            keys = [player_key(row) for row in rows]
+            keys_by_table[table] = keys
+            for key, row in zip(keys, rows):
+                if key not in index:
+                    index[key] = len(names)
+                    names.append(row["name"])
+                    profiles.append({})
+                profile = profiles[index[key]]
+                for field in ("position", "age"):
+                    if field not in profile and row.get(field) is not None:
+                        profile[field] = row[field]
+
+        size = len(names)
+        player_positions = [profile.get("position", "") for profile in profiles]
+        ages = np.fromiter((profile.get("age", -1) for profile in profiles), dtype=np.int64, count=size)
+        columns: Dict[str, np.ndarray] = {}
+        sources: Dict[str, str] = {}
+        present: Dict[str, np.ndarray] = {}
+        for table, rows in rows_by_table.items():
+            positions = np.fromiter((index[key] for key in keys_by_table[table]), dtype=np.intp, count=len(rows))
+            present[table] = np.zeros(size, dtype=bool)
+            present[table][positions] = True
+
+            for column in numeric_columns(STATS_TABLES[table]):
+                stat = column.stat if isinstance(column.stat, str) else column.stat[0]
+                if stat in columns:
+                    continue
+                if NUMERIC_PARSERS[column.parse] == "int64":
+                    values = np.zeros(size, dtype=np.int64)
+                    values[positions] = np.fromiter(
+                        (row[column.name] or 0 for row in rows), dtype=np.int64, count=len(rows)
+                    )
+                else:
+                    values = np.full(size, np.nan)
+                    values[positions] = np.fromiter(
+                        (math.nan if row[column.name] is None else row[column.name] for row in rows),
+                        dtype=np.float64, count=len(rows)
+                    )
+                columns[stat] = values
+                sources[stat] = table
+
+        return cls(list(index), names, columns, sources, present, version, player_positions, ages)
+
+    def column_values(self, stat: str) -> np.ndarray:
+        """A stat as float64 with NaN for players outside its table"""
+        values = self.columns[stat].astype(np.float64)
+        values[~self.present[self.sources[stat]]] = np.nan
+        return values
+
+    def derived(self, min_90s: float = 0.0) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        {metric: {stat: array}} for every metric in METRICS, computed in one
+        pass over a players x stats matrix. Players under `min_90s` 90-minute
+        units are left out of the percentiles. Cached for the last
+        DERIVED_CACHE_SIZE thresholds.
+        """
+        if min_90s in self._derived:
+            return self._derived[min_90s]
+
+        stats = list(self.columns)
+        matrix = np.column_stack([self.column_values(stat) for stat in stats]) if stats else np.empty((len(self), 0))
+        totals = [position for position, stat in enumerate(stats) if is_total(stat)]
+        total_stats = [stats[position] for position in totals]
+
+        nineties = self.column_values("minutes_90s") if "minutes_90s" in self.columns else np.full(len(self), np.nan)
+        per90 = _safe_divide(matrix[:, totals], nineties[:, None])
+        shares = _safe_divide(matrix[:, totals], np.nansum(matrix[:, totals], axis=0)[None, :])
+
+        # Percentiles of raw stats and per-90 values, among players with enough minutes
+        eligible = np.nan_to_num(nineties, nan=0.0) >= min_90s
+        ranked = np.column_stack([matrix, per90])
+        ranked[~eligible, :] = np.nan
+        ranks = percentile_ranks(ranked)
+
+        derived = {
+            "per90": dict(zip(total_stats, per90.T)),
+            "share": dict(zip(total_stats, shares.T)),
+            "percentile": dict(zip(stats, ranks[:, :len(stats)].T)),
+            "percentile_per90": dict(zip(total_stats, ranks[:, len(stats):].T)),
+        }
+        if len(self._derived) >= DERIVED_CACHE_SIZE:
+            # Oldest threshold first (dicts keep insertion order)
+            del self._derived[next(iter(self._derived))]
+        self._derived[min_90s] = derived
+        return derived
+
+    def describe(self) -> Dict[str, Any]:
+        derived = self.derived()
+        return {
+            "version": self.version,
+            "players": len(self),
+            "stats": [
+                {"name": stat, "table": self.sources[stat], "dtype": str(values.dtype)}
+                for stat, values in self.columns.items()
+            ],
+            "metrics": {metric: list(columns) for metric, columns in derived.items()},
+        }
+
+    def to_columns(self, stats: Optional[Sequence[str]] = None, metrics: Iterable[str] = (),
+                   min_90s: float = 0.0, positions: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """
+        Columnar view: player ids and names plus {stat: values} and
+        {metric: {stat: values}}, restricted to `stats` and the players at
+        `positions` when given.
+        """
+        stats = list(stats) if stats else list(self.columns)
+        unknown = [stat for stat in stats if stat not in self.columns]
+        if unknown:
+            raise KeyError(f"Unknown stats: {', '.join(unknown)}")
+        rows = slice(None) if positions is None else positions
+
+        result: Dict[str, Any] = {
+            "players": np.asarray(self.player_ids, dtype=object)[rows].tolist(),
+            "names": np.asarray(self.names, dtype=object)[rows].tolist(),
+            "stats": {stat: _as_json(self.columns[stat][rows]) for stat in stats},
+        }
+        derived = self.derived(min_90s) if metrics else {}
+        for metric in metrics:
+            values = derived[metric]
+            result[metric] = {stat: _as_json(values[stat][rows]) for stat in stats if stat in values}
+        return result
+
+
+class PlayerStatsService:
+    """Keeps a PlayerStatsStore in step with the scraper's page snapshot"""
+
+    def __init__(self, scraper_service, refresh_interval: Optional[float] = None):
+        self.scraper_service = scraper_service
+        # Seconds a store is served before the page is checked again (defaults to the scraper's page cache)
+        self.refresh_interval = (refresh_interval if refresh_interval is not None
+                                 else scraper_service.page_cache_duration / 1000)
+        self._store: Optional[PlayerStatsStore] = None
+        self._checked_at = 0.0
+        self._revalidation: Optional[asyncio.Task] = None
+
+    async def _load(self) -> Optional[PlayerStatsStore]:
+        """Fetch the stats tables and rebuild the store when their content changed"""
+        result = await self.scraper_service.fetch_stats_tables(list(STATS_TABLES))
+        self._checked_at = time.monotonic()
+        if not result["isLive"]:
+            # Keep serving the last good store when FBref is unreachable
+            return self._store
+        version = content_version(result["tables"])
+        if self._store is None or self._store.version != version:
+            self._store = PlayerStatsStore.from_tables(result["tables"], version)
+            logger.info(f"📊 Rebuilt player stats store: {len(self._store)} players, "
+                        f"{len(self._store.columns)} stats (version {self._store.version})")
+        return self._store
+
+    async def _revalidate(self) -> None:
+        try:
+            await self._load()
+        except Exception as e:
+            logger.error(f"❌ Error refreshing player stats store: {str(e)}")
+
+    async def get_store(self) -> Optional[PlayerStatsStore]:
+        """
+        The current store. Only the first call waits for the page; after that a
+        stale store is returned at once while a background task re-checks it.
+        """
+        if self._store is None:
+            return await self._load()
+        stale = time.monotonic() - self._checked_at >= self.refresh_interval
+        if stale and (self._revalidation is None or self._revalidation.done()):
+            self._revalidation = asyncio.create_task(self._revalidate())
+        return self._store
+
+    async def get_columns(self) -> Dict[str, Any]:
+        store = await self.get_store()
+        if store is None:
+            return {"success": False, "error": "Player stats are unavailable"}
+        return {"success": True, "data": store.describe()}
+
+    async def get_stats(self, stats: Optional[List[str]] = None, metrics: Sequence[str] = (),
+                        min_90s: float = 0.0) -> Dict[str, Any]:
+        unknown_metrics = [metric for metric in metrics if metric not in METRICS]
+        if unknown_metrics:
+            return {"success": False, "bad_request": True, "error": f"Unknown metrics: {', '.join(unknown_metrics)}"}
+        store = await self.get_store()
+        if store is None:
+            return {"success": False, "error": "Player stats are unavailable"}
+        try:
+            data = store.to_columns(stats, metrics, min_90s)
+        except KeyError as error:
+            return {"success": False, "bad_request": True, "error": error.args[0]}
+        return {"success": True, "data": {"version": store.version, **data}}
+
+    async def get_player(self, player_id: str, min_90s: float = 0.0) -> Dict[str, Any]:
+        store = await self.get_store()
+        if store is None:
+            return {"success": False, "error": "Player stats are unavailable"}
+        if player_id not in store.index:
+            return {"success": False, "not_found": True, "error": f"Player {player_id} not found"}
+        data = store.to_columns(metrics=METRICS, min_90s=min_90s, positions=np.array([store.index[player_id]]))
+        # Unwrap the single-player columns
+        player = {
+            "id": data["players"][0],
+            "name": data["names"][0],
+            "stats": {stat: values[0] for stat, values in data["stats"].items()},
+        }
+        for metric in METRICS:
+            player[metric] = {stat: values[0] for stat, values in data[metric].items()}
+        return {"success": True, "data": {"version": store.version, "player": player}}
@@ -0,0 +1,67 @@
+"""
+Query spec shared by the database backends.
+
+``get_records`` accepts:
+
+- ``filters``: ``{column: value}`` for equality, ``{column: (operator, value)}``
+  for one predicate, or ``{column: [(operator, value), ...]}`` for several
+  predicates on the same column (ANDed together).
+- ``columns``: list of columns to select (defaults to all).
+- ``order_by``: list of ``"column"`` / ``"column.desc"`` entries.
+- ``count``: ``"exact"`` or ``"estimated"`` to also return the total number of
+  matching rows (ignoring skip/limit).
+
+Supported operators: eq, neq, gt, gte, lt, lte, like, ilike, in (value is a
+list), is (value None/True/False) and not_is (``("not_is", None)`` -> IS NOT NULL).
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+FilterValue = Union[Any, Tuple[str, Any], List[Tuple[str, Any]]]
+Filters = Dict[str, FilterValue]
+
+FILTER_OPERATORS = {"eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "in", "is", "not_is"}
+COUNT_METHODS = {"exact", "estimated"}
+
+
+def normalize_filters(filters: Optional[Filters]) -> List[Tuple[str, str, Any]]:
+    """Flatten a filter dict into (column, operator, value) predicates"""
+    predicates = []
+    if not filters:
+        return predicates
+
+    for column, value in filters.items():
+        if isinstance(value, list) and value and all(isinstance(item, tuple) for item in value):
+            conditions = value
+        elif isinstance(value, tuple) and len(value) == 2:
+            conditions = [value]
+        else:
+            conditions = [("eq", value)]
+
+        for operator, filter_value in conditions:
+            if operator not in FILTER_OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+            if operator in ("is", "not_is") and filter_value not in (None, True, False):
+                raise ValueError(f"'{operator}' filter on {column} only accepts None, True or False")
+            predicates.append((column, operator, filter_value))
+
+    return predicates
+
+
+def parse_order(order_by: Optional[Sequence[str]]) -> List[Tuple[str, bool]]:
+    """Turn ["col", "other.desc"] into [(column, descending)] pairs"""
+    orders = []
+    for entry in order_by or []:
+        column, _, direction = entry.partition(".")
+        direction = direction.lower() or "asc"
+        if direction not in ("asc", "desc"):
+            raise ValueError(f"Invalid sort direction in {entry!r}")
+        orders.append((column, direction == "desc"))
+    return orders
+
+
+def check_count(count: Optional[str]) -> Optional[str]:
+    """Validate the requested count method"""
+    if count is not None and count not in COUNT_METHODS:
+        raise ValueError(f"Unsupported count method: {count}")
+    return count
@@ -0,0 +1,182 @@
+"""
+Append-only columnar archive of every scrape.
+
+The database only keeps the latest refresh, so each extraction (squad,
+fixtures, standings) is also written to disk as one partition:
+
+    {root}/{data type}/club={squad id}/season={2024-2025}/scraped_at={ms}/
+        _meta.json      columns, dtypes and row count
+        {column}.npy    one typed NumPy array per column
+
+Numbers are int64 (float64 with NaN when some are missing), flags bool and
+everything else fixed-width unicode, so every column can be opened with
+np.load(mmap_mode="r"): a scan over many partitions maps the files and
+reads only the pages it touches, without building Python objects per row.
+Partitions are written to a temporary directory and renamed into place, so
+readers never see half a partition, and an existing one is never rewritten.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT = 1
+META_FILE = "_meta.json"
+# Extractions archived by the football refresh
+DATA_TYPES = ("players", "fixtures", "standings")
+
+_PARTITION = re.compile(r"club=(?P<club>[^/]+)/season=(?P<season>[^/]+)/scraped_at=(?P<scraped_at>\d+)$")
+
+
+def season_of(scraped_at: int) -> str:
+    """Season label of a scrape time (ms): seasons run July to June, e.g. "2024-2025" """
+    moment = datetime.fromtimestamp(scraped_at / 1000, tz=timezone.utc)
+    start = moment.year if moment.month >= 7 else moment.year - 1
+    return f"{start}-{start + 1}"
+
+
+def column_array(values: Sequence[Any]) -> np.ndarray:
+    """A memory-mappable array for one column of scraped values (None becomes NaN, False or "")"""
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, bool) for value in present):
+        return np.array([bool(value) for value in values], dtype=bool)
+    if present and all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        if len(present) == len(values):
+            return np.array(values, dtype=np.int64)
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    if present and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    text = ["" if value is None else value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+            for value in values]
+    # Fixed-width unicode: object arrays can't be memory-mapped
+    return np.array(text, dtype=f"<U{max((len(value) for value in text), default=0) or 1}")
+
+
+@dataclass(frozen=True)
+class Partition:
+    data_type: str
+    club: str
+    season: str
+    scraped_at: int
+    path: str
+
+    def meta(self) -> Dict[str, Any]:
+        with open(os.path.join(self.path, META_FILE), encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def read(self, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Memory-mapped columns (all by default); a column this scrape didn't have is skipped"""
+        names = columns if columns is not None else self.meta()["columns"]
+        arrays = {}
+        for name in names:
+            file = os.path.join(self.path, f"{name}.npy")
+            if os.path.exists(file):
+                arrays[name] = np.load(file, mmap_mode="r")
+        return arrays
+
+
+class ScrapeArchive:
+    """Partitioned archive under `root`, one directory per scrape"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def partition_path(self, data_type: str, club: str, scraped_at: int) -> str:
+        return os.path.join(self.root, data_type, f"club={club}", f"season={season_of(scraped_at)}",
+                            f"scraped_at={scraped_at}")
+
+    def append(self, data_type: str, club: str, rows: List[Dict[str, Any]], scraped_at: int) -> Optional[Partition]:
+        """
+        Archive one extraction; returns its partition, or None when this scrape
+        (same data type, club and scrape time) is already archived.
+        """
+        path = self.partition_path(data_type, club, scraped_at)
+        if os.path.exists(path):
+            return None
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        arrays = {name: column_array([row.get(name) for row in rows]) for name in names}
+
+        parent = os.path.dirname(path)
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+        try:
+            for name, values in arrays.items():
+                np.save(os.path.join(staging, f"{name}.npy"), values)
+            meta = {
+                "format": ARCHIVE_FORMAT,
+                "dataType": data_type,
+                "club": club,
+                "season": season_of(scraped_at),
+                "scrapedAt": scraped_at,
+                "rows": len(rows),
+                "columns": {name: str(values.dtype) for name, values in arrays.items()},
+            }
+            with open(os.path.join(staging, META_FILE), "w", encoding="utf-8") as handle:
+                json.dump(meta, handle)
+            os.rename(staging, path)
+        except FileExistsError:
+            # Another writer archived the same scrape first
+            shutil.rmtree(staging, ignore_errors=True)
+            return None
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        logger.info(f"🗄️ Archived {len(rows)} {data_type} rows ({path})")
+        return Partition(data_type, club, meta["season"], scraped_at, path)
+
+    def partitions(self, data_type: str, club: Optional[str] = None, season: Optional[str] = None,
+                   since: Optional[int] = None, until: Optional[int] = None) -> List[Partition]:
+        """Partitions of a data type, oldest scrape first, pruned by directory name (no file is opened)"""
+        base = os.path.join(self.root, data_type)
+        found = []
+        # One club's partitions sit under a single directory
+        start = os.path.join(base, f"club={club}") if club is not None else base
+        for directory, subdirectories, _ in os.walk(start):
+            subdirectories[:] = [name for name in subdirectories if not name.startswith(".")]
+            match = _PARTITION.search(os.path.relpath(directory, base).replace(os.sep, "/"))
+            if not match:
+                continue
+            subdirectories[:] = []
+            scraped_at = int(match["scraped_at"])
+            if ((club is not None and match["club"] != club) or (season is not None and match["season"] != season)
+                    or (since is not None and scraped_at < since) or (until is not None and scraped_at > until)):
+                continue
+            found.append(Partition(data_type, match["club"], match["season"], scraped_at, directory))
+        found.sort(key=lambda partition: partition.scraped_at)
+        return found
+
+    def scan(self, data_type: str, columns: Optional[Sequence[str]] = None,
+             **filters: Any) -> Iterator[Tuple[Partition, Dict[str, np.ndarray]]]:
+        """(partition, memory-mapped columns) for every matching partition, oldest first"""
+        for partition in self.partitions(data_type, **filters):
+            yield partition, partition.read(columns)
+
+
+class ArchiveService:
+    """History queries over the archive for one club"""
+
+    def __init__(self, archive: Optional[ScrapeArchive], club: str):
+        self.archive = archive
+        self.club = club
+
+    def _unavailable(self) -> Dict[str, Any]:
+        return {"success": False, "error": "The scrape archive is disabled (set ARCHIVE_DIR)"}
+
+    def get_partitions(self, data_type: str, season: Optional[str] = None) -> Dict[str, Any]:
+        if data_type not in DATA_TYPES:
+            return {"success": False, "bad_request": True,
+                    "error": f"Unknown data type '{data_type}' ({', '.join(DATA_TYPES)})"}
+        if self.archive is None:
+            return self._unavailable()
+        partitions = [partition.meta() for partition in self.archive.partitions(data_type, self.club, season)]
+        return {"success": True, "data": {"dataType": data_type, "club": self.club, "partitions": partitions}}
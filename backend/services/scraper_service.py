@@ -1,13 +1,34 @@
+import asyncio
 import requests
 import time
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Any
+from lxml import html as lxml_html
+from typing import Dict, Iterator, List, Optional, Any, Sequence, Union
 import logging
-from datetime import datetime
+from datetime import date, datetime
 import re
+from monitoring.metrics import CACHE_EVENTS, PARSE_SECONDS, SCRAPE_FETCH_SECONDS, timed
+from monitoring.tracing import span, traced
+from services.html_stream import (
+    PageSnapshot, ResponseTooLarge, TableId, TableScanner, declared_encoding, make_tree, read_body
+)
+from services.table_schema import LEAGUE_TABLE, MATCH_LOGS, STANDARD_STATS, STATS_TABLES, compile_row_iterator, compile_schema
 
 logger = logging.getLogger(__name__)
 
+# Table extractors, compiled once from their schemas (services/table_schema.py)
+_extract_standard_stats = compile_schema(STANDARD_STATS)
+_extract_match_logs = compile_schema(MATCH_LOGS)
+_iter_match_logs = compile_row_iterator(MATCH_LOGS)
+_extract_league_table = compile_schema(LEAGUE_TABLE)
+_stats_extractors = {name: compile_schema(schema) for name, schema in STATS_TABLES.items()}
+# The league table's real id carries the season: downloads wait for a table matching an alternate
+_league_table_id = (LEAGUE_TABLE.table_id, *LEAGUE_TABLE.alternates)
+
+def squad_id(href: Optional[str]) -> Optional[str]:
+    """FBref squad id from a link like /en/squads/3640715c/CD-Mirandes-Stats"""
+    match = re.search(r'/en/squads/([a-f0-9]+)/', href or "")
+    return match.group(1) if match else None
+
 class FBrefScraperService:
     """
     Python equivalent of the JavaScript FBrefScraper class.
@@ -16,6 +37,7 @@ class FBrefScraperService:
     
     def __init__(self):
         self.base_url = "https://fbref.com/en/squads/dee3bbc8/2024-2025/Racing-Santander-Stats"
+        self.team_id = "dee3bbc8"  # Racing Santander's FBref squad id
         
         # Separate caches for different data types
         self.squad_cache = None
@@ -34,6 +56,11 @@ class FBrefScraperService:
         self.fixtures_cache_duration = 5 * 60 * 1000     # 5 minutes (fixtures update more often)
         self.standings_cache_duration = 10 * 60 * 1000   # 10 minutes (standings update regularly)
         self.full_cache_duration = 5 * 60 * 1000         # 5 minutes (for backward compatibility)
+
+        # Downloaded page shared by the squad, fixtures and standings fetches
+        self.page_snapshot: Optional[PageSnapshot] = None
+        self.page_cache_duration = 60 * 1000             # 1 minute (one download per refresh round)
+        self._page_lock = asyncio.Lock()
         
         # CORS proxies to try
         self.proxies = [
@@ -49,6 +76,12 @@ class FBrefScraperService:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
         }
 
+        # Download limits: the body is streamed in chunks, abandoned past the byte cap,
+        # and cut short once every table the extractors read has been closed
+        self.max_response_bytes = 8 * 1024 * 1024
+        self.download_chunk_size = 64 * 1024
+        self.required_tables = ("stats_standard_17", "matchlogs_for")
+
     def is_cache_valid(self, cache_type: str = "full") -> bool:
         """Check if cache is still valid for specific data type"""
         cache_map = {
@@ -73,6 +106,7 @@ class FBrefScraperService:
         try:
             # Check if we have valid cached squad data
             if self.is_cache_valid("squad"):
+                CACHE_EVENTS.inc("scraper", "squad", "hit")
                 logger.info("🔄 Using cached squad data from FBref (cache valid)")
                 return {
                     "squad": self.squad_cache,
@@ -81,15 +115,16 @@ class FBrefScraperService:
                     "source": "FBref.com (squad cached)",
                 }
 
+            CACHE_EVENTS.inc("scraper", "squad", "miss")
             logger.info("🌐 Attempting to fetch fresh squad data from FBref...")
             
             # Fetch and parse HTML
-            html = await self._fetch_html()
-            if not html:
+            page = await self._get_page()
+            if not page:
                 return self._get_fallback_squad_data()
 
-            soup = BeautifulSoup(html, 'html.parser')
-            squad_data = self.extract_squad_data(soup)
+            root = page.tree()
+            squad_data = self.extract_squad_data(root)
 
             # Cache the results
             self.squad_cache = squad_data
@@ -117,6 +152,7 @@ class FBrefScraperService:
         try:
             # Check if we have valid cached fixtures data
             if self.is_cache_valid("fixtures"):
+                CACHE_EVENTS.inc("scraper", "fixtures", "hit")
                 logger.info("🔄 Using cached fixtures data from FBref (cache valid)")
                 return {
                     "pastFixtures": self.fixtures_cache,
@@ -125,15 +161,16 @@ class FBrefScraperService:
                     "source": "FBref.com (fixtures cached)",
                 }
 
+            CACHE_EVENTS.inc("scraper", "fixtures", "miss")
             logger.info("🌐 Attempting to fetch fresh fixtures data from FBref...")
             
             # Fetch and parse HTML
-            html = await self._fetch_html()
-            if not html:
+            page = await self._get_page()
+            if not page:
                 return self._get_fallback_fixtures_data()
 
-            soup = BeautifulSoup(html, 'html.parser')
-            fixtures_data = self.extract_past_fixtures(soup)
+            root = page.tree()
+            fixtures_data = self.extract_past_fixtures(root)
 
             # Cache the results
             self.fixtures_cache = fixtures_data
@@ -153,6 +190,56 @@ class FBrefScraperService:
             logger.error(f"❌ Error fetching fixtures data from FBref: {str(error)}")
             return self._get_fallback_fixtures_data()
 
+    async def fetch_fixture_history(self, after: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Every completed fixture of the season's match log, oldest first, or
+        only the ones dated after `after`. `fixtures` is a generator over the
+        shared page snapshot (see iter_fixture_history); it is empty when
+        FBref is unreachable, since fallback fixtures must never be stored.
+        """
+        try:
+            page = await self._get_page()
+            if not page:
+                return self._get_fallback_fixture_history()
+
+            return {
+                "fixtures": self.iter_fixture_history(page.tree(), after),
+                "isLive": True,
+                "lastUpdated": int(page.fetched_at * 1000),
+                "source": "FBref.com (fixture history live)",
+            }
+
+        except Exception as error:
+            logger.error(f"❌ Error fetching fixture history from FBref: {str(error)}")
+            return self._get_fallback_fixture_history()
+
+    async def fetch_season_state(self) -> Dict[str, Any]:
+        """
+        Every team's league table row plus Racing's unplayed league fixtures,
+        from one page snapshot. lastUpdated identifies the page version.
+        """
+        try:
+            page = await self._get_page(extra_tables=[_league_table_id])
+            if not page:
+                return self._get_fallback_season_state()
+
+            table = page.extracted("league_table", lambda: self.extract_league_table(page.tree()))
+            remaining = page.extracted("remaining_fixtures", lambda: self.extract_remaining_fixtures(page.tree()))
+            logger.info(f"🏆 League table: {len(table)} teams, {len(remaining)} fixtures left")
+
+            return {
+                "table": table,
+                "remainingFixtures": remaining,
+                "teamId": self.team_id,
+                "isLive": True,
+                "lastUpdated": int(page.fetched_at * 1000),
+                "source": "FBref.com (season live)",
+            }
+
+        except Exception as error:
+            logger.error(f"❌ Error fetching season state from FBref: {str(error)}")
+            return self._get_fallback_season_state()
+
     async def fetch_standings_data(self) -> Dict[str, Any]:
         """
         Fetch only standings data from FBref with separate caching.
@@ -161,6 +248,7 @@ class FBrefScraperService:
         try:
             # Check if we have valid cached standings data
             if self.is_cache_valid("standings"):
+                CACHE_EVENTS.inc("scraper", "standings", "hit")
                 logger.info("🔄 Using cached standings data from FBref (cache valid)")
                 return {
                     "leaguePosition": self.standings_cache,
@@ -169,15 +257,16 @@ class FBrefScraperService:
                     "source": "FBref.com (standings cached)",
                 }
 
+            CACHE_EVENTS.inc("scraper", "standings", "miss")
             logger.info("🌐 Attempting to fetch fresh standings data from FBref...")
             
             # Fetch and parse HTML
-            html = await self._fetch_html()
-            if not html:
+            page = await self._get_page()
+            if not page:
                 return self._get_fallback_standings_data()
 
-            soup = BeautifulSoup(html, 'html.parser')
-            standings_data = self.extract_league_position(soup)
+            root = page.tree()
+            standings_data = self.extract_league_position(root)
 
             # Cache the results
             self.standings_cache = standings_data
@@ -197,11 +286,99 @@ class FBrefScraperService:
             logger.error(f"❌ Error fetching standings data from FBref: {str(error)}")
             return self._get_fallback_standings_data()
 
-    async def _fetch_html(self) -> Optional[str]:
+    async def fetch_stats_table(self, table: str) -> Dict[str, Any]:
+        """
+        Fetch one player stats table (a key of STATS_TABLES) from FBref.
+        Returns dict with the table's rows, one per player, and metadata.
+        Raises ValueError for an unknown table.
+        """
+        if table not in STATS_TABLES:
+            raise ValueError(f"Unknown stats table '{table}'. Available: {', '.join(STATS_TABLES)}")
+        schema = STATS_TABLES[table]
+
+        try:
+            page = await self._get_page(extra_tables=[schema.table_id])
+            if not page:
+                return self._get_fallback_stats_table(table)
+
+            rows = page.extracted(f"stats:{table}", lambda: self.extract_stats_table(page.tree(), table))
+            logger.info(f"📊 Extracted {len(rows)} rows from {schema.description.lower()} table {schema.table_id}")
+
+            return {
+                "table": table,
+                "rows": rows,
+                "isLive": True,
+                "lastUpdated": int(page.fetched_at * 1000),
+                "source": f"FBref.com ({table} live)",
+            }
+
+        except Exception as error:
+            logger.error(f"❌ Error fetching {table} stats from FBref: {str(error)}")
+            return self._get_fallback_stats_table(table)
+
+    async def fetch_stats_tables(self, tables: Sequence[str]) -> Dict[str, Any]:
+        """
+        Fetch several player stats tables from one page download.
+        Returns dict with {table: rows} and metadata; lastUpdated identifies the page version.
+        Raises ValueError for an unknown table.
+        """
+        unknown = [table for table in tables if table not in STATS_TABLES]
+        if unknown:
+            raise ValueError(f"Unknown stats tables {unknown}. Available: {', '.join(STATS_TABLES)}")
+
+        try:
+            page = await self._get_page(extra_tables=[STATS_TABLES[table].table_id for table in tables])
+            if not page:
+                return self._get_fallback_stats_tables(tables)
+
+            # Extracted once per page snapshot, so repeated analytics queries don't re-parse
+            rows = {
+                table: page.extracted(f"stats:{table}", lambda table=table: self.extract_stats_table(page.tree(), table))
+                for table in tables
+            }
+            logger.info(f"📊 Extracted stats tables: {', '.join(f'{t} ({len(r)})' for t, r in rows.items())}")
+
+            return {
+                "tables": rows,
+                "isLive": True,
+                "lastUpdated": int(page.fetched_at * 1000),
+                "source": "FBref.com (stats live)",
+            }
+
+        except Exception as error:
+            logger.error(f"❌ Error fetching stats tables from FBref: {str(error)}")
+            return self._get_fallback_stats_tables(tables)
+
+    async def _get_page(self, extra_tables: Sequence[TableId] = ()) -> Optional[PageSnapshot]:
+        """
+        Latest page snapshot, downloading a new one once it is older than page_cache_duration
+        or was cut short before `extra_tables` (beyond self.required_tables).
+        Concurrent fetches wait for a single download and share its parsed tree.
+        """
+        required_tables = tuple(self.required_tables) + tuple(t for t in extra_tables if t not in self.required_tables)
+        async with self._page_lock:
+            page = self.page_snapshot
+            if page and page.age_ms() < self.page_cache_duration and page.covers(required_tables):
+                CACHE_EVENTS.inc("scraper", "page", "hit")
+                return page
+
+            CACHE_EVENTS.inc("scraper", "page", "miss")
+            page = await self._fetch_page(required_tables)
+            if page:
+                self.page_snapshot = page
+            return page
+
+    @traced("scrape.fetch_page")
+    async def _fetch_page(self, required_tables: Optional[Sequence[TableId]] = None) -> Optional[PageSnapshot]:
         """
         Common method to fetch HTML from FBref using proxies.
-        Returns HTML string or None if all proxies fail.
+        The body is streamed under a byte cap and stops once the required tables
+        (self.required_tables by default, none to read the whole page) are in.
+        Returns the raw page bytes with their declared encoding, or None if all proxies fail.
         """
+        if required_tables is None:
+            required_tables = self.required_tables
+
         response = None
         last_error = None
         successful_proxy = None
@@ -218,21 +395,51 @@ class FBrefScraperService:
                 
                 logger.info(f"🔗 Trying proxy: {proxy}")
                 
-                start_time = time.time()
-                response = requests.get(
-                    full_url,
-                    headers=self.headers,
-                    timeout=10
-                )
-                end_time = time.time()
+                start_time = time.perf_counter()
+                with span("scrape.fetch", proxy=proxy) as fetch_span:
+                    try:
+                        response = requests.get(
+                            full_url,
+                            headers=self.headers,
+                            timeout=10,
+                            stream=True
+                        )
+                        try:
+                            body, stopped_early = None, False
+                            if response.ok:
+                                body, stopped_early = read_body(
+                                    response,
+                                    self.max_response_bytes,
+                                    self.download_chunk_size,
+                                    TableScanner(required_tables) if required_tables else None,
+                                )
+                        finally:
+                            # Drops the connection if the body wasn't read to the end
+                            response.close()
+                    except ResponseTooLarge:
+                        SCRAPE_FETCH_SECONDS.observe(time.perf_counter() - start_time, proxy, "too_large")
+                        raise
+                    except Exception:
+                        SCRAPE_FETCH_SECONDS.observe(time.perf_counter() - start_time, proxy, "error")
+                        raise
+                    elapsed = time.perf_counter() - start_time
+                    SCRAPE_FETCH_SECONDS.observe(elapsed, proxy, "ok" if response.ok else "http_error")
+                    fetch_span.set("status_code", response.status_code)
+                    if body is not None:
+                        fetch_span.set("bytes", len(body))
+                        fetch_span.set("stopped_early", stopped_early)
                 
-                logger.info(f"⏱️ Response time: {(end_time - start_time) * 1000:.0f}ms")
+                logger.info(f"⏱️ Response time: {elapsed * 1000:.0f}ms")
                 logger.info(f"📊 Response status: {response.status_code}")
                 
                 if response.ok:
                     successful_proxy = proxy
                     logger.info(f"✅ Successfully fetched data using proxy: {proxy}")
-                    return response.text
+                    if stopped_early:
+                        logger.info(f"✂️ Stopped download after {len(body)} bytes (required tables complete)")
+                    # Explicit charset rather than requests' guess (ISO-8859-1 for text/* without one)
+                    encoding = declared_encoding(response.headers.get("Content-Type"), body)
+                    return PageSnapshot(body, encoding, stopped_early=stopped_early)
                 else:
                     logger.warning(f"❌ Proxy {proxy} returned status: {response.status_code}")
                     last_error = Exception(f"HTTP error! status: {response.status_code}")
@@ -266,6 +473,24 @@ class FBrefScraperService:
             "source": "FBref.com (fixtures fallback)",
         }
 
+    def _get_fallback_fixture_history(self) -> Dict[str, Any]:
+        return {
+            "fixtures": iter(()),
+            "isLive": False,
+            "lastUpdated": int(time.time() * 1000),
+            "source": "FBref.com (fixture history fallback)",
+        }
+
+    def _get_fallback_season_state(self) -> Dict[str, Any]:
+        return {
+            "table": [],
+            "remainingFixtures": [],
+            "teamId": self.team_id,
+            "isLive": False,
+            "lastUpdated": int(time.time() * 1000),
+            "source": "FBref.com (season fallback)",
+        }
+
     def _get_fallback_standings_data(self) -> Dict[str, Any]:
         """Get fallback standings data when network requests fail"""
         fallback = self.get_fallback_data()
@@ -276,6 +501,24 @@ class FBrefScraperService:
             "source": "FBref.com (standings fallback)",
         }
 
+    def _get_fallback_stats_table(self, table: str) -> Dict[str, Any]:
+        """No static copy of the detailed stats tables exists"""
+        return {
+            "table": table,
+            "rows": [],
+            "isLive": False,
+            "lastUpdated": int(time.time() * 1000),
+            "source": f"FBref.com ({table} fallback)",
+        }
+
+    def _get_fallback_stats_tables(self, tables: Sequence[str]) -> Dict[str, Any]:
+        return {
+            "tables": {table: [] for table in tables},
+            "isLive": False,
+            "lastUpdated": int(time.time() * 1000),
+            "source": "FBref.com (stats fallback)",
+        }
+
     # Keep the original method for backward compatibility
     async def fetch_live_data(self) -> Dict[str, Any]:
         """
@@ -298,22 +541,22 @@ class FBrefScraperService:
             logger.info(f"📡 Target URL: {self.base_url}")
 
             # Fetch HTML
-            html = await self._fetch_html()
-            if not html:
+            page = await self._get_page()
+            if not page:
                 logger.warning("❌ All proxies failed, using fallback data")
                 return self.get_fallback_data()
 
             logger.info("📄 Parsing HTML response...")
-            logger.info(f"📄 HTML length: {len(html)} characters")
+            logger.info(f"📄 HTML length: {len(page.body)} bytes ({page.encoding})")
 
             # Check if we got actual HTML content
-            if len(html) < 1000:
+            if len(page.body) < 1000:
                 logger.warning("⚠️ Response seems too short, might be an error page")
-                logger.info(f"📄 First 500 chars: {html[:500]}")
+                logger.info(f"📄 First 500 bytes: {page.body[:500]!r}")
 
             # Parse the HTML to extract data
             logger.info("🔍 Extracting data from HTML...")
-            data = self.parse_fbref_data(html)
+            data = self.parse_fbref_data(page.body, page.encoding)
 
             logger.info("📊 Extracted data summary:")
             logger.info(f"   - Squad: {len(data['squad'])} players")
@@ -339,136 +582,79 @@ class FBrefScraperService:
             logger.warning("🔄 Using fallback data due to network error")
             return self.get_fallback_data()
 
-    def parse_fbref_data(self, html: str) -> Dict[str, Any]:
-        """Parse HTML to extract player data, fixtures, and league position"""
-        soup = BeautifulSoup(html, 'html.parser')
+    @traced("parse.full")
+    @timed(PARSE_SECONDS, "full")
+    def parse_fbref_data(self, html: Union[bytes, str], encoding: Optional[str] = None) -> Dict[str, Any]:
+        """Parse HTML (preferably the raw bytes and their encoding) to extract player data, fixtures, and league position"""
+        root = make_tree(html, encoding)
         
         # Debug: Log all table IDs to see what's available
-        all_tables = soup.find_all('table')
+        all_tables = list(root.iter('table'))
         logger.info(f"🔍 Found tables: {len(all_tables)}")
         for i, table in enumerate(all_tables):
             table_id = table.get('id', 'no-id')
-            table_class = table.get('class', 'no-class')
+            table_class = table.get('class', 'no-class').split()
             logger.info(f"   Table {i + 1}: id=\"{table_id}\", class=\"{table_class}\"")
 
         return {
-            "squad": self.extract_squad_data(soup),
-            "pastFixtures": self.extract_past_fixtures(soup),
-            "leaguePosition": self.extract_league_position(soup),
+            "squad": self.extract_squad_data(root),
+            "pastFixtures": self.extract_past_fixtures(root),
+            "leaguePosition": self.extract_league_position(root),
         }
 
-    def extract_squad_data(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    @traced("parse.squad")
+    @timed(PARSE_SECONDS, "squad")
+    def extract_squad_data(self, root: lxml_html.HtmlElement) -> List[Dict[str, Any]]:
         """Extract squad data from the stats table"""
         players = []
         
         try:
-            # Find the correct stats table
-            stats_table = soup.find('table', id='stats_standard_17')
-            if not stats_table:
-                logger.warning("❌ No stats table found with id stats_standard_17")
-                return []
-            
-            tbody = stats_table.find('tbody')
-            if not tbody:
-                logger.warning("❌ No tbody found in stats table")
+            rows = _extract_standard_stats(root)
+            if not rows:
+                logger.warning("❌ No player rows found in stats table with id stats_standard_17")
                 return []
             
-            rows = tbody.find_all('tr')
-            logger.info(f"📊 Found {len(rows)} rows in stats table")
+            logger.info(f"📊 Found {len(rows)} player rows in stats table")
             
-            for index, row in enumerate(rows):
+            for row in rows:
                 try:
-                    # Always get player name from <th data-stat="player">
-                    th = row.find('th', {'data-stat': 'player'})
-                    if not th:
-                        continue
-                    
-                    name_cell = th.find('a')
-                    print(f"name cell is {name_cell}")
-                    if not name_cell:
+                    if row["matches"] <= 0:
                         continue
                     
-                    name = name_cell.get_text(strip=True)
-                    if not name or name in ["Squad Total", "Opponent Total"]:
-                        continue
-                    
-                    # All other stats are in <td> cells
-                    nation_cell = row.find('td', {'data-stat': 'nationality'})
-                    position_cell = row.find('td', {'data-stat': 'position'})
-                    age_cell = row.find('td', {'data-stat': 'age'})
-                    matches_cell = row.find('td', {'data-stat': 'games'})
-                    goals_cell = row.find('td', {'data-stat': 'goals'})
-                    assists_cell = row.find('td', {'data-stat': 'assists'})
-                    
-                    nationality = "Spain"
-                    if nation_cell:
-                        nation_text = nation_cell.get_text(strip=True)
-                        nationality = nation_text.split()[-1] if nation_text else "Spain"
+                    name = row["name"]
+                    nation_text = row["nationality"]
+                    nationality = nation_text.split()[-1] if nation_text else "Spain"
                     
-                    position = self.map_position(
-                        position_cell.get_text(strip=True) if position_cell else ""
-                    )
+                    # Extract player ID from the name link for direct FBRef image URL
+                    photo_url = None
+                    # Extract player ID from href like: /en/players/0f7dbaf6/Jokin-Ezkieta
+                    id_match = re.search(r'/en/players/([a-f0-9]+)/', row["player_href"] or "")
+                    if id_match:
+                        player_id = id_match.group(1)
+                        # Construct direct FBRef image URL
+                        photo_url = f"https://fbref.com/req/202302030/images/headshots/{player_id}_2022.jpg"
                     
-                    age = 25
-                    if age_cell:
-                        age_text = age_cell.get_text(strip=True)
-                        age_match = re.match(r'(\d+)', age_text)
-                        age = int(age_match.group(1)) if age_match else 25
-                    
-                    matches = 0
-                    if matches_cell:
-                        try:
-                            matches = int(matches_cell.get_text(strip=True))
-                        except ValueError:
-                            matches = 0
+                    # Fallback to local placeholder if no ID found
+                    if not photo_url:
+                        clean_name = re.sub(r'[^a-zA-Z0-9\s]', '', name)
+                        clean_name = clean_name.lower().replace(' ', '_')
+                        photo_url = f"/images/players/{clean_name}.jpg"
                     
-                    goals = 0
-                    if goals_cell:
-                        try:
-                            goals = int(goals_cell.get_text(strip=True))
-                        except ValueError:
-                            goals = 0
-                    
-                    assists = 0
-                    if assists_cell:
-                        try:
-                            assists = int(assists_cell.get_text(strip=True))
-                        except ValueError:
-                            assists = 0
-                    
-                    if matches > 0:
-                        # Extract player ID from the name link for direct FBRef image URL
-                        photo_url = None
-                        if name_cell and name_cell.get('href'):
-                            href = name_cell.get('href')
-                            # Extract player ID from href like: /en/players/0f7dbaf6/Jokin-Ezkieta
-                            id_match = re.search(r'/en/players/([a-f0-9]+)/', href)
-                            if id_match:
-                                player_id = id_match.group(1)
-                                # Construct direct FBRef image URL
-                                photo_url = f"https://fbref.com/req/202302030/images/headshots/{player_id}_2022.jpg"
-                        
-                        # Fallback to local placeholder if no ID found
-                        if not photo_url:
-                            clean_name = re.sub(r'[^a-zA-Z0-9\s]', '', name)
-                            clean_name = clean_name.lower().replace(' ', '_')
-                            photo_url = f"/images/players/{clean_name}.jpg"
-                        
-                        players.append({
-                            "id": index + 1,
-                            "name": name,
-                            "position": position,
-                            "age": age,
-                            "nationality": nationality,
-                            "photo": photo_url,
-                            "number": self.get_player_number(name),
-                            "matches": matches,
-                            "goals": goals,
-                            "assists": assists,
-                        })
+                    players.append({
+                        "id": row["row"] + 1,
+                        "name": name,
+                        "position": self.map_position(row["position"]),
+                        "age": row["age"],
+                        "nationality": nationality,
+                        "photo": photo_url,
+                        "number": self.get_player_number(name),
+                        "matches": row["matches"],
+                        "goals": row["goals"],
+                        "assists": row["assists"],
+                    })
                         
                 except Exception as error:
-                    logger.warning(f"Error parsing player row {index}: {str(error)}")
+                    logger.warning(f"Error parsing player row {row.get('row')}: {str(error)}")
             
             logger.info(f"👥 Extracted {len(players)} players from FBref using <th data-stat=\"player\">")
             if players:
@@ -482,179 +668,33 @@ class FBrefScraperService:
             logger.error(f"❌ Error extracting squad data: {str(error)}")
             return []
 
-    def extract_past_fixtures(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
-        """Extract past fixtures from the fixtures table using the correct table selector"""
+    @traced("parse.fixtures")
+    @timed(PARSE_SECONDS, "fixtures")
+    def extract_past_fixtures(self, root: lxml_html.HtmlElement) -> List[Dict[str, Any]]:
+        """Extract past fixtures from the fixtures table (#matchlogs_for, or the first similar table)"""
         fixtures = []
         
         try:
-            # Log table search for debugging
-            all_tables = soup.find_all('table')
-            logger.info(f"🔍 Found {len(all_tables)} tables in the page")
-            
-            # Use the correct table selector: #matchlogs_for
-            fixtures_table = soup.find('table', id='matchlogs_for')
-            if not fixtures_table:
-                logger.warning("❌ Fixtures table not found with id 'matchlogs_for'")
-                # Try alternative selectors
-                alternative_selectors = [
-                    'table[id*="matchlogs"]',
-                    'table[id*="results"]',
-                    'table[id*="fixtures"]',
-                    'table[id*="scores"]'
-                ]
-                for selector in alternative_selectors:
-                    alt_table = soup.select_one(selector)
-                    if alt_table:
-                        logger.info(f"✅ Found alternative table with selector: {selector}")
-                        fixtures_table = alt_table
-                        break
-                
-                if not fixtures_table:
-                    logger.warning("❌ No fixtures table found with any selector")
-                    return []
-            
-            tbody = fixtures_table.find('tbody')
-            if not tbody:
-                logger.warning("❌ No tbody found in fixtures table")
-                return []
-            
-            # Get all rows with data-row attribute, excluding header rows
-            rows = tbody.find_all('tr', attrs={'data-row': True})
+            rows = _extract_match_logs(root)
             logger.info(f"📊 Found {len(rows)} data rows in fixtures table")
-            
-            # If no rows with data-row, try all tr elements
             if not rows:
-                logger.info("🔍 No rows with data-row attribute, trying all tr elements")
-                rows = tbody.find_all('tr')
-                logger.info(f"📊 Found {len(rows)} total rows in fixtures table")
-            
-            count = 0
+                logger.warning("❌ No fixtures table found, or it has no rows")
+                return []
             
             # Get the last 3 completed fixtures (process in reverse order)
-            for i in range(len(rows) - 1, -1, -1):
-                if count >= 3:
+            for row in reversed(rows):
+                if len(fixtures) >= 3:
                     break
                     
-                row = rows[i]
                 try:
-                    # Skip header rows (rows with class "thead")
-                    if row.get('class') and 'thead' in row.get('class'):
-                        continue
-                    
-                    # Extract data using the correct data-stat attributes
-                    date_cell = row.find('th', {'data-stat': 'date'})
-                    time_cell = row.find('td', {'data-stat': 'start_time'})
-                    competition_cell = row.find('td', {'data-stat': 'comp'})
-                    round_cell = row.find('td', {'data-stat': 'round'})
-                    venue_cell = row.find('td', {'data-stat': 'venue'})
-                    result_cell = row.find('td', {'data-stat': 'result'})
-                    goals_for_cell = row.find('td', {'data-stat': 'goals_for'})
-                    goals_against_cell = row.find('td', {'data-stat': 'goals_against'})
-                    opponent_cell = row.find('td', {'data-stat': 'opponent'})
-                    attendance_cell = row.find('td', {'data-stat': 'attendance'})
-                    referee_cell = row.find('td', {'data-stat': 'referee'})
-                    
-                    # Try alternative data-stat attributes if the main ones don't work
-                    if not date_cell:
-                        date_cell = row.find('td', {'data-stat': 'date'})
-                    if not opponent_cell:
-                        opponent_cell = row.find('td', {'data-stat': 'team'})
-                    if not goals_for_cell:
-                        goals_for_cell = row.find('td', {'data-stat': 'gf'})
-                    if not goals_against_cell:
-                        goals_against_cell = row.find('td', {'data-stat': 'ga'})
-                    
-                    if not all([date_cell, opponent_cell, goals_for_cell, goals_against_cell]):
-                        continue
-                    
-                    date = date_cell.get_text(strip=True)
-                    
-                    # Extract opponent name and team ID from the link
-                    opponent_link = opponent_cell.find('a')
-                    if opponent_link:
-                        opponent = opponent_link.get_text(strip=True)
-                        opponent_href = opponent_link.get('href', '')
-                        # Extract team ID from href like: /en/squads/3640715c/CD-Mirandes-Stats
-                        opponent_id_match = re.search(r'/en/squads/([a-f0-9]+)/', opponent_href)
-                        opponent_team_id = opponent_id_match.group(1) if opponent_id_match else None
-                    else:
-                        opponent = opponent_cell.get_text(strip=True)
-                        opponent_team_id = None
-                    
-                    # Parse scores
-                    goals_for = None
-                    goals_against = None
-                    
-                    try:
-                        goals_for = int(goals_for_cell.get_text(strip=True))
-                    except (ValueError, AttributeError):
-                        pass
-                    
-                    try:
-                        goals_against = int(goals_against_cell.get_text(strip=True))
-                    except (ValueError, AttributeError):
-                        pass
-                    
+                    fixture = self.fixture_fields(row)
                     # Only include completed matches
-                    if goals_for is not None and goals_against is not None:
-                        # Determine if Racing was home or away
-                        venue = venue_cell.get_text(strip=True) if venue_cell else ""
-                        is_racing_home = venue.lower() == "home"
-                        
-                        # Set team names and logos based on venue
-                        racing_team_id = "dee3bbc8"  # Racing Santander's team ID from their URL
-                        racing_logo_url = f"https://cdn.ssref.net/req/202507211/tlogo/fb/{racing_team_id}.png"
-                        
-                        if opponent_team_id:
-                            opponent_logo_url = f"https://cdn.ssref.net/req/202507211/tlogo/fb/{opponent_team_id}.png"
-                        else:
-                            # Fallback to placeholder if team ID not found
-                            opponent_logo_url = f"/images/{opponent.lower().replace(' ', '').replace('de', '').replace('ñ', 'n')}.png"
-                        
-                        if is_racing_home:
-                            home_team = "Racing de Santander"
-                            away_team = opponent
-                            home_score = goals_for
-                            away_score = goals_against
-                            home_logo = racing_logo_url
-                            away_logo = opponent_logo_url
-                        else:
-                            home_team = opponent
-                            away_team = "Racing de Santander"
-                            home_score = goals_against
-                            away_score = goals_for
-                            home_logo = opponent_logo_url
-                            away_logo = racing_logo_url
-                        
-                        # Get additional data
-                        competition = competition_cell.get_text(strip=True) if competition_cell else "Segunda División"
-                        round_info = round_cell.get_text(strip=True) if round_cell else ""
-                        result = result_cell.get_text(strip=True) if result_cell else ""
-                        
-                        # Calculate result from Racing's perspective
-                        racing_result = self.calculate_result(home_score, away_score, is_racing_home)
-                        
-                        fixtures.append({
-                            "id": count + 1,
-                            "date": self.parse_date(date),
-                            "homeTeam": home_team,
-                            "awayTeam": away_team,
-                            "homeLogo": home_logo,
-                            "awayLogo": away_logo,
-                            "competition": competition,
-                            "round": round_info,
-                            "venue": "El Sardinero" if is_racing_home else "Away",
-                            "homeScore": home_score,
-                            "awayScore": away_score,
-                            "result": racing_result,
-                            "attendance": attendance_cell.get_text(strip=True) if attendance_cell else "",
-                            "referee": referee_cell.get_text(strip=True) if referee_cell else "",
-                        })
-                        
-                        count += 1
+                    if fixture is None:
+                        continue
+                    fixtures.append({"id": len(fixtures) + 1, **fixture})
                         
                 except Exception as error:
-                    logger.warning(f"Error parsing fixture row {i}: {str(error)}")
+                    logger.warning(f"Error parsing fixture row {row.get('date')}: {str(error)}")
             
             logger.info(f"⚽ Extracted {len(fixtures)} fixtures from FBref using table id 'matchlogs_for'")
             
@@ -672,11 +712,139 @@ class FBrefScraperService:
             logger.error(f"❌ Error extracting past fixtures: {str(error)}")
             return []
 
-    def extract_league_position(self, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+    def iter_fixture_history(self, root: lxml_html.HtmlElement, after: Optional[date] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield the completed fixtures of the match log, oldest first, in
+        the pastFixtures format (without ids).
+
+        With `after`, the log is read from its newest row backwards and reading
+        stops at the first match on or before that date, so only the rows of
+        newer matches are ever converted.
+        """
+        if after is None:
+            for row in _iter_match_logs(root):
+                fixture = self._history_fixture(row)
+                if fixture is not None:
+                    yield fixture
+            return
+
+        newer = []
+        for row in _iter_match_logs(root, reverse=True):
+            try:
+                played_on = date.fromisoformat(row["date"])
+            except ValueError:
+                logger.warning(f"Skipping fixture row with unparseable date {row['date']!r}")
+                continue
+            if played_on <= after:
+                break
+            fixture = self._history_fixture(row)
+            if fixture is not None:
+                newer.append(fixture)
+        logger.info(f"⚽ {len(newer)} completed fixtures after {after.isoformat()}")
+        yield from reversed(newer)
+
+    def _history_fixture(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            return self.fixture_fields(row)
+        except Exception as error:
+            logger.warning(f"Error parsing fixture row {row.get('date')}: {str(error)}")
+            return None
+
+    def fixture_fields(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fixture dict (pastFixtures format, without the id) for a MATCH_LOGS row, or None if the match is unplayed"""
+        goals_for = row["goals_for"]
+        goals_against = row["goals_against"]
+        
+        if goals_for is None or goals_against is None:
+            return None
+        
+        opponent = row["opponent"]
+        # Extract team ID from href like: /en/squads/3640715c/CD-Mirandes-Stats
+        opponent_id_match = re.search(r'/en/squads/([a-f0-9]+)/', row["opponent_href"] or "")
+        opponent_team_id = opponent_id_match.group(1) if opponent_id_match else None
+        
+        # Determine if Racing was home or away
+        is_racing_home = row["venue"].lower() == "home"
+        
+        # Set team names and logos based on venue
+        racing_team_id = "dee3bbc8"  # Racing Santander's team ID from their URL
+        racing_logo_url = f"https://cdn.ssref.net/req/202507211/tlogo/fb/{racing_team_id}.png"
+        
+        if opponent_team_id:
+            opponent_logo_url = f"https://cdn.ssref.net/req/202507211/tlogo/fb/{opponent_team_id}.png"
+        else:
+            # Fallback to placeholder if team ID not found
+            opponent_logo_url = f"/images/{opponent.lower().replace(' ', '').replace('de', '').replace('ñ', 'n')}.png"
+        
+        if is_racing_home:
+            home_team = "Racing de Santander"
+            away_team = opponent
+            home_score = goals_for
+            away_score = goals_against
+            home_logo = racing_logo_url
+            away_logo = opponent_logo_url
+        else:
+            home_team = opponent
+            away_team = "Racing de Santander"
+            home_score = goals_against
+            away_score = goals_for
+            home_logo = opponent_logo_url
+            away_logo = racing_logo_url
+        
+        # Calculate result from Racing's perspective
+        racing_result = self.calculate_result(home_score, away_score, is_racing_home)
+        
+        return {
+            "date": self.parse_date(row["date"]),
+            "homeTeam": home_team,
+            "awayTeam": away_team,
+            "homeLogo": home_logo,
+            "awayLogo": away_logo,
+            "competition": row["competition"],
+            "round": row["round"],
+            "venue": "El Sardinero" if is_racing_home else "Away",
+            "homeScore": home_score,
+            "awayScore": away_score,
+            "result": racing_result,
+            "attendance": row["attendance"],
+            "referee": row["referee"],
+        }
+
+    @traced("parse.league_table")
+    @timed(PARSE_SECONDS, "league_table")
+    def extract_league_table(self, root: lxml_html.HtmlElement) -> List[Dict[str, Any]]:
+        """Every team's row of the league table (rank, games, wins/ties/losses, goals, points)"""
+        rows = _extract_league_table(root)
+        for row in rows:
+            row["team_id"] = squad_id(row.pop("team_href"))
+        return rows
+
+    def extract_remaining_fixtures(self, root: lxml_html.HtmlElement) -> List[Dict[str, Any]]:
+        """Racing's unplayed league fixtures (match log rows of a matchweek without a score), oldest first"""
+        return [
+            {
+                "date": row["date"],
+                "opponent": row["opponent"],
+                "opponentId": squad_id(row["opponent_href"]),
+                "home": row["venue"].lower() == "home",
+            }
+            for row in _iter_match_logs(root)
+            if row["goals_for"] is None and row["round"].startswith("Matchweek")
+        ]
+
+    @traced("parse.stats_table")
+    def extract_stats_table(self, root: lxml_html.HtmlElement, table: str) -> List[Dict[str, Any]]:
+        """Extract one of the STATS_TABLES (standard, shooting, passing, keeper) as raw per-player rows"""
+        with PARSE_SECONDS.time(table):
+            return _stats_extractors[table](root)
+
+    @traced("parse.standings")
+    @timed(PARSE_SECONDS, "standings")
+    def extract_league_position(self, root: lxml_html.HtmlElement) -> Optional[Dict[str, Any]]:
         """Extract league position from the standings info"""
         try:
-            # Look for league position in the page content
-            page_text = soup.get_text()
+            # Look for league position in the page content (comments excluded)
+            page_text = root.xpath("string()")
             
             # Extract position from text like "5th in Segunda División"
             position_match = re.search(r'(\d+)(?:st|nd|rd|th)\s+in\s+Segunda\s+División', page_text)
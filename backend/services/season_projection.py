@@ -0,0 +1,305 @@
+"""
+Monte Carlo projection of the rest of the league season.
+
+Team strengths come from the league table (goals scored and conceded per
+match, shrunk towards the league average) and give every remaining match a
+win/draw/loss probability through independent Poisson scorelines. The season
+is then played out thousands of times in NumPy, all simulations at once:
+
+- Racing's own remaining fixtures are known (the match log) and drawn one
+  by one, so both sides of each match get their points.
+- Other teams' remaining matches are not on the page. Each is drawn against
+  an opponent picked uniformly at random, which for one team's points is the
+  same as drawing its results from its average win/draw/loss probabilities -
+  two binomial draws (wins, then draws among the rest) for all teams at once.
+
+Final tables are ranked by points, then current goal difference, then at
+random. Large runs are split into chunks with independent seeds and spread
+over a process pool.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from monitoring.metrics import ANALYTICS_QUERY_SECONDS
+from services.player_stats import content_version
+
+logger = logging.getLogger(__name__)
+
+# Goals per match are scaled by this at home and divided by it away
+HOME_ADVANTAGE = 1.12
+# Pseudo-matches at the league average added to every team's record, so early-season rates don't run wild
+PRIOR_MATCHES = 5
+# Scorelines up to this many goals per side are summed for the outcome probabilities
+MAX_GOALS = 10
+
+# Finishing positions per zone for a 22-team Segunda División; the last four are relegated
+PROMOTION = (1, 2)
+PLAYOFFS = (3, 6)
+RELEGATED = 4
+
+
+def outcome_probabilities(home_rate: np.ndarray, away_rate: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(P(home win), P(draw)) for independent Poisson scores with the given means"""
+    goals = np.arange(MAX_GOALS + 1)
+    log_factorial = np.array([math.lgamma(k + 1) for k in goals])
+
+    def pmf(rate):
+        rate = np.asarray(rate, dtype=np.float64)[..., None]
+        return np.exp(goals * np.log(rate) - rate - log_factorial)
+
+    joint = pmf(home_rate)[..., :, None] * pmf(away_rate)[..., None, :]
+    home_win = np.tril(joint, -1).sum(axis=(-2, -1))
+    draw = np.trace(joint, axis1=-2, axis2=-1)
+    return home_win, draw
+
+
+@dataclass
+class SeasonModel:
+    """Everything a simulation needs, as plain arrays (picklable for the process pool)"""
+
+    teams: List[str]
+    team: int                       # index of the projected team
+    points: np.ndarray              # current points per team
+    goal_difference: np.ndarray     # current goal difference per team (tie-break)
+    # Known fixtures: home/away team indices and outcome probabilities
+    home: np.ndarray
+    away: np.ndarray
+    p_home: np.ndarray
+    p_draw: np.ndarray
+    # Matches against unknown opponents per team, with average win/draw probabilities
+    open_matches: np.ndarray
+    p_win: np.ndarray
+    p_tie: np.ndarray
+
+
+def _value(row: Dict[str, Any], key: str) -> int:
+    return row.get(key) or 0
+
+
+def build_model(table: List[Dict[str, Any]], remaining: List[Dict[str, Any]], team_id: str) -> SeasonModel:
+    """
+    Model the rest of the season from league table rows (services/table_schema.py,
+    LEAGUE_TABLE, with team_id) and the projected team's unplayed fixtures.
+    Raises ValueError when the team is not in the table.
+    """
+    teams = [row["team"] for row in table]
+    size = len(teams)
+    by_id = {row["team_id"]: position for position, row in enumerate(table) if row.get("team_id")}
+    by_name = {row["team"]: position for position, row in enumerate(table)}
+    if team_id not in by_id:
+        raise ValueError(f"Team {team_id} is not in the league table")
+    team = by_id[team_id]
+
+    games = np.array([_value(row, "games") for row in table], dtype=np.float64)
+    scored = np.array([_value(row, "goals_for") for row in table], dtype=np.float64)
+    conceded = np.array([_value(row, "goals_against") for row in table], dtype=np.float64)
+    average = scored.sum() / games.sum() if games.sum() else 1.3
+    attack = (scored + PRIOR_MATCHES * average) / (games + PRIOR_MATCHES) / average
+    defence = (conceded + PRIOR_MATCHES * average) / (games + PRIOR_MATCHES) / average
+
+    # Every pairing with i at home to j: expected goals of each side, then the outcome odds
+    home_rate = average * HOME_ADVANTAGE * attack[:, None] * defence[None, :]
+    away_rate = average / HOME_ADVANTAGE * attack[None, :] * defence[:, None]
+    p_home_matrix, p_draw_matrix = outcome_probabilities(home_rate, away_rate)
+
+    # Known fixtures of the projected team (opponents matched by squad id, else name)
+    home, away = [], []
+    for fixture in remaining:
+        opponent = by_id.get(fixture.get("opponentId"), by_name.get(fixture.get("opponent")))
+        if opponent is None or opponent == team:
+            logger.warning(f"Skipping fixture against {fixture.get('opponent')}: not in the league table")
+            continue
+        home.append(team if fixture["home"] else opponent)
+        away.append(opponent if fixture["home"] else team)
+    home = np.array(home, dtype=np.intp)
+    away = np.array(away, dtype=np.intp)
+
+    # Everyone else's remaining matches: a double round robin minus games played and the known fixtures
+    season_games = 2 * (size - 1)
+    open_matches = np.maximum(season_games - games, 0).astype(np.int64)
+    open_matches[team] = 0
+    np.subtract.at(open_matches, home[home != team], 1)
+    np.subtract.at(open_matches, away[away != team], 1)
+    open_matches = np.maximum(open_matches, 0)
+
+    # Average result against a random opponent (not itself, not the projected team), home or away
+    others = np.ones((size, size), dtype=bool)
+    np.fill_diagonal(others, False)
+    others[:, team] = False
+    count = np.maximum(others.sum(axis=1), 1)
+    p_draw_away = p_draw_matrix.T
+    p_win = ((p_home_matrix * others).sum(axis=1) + ((1 - p_home_matrix - p_draw_matrix).T * others).sum(axis=1)) / (2 * count)
+    p_tie = ((p_draw_matrix * others).sum(axis=1) + (p_draw_away * others).sum(axis=1)) / (2 * count)
+
+    return SeasonModel(
+        teams=teams,
+        team=team,
+        points=np.array([_value(row, "points") for row in table], dtype=np.int64),
+        goal_difference=(scored - conceded).astype(np.int64),
+        home=home,
+        away=away,
+        p_home=p_home_matrix[home, away],
+        p_draw=p_draw_matrix[home, away],
+        open_matches=open_matches,
+        p_win=p_win,
+        p_tie=p_tie,
+    )
+
+
+def simulate(model: SeasonModel, simulations: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Play out the season `simulations` times.
+    Returns (position counts: teams x positions, summed final points per team).
+    """
+    rng = np.random.default_rng(seed)
+    size = len(model.teams)
+    points = np.broadcast_to(model.points, (simulations, size)).copy()
+
+    # Known fixtures: one uniform draw per match decides home win / draw / away win
+    if len(model.home):
+        draws = rng.random((simulations, len(model.home)))
+        home_win = draws < model.p_home
+        draw = ~home_win & (draws < model.p_home + model.p_draw)
+        home_points = np.where(home_win, 3.0, draw)
+        away_points = np.where(home_win | draw, draw, 3.0)
+        # One-hot team incidence, so the points land on each team with two (BLAS) matrix products
+        incidence_home = np.zeros((len(model.home), size))
+        incidence_home[np.arange(len(model.home)), model.home] = 1
+        incidence_away = np.zeros((len(model.away), size))
+        incidence_away[np.arange(len(model.away)), model.away] = 1
+        points += (home_points @ incidence_home + away_points @ incidence_away).astype(np.int64)
+
+    # Unknown opponents: wins, then draws among the rest, for every team in two binomial draws
+    wins = rng.binomial(model.open_matches, model.p_win, size=(simulations, size))
+    tie_given_no_win = np.divide(model.p_tie, 1 - model.p_win, out=np.zeros(size), where=model.p_win < 1)
+    ties = rng.binomial(model.open_matches - wins, np.minimum(tie_given_no_win, 1.0))
+    points += 3 * wins + ties
+
+    # Rank by points, then goal difference, then at random (the fractions never outweigh a point)
+    keys = points + (model.goal_difference + 1000) * 1e-4 + rng.random((simulations, size)) * 1e-6
+    order = np.argsort(-keys, axis=1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(size), axis=1)
+
+    counts = np.bincount((np.arange(size) * size + positions).ravel(), minlength=size * size).reshape(size, size)
+    return counts, points.sum(axis=0)
+
+
+def _chunks(simulations: int, parts: int) -> List[int]:
+    base, extra = divmod(simulations, parts)
+    return [base + (1 if part < extra else 0) for part in range(parts) if base or part < extra]
+
+
+def summarize(model: SeasonModel, counts: np.ndarray, point_totals: np.ndarray, simulations: int) -> Dict[str, Any]:
+    """Position distribution and zone odds for the projected team, plus every team's odds"""
+    size = len(model.teams)
+    probabilities = counts / simulations
+
+    def zone(first: int, last: int) -> np.ndarray:
+        return probabilities[:, first - 1:last].sum(axis=1)
+
+    promotion = zone(*PROMOTION)
+    playoffs = zone(*PLAYOFFS)
+    relegation = zone(size - RELEGATED + 1, size)
+    expected_points = point_totals / simulations
+    team = model.team
+
+    return {
+        "team": model.teams[team],
+        "simulations": simulations,
+        "positions": {str(position + 1): round(float(p), 4) for position, p in enumerate(probabilities[team]) if p > 0},
+        "expectedPosition": round(float((probabilities[team] * np.arange(1, size + 1)).sum()), 2),
+        "expectedPoints": round(float(expected_points[team]), 1),
+        "promotion": round(float(promotion[team]), 4),
+        "playoffs": round(float(playoffs[team]), 4),
+        "relegation": round(float(relegation[team]), 4),
+        "remainingFixtures": int(len(model.home)),
+        "table": [
+            {
+                "team": name,
+                "points": int(model.points[position]),
+                "expectedPoints": round(float(expected_points[position]), 1),
+                "promotion": round(float(promotion[position]), 4),
+                "playoffs": round(float(playoffs[position]), 4),
+                "relegation": round(float(relegation[position]), 4),
+            }
+            for position, name in enumerate(model.teams)
+        ],
+    }
+
+
+class SeasonProjectionService:
+    """Projects the season from the scraped league table, cached per table content"""
+
+    def __init__(self, scraper_service, workers: int = 4, parallel_threshold: int = 50000):
+        self.scraper_service = scraper_service
+        self.workers = workers
+        # Below this many simulations the pool's overhead outweighs the split
+        self.parallel_threshold = parallel_threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Smaller runs stay in this process, on threads of their own rather than the default executor
+        self._thread_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="projection")
+        self._cache: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned rather than forked: the server process runs threads and an event loop
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def close(self):
+        self._thread_executor.shutdown(wait=False, cancel_futures=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, model: SeasonModel, simulations: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+        loop = asyncio.get_running_loop()
+        if self.workers <= 1 or simulations < self.parallel_threshold:
+            return await loop.run_in_executor(self._thread_executor, simulate, model, simulations, seed)
+
+        seeds = np.random.SeedSequence(seed).spawn(self.workers)
+        executor = self._get_executor()
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(executor, simulate, model, chunk, child.generate_state(1)[0])
+            for chunk, child in zip(_chunks(simulations, self.workers), seeds)
+        ))
+        counts = sum(part[0] for part in parts)
+        point_totals = sum(part[1] for part in parts)
+        return counts, point_totals
+
+    async def get_projection(self, simulations: int = 10000) -> Dict[str, Any]:
+        state = await self.scraper_service.fetch_season_state()
+        if not state["isLive"] or not state["table"]:
+            return {"success": False, "error": "League table is unavailable"}
+
+        # Versioned by content: a re-downloaded but unchanged table is not simulated again
+        version = content_version({"table": state["table"], "remainingFixtures": state["remainingFixtures"]})
+        key = (version, simulations)
+        if key in self._cache:
+            return {"success": True, "data": self._cache[key]}
+
+        try:
+            model = build_model(state["table"], state["remainingFixtures"], state["teamId"])
+        except ValueError as error:
+            return {"success": False, "error": str(error)}
+
+        with ANALYTICS_QUERY_SECONDS.time("season_projection"):
+            # Seeded by the version, so the same table always projects the same way
+            counts, point_totals = await self._run(model, simulations, version)
+        projection = {"version": version, **summarize(model, counts, point_totals, simulations)}
+
+        # Only the current version is worth keeping
+        self._cache = {cached: value for cached, value in self._cache.items() if cached[0] == version}
+        self._cache[key] = projection
+        logger.info(f"🎲 Projected season over {simulations} simulations: promotion {projection['promotion']:.1%}, "
+                    f"play-offs {projection['playoffs']:.1%}")
+        return {"success": True, "data": projection}
@@ -0,0 +1,120 @@
+"""
+What changed between two archived scrapes.
+
+A version is a scrape time (ms). Any timestamp resolves to the latest
+archived scrape at or before it, so "since yesterday" works without knowing
+the exact version ids (GET /analytics/archive/{data_type} lists them).
+Squad and standings partitions are full snapshots. Fixture partitions hold
+the matches each refresh appended, so the fixtures at a version are every
+partition up to it merged by match.
+
+Records are matched on their natural key (player name; date and teams for a
+match) and compared field by field. Archived partitions never change, so a
+diff between two resolved versions is cached as it is.
+"""
+
+import logging
+import math
+import threading
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+from monitoring.metrics import ANALYTICS_QUERY_SECONDS
+from services.scrape_archive import DATA_TYPES, Partition, ScrapeArchive
+
+logger = logging.getLogger(__name__)
+
+RECORD_KEYS: Dict[str, Tuple[str, ...]] = {
+    "players": ("name",),
+    "fixtures": ("date", "homeTeam", "awayTeam"),
+    "standings": (),
+}
+# Data types whose partitions only hold what each refresh added
+APPEND_ONLY = {"fixtures"}
+CACHE_SIZE = 128
+
+
+def _rows(partition: Partition) -> List[Dict[str, Any]]:
+    """A partition's records as dicts (NaN back to None)"""
+    columns = {name: values.tolist() for name, values in partition.read().items()}
+    size = len(next(iter(columns.values()))) if columns else 0
+    return [
+        {name: None if isinstance(values[row], float) and math.isnan(values[row]) else values[row]
+         for name, values in columns.items()}
+        for row in range(size)
+    ]
+
+
+def diff_records(before: Dict[Tuple, Dict[str, Any]], after: Dict[Tuple, Dict[str, Any]],
+                 key_fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Added, removed and changed records (with only their changed fields) between two keyed snapshots"""
+    changed = []
+    for key in before.keys() & after.keys():
+        old, new = before[key], after[key]
+        fields = {
+            name: {"from": old.get(name), "to": new.get(name)}
+            for name in dict.fromkeys([*old, *new])
+            if old.get(name) != new.get(name)
+        }
+        if fields:
+            changed.append({"key": dict(zip(key_fields, key)), "fields": fields})
+    changed.sort(key=lambda change: tuple(str(value) for value in change["key"].values()))
+    return {
+        "added": [after[key] for key in sorted(after.keys() - before.keys(), key=str)],
+        "removed": [before[key] for key in sorted(before.keys() - after.keys(), key=str)],
+        "changed": changed,
+        "unchanged": len(before.keys() & after.keys()) - len(changed),
+    }
+
+
+class SnapshotDiffService:
+    """Server-side diffs between archived versions of one club's data"""
+
+    def __init__(self, archive: Optional[ScrapeArchive], club: str):
+        self.archive = archive
+        self.club = club
+        self._cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+        # Diffs are served from the threadpool; concurrent misses may compute a diff twice, but never corrupt the cache
+        self._lock = threading.Lock()
+
+    def _records(self, data_type: str, partitions: List[Partition], position: int) -> Dict[Tuple, Dict[str, Any]]:
+        """Keyed records of the version at `position` in the partition list"""
+        key_fields = RECORD_KEYS[data_type]
+        sources = partitions[:position + 1] if data_type in APPEND_ONLY else [partitions[position]]
+        records = {}
+        for partition in sources:
+            for row in _rows(partition):
+                records[tuple(row.get(field) for field in key_fields)] = row
+        return records
+
+    def get_diff(self, data_type: str, since: int, until: Optional[int] = None) -> Dict[str, Any]:
+        if data_type not in DATA_TYPES:
+            return {"success": False, "bad_request": True,
+                    "error": f"Unknown data type '{data_type}' ({', '.join(DATA_TYPES)})"}
+        if self.archive is None:
+            return {"success": False, "error": "The scrape archive is disabled (set ARCHIVE_DIR)"}
+
+        partitions = self.archive.partitions(data_type, self.club)
+        versions = [partition.scraped_at for partition in partitions]
+        positions = []
+        for moment in (since, until if until is not None else versions[-1] if versions else since):
+            position = bisect_right(versions, moment) - 1
+            if position < 0:
+                return {"success": False, "not_found": True, "error": f"No {data_type} scrape archived at or before {moment}"}
+            positions.append(position)
+        start, end = positions
+        key = (data_type, versions[start], versions[end])
+
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is None:
+            with ANALYTICS_QUERY_SECONDS.time("snapshot_diff"):
+                diff = diff_records(self._records(data_type, partitions, start),
+                                    self._records(data_type, partitions, end), RECORD_KEYS[data_type])
+            cached = {"dataType": data_type, "from": versions[start], "to": versions[end], **diff}
+            with self._lock:
+                if key not in self._cache and len(self._cache) >= CACHE_SIZE:
+                    # Oldest entry first (dicts keep insertion order)
+                    del self._cache[next(iter(self._cache))]
+                self._cache[key] = cached
+        return {"success": True, "data": cached}
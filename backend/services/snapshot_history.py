@@ -0,0 +1,195 @@
+"""
+Compact time series of the standings and player stats across refreshes.
+
+The database keeps one standings row and one row per player, overwritten
+on every refresh. Here each series (the standings, or one player) is an
+append-only binary file of fixed-size records:
+
+    (time delta in ms: int64, value deltas: int32 x fields)
+
+A record is written only when a value changed since the previous one, so a
+season of hourly refreshes stores one record per match day, not per scrape.
+Reading is one np.fromfile and a cumulative sum. Range queries cut the
+decoded arrays with a binary search and downsample on the server: for more
+points than asked, each time bucket keeps its last change, which is exact
+for these step-shaped series, so a chart response stays small whatever the
+length of the history.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from monitoring.metrics import ANALYTICS_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+STANDINGS_FIELDS = ("position", "points", "played", "won", "drawn", "lost", "goalDifference")
+PLAYER_FIELDS = ("matches", "goals", "assists")
+DEFAULT_POINTS = 200
+
+
+def _record_dtype(fields: int) -> np.dtype:
+    return np.dtype([("time", "<i8"), ("values", "<i4", (fields,))])
+
+
+def downsample(times: np.ndarray, values: np.ndarray, start: int, end: int,
+               points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """At most `points` samples of a step series over [start, end]: the last change in each time bucket"""
+    if len(times) <= points:
+        return times, values
+    edges = np.linspace(start, end, points + 1)[1:]
+    last = np.unique(np.searchsorted(times, edges, side="right") - 1)
+    last = last[last >= 0]
+    return times[last], values[last]
+
+
+class SeriesFile:
+    """One delta-encoded series on disk, with its last values kept in memory"""
+
+    def __init__(self, path: str, fields: Sequence[str]):
+        self.path = path
+        self.fields = tuple(fields)
+        self.dtype = _record_dtype(len(self.fields))
+        self._last: Optional[Tuple[int, np.ndarray]] = None
+        self._loaded = False
+
+    def read(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(times in ms, values: points x fields), decoded"""
+        if not os.path.exists(self.path):
+            return np.empty(0, dtype=np.int64), np.empty((0, len(self.fields)), dtype=np.int64)
+        records = np.fromfile(self.path, dtype=self.dtype)
+        times = np.cumsum(records["time"].astype(np.int64))
+        values = np.cumsum(records["values"].astype(np.int64), axis=0)
+        return times, values
+
+    def _ensure_last(self):
+        if not self._loaded:
+            times, values = self.read()
+            self._last = (int(times[-1]), values[-1]) if len(times) else None
+            self._loaded = True
+
+    def append(self, time_ms: int, values: Sequence[int]) -> bool:
+        """Store a snapshot if any value changed; False for unchanged or out-of-order snapshots"""
+        self._ensure_last()
+        current = np.asarray(values, dtype=np.int64)
+        if self._last is not None:
+            last_time, last_values = self._last
+            if time_ms <= last_time or np.array_equal(current, last_values):
+                return False
+            record = np.array([(time_ms - last_time, current - last_values)], dtype=self.dtype)
+        else:
+            record = np.array([(time_ms, current)], dtype=self.dtype)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "ab") as handle:
+            handle.write(record.tobytes())
+        self._last = (time_ms, current)
+        return True
+
+
+class SnapshotHistory:
+    """The standings series and one series per player under `root`"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._series: Dict[str, SeriesFile] = {}
+        os.makedirs(os.path.join(root, "players"), exist_ok=True)
+        self._players_file = os.path.join(root, "players.json")
+        self._players = self._load_players()
+
+    def _load_players(self) -> Dict[str, str]:
+        """Player name -> series file name"""
+        try:
+            with open(self._players_file, encoding="utf-8") as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return {}
+
+    def _series_file(self, name: str, fields: Sequence[str]) -> SeriesFile:
+        if name not in self._series:
+            self._series[name] = SeriesFile(os.path.join(self.root, f"{name}.bin"), fields)
+        return self._series[name]
+
+    def standings(self) -> SeriesFile:
+        return self._series_file("standings", STANDINGS_FIELDS)
+
+    def player(self, name: str, create: bool = False) -> Optional[SeriesFile]:
+        if name not in self._players:
+            if not create:
+                return None
+            slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+            self._players[name] = f"{slug}-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+            with open(self._players_file, "w", encoding="utf-8") as handle:
+                json.dump(self._players, handle)
+        return self._series_file(f"players/{self._players[name]}", PLAYER_FIELDS)
+
+    def record_standings(self, league_position: Dict[str, Any], time_ms: int) -> bool:
+        if any(league_position.get(field) is None for field in STANDINGS_FIELDS):
+            return False
+        return self.standings().append(time_ms, [league_position[field] for field in STANDINGS_FIELDS])
+
+    def record_players(self, squad: List[Dict[str, Any]], time_ms: int) -> int:
+        """Append each player whose stats changed; returns how many did"""
+        changed = 0
+        for player in squad:
+            if not player.get("name"):
+                continue
+            values = [int(player.get(field) or 0) for field in PLAYER_FIELDS]
+            changed += self.player(player["name"], create=True).append(time_ms, values)
+        return changed
+
+    def players(self) -> List[str]:
+        return sorted(self._players)
+
+
+def series_response(series: SeriesFile, since: Optional[int], until: Optional[int],
+                    points: int) -> Dict[str, Any]:
+    """Columnar range of a series: times plus one list per field, downsampled to `points`"""
+    times, values = series.read()
+    start = np.searchsorted(times, since, side="left") if since is not None else 0
+    end = np.searchsorted(times, until, side="right") if until is not None else len(times)
+    times, values = times[start:end], values[start:end]
+    stored = len(times)
+    if stored:
+        times, values = downsample(times, values, since if since is not None else int(times[0]),
+                                   until if until is not None else int(times[-1]), points)
+    return {
+        "stored": stored,
+        "returned": len(times),
+        "times": times.tolist(),
+        **{field: values[:, column].tolist() for column, field in enumerate(series.fields)},
+    }
+
+
+class SnapshotHistoryService:
+    """Range queries over the snapshot history"""
+
+    def __init__(self, history: Optional[SnapshotHistory]):
+        self.history = history
+
+    def _unavailable(self) -> Dict[str, Any]:
+        return {"success": False, "error": "Snapshot history is disabled (set HISTORY_DIR)"}
+
+    def get_standings(self, since: Optional[int] = None, until: Optional[int] = None,
+                      points: int = DEFAULT_POINTS) -> Dict[str, Any]:
+        if self.history is None:
+            return self._unavailable()
+        with ANALYTICS_QUERY_SECONDS.time("standings_history"):
+            data = series_response(self.history.standings(), since, until, points)
+        return {"success": True, "data": data}
+
+    def get_player(self, name: str, since: Optional[int] = None, until: Optional[int] = None,
+                   points: int = DEFAULT_POINTS) -> Dict[str, Any]:
+        if self.history is None:
+            return self._unavailable()
+        series = self.history.player(name)
+        if series is None:
+            return {"success": False, "not_found": True, "error": f"No stat history for {name}"}
+        with ANALYTICS_QUERY_SECONDS.time("player_history"):
+            data = series_response(series, since, until, points)
+        return {"success": True, "data": {"player": name, **data}}
@@ -0,0 +1,327 @@
+"""
+League standings derived from the stored match results.
+
+Each club keeps running counters (played, won, drawn, lost, goals for and
+against), so a new result is two counter updates rather than a recount of
+the season. Results are also indexed by pair of clubs, which is all the
+head-to-head tie-break needs: clubs level on points are ordered by a
+mini-league of the matches between them (points, then goal difference),
+then by overall goal difference, goals scored and name.
+
+After each match day the counters are copied into a compact int32 snapshot,
+so "the table as of date X" is a binary search plus a sort of one small
+array instead of a replay. Snapshots only grow at the end, since results are
+applied in date order with the same once-only bookkeeping as the ratings.
+
+The fixtures table keeps every season, so the service holds one engine per
+season (July to June): a table never adds two seasons together. The derived
+table covers the clubs and matches in the fixtures table; the cross-check
+compares the latest season's table with the scraped standings for the
+tracked club.
+"""
+
+import logging
+from bisect import bisect_right
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from monitoring.metrics import ANALYTICS_QUERY_SECONDS
+from services.team_ratings import Result, result_from_fixture
+
+logger = logging.getLogger(__name__)
+
+LEAGUE_COMPETITION = "Segunda División"
+FIXTURE_FIELDS = ["id", "fixture_date", "home_team", "away_team", "home_score", "away_score", "competition"]
+
+# Counter columns of a snapshot row
+PLAYED, WON, DRAWN, LOST, GOALS_FOR, GOALS_AGAINST = range(6)
+POINTS_FOR = {WON: 3, DRAWN: 1, LOST: 0}
+
+
+def season_of(played_on: str) -> str:
+    """Season of an ISO match date: seasons run July to June, e.g. "2024-2025" """
+    year, month = int(played_on[:4]), int(played_on[5:7])
+    start = year if month >= 7 else year - 1
+    return f"{start}-{start + 1}"
+
+
+def _outcome(goals_for: int, goals_against: int) -> int:
+    return WON if goals_for > goals_against else DRAWN if goals_for == goals_against else LOST
+
+
+class StandingsEngine:
+    """Per-club counters, the head-to-head index and per-match-day snapshots"""
+
+    def __init__(self, competition: Optional[str] = LEAGUE_COMPETITION):
+        self.competition = competition
+        self.reset()
+
+    def reset(self):
+        self.clubs: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.counters = np.zeros((0, 6), dtype=np.int32)
+        # (club a, club b) with a < b -> results between them, in date order
+        self.pairs: Dict[Tuple[str, str], List[Result]] = {}
+        self.snapshot_dates: List[str] = []
+        self.snapshots: List[np.ndarray] = []
+        self.last_date: Optional[str] = None
+        self._applied_on_last_date: Set[Tuple[str, str, str]] = set()
+
+    def __len__(self) -> int:
+        return len(self.clubs)
+
+    def counts(self, result: Result) -> bool:
+        """Whether a result belongs to the league (unlabelled rows are assumed to)"""
+        return self.competition is None or result.competition in (None, self.competition)
+
+    def _club(self, name: str) -> int:
+        if name not in self.index:
+            self.index[name] = len(self.clubs)
+            self.clubs.append(name)
+            self.counters = np.vstack([self.counters, np.zeros((1, 6), dtype=np.int32)])
+        return self.index[name]
+
+    def apply(self, result: Result) -> bool:
+        """
+        Fold one result into the counters. Results must arrive in date order;
+        ones dated before the last applied day, already applied, or from
+        another competition are skipped (returns False).
+        """
+        if not self.counts(result):
+            return False
+        if self.last_date is not None:
+            if result.played_on < self.last_date:
+                return False
+            if result.played_on == self.last_date and result.key in self._applied_on_last_date:
+                return False
+        if result.played_on != self.last_date:
+            self.last_date = result.played_on
+            self._applied_on_last_date = set()
+        self._applied_on_last_date.add(result.key)
+
+        for club, goals_for, goals_against in ((result.home, result.home_goals, result.away_goals),
+                                               (result.away, result.away_goals, result.home_goals)):
+            position = self._club(club)
+            row = self.counters[position]
+            row[PLAYED] += 1
+            row[_outcome(goals_for, goals_against)] += 1
+            row[GOALS_FOR] += goals_for
+            row[GOALS_AGAINST] += goals_against
+        self.pairs.setdefault(tuple(sorted((result.home, result.away))), []).append(result)
+        return True
+
+    def _snapshot(self):
+        """Store the counters as the table at the end of last_date (replacing that day's earlier copy)"""
+        if self.last_date is None:
+            return
+        if self.snapshot_dates and self.snapshot_dates[-1] == self.last_date:
+            self.snapshots[-1] = self.counters.copy()
+        else:
+            self.snapshot_dates.append(self.last_date)
+            self.snapshots.append(self.counters.copy())
+
+    def apply_all(self, results: Iterable[Result]) -> int:
+        """Apply results in date order, snapshotting after each match day; returns how many were new"""
+        applied = 0
+        ordered = sorted(results, key=lambda result: result.played_on)
+        for _, day in groupby(ordered, key=lambda result: result.played_on):
+            day_applied = sum(self.apply(result) for result in day)
+            if day_applied:
+                self._snapshot()
+            applied += day_applied
+        return applied
+
+    def rebuild(self, results: Iterable[Result]) -> int:
+        """Forget everything and replay a full history"""
+        self.reset()
+        return self.apply_all(results)
+
+    def _state(self, as_of: Optional[str]) -> Tuple[Optional[str], np.ndarray]:
+        """(date of the table, counters) for the live table or the last match day on or before `as_of`"""
+        if as_of is None:
+            return self.last_date, self.counters
+        position = bisect_right(self.snapshot_dates, as_of)
+        if position == 0:
+            return None, np.zeros((0, 6), dtype=np.int32)
+        return self.snapshot_dates[position - 1], self.snapshots[position - 1]
+
+    def _head_to_head(self, group: List[str], up_to: str) -> Dict[str, Tuple[int, int]]:
+        """(points, goal difference) of each club in a mini-league of the matches among `group`"""
+        mini = {club: [0, 0] for club in group}
+        for position, club in enumerate(group):
+            for other in group[position + 1:]:
+                for result in self.pairs.get(tuple(sorted((club, other))), ()):
+                    if result.played_on > up_to:
+                        break
+                    difference = result.home_goals - result.away_goals
+                    mini[result.home][0] += POINTS_FOR[_outcome(result.home_goals, result.away_goals)]
+                    mini[result.away][0] += POINTS_FOR[_outcome(result.away_goals, result.home_goals)]
+                    mini[result.home][1] += difference
+                    mini[result.away][1] -= difference
+        return {club: (points, difference) for club, (points, difference) in mini.items()}
+
+    def table(self, as_of: Optional[str] = None) -> Dict[str, Any]:
+        """The standings after every result up to `as_of` (ISO date; None for all), leader first"""
+        table_date, counters = self._state(as_of)
+        clubs = self.clubs[:len(counters)]
+        points = counters[:, WON] * 3 + counters[:, DRAWN]
+        difference = counters[:, GOALS_FOR] - counters[:, GOALS_AGAINST]
+
+        # Points first; clubs level on points are separated by their head-to-head mini-league
+        by_points = sorted(range(len(clubs)), key=lambda club: -points[club])
+        order = []
+        for _, level in groupby(by_points, key=lambda club: points[club]):
+            level = list(level)
+            mini = self._head_to_head([clubs[club] for club in level], table_date) if len(level) > 1 else {}
+            level.sort(key=lambda club: (
+                *(-value for value in mini.get(clubs[club], (0, 0))),
+                -difference[club], -counters[club, GOALS_FOR], clubs[club],
+            ))
+            order.extend(level)
+
+        rows = [
+            {
+                "position": position,
+                "team": clubs[club],
+                "played": int(counters[club, PLAYED]),
+                "won": int(counters[club, WON]),
+                "drawn": int(counters[club, DRAWN]),
+                "lost": int(counters[club, LOST]),
+                "goalsFor": int(counters[club, GOALS_FOR]),
+                "goalsAgainst": int(counters[club, GOALS_AGAINST]),
+                "goalDifference": int(difference[club]),
+                "points": int(points[club]),
+            }
+            for position, club in enumerate(order, start=1)
+            if counters[club, PLAYED]
+        ]
+        return {"asOf": table_date, "table": rows}
+
+
+class StandingsService:
+    """Serves derived standings from memory, fed by the fixture refresh and built lazily from the fixtures table"""
+
+    def __init__(self, db_service, scraper_service, competition: Optional[str] = LEAGUE_COMPETITION):
+        self.db_service = db_service
+        self.scraper_service = scraper_service
+        self.competition = competition
+        # Season ("2024-2025") -> that season's engine
+        self.engines: Dict[str, StandingsEngine] = {}
+        self._loaded = False
+
+    def seasons(self) -> List[str]:
+        return sorted(self.engines)
+
+    def _by_season(self, fixtures: Iterable[Dict[str, Any]]) -> Dict[str, List[Result]]:
+        seasons: Dict[str, List[Result]] = {}
+        for result in map(result_from_fixture, fixtures):
+            if result is not None:
+                seasons.setdefault(season_of(result.played_on), []).append(result)
+        return seasons
+
+    def record(self, fixtures: Iterable[Dict[str, Any]]) -> int:
+        """Apply newly stored fixtures; before the first build they're left for the build to read"""
+        if not self._loaded:
+            return 0
+        applied = 0
+        for season, results in self._by_season(fixtures).items():
+            if season not in self.engines:
+                self.engines[season] = StandingsEngine(self.competition)
+            applied += self.engines[season].apply_all(results)
+        if applied:
+            logger.info(f"🏆 Applied {applied} results to the derived standings")
+        return applied
+
+    def rebuild_from(self, fixtures: Iterable[Dict[str, Any]]) -> int:
+        """Replace the standings with a replay of `fixtures`"""
+        self.engines = {}
+        applied = 0
+        for season, results in self._by_season(fixtures).items():
+            self.engines[season] = StandingsEngine(self.competition)
+            applied += self.engines[season].rebuild(results)
+        self._loaded = True
+        logger.info(f"🏆 Rebuilt derived standings from {applied} results ({len(self.engines)} seasons)")
+        return applied
+
+    async def rebuild(self) -> Dict[str, Any]:
+        """Replay every stored fixture"""
+        try:
+            fixtures = []
+            async for page in self.db_service.iter_records(
+                "fixtures",
+                filters={"fixture_date": ("not_is", None)},
+                columns=FIXTURE_FIELDS,
+                order_by=["fixture_date", "id"]
+            ):
+                fixtures.extend(page)
+        except RuntimeError as error:
+            return {"success": False, "error": str(error)}
+        applied = self.rebuild_from(fixtures)
+        return {"success": True, "data": {"results": applied, "seasons": self.seasons()}}
+
+    async def get_table(self, as_of: Optional[str] = None, season: Optional[str] = None) -> Dict[str, Any]:
+        """A season's table (by default the season of `as_of`, else the latest stored one)"""
+        if not self._loaded:
+            result = await self.rebuild()
+            if not result["success"]:
+                return result
+        if season is None:
+            season = season_of(as_of) if as_of else (self.seasons()[-1] if self.engines else None)
+        elif season not in self.engines:
+            return {"success": False, "not_found": True,
+                    "error": f"No stored results for season {season} ({', '.join(self.seasons()) or 'none'})"}
+        engine = self.engines.get(season) or StandingsEngine(self.competition)
+        with ANALYTICS_QUERY_SECONDS.time("standings"):
+            table = engine.table(as_of)
+        return {
+            "success": True,
+            "data": {"competition": self.competition, "season": season, "seasons": self.seasons(), **table},
+        }
+
+    async def cross_check(self, team: str = "Racing de Santander") -> Dict[str, Any]:
+        """Compare the tracked club's derived row with the scraped standings and league table"""
+        result = await self.get_table()
+        if not result["success"]:
+            return result
+        derived = next((row for row in result["data"]["table"] if row["team"] == team), None)
+        if derived is None:
+            return {"success": False, "not_found": True, "error": f"No stored league results for {team}"}
+
+        standings = await self.scraper_service.fetch_standings_data()
+        season = await self.scraper_service.fetch_season_state()
+        scraped = standings.get("leaguePosition") or {}
+        table_row = next(
+            (row for row in season.get("table", []) if row.get("team_id") == self.scraper_service.team_id), None
+        )
+        sources = {"standings": {field: scraped.get(field) for field in
+                                 ("position", "points", "played", "won", "drawn", "lost", "goalDifference")}}
+        if table_row:
+            sources["leagueTable"] = {
+                "position": table_row["rank"],
+                "points": table_row["points"],
+                "played": table_row["games"],
+                "won": table_row["wins"],
+                "drawn": table_row["ties"],
+                "lost": table_row["losses"],
+                "goalDifference": table_row["goals_for"] - table_row["goals_against"],
+            }
+
+        differences = [
+            {"source": source, "field": field, "derived": derived[field], "scraped": value}
+            for source, values in sources.items()
+            for field, value in values.items()
+            if value is not None and value != derived[field]
+        ]
+        return {
+            "success": True,
+            "data": {
+                "team": team,
+                "derived": derived,
+                "scraped": sources,
+                "isLive": bool(standings.get("isLive")),
+                "matches": not differences,
+                "differences": differences,
+            },
+        }
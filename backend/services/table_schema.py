@@ -0,0 +1,399 @@
+"""
+Declarative extraction of FBref stats tables.
+
+A table is described once as a TableSchema - the table id plus one Column per
+output field, naming the cell's ``data-stat`` and how to turn it into a value -
+and compiled into an extractor function that walks the parsed page (an lxml
+tree, see services/html_stream.py) and returns one dict per row:
+
+    SHOOTING = TableSchema("stats_shooting_17", (
+        Column("name", "player", source="link", required=True),
+        Column("shots", "shots", parse=int, default=0),
+    ))
+    rows = compile_schema(SHOOTING)(root)
+
+All per-column decisions (cell source, parser, default) are made at compile
+time; the per-row loop only indexes the row's cells by ``data-stat`` once and
+calls the prepared readers. FBref ships most secondary tables inside HTML
+comments; those are found and parsed on demand.
+"""
+
+import re
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple, Union
+
+from lxml import etree, html as lxml_html
+
+# Value sources for a column
+TEXT = "text"                  # stripped text of the cell
+LINK = "link"                  # stripped text of the cell's first link (None without one)
+LINK_OR_TEXT = "link_or_text"  # link text when the cell has a link, else the cell text
+HREF = "href"                  # href of the cell's first link (None without one)
+SOURCES = (TEXT, LINK, LINK_OR_TEXT, HREF)
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    One output field of a table row.
+
+    `stat` is the cell's data-stat, or a tuple of alternatives tried in order.
+    `parse` converts the source string; when it raises ValueError, or the cell
+    is missing, `default` is used. A `required` column drops the row when its
+    cell (or link, for link sources) is missing, and `exclude` drops rows whose
+    raw value is one of the listed strings (e.g. "Squad Total").
+    """
+
+    name: str
+    stat: Union[str, Tuple[str, ...]]
+    parse: Optional[Callable[[str], Any]] = None
+    default: Any = None
+    source: str = TEXT
+    required: bool = False
+    exclude: FrozenSet[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """
+    A table to extract: its id, the columns, and where to look when the id is
+    missing (`alternates` are id substrings tried in order).
+    """
+
+    table_id: str
+    columns: Tuple[Column, ...]
+    alternates: Tuple[str, ...] = ()
+    # Key for the row's position among the table body rows, if wanted in the output
+    index_key: Optional[str] = None
+    description: str = field(default="", compare=False)
+
+
+Extractor = Callable[[etree._Element], List[Dict[str, Any]]]
+RowIterator = Callable[..., Iterator[Dict[str, Any]]]
+
+
+def cell_text(element) -> str:
+    """Text of an element with each text node stripped, like BeautifulSoup's get_text(strip=True)"""
+    return "".join(piece.strip() for piece in element.itertext())
+
+
+def leading_int(text: str) -> int:
+    """Integer at the start of a value like FBref ages ("23-117")"""
+    match = re.match(r"(\d+)", text)
+    if not match:
+        raise ValueError(f"No leading integer in {text!r}")
+    return int(match.group(1))
+
+
+def comma_int(text: str) -> int:
+    """Integer with thousands separators ("1,234")"""
+    return int(text.replace(",", ""))
+
+
+def _first_link(cell):
+    for link in cell.iter("a"):
+        return link
+    return None
+
+
+def _compile_reader(column: Column) -> Callable[[Dict[str, Any]], Tuple[bool, Any]]:
+    """Build the function reading `column` from a row's {data-stat: cell} index"""
+    if column.source not in SOURCES:
+        raise ValueError(f"Unknown source '{column.source}' for column '{column.name}'")
+    stats = (column.stat,) if isinstance(column.stat, str) else tuple(column.stat)
+    parse, default, required, exclude, source = (
+        column.parse, column.default, column.required, column.exclude, column.source
+    )
+
+    if len(stats) == 1:
+        stat = stats[0]
+        find_cell = lambda cells: cells.get(stat)
+    else:
+        def find_cell(cells):
+            for stat in stats:
+                cell = cells.get(stat)
+                if cell is not None:
+                    return cell
+            return None
+
+    if source == TEXT:
+        raw_value = cell_text
+    elif source == LINK:
+        def raw_value(cell):
+            link = _first_link(cell)
+            return None if link is None else cell_text(link)
+    elif source == LINK_OR_TEXT:
+        def raw_value(cell):
+            link = _first_link(cell)
+            return cell_text(cell if link is None else link)
+    else:
+        def raw_value(cell):
+            link = _first_link(cell)
+            return None if link is None else link.get("href")
+
+    def read(cells: Dict[str, Any]) -> Tuple[bool, Any]:
+        """(keep row, value)"""
+        cell = find_cell(cells)
+        if cell is None:
+            return not required, default
+        raw = raw_value(cell)
+        if raw is None:
+            return not required, default
+        if raw in exclude:
+            return False, None
+        if parse is None:
+            return True, raw
+        try:
+            return True, parse(raw)
+        except ValueError:
+            return True, default
+
+    return read
+
+
+def _find_in_comments(root, text_marks: Tuple[str, ...], matches: Callable[[str], bool]):
+    """
+    FBref comments out most tables and swaps them in with JavaScript; parse
+    the comments holding any of `text_marks` for a table whose id `matches`
+    """
+    for comment in root.iter(etree.Comment):
+        text = comment.text or ""
+        if any(mark in text for mark in text_marks):
+            fragment = lxml_html.fragment_fromstring(text, create_parent="div")
+            for table in fragment.iter("table"):
+                if matches(table.get("id") or ""):
+                    return table
+    return None
+
+
+def find_table(root, schema: TableSchema):
+    """The schema's table in the page (including commented-out tables), or None"""
+    table_id = schema.table_id
+    for table in root.iter("table"):
+        if table.get("id") == table_id:
+            return table
+    table = _find_in_comments(root, (f'id="{table_id}"', f"id='{table_id}'"), lambda found: found == table_id)
+    if table is not None:
+        return table
+    for fragment in schema.alternates:
+        for table in root.iter("table"):
+            if fragment in (table.get("id") or ""):
+                return table
+        table = _find_in_comments(root, (fragment,), lambda found: fragment in found)
+        if table is not None:
+            return table
+    return None
+
+
+def _compile_row_converter(schema: TableSchema) -> Callable[[Any, int], Optional[Dict[str, Any]]]:
+    """Build the function turning one body row into a record (None for header and dropped rows)"""
+    readers = [(column.name, _compile_reader(column)) for column in schema.columns]
+    index_key = schema.index_key
+
+    def convert(row, index: int) -> Optional[Dict[str, Any]]:
+        if "thead" in (row.get("class") or "").split():
+            return None
+        cells: Dict[str, Any] = {}
+        for cell in row:
+            stat = cell.get("data-stat") if isinstance(cell.tag, str) else None
+            if stat is not None and stat not in cells:
+                cells[stat] = cell
+
+        record: Dict[str, Any] = {}
+        for name, read in readers:
+            keep, value = read(cells)
+            if not keep:
+                return None
+            record[name] = value
+        if index_key:
+            record[index_key] = index
+        return record
+
+    return convert
+
+
+def _table_body(root, schema: TableSchema):
+    table = find_table(root, schema)
+    return None if table is None else table.find("tbody")
+
+
+def compile_schema(schema: TableSchema) -> Extractor:
+    """
+    Compile a schema into an extractor taking the page root and returning the
+    rows as dicts (an empty list when the table is missing). Header rows
+    repeated inside the body (class "thead") are skipped.
+    """
+    convert = _compile_row_converter(schema)
+
+    def extract(root) -> List[Dict[str, Any]]:
+        body = _table_body(root, schema)
+        if body is None:
+            return []
+        records = []
+        for index, row in enumerate(body.iter("tr")):
+            record = convert(row, index)
+            if record is not None:
+                records.append(record)
+        return records
+
+    extract.schema = schema
+    extract.__name__ = f"extract_{schema.table_id}"
+    return extract
+
+
+def compile_row_iterator(schema: TableSchema) -> RowIterator:
+    """
+    Lazy counterpart of compile_schema: a generator over the table's rows,
+    converting one row per step. With reverse=True the body is walked from
+    the last row up, so a caller that only wants the newest rows of a log
+    can stop early and never convert the rest.
+    """
+    convert = _compile_row_converter(schema)
+
+    def iterate(root, reverse: bool = False) -> Iterator[Dict[str, Any]]:
+        body = _table_body(root, schema)
+        if body is None:
+            return
+        rows = enumerate(body.iter("tr"))
+        if reverse:
+            rows = reversed(list(rows))
+        for index, row in rows:
+            record = convert(row, index)
+            if record is not None:
+                yield record
+
+    iterate.schema = schema
+    iterate.__name__ = f"iterate_{schema.table_id}"
+    return iterate
+
+
+def player_columns(*columns: Column) -> Tuple[Column, ...]:
+    """Columns of a player stats table: the linked player name (rows without a link are totals) plus `columns`"""
+    return (
+        Column("name", "player", source=LINK, required=True, exclude=frozenset({"", "Squad Total", "Opponent Total"})),
+        Column("player_href", "player", source=HREF),
+    ) + tuple(columns)
+
+
+def stat_columns(kind: Callable[[str], Any], *stats: str) -> Tuple[Column, ...]:
+    """Numeric columns named after their data-stat, missing or blank values as None"""
+    return tuple(Column(stat, stat, parse=kind) for stat in stats)
+
+
+# Squad page tables. Adding a table only needs a schema here.
+
+STANDARD_STATS = TableSchema(
+    "stats_standard_17",
+    player_columns(
+        Column("nationality", "nationality"),
+        Column("position", "position", default=""),
+        Column("age", "age", parse=leading_int, default=25),
+        Column("matches", "games", parse=int, default=0),
+        Column("goals", "goals", parse=int, default=0),
+        Column("assists", "assists", parse=int, default=0),
+    ),
+    index_key="row",
+    description="Standard stats",
+)
+
+# Every numeric standard column, for the player stats store; the squad list only needs the columns above
+STANDARD_STATS_WIDE = replace(
+    STANDARD_STATS,
+    columns=STANDARD_STATS.columns + (
+        *stat_columns(comma_int, "games_starts", "minutes", "goals_assists", "goals_pens", "pens_made", "pens_att",
+                      "cards_yellow", "cards_red", "progressive_carries", "progressive_passes",
+                      "progressive_passes_received"),
+        *stat_columns(float, "minutes_90s", "xg", "npxg", "xg_assist", "npxg_xg_assist", "goals_per90",
+                      "assists_per90", "goals_assists_per90", "goals_pens_per90", "goals_assists_pens_per90",
+                      "xg_per90", "xg_assist_per90", "xg_xg_assist_per90", "npxg_per90", "npxg_xg_assist_per90"),
+    ),
+)
+
+MATCH_LOGS = TableSchema(
+    "matchlogs_for",
+    (
+        Column("date", "date", required=True),
+        Column("start_time", "start_time", default=""),
+        Column("competition", "comp", default="Segunda División"),
+        Column("round", "round", default=""),
+        Column("venue", "venue", default=""),
+        Column("result", "result", default=""),
+        # Unplayed fixtures have blank scores and come out as None
+        Column("goals_for", ("goals_for", "gf"), parse=int, required=True),
+        Column("goals_against", ("goals_against", "ga"), parse=int, required=True),
+        Column("opponent", ("opponent", "team"), source=LINK_OR_TEXT, required=True),
+        Column("opponent_href", ("opponent", "team"), source=HREF),
+        Column("attendance", "attendance", default=""),
+        Column("referee", "referee", default=""),
+    ),
+    alternates=("matchlogs", "results", "fixtures", "scores"),
+    description="Scores & fixtures",
+)
+
+LEAGUE_TABLE = TableSchema(
+    # The real id carries the season and competition, e.g. "results2024-2025171_overall"
+    "results_overall",
+    (
+        Column("rank", "rank", parse=int),
+        Column("team", "team", source=LINK_OR_TEXT, required=True, exclude=frozenset({""})),
+        Column("team_href", "team", source=HREF),
+        *stat_columns(int, "games", "wins", "ties", "losses", "goals_for", "goals_against", "points"),
+    ),
+    alternates=("_overall",),
+    description="League table",
+)
+
+SHOOTING_STATS = TableSchema(
+    "stats_shooting_17",
+    player_columns(
+        *stat_columns(float, "minutes_90s", "shots_on_target_pct", "shots_per90", "shots_on_target_per90",
+                      "goals_per_shot", "goals_per_shot_on_target", "average_shot_distance",
+                      "xg", "npxg", "npxg_per_shot", "xg_net", "npxg_net"),
+        *stat_columns(int, "goals", "shots", "shots_on_target", "shots_free_kicks", "pens_made", "pens_att"),
+    ),
+    description="Shooting",
+)
+
+PASSING_STATS = TableSchema(
+    "stats_passing_17",
+    player_columns(
+        *stat_columns(float, "minutes_90s", "passes_pct", "passes_pct_short", "passes_pct_medium",
+                      "passes_pct_long", "xg_assist", "pass_xa", "xg_assist_net"),
+        *stat_columns(comma_int, "passes_completed", "passes", "passes_total_distance",
+                      "passes_progressive_distance", "passes_completed_short", "passes_short",
+                      "passes_completed_medium", "passes_medium", "passes_completed_long", "passes_long"),
+        *stat_columns(int, "assists", "assisted_shots", "passes_into_final_third", "passes_into_penalty_area",
+                      "crosses_into_penalty_area", "progressive_passes"),
+    ),
+    description="Passing",
+)
+
+KEEPER_STATS = TableSchema(
+    "stats_keeper_17",
+    player_columns(
+        *stat_columns(float, "minutes_90s", "gk_goals_against_per90", "gk_save_pct", "gk_clean_sheets_pct",
+                      "gk_pens_save_pct"),
+        *stat_columns(comma_int, "minutes_gk"),
+        *stat_columns(int, "games_gk", "games_starts_gk", "gk_goals_against", "gk_shots_on_target_against",
+                      "gk_saves", "gk_wins", "gk_ties", "gk_losses", "gk_clean_sheets", "gk_pens_att",
+                      "gk_pens_allowed", "gk_pens_saved", "gk_pens_missed"),
+    ),
+    description="Goalkeeping",
+)
+
+# Parsers whose columns hold numbers, and the NumPy dtype they are stored as (services/player_stats.py)
+NUMERIC_PARSERS: Dict[Callable[[str], Any], str] = {int: "int64", comma_int: "int64", float: "float64"}
+
+
+def numeric_columns(schema: TableSchema) -> List[Column]:
+    """The schema's numeric stat columns"""
+    return [column for column in schema.columns if column.parse in NUMERIC_PARSERS]
+
+
+# Player stats tables served by name (see FBrefScraperService.fetch_stats_table)
+STATS_TABLES: Dict[str, TableSchema] = {
+    "standard": STANDARD_STATS_WIDE,
+    "shooting": SHOOTING_STATS,
+    "passing": PASSING_STATS,
+    "keeper": KEEPER_STATS,
+}
@@ -0,0 +1,319 @@
+"""
+Elo-style strength ratings for every club in the fixture history.
+
+Ratings follow the World Football Elo scheme: the expected score comes from
+the rating gap (plus a home advantage), and the update is scaled by the goal
+margin. Applying a result touches two ratings and appends two history
+points, so new fixtures are folded in one at a time without replaying the
+season. `rebuild()` replays a full history for backfills.
+
+The state (ratings, match counts, history and the last applied fixture) is
+kept in memory. When a state file is configured, each batch of new results
+is appended to a journal next to it (`<state file>.journal`, one JSON result
+per line), and every COMPACT_AFTER results the whole state is rewritten
+atomically and the journal emptied. Loading replays the journal over the
+state file. Both writes run on one writer thread, in order, off the event
+loop. Without a state file the ratings are rebuilt from the fixtures table
+on first use.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 20.0
+HOME_ADVANTAGE = 60.0
+# Journaled results after which the state file is rewritten and the journal emptied
+COMPACT_AFTER = 500
+
+
+@dataclass(frozen=True)
+class Result:
+    """One completed match"""
+
+    played_on: str  # ISO date
+    home: str
+    away: str
+    home_goals: int
+    away_goals: int
+    competition: Optional[str] = field(default=None, compare=False)
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.played_on, self.home, self.away)
+
+
+def margin_multiplier(goal_difference: int) -> float:
+    """Bigger wins move ratings more: x1 for one goal, x1.5 for two, (11 + N) / 8 beyond"""
+    margin = abs(goal_difference)
+    if margin <= 1:
+        return 1.0
+    if margin == 2:
+        return 1.5
+    return (11 + margin) / 8
+
+
+def expected_score(rating: float, opponent: float) -> float:
+    return 1.0 / (1.0 + 10 ** ((opponent - rating) / 400.0))
+
+
+class EloRatings:
+    """Ratings, per-club histories and the bookkeeping to apply each result exactly once"""
+
+    def __init__(self, k_factor: float = K_FACTOR, home_advantage: float = HOME_ADVANTAGE,
+                 initial: float = INITIAL_RATING):
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.initial = initial
+        self.reset()
+
+    def reset(self):
+        self.ratings: Dict[str, float] = {}
+        self.matches: Dict[str, int] = {}
+        # club -> [(date, rating after the match, opponent)]
+        self.history: Dict[str, List[Tuple[str, float, str]]] = {}
+        self.last_date: Optional[str] = None
+        # Results already applied on last_date, so a re-sent day isn't counted twice
+        self._applied_on_last_date: Set[Tuple[str, str, str]] = set()
+
+    def __len__(self) -> int:
+        return len(self.ratings)
+
+    def rating(self, club: str) -> float:
+        return self.ratings.get(club, self.initial)
+
+    def apply(self, result: Result) -> bool:
+        """
+        Fold one result into the ratings. Results must arrive in date order;
+        ones dated before the last applied day, or already applied, are
+        skipped (returns False).
+        """
+        if self.last_date is not None:
+            if result.played_on < self.last_date:
+                return False
+            if result.played_on == self.last_date and result.key in self._applied_on_last_date:
+                return False
+        if result.played_on != self.last_date:
+            self.last_date = result.played_on
+            self._applied_on_last_date = set()
+        self._applied_on_last_date.add(result.key)
+
+        home_rating, away_rating = self.rating(result.home), self.rating(result.away)
+        expected_home = expected_score(home_rating + self.home_advantage, away_rating)
+        goal_difference = result.home_goals - result.away_goals
+        actual_home = 1.0 if goal_difference > 0 else 0.5 if goal_difference == 0 else 0.0
+        change = self.k_factor * margin_multiplier(goal_difference) * (actual_home - expected_home)
+
+        for club, rating, opponent in ((result.home, home_rating + change, result.away),
+                                       (result.away, away_rating - change, result.home)):
+            self.ratings[club] = rating
+            self.matches[club] = self.matches.get(club, 0) + 1
+            self.history.setdefault(club, []).append((result.played_on, rating, opponent))
+        return True
+
+    def apply_all(self, results: Iterable[Result]) -> int:
+        """Apply results in date order; returns how many were new"""
+        return sum(self.apply(result) for result in sorted(results, key=lambda result: result.played_on))
+
+    def rebuild(self, results: Iterable[Result]) -> int:
+        """Forget everything and replay a full history"""
+        self.reset()
+        return self.apply_all(results)
+
+    def table(self) -> List[Dict[str, Any]]:
+        return [
+            {"team": club, "rating": round(rating, 1), "matches": self.matches[club]}
+            for club, rating in sorted(self.ratings.items(), key=lambda item: item[1], reverse=True)
+        ]
+
+    def to_state(self) -> Dict[str, Any]:
+        """A copy of the state, safe to serialize while new results are applied"""
+        return {
+            "settings": {"k_factor": self.k_factor, "home_advantage": self.home_advantage, "initial": self.initial},
+            "ratings": dict(self.ratings),
+            "matches": dict(self.matches),
+            "history": {club: list(points) for club, points in self.history.items()},
+            "last_date": self.last_date,
+            "applied_on_last_date": sorted(self._applied_on_last_date),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "EloRatings":
+        ratings = cls(**state["settings"])
+        ratings.ratings = state["ratings"]
+        ratings.matches = state["matches"]
+        ratings.history = {club: [tuple(point) for point in points] for club, points in state["history"].items()}
+        ratings.last_date = state["last_date"]
+        ratings._applied_on_last_date = {tuple(key) for key in state["applied_on_last_date"]}
+        return ratings
+
+
+def _played_on(value: Any) -> Optional[str]:
+    """ISO date of a stored (date / ISO string) or scraped ("2024-08-18T00:00:00Z") fixture date"""
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return value.isoformat()
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date().isoformat()
+    except ValueError:
+        return None
+
+
+def result_from_fixture(fixture: Dict[str, Any]) -> Optional[Result]:
+    """Result from a fixtures row or a scraped fixture (pastFixtures format); None if unplayed or undated"""
+    played_on = _played_on(fixture.get("fixture_date", fixture.get("date")))
+    home = fixture.get("home_team", fixture.get("homeTeam"))
+    away = fixture.get("away_team", fixture.get("awayTeam"))
+    home_goals = fixture.get("home_score", fixture.get("homeScore"))
+    away_goals = fixture.get("away_score", fixture.get("awayScore"))
+    if played_on is None or not home or not away or home_goals is None or away_goals is None:
+        return None
+    return Result(played_on, home, away, int(home_goals), int(away_goals), fixture.get("competition"))
+
+
+class TeamRatingsService:
+    """Serves ratings from memory, fed by the fixture refresh and saved to `state_file` (if any)"""
+
+    def __init__(self, db_service, state_file: Optional[str]):
+        self.db_service = db_service
+        self.state_file = state_file
+        self.journal_file = f"{state_file}.journal" if state_file else None
+        if state_file:
+            os.makedirs(os.path.dirname(os.path.abspath(state_file)), exist_ok=True)
+        self._journaled = 0
+        # One thread, so journal appends and state rewrites land in order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ratings-writer")
+        self.ratings = self._load()
+
+    def _load(self) -> EloRatings:
+        if not self.state_file:
+            return EloRatings()
+        try:
+            with open(self.state_file, encoding="utf-8") as handle:
+                ratings = EloRatings.from_state(json.load(handle))
+        except FileNotFoundError:
+            ratings = EloRatings()
+        except (ValueError, KeyError, TypeError) as error:
+            logger.warning(f"Ignoring unreadable ratings state {self.state_file}: {error}")
+            ratings = EloRatings()
+
+        results = []
+        try:
+            with open(self.journal_file, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        results.append(Result(**json.loads(line)))
+                    except (ValueError, TypeError):
+                        # A line cut short by a crash
+                        logger.warning(f"Skipping unreadable line in {self.journal_file}")
+        except FileNotFoundError:
+            pass
+        # Results already in the state file (a crash before the journal was emptied) are skipped
+        ratings.apply_all(results)
+        self._journaled = len(results)
+        if len(ratings):
+            logger.info(f"📈 Loaded ratings for {len(ratings)} clubs (up to {ratings.last_date})")
+        return ratings
+
+    def _append(self, lines: str) -> None:
+        try:
+            with open(self.journal_file, "a", encoding="utf-8") as handle:
+                handle.write(lines)
+        except OSError as error:
+            logger.error(f"❌ Could not append to {self.journal_file}: {error}")
+
+    def _write_state(self, state: Dict[str, Any]) -> None:
+        try:
+            directory = os.path.dirname(os.path.abspath(self.state_file))
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, delete=False, suffix=".tmp") as handle:
+                json.dump(state, handle)
+            os.replace(handle.name, self.state_file)
+            # Everything journaled so far is in the state file now
+            open(self.journal_file, "w").close()
+        except OSError as error:
+            logger.error(f"❌ Could not save ratings state {self.state_file}: {error}")
+
+    def _save(self, results: Optional[List[Result]] = None):
+        """Journal newly applied results, or rewrite the whole state (after a rebuild, or every COMPACT_AFTER results)"""
+        if not self.state_file:
+            return
+        if results is not None and self._journaled + len(results) < COMPACT_AFTER:
+            self._journaled += len(results)
+            lines = "".join(json.dumps(asdict(result)) + "\n" for result in results)
+            self._writer.submit(self._append, lines)
+        else:
+            self._journaled = 0
+            self._writer.submit(self._write_state, self.ratings.to_state())
+
+    def close(self):
+        """Finish the pending writes"""
+        self._writer.shutdown(wait=True)
+
+    def record(self, fixtures: Iterable[Dict[str, Any]]) -> int:
+        """Apply newly stored fixtures (O(1) each) and journal them; returns how many changed the ratings"""
+        results = [result for result in map(result_from_fixture, fixtures) if result is not None]
+        applied = [result for result in sorted(results, key=lambda result: result.played_on) if self.ratings.apply(result)]
+        if applied:
+            self._save(applied)
+            logger.info(f"📈 Applied {len(applied)} results to team ratings")
+        return len(applied)
+
+    def rebuild_from(self, fixtures: Iterable[Dict[str, Any]]) -> int:
+        """Replace the ratings with a replay of `fixtures` and save"""
+        results = [result for result in map(result_from_fixture, fixtures) if result is not None]
+        applied = self.ratings.rebuild(results)
+        self._save()
+        logger.info(f"📈 Rebuilt team ratings from {applied} results ({len(self.ratings)} clubs)")
+        return applied
+
+    async def rebuild(self) -> Dict[str, Any]:
+        """Backfill: replay every stored fixture"""
+        try:
+            fixtures = []
+            async for page in self.db_service.iter_records(
+                "fixtures",
+                filters={"fixture_date": ("not_is", None)},
+                columns=["id", "fixture_date", "home_team", "away_team", "home_score", "away_score"],
+                order_by=["fixture_date", "id"]
+            ):
+                fixtures.extend(page)
+        except RuntimeError as error:
+            return {"success": False, "error": str(error)}
+        applied = self.rebuild_from(fixtures)
+        return {"success": True, "data": {"results": applied, "clubs": len(self.ratings), "lastFixture": self.ratings.last_date}}
+
+    async def get_ratings(self) -> Dict[str, Any]:
+        if not len(self.ratings):
+            # Nothing saved yet: build from the stored fixtures once
+            result = await self.rebuild()
+            if not result["success"]:
+                return result
+        return {
+            "success": True,
+            "data": {"lastFixture": self.ratings.last_date, "ratings": self.ratings.table()},
+        }
+
+    async def get_history(self, team: str) -> Dict[str, Any]:
+        if not len(self.ratings):
+            result = await self.rebuild()
+            if not result["success"]:
+                return result
+        if team not in self.ratings.history:
+            return {"success": False, "not_found": True, "error": f"No rated matches for {team}"}
+        history = [
+            {"date": played_on, "rating": round(rating, 1), "opponent": opponent}
+            for played_on, rating, opponent in self.ratings.history[team]
+        ]
+        return {
+            "success": True,
+            "data": {"team": team, "rating": round(self.ratings.rating(team), 1), "history": history},
+        }
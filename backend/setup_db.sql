@@ -85,7 +85,12 @@ CREATE TABLE IF NOT EXISTS data_cache (
 CREATE INDEX IF NOT EXISTS idx_players_name ON players(name);
 CREATE INDEX IF NOT EXISTS idx_players_position ON players(position);
 CREATE INDEX IF NOT EXISTS idx_fixtures_date ON fixtures(fixture_date);
+-- Keyset pagination key for the newest-first fixtures listing
+CREATE INDEX IF NOT EXISTS idx_fixtures_date_id ON fixtures(fixture_date DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_fixtures_teams ON fixtures(home_team, away_team);
+-- Opponent lookups match either side, so each side leads an index (with the date for newest-first reads)
+CREATE INDEX IF NOT EXISTS idx_fixtures_home_date ON fixtures(home_team, fixture_date DESC);
+CREATE INDEX IF NOT EXISTS idx_fixtures_away_date ON fixtures(away_team, fixture_date DESC);
 CREATE INDEX IF NOT EXISTS idx_standings_position ON standings(position);
 CREATE INDEX IF NOT EXISTS idx_data_cache_type ON data_cache(data_type);
 
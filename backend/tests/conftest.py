@@ -0,0 +1,16 @@
+import pytest
+
+from services.table_schema import STATS_TABLES, numeric_columns
+
+
+@pytest.fixture
+def stats_row():
+    """Factory for extracted STATS_TABLES rows: every numeric column 0 unless given"""
+    def build(table: str, name: str, player_id: str, **values):
+        row = {column.name: 0 for column in numeric_columns(STATS_TABLES[table])}
+        row.update(name=name, player_href=f"/en/players/{player_id}/{name}")
+        if table == "standard":
+            row.update(nationality="es ESP", position="MF", age=25)
+        row.update(values)
+        return row
+    return build
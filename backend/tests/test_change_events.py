@@ -0,0 +1,219 @@
+import asyncio
+import socket
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks.webhook_receiver import WebhookReceiver
+from config import settings
+from controllers.webhooks_controller import webhooks_router
+from dependencies import get_webhook_service
+from services.change_events import (
+    EventQueue, WebhookDispatcher, WebhookService, change_events, non_public_address,
+)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    events = EventQueue(str(tmp_path / "events.sqlite3"))
+    yield events
+    events.close()
+
+
+def player_events(*names):
+    return change_events("players", {"version": 2, "upserted": [{"name": name} for name in names], "removed": []})
+
+
+def test_change_events():
+    events = change_events("fixtures", {"version": 5, "upserted": [{"week": 1}], "removed": [{"week": 2}]})
+    assert [(event["type"], event["version"]) for event in events] == [("fixtures.changed", 5), ("fixtures.removed", 5)]
+    assert events[0]["record"] == {"week": 1} and events[1]["key"] == {"week": 2}
+
+
+def test_enqueue_fans_out_to_subscribers(queue):
+    everything = queue.add_webhook("https://example.com/all")
+    fixtures = queue.add_webhook("https://example.com/fixtures", ["fixtures"], secret="s3cret")
+    assert everything["dataTypes"] == ["players", "fixtures", "standings"]
+    assert fixtures["signed"] and not everything["signed"]
+
+    assert queue.enqueue(player_events("Aspas", "Borja")) == 2
+    assert queue.enqueue(change_events("fixtures", {"version": 1, "upserted": [{"week": 1}], "removed": []})) == 2
+    assert queue.enqueue([]) == 0
+    counts = {webhook["id"]: webhook["pending"] for webhook in queue.webhooks()}
+    assert counts == {everything["id"]: 3, fixtures["id"]: 1}
+
+    due = dict((webhook["id"], deliveries) for webhook, deliveries in queue.due(now=2 ** 62, per_webhook=2))
+    assert [event["record"] for event, _ in due[everything["id"]]] == [{"name": "Aspas"}, {"name": "Borja"}]
+    assert [attempts for _, attempts in due[fixtures["id"]]] == [0]
+
+
+def test_retry_marks_failed_after_max_attempts_and_requeue(queue):
+    webhook = queue.add_webhook("https://example.com/hook")
+    queue.enqueue(player_events("Aspas"))
+    (_, [(event, _)]), = queue.due(now=2 ** 62, per_webhook=10)
+
+    queue.retry(webhook["id"], [event["id"]], "HTTP 503", next_attempt_at=5000, max_attempts=2)
+    assert queue.due(now=4999, per_webhook=10) == []
+    (_, [(_, attempts)]), = queue.due(now=5000, per_webhook=10)
+    assert attempts == 1
+
+    queue.retry(webhook["id"], [event["id"]], "HTTP 503", next_attempt_at=6000, max_attempts=2)
+    assert queue.due(now=2 ** 62, per_webhook=10) == []
+    assert queue.webhooks()[0]["failed"] == 1 and queue.webhooks()[0]["pending"] == 0
+
+    assert queue.requeue_failed(webhook["id"]) == 1
+    assert queue.requeue_failed(webhook["id"]) == 0
+    assert queue.requeue_failed(999) is None
+    (_, [(_, attempts)]), = queue.due(now=2 ** 62, per_webhook=10)
+    assert attempts == 0
+
+
+def test_ack_keeps_events_other_webhooks_wait_for(queue):
+    first = queue.add_webhook("https://example.com/first")
+    second = queue.add_webhook("https://example.com/second")
+    queue.enqueue(player_events("Aspas"))
+    event_id = queue.due(now=2 ** 62, per_webhook=10)[0][1][0][0]["id"]
+
+    queue.ack(first["id"], [event_id])
+    assert [webhook["id"] for webhook, _ in queue.due(now=2 ** 62, per_webhook=10)] == [second["id"]]
+    assert queue.remove_webhook(second["id"])
+    assert not queue.remove_webhook(second["id"])
+    assert queue._db.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 0
+
+
+def test_dispatcher_retries_gives_up_and_delivers_after_requeue(tmp_path):
+    async def scenario(receiver):
+        dispatcher = WebhookDispatcher(EventQueue(str(tmp_path / "events.sqlite3")), batch_size=2,
+                                       max_attempts=2, backoff=0.0, allowed_hosts=["127.0.0.1"])
+        webhook = dispatcher.queue.add_webhook(receiver.url, secret="s3cret")
+        assert await dispatcher.publish(player_events("Aspas", "Borja", "Cano")) == 3
+
+        assert await dispatcher.deliver_due() == 0
+        assert dispatcher.queue.webhooks()[0]["pending"] == 3
+        assert await dispatcher.deliver_due() == 0
+        assert dispatcher.queue.webhooks()[0]["failed"] == 3
+
+        receiver.error_rate = 0.0
+        assert await dispatcher.deliver_due() == 0
+        assert dispatcher.queue.requeue_failed(webhook["id"]) == 3
+        assert await dispatcher.deliver_due() == 3
+        assert dispatcher.queue.webhooks()[0]["pending"] == 0
+        await dispatcher.stop()
+
+    with WebhookReceiver(error_rate=1.0, secret="s3cret") as receiver:
+        asyncio.run(scenario(receiver))
+        # Two batches per pass, signed
+        assert receiver.requests == 6 and receiver.rejected == 0
+        assert [event["record"]["name"] for event in receiver.events] == ["Aspas", "Borja", "Cano"]
+
+
+@pytest.fixture
+def rebound_host(monkeypatch):
+    """hooks.example.com resolves to the loopback address (as after a DNS rebinding)"""
+    getaddrinfo = socket.getaddrinfo
+
+    def resolve(host, *args, **kwargs):
+        return getaddrinfo("127.0.0.1" if host == "hooks.example.com" else host, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", resolve)
+    return "hooks.example.com"
+
+
+@pytest.mark.parametrize("allowed, delivered", [((), 0), (("hooks.example.com",), 2)])
+def test_deliveries_recheck_the_address_and_connect_to_it(tmp_path, rebound_host, allowed, delivered):
+    async def scenario(receiver):
+        dispatcher = WebhookDispatcher(EventQueue(str(tmp_path / "events.sqlite3")), allowed_hosts=allowed)
+        # Registered while the host still resolved to a public address
+        dispatcher.queue.add_webhook(receiver.url.replace("127.0.0.1", rebound_host))
+        await dispatcher.publish(player_events("Aspas", "Borja"))
+        assert await dispatcher.deliver_due() == delivered
+        webhook, = dispatcher.queue.webhooks()
+        await dispatcher.stop()
+        return webhook
+
+    with WebhookReceiver() as receiver:
+        webhook = asyncio.run(scenario(receiver))
+    if delivered:
+        assert len(receiver.events) == 2 and webhook["pending"] == 0
+    else:
+        # Refused without a request, and not retried
+        assert receiver.requests == 0 and webhook["failed"] == 2 and webhook["pending"] == 0
+
+
+def test_non_public_address():
+    assert non_public_address("127.0.0.1") == "127.0.0.1"
+    assert non_public_address("10.1.2.3") == "10.1.2.3"
+    assert non_public_address("169.254.169.254") == "169.254.169.254"
+    assert non_public_address("8.8.8.8") is None
+
+
+def test_register_refuses_internal_hosts_unless_allowed(tmp_path):
+    async def scenario():
+        dispatcher = WebhookDispatcher(EventQueue(str(tmp_path / "events.sqlite3")))
+        service = WebhookService(dispatcher)
+        assert (await service.register("ftp://example.com/hook"))["bad_request"]
+        refused = await service.register("http://127.0.0.1:9420/events")
+        assert refused["bad_request"] and "non-public" in refused["error"]
+        assert (await service.register("http://8.8.8.8/hook", ["ratings"]))["bad_request"]
+
+        allowed = WebhookService(dispatcher, allowed_hosts=["127.0.0.1"])
+        registered = await allowed.register("http://127.0.0.1:9420/events", ["players"])
+        assert registered["success"] and registered["data"]["dataTypes"] == ["players"]
+        assert (await allowed.retry_failed(registered["data"]["id"]))["data"]["requeued"] == 0
+        assert (await allowed.remove(registered["data"]["id"]))["success"]
+        assert (await allowed.remove(registered["data"]["id"]))["not_found"]
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
+    disabled = asyncio.run(WebhookService(None).list_webhooks())
+    assert "EVENTS_DB" in disabled["error"]
+
+
+def test_admin_key_guards_the_webhook_routes(monkeypatch):
+    app = FastAPI()
+    app.include_router(webhooks_router)
+    app.dependency_overrides[get_webhook_service] = lambda: WebhookService(None)
+
+    with TestClient(app) as client:
+        monkeypatch.setattr(settings, "webhook_admin_key", "")
+        assert client.get("/api/v1/webhooks/").status_code == 503
+
+        monkeypatch.setattr(settings, "webhook_admin_key", "k3y")
+        assert client.get("/api/v1/webhooks/").status_code == 401
+        assert client.get("/api/v1/webhooks/", headers={"X-Admin-Key": "wrong"}).status_code == 401
+        # Past the key check: the queue itself is disabled here
+        response = client.get("/api/v1/webhooks/", headers={"X-Admin-Key": "k3y"})
+        assert response.status_code == 503 and "EVENTS_DB" in response.json()["detail"]["error"]
+
+
+def test_a_slow_webhook_does_not_hold_up_the_others(tmp_path):
+    async def wait_for(condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline
+            await asyncio.sleep(0.01)
+
+    async def scenario(slow, fast):
+        dispatcher = WebhookDispatcher(EventQueue(str(tmp_path / "events.sqlite3")), poll_interval=0.05,
+                                       allowed_hosts=["127.0.0.1"])
+        dispatcher.queue.add_webhook(slow.url)
+        dispatcher.queue.add_webhook(fast.url)
+        dispatcher.start()
+        started = time.monotonic()
+        await dispatcher.publish(player_events("Aspas", "Borja"))
+        await wait_for(lambda: len(fast.events) == 2)
+        await dispatcher.publish(player_events("Cano", "Diaz"))
+        await wait_for(lambda: len(fast.events) == 4)
+        # The slow receiver is still answering its first batch
+        assert time.monotonic() - started < slow.latency and not slow.batches
+
+        await wait_for(lambda: len(slow.events) == 4)
+        await dispatcher.stop()
+
+    with WebhookReceiver(latency=1.0) as slow, WebhookReceiver() as fast:
+        asyncio.run(scenario(slow, fast))
+    # One batch in flight at a time: nothing was sent twice
+    assert slow.requests == 2
+    assert [event["record"]["name"] for event in slow.events] == ["Aspas", "Borja", "Cano", "Diaz"]
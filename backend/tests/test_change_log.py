@@ -0,0 +1,94 @@
+from services.change_log import ChangeLog
+
+
+def player(name, goals, record_id=1):
+    return {"id": record_id, "name": name, "goals": goals}
+
+
+def seeded(size=256):
+    log = ChangeLog(["name"], size=size)
+    assert not log.publish([player("Aspas", 1), player("Borja", 0)])
+    return log
+
+
+def test_first_publish_is_the_baseline():
+    log = ChangeLog(["name"])
+    start = log.version
+    assert not log.publish([player("Aspas", 1)])
+    assert log.seeded and log.version == start
+    assert log.changes_since(start) is None
+
+
+def test_ignored_fields_are_not_changes():
+    log = seeded()
+    version = log.version
+    assert not log.publish([player("Aspas", 1, record_id=7), player("Borja", 0, record_id=8)])
+    assert log.version == version
+    # The snapshot still takes the new rows
+    assert {row["id"] for row in log.snapshot()} == {7, 8}
+
+
+def test_changes_since_returns_upserts_and_removals():
+    log = seeded()
+    start = log.version
+    assert log.publish([player("Aspas", 2), player("Borja", 0)])
+    assert log.version == start + 1
+    assert log.changes_since(start) == {"version": start + 1, "reset": False,
+                                        "upserted": [player("Aspas", 2)], "removed": []}
+    assert log.changes_since(log.version) is None
+
+    assert log.publish([player("Aspas", 2)])
+    assert log.changes_since(start + 1) == {"version": start + 2, "reset": False,
+                                            "upserted": [], "removed": [{"name": "Borja"}]}
+
+
+def test_changes_are_merged_per_key():
+    log = seeded()
+    start = log.version
+    log.publish([player("Aspas", 2), player("Borja", 0), player("Cano", 0)])
+    log.publish([player("Aspas", 3), player("Cano", 0)])
+    log.publish([player("Aspas", 3), player("Borja", 1)])
+    changes = log.changes_since(start)
+    # Aspas changed twice, Cano came and went, Borja went and came back
+    assert changes["upserted"] == [player("Aspas", 3), player("Borja", 1)]
+    assert changes["removed"] == [{"name": "Cano"}]
+
+
+def test_reset_when_the_log_does_not_reach_back():
+    log = seeded(size=2)
+    start = log.version
+    for goals in (2, 3, 4):
+        log.publish([player("Aspas", goals), player("Borja", 0)])
+
+    reset = log.changes_since(start)
+    assert reset["reset"] and reset["version"] == start + 3
+    assert reset["upserted"] == [player("Aspas", 4), player("Borja", 0)] and reset["removed"] == []
+    # The oldest logged change still reaches back one version
+    assert not log.changes_since(start + 1)["reset"]
+    # A version from the future (or another process) resets too
+    assert log.changes_since(log.version + 1000)["reset"]
+
+
+def test_version_unknown_before_any_change_resets():
+    log = seeded()
+    assert log.changes_since(log.version - 1)["reset"]
+
+
+def test_rebase_resets_every_client():
+    log = seeded()
+    start = log.version
+    log.publish([player("Aspas", 2), player("Borja", 0)])
+    log.rebase([player("Cano", 5)])
+    assert log.version == start + 2
+    changes = log.changes_since(start + 1)
+    assert changes["reset"] and changes["upserted"] == [player("Cano", 5)]
+    assert log.publish([player("Cano", 6)])
+
+
+def test_composite_keys():
+    log = ChangeLog(["date", "homeTeam", "awayTeam"])
+    fixture = {"date": "2024-08-18", "homeTeam": "Racing", "awayTeam": "Oviedo", "homeScore": None}
+    log.publish([fixture])
+    start = log.version
+    log.publish([])
+    assert log.changes_since(start)["removed"] == [{"date": "2024-08-18", "homeTeam": "Racing", "awayTeam": "Oviedo"}]
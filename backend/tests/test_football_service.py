@@ -0,0 +1,193 @@
+import asyncio
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.memory_db import InMemoryDatabaseService
+from services.football_service import FootballDataService
+from services.html_stream import PageSnapshot, make_tree
+from services.scraper_service import FBrefScraperService
+from services.standings_engine import StandingsService
+from services.team_ratings import TeamRatingsService
+
+RACING = "Racing de Santander"
+SEASON_START = date(2024, 8, 10)
+
+
+def match(week: int, goals_for, goals_against, opponent: str = None):
+    """A match log entry: one match a week from SEASON_START, home in even weeks"""
+    return (SEASON_START + timedelta(weeks=week), "Home" if week % 2 == 0 else "Away",
+            goals_for, goals_against, opponent or f"Rival {week}")
+
+
+def match_log_page(matches) -> bytes:
+    score = lambda goals: "" if goals is None else str(goals)
+    rows = []
+    for played_on, venue, goals_for, goals_against, opponent in matches:
+        rows.append(
+            f'<tr><th data-stat="date">{played_on.isoformat()}</th><td data-stat="venue">{venue}</td>'
+            f'<td data-stat="goals_for">{score(goals_for)}</td><td data-stat="goals_against">{score(goals_against)}</td>'
+            f'<td data-stat="opponent"><a href="/en/squads/0000000{len(rows)}/x">{opponent}</a></td></tr>'
+        )
+    return f'<html><body><table id="matchlogs_for"><tbody>{"".join(rows)}</tbody></table></body></html>'.encode()
+
+
+class ListenerRecorder:
+    def __init__(self):
+        self.calls = []
+
+    def record(self, fixtures):
+        self.calls.append(("record", len(fixtures)))
+
+    def rebuild_from(self, fixtures):
+        self.calls.append(("rebuild", len(fixtures)))
+
+
+@pytest.fixture
+def football():
+    db = InMemoryDatabaseService()
+    scraper = FBrefScraperService()
+    scraper.page_cache_duration = 0
+    listener = ListenerRecorder()
+    page = SimpleNamespace(body=b"")
+
+    async def fetch_page(required_tables=None):
+        return PageSnapshot(page.body, "utf-8")
+
+    scraper._fetch_page = fetch_page
+    service = FootballDataService(db, scraper, fixture_listeners=[listener])
+
+    def refresh(matches):
+        page.body = match_log_page(matches)
+        asyncio.run(service._async_update_fixtures())
+
+    def stored():
+        rows = sorted(db.tables.get("fixtures", {}).values(), key=lambda row: (row["fixture_date"], row["id"]))
+        return [(row["fixture_date"][:10], row["home_team"], row["away_team"], row["home_score"], row["away_score"])
+                for row in rows]
+
+    yield SimpleNamespace(db=db, service=service, listener=listener, refresh=refresh, stored=stored)
+    service.close()
+
+
+def expected(matches):
+    fixtures = []
+    for played_on, venue, goals_for, goals_against, opponent in matches:
+        if goals_for is None:
+            continue
+        if venue == "Home":
+            fixtures.append((played_on.isoformat(), RACING, opponent, goals_for, goals_against))
+        else:
+            fixtures.append((played_on.isoformat(), opponent, RACING, goals_against, goals_for))
+    return fixtures
+
+
+SEASON = [match(week, week % 3, 1) for week in range(6)] + [match(6, None, None)]
+
+
+def test_first_refresh_loads_every_played_match(football):
+    football.refresh(SEASON)
+    assert football.stored() == expected(SEASON)
+    assert football.listener.calls == [("rebuild", 6)]
+
+
+def test_later_refreshes_append_only_newer_matches(football):
+    football.refresh(SEASON)
+    ids = set(football.db.tables["fixtures"])
+
+    season = SEASON[:6] + [match(6, 2, 2), match(7, None, None)]
+    football.refresh(season)
+    assert football.stored() == expected(season)
+    assert ids < set(football.db.tables["fixtures"])
+    assert football.listener.calls[-1] == ("record", 1)
+
+    football.refresh(season)
+    assert football.listener.calls[-1] == ("record", 0)
+    assert len(football.db.tables["fixtures"]) == 7
+
+
+def test_corrected_scores_are_replaced_and_replayed(football):
+    football.refresh(SEASON)
+    season = SEASON[:5] + [match(5, 4, 0)] + SEASON[6:]
+    football.refresh(season)
+    assert football.stored() == expected(season)
+    assert football.listener.calls[-1] == ("rebuild", 6)
+
+
+def test_matches_stored_without_a_score_are_rechecked(football):
+    football.refresh(SEASON)
+    oldest = min(football.db.tables["fixtures"].values(), key=lambda row: row["fixture_date"])
+    oldest["home_score"] = oldest["away_score"] = None
+
+    football.refresh(SEASON)
+    assert football.stored() == expected(SEASON)
+
+
+def test_partial_history_is_backfilled(football):
+    football.refresh(SEASON)
+    for row in sorted(football.db.tables["fixtures"].values(), key=lambda row: row["fixture_date"])[:3]:
+        del football.db.tables["fixtures"][row["id"]]
+
+    football.refresh(SEASON)
+    assert football.stored() == expected(SEASON)
+    assert football.listener.calls[-1] == ("rebuild", 6)
+
+
+def test_history_after_a_date_only_reads_newer_rows():
+    scraper = FBrefScraperService()
+    root = make_tree(match_log_page(SEASON))
+    newer = list(scraper.iter_fixture_history(root, after=SEASON_START + timedelta(weeks=3)))
+    assert [fixture["date"][:10] for fixture in newer] == [
+        (SEASON_START + timedelta(weeks=week)).isoformat() for week in (4, 5)
+    ]
+
+
+def test_a_match_scored_after_a_later_one_is_replayed(football):
+    # Week 5 is postponed: week 6 is played and stored first
+    season = SEASON[:5] + [match(5, None, None), match(6, 2, 0)]
+    football.refresh(season)
+    assert football.listener.calls[-1] == ("rebuild", 6)
+
+    season = SEASON[:5] + [match(5, 1, 1), match(6, 2, 0)]
+    football.refresh(season)
+    assert football.stored() == expected(season)
+    # Date-ordered listeners would skip it as older than their last result
+    assert football.listener.calls[-1] == ("rebuild", 7)
+
+
+def test_late_results_reach_the_ratings_and_standings(football):
+    ratings = TeamRatingsService(football.db, "")
+    standings = StandingsService(football.db, None)
+    standings.rebuild_from([])
+    football.service.fixture_listeners.extend([ratings, standings])
+
+    football.refresh(SEASON[:5] + [match(5, None, None), match(6, 2, 0)])
+    football.refresh(SEASON[:5] + [match(5, 1, 1), match(6, 2, 0)])
+    assert ratings.ratings.matches[RACING] == 7
+    engine, = standings.engines.values()
+    assert engine.counters[engine.index[RACING]][0] == 7
+    ratings.close()
+
+
+def test_only_a_complete_listing_gets_a_delta_sync_version(football):
+    football.refresh(SEASON)
+    service = football.service
+    # Keep the reads from starting a background refresh
+    service._updating_lock["fixtures"] = True
+
+    page = asyncio.run(service.get_fixtures_data(limit=2))["data"]
+    assert len(page["pastFixtures"]) == 2 and page["nextCursor"] is not None
+    assert page["version"] is None
+    rest = asyncio.run(service.get_fixtures_data(cursor=page["nextCursor"], limit=20))["data"]
+    assert rest["nextCursor"] is None and rest["version"] is None
+
+    listing = asyncio.run(service.get_fixtures_data(limit=20))["data"]
+    assert listing["nextCursor"] is None and listing["version"] == service.change_logs["fixtures"].version
+
+    # A reset covers every stored fixture: the complete listing, not a page of it
+    reset = asyncio.run(service.get_changes("fixtures", listing["version"] - 1000))["data"]
+    assert reset["reset"]
+    key = lambda fixture: (fixture["date"], fixture["homeTeam"], fixture["awayTeam"])
+    assert sorted(map(key, reset["upserted"])) == sorted(map(key, listing["pastFixtures"]))
+    assert len(reset["upserted"]) > len(page["pastFixtures"])
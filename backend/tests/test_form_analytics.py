@@ -0,0 +1,100 @@
+import asyncio
+
+import numpy as np
+
+from benchmarks.memory_db import InMemoryDatabaseService
+from services.form_analytics import ClubMatches, FormAnalyticsService
+
+
+def fixture(fixture_id, played_on, home, away, home_score, away_score):
+    return {"id": fixture_id, "fixture_date": played_on, "home_team": home, "away_team": away,
+            "home_score": home_score, "away_score": away_score}
+
+
+FIXTURES = [
+    fixture(1, "2024-08-18", "Racing", "Oviedo", 2, 0),
+    fixture(2, "2024-08-25", "Oviedo", "Racing", 1, 1),
+    fixture(3, "2024-09-01", "Racing", "Eldense", 0, 1),
+    fixture(4, "2024-09-08", "Eldense", "Racing", 0, 3),
+    fixture(5, "2024-09-15", "Racing", "Oviedo", None, None),
+]
+
+
+def brute_force_rolling(values, clubs, window):
+    sums, counts = [], []
+    for row in range(len(values)):
+        start = row
+        while start > 0 and row - start + 1 < window and clubs[start - 1] == clubs[row]:
+            start -= 1
+        sums.append(values[start:row + 1].sum())
+        counts.append(row + 1 - start)
+    return np.array(sums), np.array(counts)
+
+
+def test_rows_are_grouped_by_club_in_date_order():
+    matches = ClubMatches(FIXTURES)
+    assert matches.clubs == ["Eldense", "Oviedo", "Racing"]
+    assert len(matches) == 8
+    racing = slice(matches.starts[2], matches.ends[2])
+    assert matches.dates[racing].astype(str).tolist() == ["2024-08-18", "2024-08-25", "2024-09-01", "2024-09-08"]
+    assert matches.points[racing].tolist() == [3, 1, 0, 3]
+    assert matches.is_home[racing].tolist() == [True, False, True, False]
+
+
+def test_rolling_windows_stop_at_the_club_boundary():
+    matches = ClubMatches(FIXTURES)
+    for window in (1, 2, 3, 10):
+        sums, counts = matches.rolling(matches.points, window)
+        expected_sums, expected_counts = brute_force_rolling(matches.points, matches.club, window)
+        np.testing.assert_array_equal(sums, expected_sums)
+        np.testing.assert_array_equal(counts, expected_counts)
+
+
+def test_form_table():
+    table = ClubMatches(FIXTURES).form_table(window=2)
+    assert [row["team"] for row in table] == ["Racing", "Eldense", "Oviedo"]
+    racing = table[0]
+    assert racing["matches"] == 4 and racing["points"] == 7 and racing["form"] == "LW"
+    assert racing["window"] == {"matches": 2, "points": 3, "ppg": 1.5, "goalsFor": 3, "goalsAgainst": 1, "goalDifference": 2}
+    assert racing["home"] == {"matches": 2, "ppg": 1.5, "goalsFor": 2, "goalsAgainst": 1}
+    assert racing["away"] == {"matches": 2, "ppg": 2.0, "goalsFor": 4, "goalsAgainst": 1}
+    eldense = table[1]
+    assert eldense["home"]["matches"] == 1 and eldense["away"]["ppg"] == 3.0
+
+
+def test_club_series():
+    matches = ClubMatches(FIXTURES)
+    series = matches.club_series(matches.index["Oviedo"], window=2)
+    assert series["opponents"] == ["Racing", "Racing"]
+    assert series["venues"] == ["away", "home"]
+    assert series["results"] == ["L", "D"]
+    assert series["cumulativePoints"] == [0, 1]
+    assert series["rollingPpg"] == [0.0, 0.5]
+    assert series["rollingGoalDifference"] == [-2, -2]
+
+
+def test_no_fixtures():
+    matches = ClubMatches([])
+    assert len(matches) == 0
+    assert matches.form_table(5) == []
+
+
+def test_service_rebuilds_only_when_fixtures_change():
+    db = InMemoryDatabaseService()
+    db.seed("fixtures", FIXTURES[:2])
+    service = FormAnalyticsService(db)
+
+    first = asyncio.run(service.get_form_table(window=3))
+    assert {row["team"] for row in first["data"]["table"]} == {"Racing", "Oviedo"}
+    matches = service._matches
+    asyncio.run(service.get_form_table(window=3))
+    assert service._matches is matches
+
+    db.seed("fixtures", FIXTURES[2:3])
+    second = asyncio.run(service.get_form_table(window=3))
+    assert service._matches is not matches
+    assert {row["team"] for row in second["data"]["table"]} == {"Racing", "Oviedo", "Eldense"}
+
+    form = asyncio.run(service.get_team_form("Racing", window=3))
+    assert form["data"]["results"] == ["W", "D", "L"]
+    assert asyncio.run(service.get_team_form("Burgos"))["not_found"]
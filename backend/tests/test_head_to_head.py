@@ -0,0 +1,104 @@
+import asyncio
+
+from benchmarks.memory_db import InMemoryDatabaseService
+from services.head_to_head import HeadToHeadService, OpponentIndex
+from services.team_ratings import Result
+
+RESULTS = [
+    Result("2024-08-18", "Racing", "Zaragoza", 2, 0, competition="Segunda División"),
+    Result("2023-12-03", "Zaragoza", "Racing", 1, 1, competition="Segunda División"),
+    Result("2024-10-30", "Zaragoza", "Racing", 3, 1, competition="Copa del Rey"),
+    Result("2024-09-01", "Racing", "Eldense", 0, 0),
+    Result("2024-09-15", "Burgos", "Racing", 0, 1),
+]
+
+
+class FakeScraper:
+    """Serves a fixed league table"""
+
+    def __init__(self, table):
+        self.table = table
+
+    async def fetch_season_state(self):
+        return {"table": self.table}
+
+
+def index():
+    opponents = OpponentIndex()
+    opponents.apply_all(RESULTS)
+    return opponents
+
+
+def test_head_to_head_from_both_sides():
+    opponents = index()
+    racing = opponents.head_to_head("Racing", "Zaragoza")
+    assert [match["date"] for match in racing["matches"]] == ["2024-10-30", "2024-08-18", "2023-12-03"]
+    assert [match["result"] for match in racing["matches"]] == ["L", "W", "D"]
+    assert racing["matches"][0]["venue"] == "away" and racing["matches"][0]["competition"] == "Copa del Rey"
+    assert racing["record"]["all"] == {"played": 3, "won": 1, "drawn": 1, "lost": 1, "goalsFor": 4,
+                                       "goalsAgainst": 4, "goalDifference": 0, "points": 4}
+    assert racing["record"]["home"]["played"] == 1 and racing["record"]["away"]["played"] == 2
+
+    zaragoza = opponents.head_to_head("Zaragoza", "Racing")
+    assert zaragoza["record"]["all"]["won"] == 1 and zaragoza["record"]["home"]["played"] == 2
+    assert opponents.head_to_head("Racing", "Mirandés") == {"team": "Racing", "opponent": "Mirandés",
+                                                            "record": None, "matches": []}
+
+
+def test_results_are_indexed_once():
+    opponents = index()
+    assert len(opponents) == 5
+    assert opponents.apply_all(RESULTS) == 0
+    assert opponents.head_to_head("Racing", "Zaragoza")["record"]["all"]["played"] == 3
+    assert opponents.rebuild(RESULTS[:1]) == 1
+    assert opponents.head_to_head("Racing", "Zaragoza")["record"]["all"]["played"] == 1
+
+
+def test_opponents_per_venue_and_subset():
+    opponents = index()
+    everyone = opponents.opponents("Racing")
+    assert [row["opponent"] for row in everyone["opponents"]] == ["Burgos", "Zaragoza", "Eldense"]
+    assert everyone["total"]["played"] == 5 and everyone["total"]["points"] == 8
+
+    home = opponents.opponents("Racing", venue="home")
+    assert [row["opponent"] for row in home["opponents"]] == ["Zaragoza", "Eldense"]
+
+    subset = opponents.opponents("Racing", only=["Zaragoza", "Mirandés"])
+    assert [row["opponent"] for row in subset["opponents"]] == ["Zaragoza"]
+    assert subset["total"]["played"] == 3
+
+
+def fixtures_db():
+    db = InMemoryDatabaseService()
+    db.seed("fixtures", [
+        {"id": position, "fixture_date": result.played_on, "home_team": result.home, "away_team": result.away,
+         "home_score": result.home_goals, "away_score": result.away_goals, "competition": result.competition}
+        for position, result in enumerate(RESULTS, start=1)
+    ])
+    return db
+
+
+def test_service_builds_lazily_and_filters_the_top_clubs():
+    scraper = FakeScraper([
+        {"team": "Burgos", "rank": 1}, {"team": "Zaragoza", "rank": 2}, {"team": "Eldense", "rank": 3},
+    ])
+    service = HeadToHeadService(fixtures_db(), scraper)
+    assert service.record([{"fixture_date": "2024-11-01", "home_team": "Racing", "away_team": "Burgos",
+                            "home_score": 1, "away_score": 0}]) == 0
+
+    result = asyncio.run(service.get_opponents("Racing", top=2))
+    assert result["data"]["opponentsFilter"] == ["Burgos", "Zaragoza"]
+    assert [row["opponent"] for row in result["data"]["opponents"]] == ["Burgos", "Zaragoza"]
+
+    assert service.record([{"fixture_date": "2024-11-01", "home_team": "Racing", "away_team": "Burgos",
+                            "home_score": 1, "away_score": 0}]) == 1
+    pair = asyncio.run(service.get_head_to_head("Racing", "Burgos"))
+    assert pair["data"]["record"]["all"]["played"] == 2
+
+
+def test_service_errors():
+    service = HeadToHeadService(fixtures_db(), FakeScraper([]))
+    assert asyncio.run(service.get_opponents("Racing", venue="neutral"))["bad_request"]
+    assert asyncio.run(service.get_opponents("Mirandés"))["not_found"]
+    assert asyncio.run(service.get_head_to_head("Racing", "Mirandés"))["not_found"]
+    assert not asyncio.run(service.get_opponents("Racing", top=6))["success"]
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fake_fbref import FakeFBrefServer
+from benchmarks.fbref_pages import build_page
+from services.html_stream import PageSnapshot, ResponseTooLarge, TableScanner, declared_encoding, read_body
+from services.scraper_service import FBrefScraperService
+
+PAGE = (
+    b"<html><body><table id=\"stats_standard_17\"><tr><td>1</td></tr></table>"
+    b"<div><table id='matchlogs_for'><tr><td>2</td></tr></table></div>"
+    + b"<footer>" + b"x" * 1000 + b"</footer></body></html>"
+)
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, content_length=None):
+        self.body = body
+        self.headers = {} if content_length is None else {"Content-Length": str(content_length)}
+        self.chunks_read = 0
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            self.chunks_read += 1
+            yield self.body[start:start + chunk_size]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+def test_scanner_stops_after_the_last_required_table(chunk_size):
+    response = FakeResponse(PAGE)
+    body, stopped_early = read_body(response, 10_000, chunk_size, TableScanner(["stats_standard_17", "matchlogs_for"]))
+
+    table_end = PAGE.index(b"</table></div>") + len(b"</table>")
+    assert stopped_early
+    # Markers split across chunks are still found, and reading stops within one chunk of the end
+    assert table_end <= len(body) < table_end + chunk_size
+    assert response.chunks_read < -(-len(PAGE) // chunk_size)
+
+
+def test_scanner_waits_for_tables_that_are_open_or_missing():
+    scanner = TableScanner(["stats_standard_17", "matchlogs_for"])
+    assert not scanner.scan(PAGE[:PAGE.index(b"</table>")])
+    # A table that never shows up means the whole body is read
+    body, stopped_early = read_body(FakeResponse(PAGE), 10_000, 64, TableScanner(["keeper"]))
+    assert body == PAGE and not stopped_early
+
+
+def test_scanner_matches_id_substrings():
+    page = PAGE.replace(b"</div>", b"</div><table id=\"results2024-2025171_overall\"><tr></tr></table>")
+    scanner = TableScanner(["matchlogs_for", ("results_overall", "_overall")])
+    assert not scanner.scan(page[:page.index(b"_overall")])
+    assert scanner.scan(page)
+    assert not TableScanner([("results_overall", "_standings")]).scan(page)
+
+
+def test_byte_cap():
+    with pytest.raises(ResponseTooLarge):
+        read_body(FakeResponse(PAGE, content_length=len(PAGE)), 100, 64)
+    with pytest.raises(ResponseTooLarge):
+        read_body(FakeResponse(PAGE), 100, 64)
+
+
+def test_scraper_download_stops_early_and_parses_the_same():
+    # FBref's footer and trailing commented-out tables are never downloaded
+    page = build_page("small").encode("utf-8").replace(b"</body>", b"<footer>" + b"x" * 200_000 + b"</footer></body>")
+    scraper = FBrefScraperService()
+    with FakeFBrefServer({"small": page}, "small") as server:
+        scraper.proxies = [server.proxy_prefix]
+        snapshot = asyncio.run(scraper._fetch_page())
+
+    assert snapshot.stopped_early and len(snapshot.body) < len(page)
+    assert page.startswith(snapshot.body)
+    assert scraper.parse_fbref_data(snapshot.body, snapshot.encoding) == scraper.parse_fbref_data(page, "utf-8")
+
+
+def test_season_state_waits_for_a_league_table_past_the_required_tables():
+    page = build_page("small")
+    start = page.index('<div class="table_wrapper" id="all_results')
+    end = page.index("</div></div>", start) + len("</div></div>")
+    # The league table moved behind the early stop point, commented out as FBref ships most tables
+    league = page[start:end].replace('<div class="table_container">', "<!--").replace("</table></div>", "</table>-->")
+    page = (page[:start] + page[end:]).replace("</body>", f"<footer>{'x' * 200_000}</footer>{league}</body>")
+
+    scraper = FBrefScraperService()
+    with FakeFBrefServer({"moved": page.encode("utf-8")}, "moved") as server:
+        scraper.proxies = [server.proxy_prefix]
+        squad = asyncio.run(scraper.fetch_squad_data())
+        state = asyncio.run(scraper.fetch_season_state())
+
+    assert squad["isLive"] and server.requests == 2
+    assert scraper.page_snapshot.stopped_early
+    assert len(state["table"]) == 22 and state["isLive"]
+
+
+def test_declared_encoding_prefers_the_header_then_meta_charset():
+    assert declared_encoding("text/html; charset=ISO-8859-1", b'<meta charset="utf-8">') == "iso8859-1"
+    assert declared_encoding("text/html", b'<head><meta charset="windows-1252">') == "cp1252"
+    # No charset, or an unknown one: the default, never a guess from the content
+    assert declared_encoding("text/html; charset=bogus", "Iñigo".encode("latin-1")) == "utf-8"
+
+
+def test_pages_parse_the_same_in_any_declared_encoding():
+    page = build_page("small")
+    latin1 = page.replace('charset="utf-8"', 'charset="iso-8859-1"').encode("iso-8859-1")
+
+    scraper = FBrefScraperService()
+    expected = scraper.parse_fbref_data(page.encode("utf-8"), "utf-8")
+    assert any(not player["name"].isascii() for player in expected["squad"])
+    assert scraper.parse_fbref_data(latin1, declared_encoding("text/html", latin1)) == expected
+
+
+def test_page_snapshot_shares_its_tree_and_extractions():
+    snapshot = PageSnapshot(build_page("small").encode("utf-8"), "utf-8")
+    calls = []
+
+    def extract():
+        calls.append(1)
+        return FBrefScraperService().extract_squad_data(snapshot.tree())
+
+    assert snapshot.tree() is snapshot.tree()
+    assert snapshot.extracted("squad", extract) is snapshot.extracted("squad", extract)
+    assert len(calls) == 1
+    assert snapshot.covers(["matchlogs_for"])
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from services import leaderboards
+from services.leaderboards import LeaderboardIndex, LeaderboardService
+from services.player_stats import PlayerStatsStore
+
+
+@pytest.fixture
+def squads(stats_row):
+    def build(version: int = 1):
+        first = PlayerStatsStore.from_tables({"standard": [
+            stats_row("standard", "Aspas", "a1", position="FW", age=30, goals=10, minutes_90s=10.0),
+            stats_row("standard", "Borja", "a2", position="MF", age=20, goals=6, minutes_90s=3.0),
+            stats_row("standard", "Cano", "a3", position="DF", age=25, goals=0, minutes_90s=10.0),
+        ]}, version)
+        second = PlayerStatsStore.from_tables({"standard": [
+            stats_row("standard", "Diaz", "b1", position="FW", age=22, goals=10, minutes_90s=5.0),
+            stats_row("standard", "Eder", "b2", position="FW,MF", age=33, goals=4, minutes_90s=8.0),
+        ]}, version)
+        return first, second
+    return build
+
+
+@pytest.fixture
+def index(squads):
+    first, second = squads()
+    boards = LeaderboardIndex()
+    boards.update_segment("aaa", first)
+    boards.update_segment("bbb", second)
+    return boards
+
+
+def names(rows):
+    return [row["name"] for row in rows]
+
+
+def test_merges_squads_highest_first_ties_by_name(index):
+    rows, total = index.top(("goals", "total", None, None, 0.0))
+    assert total == 5
+    assert names(rows) == ["Aspas", "Diaz", "Borja", "Eder", "Cano"]
+    assert [row["squad"] for row in rows[:2]] == ["aaa", "bbb"]
+    assert rows[0] == {"rank": 1, "id": "a1", "name": "Aspas", "squad": "aaa", "value": 10.0}
+
+
+def test_pages_keep_their_ranks(index):
+    rows, total = index.top(("goals", "total", None, None, 0.0), offset=1, limit=2)
+    assert total == 5
+    assert [(row["rank"], row["name"]) for row in rows] == [(2, "Diaz"), (3, "Borja")]
+
+
+def test_per90_and_minimum_minutes(index):
+    rows, _ = index.top(("goals", "per90", None, None, 0.0))
+    assert names(rows) == ["Borja", "Diaz", "Aspas", "Eder", "Cano"]
+    rows, total = index.top(("goals", "per90", None, None, 4.0))
+    assert total == 4 and names(rows) == ["Diaz", "Aspas", "Eder", "Cano"]
+
+
+def test_position_and_age_filters(index):
+    assert names(index.top(("goals", "total", "FW", None, 0.0))[0]) == ["Aspas", "Diaz", "Eder"]
+    assert names(index.top(("goals", "total", "MF", None, 0.0))[0]) == ["Borja", "Eder"]
+    assert names(index.top(("goals", "total", None, "u23", 0.0))[0]) == ["Diaz", "Borja"]
+    assert names(index.top(("goals", "total", "GK", "30+", 0.0))[0]) == []
+
+
+def test_sorted_boards_are_cached_and_bounded(index, monkeypatch):
+    monkeypatch.setattr(leaderboards, "BOARD_CACHE_SIZE", 2)
+    keys = [("goals", "total", None, None, 0.0), ("goals", "per90", None, None, 0.0), ("goals", "total", "FW", None, 0.0)]
+    index.top(keys[0])
+    board = index._segments["aaa"].boards[keys[0]]
+    index.top(keys[0])
+    assert index._segments["aaa"].boards[keys[0]] is board
+
+    index.top(keys[1])
+    index.top(keys[2])
+    assert list(index._segments["aaa"].boards) == keys[1:]
+
+
+def test_replacing_a_segment_drops_its_boards(index, squads):
+    index.top(("goals", "total", None, None, 0.0))
+    first, _ = squads(version=2)
+    index.update_segment("aaa", first)
+    assert index.version("aaa") == 2 and index._segments["aaa"].boards == {}
+    assert len(index) == 5
+
+
+class FakeStatsService:
+    def __init__(self, store):
+        self.store = store
+        self.scraper_service = type("Scraper", (), {"team_id": "dee3bbc8"})()
+
+    async def get_store(self):
+        return self.store
+
+
+def test_service(squads):
+    first, _ = squads()
+    stats = FakeStatsService(first)
+    service = LeaderboardService(stats)
+
+    result = asyncio.run(service.get_leaderboard("goals", limit=2))
+    assert result["success"] and names(result["data"]["leaders"]) == ["Aspas", "Borja"]
+    assert result["data"]["total"] == 3
+    assert list(service.index._segments) == ["dee3bbc8"]
+
+    for kwargs in ({"value": "average"}, {"position": "ST"}, {"age_band": "u19"},
+                   {"stat": "minutes_90s", "value": "per90"}):
+        assert asyncio.run(service.get_leaderboard(**{"stat": "goals", **kwargs}))["bad_request"]
+    assert asyncio.run(service.get_leaderboard("unknown_stat"))["bad_request"]
+
+    stats.store = None
+    assert not asyncio.run(service.get_leaderboard("goals"))["success"]
@@ -0,0 +1,40 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from middleware.logging import LoggingMiddleware
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(LoggingMiddleware)
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f"chunk {i}\n" for i in range(3)), media_type="text/plain")
+
+    @app.get("/missing")
+    def missing():
+        return StreamingResponse(iter([b"gone"]), status_code=404)
+
+    return app
+
+
+def test_streaming_responses_pass_through_with_process_time():
+    with TestClient(_app()) as client:
+        response = client.get("/stream")
+
+    assert response.status_code == 200
+    assert response.text == "chunk 0\nchunk 1\nchunk 2\n"
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+
+def test_access_line_logged_with_the_response_status(caplog):
+    caplog.set_level(logging.INFO, logger="fast-api-playground")
+    with TestClient(_app()) as client:
+        client.get("/missing")
+
+    access = [record.getMessage() for record in caplog.records if record.name == "fast-api-playground"]
+    assert any(line.startswith("GET /missing - Status: 404") for line in access)
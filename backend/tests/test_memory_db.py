@@ -0,0 +1,60 @@
+import asyncio
+
+import requests
+
+from benchmarks.fake_fbref import FakeFBrefServer
+from benchmarks.memory_db import InMemoryDatabaseService
+
+
+def _items_db() -> InMemoryDatabaseService:
+    db = InMemoryDatabaseService()
+    db.seed("items", [
+        {"name": "Coffee beans", "price": 12.0, "category": "food"},
+        {"name": "coffee mug", "price": 8.5, "category": None},
+        {"name": "Tea", "price": 30.0, "category": "food"},
+        {"name": "Kettle", "price": 55.0, "category": "kitchen"},
+    ])
+    return db
+
+
+def test_filters_follow_sql_semantics():
+    db = _items_db()
+
+    async def names(**kwargs):
+        result = await db.get_records("items", order_by=["id"], **kwargs)
+        assert result["success"], result
+        return [row["name"] for row in result["data"]]
+
+    assert asyncio.run(names(filters={"name": ("ilike", "%coffee%")})) == ["Coffee beans", "coffee mug"]
+    assert asyncio.run(names(filters={"name": ("like", "%coffee%")})) == ["coffee mug"]
+    assert asyncio.run(names(filters={"price": [("gte", 10), ("lte", 50)]})) == ["Coffee beans", "Tea"]
+    # NULL never compares equal or unequal
+    assert asyncio.run(names(filters={"category": ("neq", "food")})) == ["Kettle"]
+    assert asyncio.run(names(filters={"category": ("is", None)})) == ["coffee mug"]
+
+
+def test_projection_ordering_and_counts():
+    db = _items_db()
+    result = asyncio.run(db.get_records(
+        "items", columns=["name"], order_by=["price.desc"], limit=2, count="exact"
+    ))
+    assert result["data"] == [{"name": "Kettle"}, {"name": "Tea"}]
+    assert result["total"] == 4
+
+
+def test_delete_records_needs_filters():
+    db = _items_db()
+    assert not asyncio.run(db.delete_records("items", {}))["success"]
+    assert asyncio.run(db.delete_records("items", {"category": "food"}))["deleted"] == 2
+    assert sorted(row["name"] for row in db.tables["items"].values()) == ["Kettle", "coffee mug"]
+
+
+def test_fake_fbref_serves_pages_and_injects_errors():
+    pages = {"small": b"<html>small</html>", "large": b"<html>large</html>"}
+    with FakeFBrefServer(pages, "small") as server:
+        assert requests.get(server.proxy_prefix + "https%3A%2F%2Ffbref.com").content == pages["small"]
+        assert requests.get(f"{server.url}/raw?page=large").content == pages["large"]
+        assert requests.get(f"{server.url}/raw?page=unknown").status_code == 404
+        server.error_rate = 1.0
+        assert requests.get(server.proxy_prefix).status_code == 503
+        assert server.requests == 4 and server.errors == 1
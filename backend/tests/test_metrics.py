@@ -0,0 +1,54 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from middleware.metrics import MetricsMiddleware
+from monitoring.metrics import HTTP_REQUEST_SECONDS, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("job_seconds", "Job time", ["job"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "scrape")
+
+    lines = registry.render().splitlines()
+    assert 'job_seconds_bucket{job="scrape",le="0.1"} 2' in lines
+    assert 'job_seconds_bucket{job="scrape",le="1"} 3' in lines
+    assert 'job_seconds_bucket{job="scrape",le="+Inf"} 4' in lines
+    assert 'job_seconds_sum{job="scrape"} 3.65' in lines
+    assert 'job_seconds_count{job="scrape"} 4' in lines
+    assert histogram.count("scrape") == 4
+
+
+def test_counters_and_duplicate_names():
+    registry = MetricsRegistry()
+    counter = registry.counter("hits_total", "Hits", ["cache"])
+    counter.inc("players")
+    counter.inc("players", amount=2)
+    assert counter.value("players") == 3
+    assert 'hits_total{cache="players"} 3' in registry.render()
+    with pytest.raises(ValueError):
+        registry.counter("hits_total", "Again")
+
+
+def test_requests_are_labelled_with_the_route_template():
+    router = APIRouter(prefix="/api/v1/items")
+
+    @router.get("/{item_id}")
+    def get_item(item_id: int):
+        return {"id": item_id}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(MetricsMiddleware)
+
+    labels = ("GET", "/api/v1/items/{item_id}", "200")
+    before = HTTP_REQUEST_SECONDS.count(*labels)
+    with TestClient(app) as client:
+        client.get("/api/v1/items/1")
+        client.get("/api/v1/items/2")
+        client.get("/nowhere")
+
+    assert HTTP_REQUEST_SECONDS.count(*labels) == before + 2
+    assert HTTP_REQUEST_SECONDS.count("GET", "unmatched", "404") >= 1
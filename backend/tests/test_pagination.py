@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from benchmarks.memory_db import InMemoryDatabaseService
+from services.db_service import _keyset_filter
+from services.football_service import FootballDataService
+from services.pagination import cursor_order, decode_cursor, encode_cursor, keyset_terms, page_result
+from services.scraper_service import FBrefScraperService
+
+ORDER = ["fixture_date.desc", "id.desc"]
+
+
+def test_keyset_terms_expand_to_or_of_ands():
+    assert keyset_terms(ORDER, ["2025-08-20", 7]) == [
+        [("fixture_date", "lt", "2025-08-20")],
+        [("fixture_date", "eq", "2025-08-20"), ("id", "lt", 7)],
+    ]
+    assert keyset_terms(["name", "id"], ["Ana", 3]) == [
+        [("name", "gt", "Ana")],
+        [("name", "eq", "Ana"), ("id", "gt", 3)],
+    ]
+
+
+def test_supabase_keyset_filter_quotes_strings():
+    assert _keyset_filter(ORDER, ['2025-08-20', 7]) == (
+        'fixture_date.lt."2025-08-20",and(fixture_date.eq."2025-08-20",id.lt.7)'
+    )
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(ORDER, {"fixture_date": "2025-08-20", "id": 7, "home_team": "Racing"})
+    assert decode_cursor(ORDER, cursor) == ["2025-08-20", 7]
+    assert cursor_order(cursor) == ORDER
+    assert decode_cursor(ORDER, None) is None
+
+
+def test_decode_cursor_rejects_garbage_and_other_listings():
+    with pytest.raises(ValueError):
+        decode_cursor(ORDER, "not-a-cursor")
+    with pytest.raises(ValueError):
+        decode_cursor(["id"], encode_cursor(ORDER, {"fixture_date": "2025-08-20", "id": 7}))
+
+
+def test_page_result_trims_the_look_ahead_row():
+    rows = [{"id": i} for i in range(4)]
+    page, cursor = page_result(rows, ["id"], 3)
+    assert [row["id"] for row in page] == [0, 1, 2]
+    assert decode_cursor(["id"], cursor) == [2]
+    assert page_result(rows, ["id"], 4) == (rows, None)
+
+
+def test_keyset_pages_cover_ties_exactly_once():
+    db = InMemoryDatabaseService()
+    db.seed("fixtures", [{"fixture_date": f"2025-08-{day:02d}"} for day in (1, 1, 2, 2, 2, 3, 4, 4)])
+
+    async def walk():
+        seen, cursor = [], None
+        while True:
+            page = await db.get_page("fixtures", ORDER, cursor=cursor, limit=3)
+            seen += [(row["fixture_date"], row["id"]) for row in page["data"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return seen
+
+    seen = asyncio.run(walk())
+    assert seen == sorted(seen, reverse=True)
+    assert sorted(row_id for _, row_id in seen) == list(range(1, 9))
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4, 5, 10])
+def test_fixtures_listing_ends_with_the_undated_fixtures(limit):
+    db = InMemoryDatabaseService()
+    db.seed("fixtures", [
+        {"fixture_date": "2025-08-10"}, {"fixture_date": None}, {"fixture_date": "2025-08-17"},
+        {"fixture_date": None}, {"fixture_date": "2025-08-24"},
+    ])
+    service = FootballDataService(db, FBrefScraperService())
+
+    async def walk():
+        ids, cursor = [], None
+        while True:
+            page = await service._fixtures_page(cursor, limit)
+            assert len(page["data"]) <= limit
+            ids += [row["id"] for row in page["data"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return ids
+
+    try:
+        assert asyncio.run(walk()) == [5, 3, 1, 2, 4]
+    finally:
+        service.close()
@@ -0,0 +1,29 @@
+from benchmarks.parser_bench import DEFAULT_THRESHOLDS, compare, digest
+
+
+def _result(median_ms, output="squad", alloc=100.0):
+    return {"targets": {"stats_table[passing]": {
+        "median_ms": median_ms, "best_ms": median_ms, "peak_alloc_kib": alloc, "output_sha256": digest(output),
+    }}}
+
+
+def _compare(new, old, thresholds=DEFAULT_THRESHOLDS):
+    return compare({"page": new}, {"page": {}}, {"pages": {"page": old}}, {}, thresholds)
+
+
+def test_small_absolute_slowdowns_are_noise():
+    # +40%, but under the absolute floor
+    assert _compare(_result(7.0), _result(5.0)) == []
+
+
+def test_slowdowns_past_both_limits_are_reported():
+    problems = _compare(_result(30.0), _result(20.0))
+    assert len(problems) == 1 and "median 20.0ms -> 30.0ms" in problems[0]
+    # Past the floor but within the relative threshold
+    assert _compare(_result(126.0), _result(120.0)) == []
+
+
+def test_output_and_allocation_changes_are_reported():
+    problems = _compare(_result(5.0, output="changed", alloc=200.0), _result(5.0))
+    assert any("output changed" in line for line in problems)
+    assert any("peak allocations" in line for line in problems)
@@ -0,0 +1,64 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from services.pg_service import PostgresDatabaseService, _quote_ident
+
+
+class RecordingPostgresService(PostgresDatabaseService):
+    """Captures the SQL sent to the pool instead of running it"""
+
+    def __init__(self, rows=None):
+        super().__init__(dsn="postgresql://unused")
+        self._column_types = {"fixtures": {"id": "bigint", "fixture_date": "date", "home_team": "text"}}
+        self.rows = rows or []
+        self.queries = []
+
+    async def _fetch(self, sql, *args):
+        self.queries.append((sql, list(args)))
+        return self.rows
+
+
+def test_quote_ident_rejects_anything_but_plain_identifiers():
+    assert _quote_ident("fixture_date") == '"fixture_date"'
+    with pytest.raises(ValueError):
+        _quote_ident('id"; DROP TABLE fixtures; --')
+
+
+def test_get_records_binds_values_and_coerces_dates():
+    service = RecordingPostgresService()
+    result = asyncio.run(service.get_records(
+        "fixtures",
+        filters={"fixture_date": [("gte", "2025-08-01"), ("lt", "2025-09-01")], "home_team": ("in", ["A", "B"])},
+        columns=["id", "home_team"],
+        order_by=["fixture_date.desc"],
+        skip=10,
+        limit=5,
+    ))
+
+    assert result["success"]
+    sql, args = service.queries[0]
+    assert sql == (
+        'SELECT "id", "home_team" FROM "fixtures" WHERE "fixture_date" >= $1 AND "fixture_date" < $2'
+        ' AND "home_team" = ANY($3) ORDER BY "fixture_date" DESC OFFSET $4 LIMIT $5'
+    )
+    assert args == [date(2025, 8, 1), date(2025, 9, 1), ["A", "B"], 10, 5]
+
+
+def test_get_page_uses_a_row_comparison_for_uniform_sort_keys():
+    service = RecordingPostgresService(rows=[
+        {"id": 3, "fixture_date": date(2025, 8, 3)},
+        {"id": 2, "fixture_date": date(2025, 8, 2)},
+        {"id": 1, "fixture_date": date(2025, 8, 1)},
+    ])
+    order_by = ["fixture_date.desc", "id.desc"]
+    first = asyncio.run(service.get_page("fixtures", order_by, limit=2))
+
+    assert [row["id"] for row in first["data"]] == [3, 2]
+    assert service.queries[0][1] == [3]  # limit + 1 look-ahead row
+
+    asyncio.run(service.get_page("fixtures", order_by, cursor=first["next_cursor"], limit=2))
+    sql, args = service.queries[1]
+    assert 'WHERE ("fixture_date", "id") < ($1, $2)' in sql
+    assert args == [date(2025, 8, 2), 2, 3]
@@ -0,0 +1,77 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from services.player_similarity import PlayerSimilarityService, SimilarityIndex, normalize
+from services.player_stats import PlayerStatsStore
+
+
+@pytest.fixture
+def squad(stats_row):
+    def build(prefix: str, version: int = 1):
+        return PlayerStatsStore.from_tables({"standard": [
+            stats_row("standard", f"{prefix} striker", f"{prefix}1", goals=10, assists=1, minutes_90s=10.0),
+            stats_row("standard", f"{prefix} forward", f"{prefix}2", goals=9, assists=2, minutes_90s=10.0),
+            stats_row("standard", f"{prefix} playmaker", f"{prefix}3", goals=1, assists=9, minutes_90s=10.0),
+            stats_row("standard", f"{prefix} sub", f"{prefix}4", goals=1, assists=0, minutes_90s=0.5),
+        ]}, version)
+    return build
+
+
+def test_normalize_centres_scales_and_fills_missing_values():
+    vectors = normalize(np.array([[1.0, 5.0, np.nan], [3.0, 5.0, 2.0], [2.0, 5.0, 4.0]]))
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), [1.0, 1.0, 1.0])
+    # The constant column carries no information, a missing value sits on the mean
+    np.testing.assert_allclose(vectors[:, 1], 0.0)
+    assert vectors[0, 2] == 0.0
+
+
+def test_nearest_neighbours_exclude_the_player_and_low_minutes(squad):
+    index = SimilarityIndex()
+    index.update_segment("aaa", squad("a"))
+
+    similar = index.similar("a1", k=5)
+    assert [player["id"] for player in similar] == ["a2", "a3"]
+    assert similar[0]["similarity"] > similar[1]["similarity"]
+    assert "a4" not in index
+
+
+def test_segments_are_replaced_independently(squad):
+    index = SimilarityIndex()
+    index.update_segment("aaa", squad("a"))
+    index.update_segment("bbb", squad("b"))
+    assert len(index) == 6
+    assert {player["squad"] for player in index.similar("a1", k=5)} == {"aaa", "bbb"}
+
+    index.update_segment("bbb", squad("c", version=2))
+    assert len(index) == 6 and "b1" not in index and "c1" in index
+    assert index.version("aaa") == 1 and index.version("bbb") == 2
+
+
+class FakeStatsService:
+    def __init__(self, store):
+        self.store = store
+        self.scraper_service = type("Scraper", (), {"team_id": "dee3bbc8"})()
+
+    async def get_store(self):
+        return self.store
+
+
+def test_service_indexes_the_scraped_squad_once_per_version(squad):
+    stats = FakeStatsService(squad("a"))
+    service = PlayerSimilarityService(stats)
+    assert service.squad == "dee3bbc8"
+
+    result = asyncio.run(service.get_similar("a1", k=1))
+    assert result["success"] and result["data"]["similar"][0]["id"] == "a2"
+    segment = service.index._segments["dee3bbc8"]
+    asyncio.run(service.get_similar("a2"))
+    assert service.index._segments["dee3bbc8"] is segment
+
+    stats.store = squad("b", version=2)
+    assert asyncio.run(service.get_similar("a1"))["not_found"]
+    assert asyncio.run(service.get_similar("b1"))["success"]
+
+    stats.store = None
+    assert not asyncio.run(service.get_similar("b1"))["success"]
@@ -0,0 +1,96 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from services.player_stats import DERIVED_CACHE_SIZE, PlayerStatsService, PlayerStatsStore, content_version
+
+
+@pytest.fixture
+def tables(stats_row):
+    return {
+        "standard": [
+            stats_row("standard", "Ana", "a1", goals=6, minutes_90s=10.0, position="FW"),
+            stats_row("standard", "Bea", "b2", goals=2, minutes_90s=2.0),
+            stats_row("standard", "Cai", "c3", goals=0, minutes_90s=20.0, position="GK"),
+        ],
+        "keeper": [stats_row("keeper", "Cai", "c3", gk_saves=40)],
+    }
+
+
+def test_store_merges_tables_by_player(tables):
+    store = PlayerStatsStore.from_tables(tables, version=1)
+
+    assert store.player_ids == ["a1", "b2", "c3"]
+    assert store.positions == ["FW", "MF", "GK"]
+    assert store.columns["goals"].dtype == np.int64
+    assert store.sources["gk_saves"] == "keeper"
+    # Players missing from a table read as NaN, not 0
+    np.testing.assert_array_equal(store.column_values("gk_saves"), [np.nan, np.nan, 40.0])
+
+
+def test_derived_metrics(tables):
+    store = PlayerStatsStore.from_tables(tables, version=1)
+    derived = store.derived()
+
+    np.testing.assert_allclose(derived["per90"]["goals"], [0.6, 1.0, 0.0])
+    np.testing.assert_allclose(derived["share"]["goals"], [0.75, 0.25, 0.0])
+    assert "minutes_90s" not in derived["per90"]
+    # Bea is below the threshold: unranked, and the others rank among themselves
+    ranked = store.derived(min_90s=5)["percentile"]["goals"]
+    assert np.isnan(ranked[1]) and ranked[0] > ranked[2]
+
+
+def test_derived_cache_is_bounded(tables):
+    store = PlayerStatsStore.from_tables(tables, version=1)
+    for threshold in range(DERIVED_CACHE_SIZE + 5):
+        store.derived(float(threshold))
+    assert len(store._derived) == DERIVED_CACHE_SIZE
+    assert 0.0 not in store._derived and float(DERIVED_CACHE_SIZE + 4) in store._derived
+
+
+def test_content_version_tracks_content(tables):
+    assert content_version(tables) == content_version({key: list(rows) for key, rows in tables.items()})
+    tables["standard"][0]["goals"] += 1
+    changed = content_version(tables)
+    assert changed != content_version({}) and 0 <= changed < 2 ** 53
+
+
+class FakeScraper:
+    page_cache_duration = 0
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.live = True
+        self.calls = 0
+
+    async def fetch_stats_tables(self, names):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return {"isLive": self.live, "tables": self.tables}
+
+
+def test_service_serves_the_store_while_revalidating(tables):
+    scraper = FakeScraper(tables)
+    service = PlayerStatsService(scraper)
+
+    async def scenario():
+        first = await service.get_store()
+        # Stale: served at once, re-checked in the background; same content keeps the store
+        assert await service.get_store() is first
+        await service._revalidation
+        assert scraper.calls == 2 and await service.get_store() is first
+        await service._revalidation
+
+        scraper.tables = {"standard": tables["standard"][:2]}
+        await service.get_store()
+        await service._revalidation
+        changed = await service.get_store()
+        assert changed is not first and len(changed) == 2
+        await service._revalidation
+
+        # FBref unreachable: keep the last good store
+        scraper.live = False
+        assert await service._load() is changed
+
+    asyncio.run(scenario())
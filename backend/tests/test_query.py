@@ -0,0 +1,72 @@
+import pytest
+
+from services.db_service import _apply_predicates
+from services.query import check_count, normalize_filters, parse_order
+
+
+class QueryRecorder:
+    """Stands in for a PostgREST query builder and records the calls made on it"""
+
+    def __init__(self):
+        self.calls = []
+
+    @property
+    def not_(self):
+        self.calls.append(("not",))
+        return self
+
+    def __getattr__(self, name):
+        def method(*args):
+            self.calls.append((name, *args))
+            return self
+        return method
+
+
+def test_normalize_filters_accepts_values_tuples_and_lists():
+    predicates = normalize_filters({
+        "name": "Racing",
+        "price": [("gte", 10), ("lte", 50)],
+        "category": ("in", ["a", "b"]),
+        "deleted_at": ("is", None),
+    })
+    assert predicates == [
+        ("name", "eq", "Racing"),
+        ("price", "gte", 10),
+        ("price", "lte", 50),
+        ("category", "in", ["a", "b"]),
+        ("deleted_at", "is", None),
+    ]
+    assert normalize_filters(None) == []
+
+
+def test_normalize_filters_rejects_unknown_operators_and_is_values():
+    with pytest.raises(ValueError):
+        normalize_filters({"price": ("between", (1, 2))})
+    with pytest.raises(ValueError):
+        normalize_filters({"deleted_at": ("is", "yesterday")})
+
+
+def test_parse_order_and_count_validation():
+    assert parse_order(["fixture_date.desc", "id"]) == [("fixture_date", True), ("id", False)]
+    assert parse_order(None) == []
+    with pytest.raises(ValueError):
+        parse_order(["id.sideways"])
+    assert check_count("exact") == "exact"
+    with pytest.raises(ValueError):
+        check_count("approximate")
+
+
+def test_supabase_predicates_map_onto_postgrest_filters():
+    query = QueryRecorder()
+    _apply_predicates(query, normalize_filters({
+        "price": [("gte", 10), ("lt", 50)],
+        "category": ("in", ("a", "b")),
+        "fixture_date": ("not_is", None),
+    }))
+    assert query.calls == [
+        ("gte", "price", 10),
+        ("lt", "price", 50),
+        ("in_", "category", ["a", "b"]),
+        ("not",),
+        ("is_", "fixture_date", None),
+    ]
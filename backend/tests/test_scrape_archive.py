@@ -0,0 +1,105 @@
+import os
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pytest
+
+from services.scrape_archive import ArchiveService, ScrapeArchive, column_array, season_of
+
+
+def ms(*moment):
+    return int(datetime(*moment, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+PLAYERS = [
+    {"name": "Aspas", "goals": 10, "xg": 8.5, "starter": True, "born": date(1995, 3, 1)},
+    {"name": "Borja", "goals": None, "xg": None, "starter": False},
+]
+
+
+def test_season_of():
+    assert season_of(ms(2024, 8, 18)) == "2024-2025"
+    assert season_of(ms(2025, 6, 30, 23)) == "2024-2025"
+    assert season_of(ms(2025, 7, 1)) == "2025-2026"
+
+
+def test_column_array_types():
+    assert column_array([1, 2]).dtype == np.int64
+    ints_with_gap = column_array([1, None])
+    assert ints_with_gap.dtype == np.float64 and np.isnan(ints_with_gap[1])
+    assert column_array([1, 2.5]).dtype == np.float64
+    assert column_array([True, None]).tolist() == [True, False]
+    text = column_array(["Racing", None, date(2024, 8, 18)])
+    assert text.dtype.kind == "U" and text.tolist() == ["Racing", "", "2024-08-18"]
+    assert column_array([]).dtype == np.dtype("<U1")
+
+
+def test_append_and_read_memory_mapped(tmp_path):
+    archive = ScrapeArchive(str(tmp_path))
+    partition = archive.append("players", "dee3bbc8", PLAYERS, ms(2024, 8, 18))
+    assert partition.season == "2024-2025"
+    assert partition.path.endswith(os.path.join("players", "club=dee3bbc8", "season=2024-2025",
+                                                f"scraped_at={ms(2024, 8, 18)}"))
+
+    meta = partition.meta()
+    assert meta["rows"] == 2
+    assert list(meta["columns"]) == ["name", "goals", "xg", "starter", "born"]
+    columns = partition.read(["goals", "born", "missing"])
+    assert isinstance(columns["goals"], np.memmap)
+    assert np.isnan(columns["goals"][1]) and columns["goals"][0] == 10
+    assert columns["born"].tolist() == ["1995-03-01", ""]
+    assert "missing" not in columns
+
+
+def test_a_scrape_is_archived_once(tmp_path):
+    archive = ScrapeArchive(str(tmp_path))
+    assert archive.append("players", "dee3bbc8", PLAYERS, ms(2024, 8, 18)) is not None
+    assert archive.append("players", "dee3bbc8", PLAYERS[:1], ms(2024, 8, 18)) is None
+    partition, = archive.partitions("players")
+    assert partition.meta()["rows"] == 2
+    # No staging directory is left behind
+    assert os.listdir(os.path.dirname(partition.path)) == [f"scraped_at={ms(2024, 8, 18)}"]
+
+
+def test_failed_write_leaves_no_partition(tmp_path, monkeypatch):
+    archive = ScrapeArchive(str(tmp_path))
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, "save", fail)
+    with pytest.raises(OSError):
+        archive.append("players", "dee3bbc8", PLAYERS, ms(2024, 8, 18))
+    assert archive.partitions("players") == []
+    assert os.listdir(tmp_path / "players" / "club=dee3bbc8" / "season=2024-2025") == []
+
+
+def test_partitions_are_pruned_by_directory(tmp_path):
+    archive = ScrapeArchive(str(tmp_path))
+    scrapes = [("dee3bbc8", ms(2024, 5, 1)), ("dee3bbc8", ms(2024, 9, 1)), ("dee3bbc8", ms(2024, 8, 1)),
+               ("0049d422", ms(2024, 8, 15))]
+    for club, scraped_at in scrapes:
+        archive.append("fixtures", club, [{"week": 1}], scraped_at)
+
+    assert [p.scraped_at for p in archive.partitions("fixtures")] == sorted(at for _, at in scrapes)
+    racing = archive.partitions("fixtures", club="dee3bbc8")
+    assert [p.scraped_at for p in racing] == [ms(2024, 5, 1), ms(2024, 8, 1), ms(2024, 9, 1)]
+    assert [p.season for p in archive.partitions("fixtures", club="dee3bbc8", season="2023-2024")] == ["2023-2024"]
+    window = archive.partitions("fixtures", since=ms(2024, 8, 1), until=ms(2024, 8, 31))
+    assert [p.club for p in window] == ["dee3bbc8", "0049d422"]
+    assert archive.partitions("standings") == []
+
+    scanned = [columns["week"].tolist() for _, columns in archive.scan("fixtures", ["week"], club="0049d422")]
+    assert scanned == [[1]]
+
+
+def test_service(tmp_path):
+    archive = ScrapeArchive(str(tmp_path))
+    archive.append("standings", "dee3bbc8", [{"position": 3}], ms(2024, 9, 1))
+    service = ArchiveService(archive, "dee3bbc8")
+    result = service.get_partitions("standings")
+    assert result["success"] and [meta["rows"] for meta in result["data"]["partitions"]] == [1]
+    assert service.get_partitions("ratings")["bad_request"]
+
+    disabled = ArchiveService(None, "dee3bbc8").get_partitions("standings")
+    assert not disabled["success"] and "ARCHIVE_DIR" in disabled["error"]
@@ -0,0 +1,132 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from services.season_projection import (
+    SeasonModel, SeasonProjectionService, _chunks, build_model, outcome_probabilities, simulate,
+)
+
+
+def model(p_home, p_draw, open_matches=(0, 0, 0), p_win=(0.0, 0.0, 0.0), p_tie=(0.0, 0.0, 0.0)):
+    """Three teams on 10, 9 and 0 points; team 0 still has fixtures at home to 1 and away to 2"""
+    return SeasonModel(
+        teams=["Racing", "Oviedo", "Eldense"],
+        team=0,
+        points=np.array([10, 9, 0]),
+        goal_difference=np.array([5, 3, -8]),
+        home=np.array([0, 2]),
+        away=np.array([1, 0]),
+        p_home=np.array(p_home, dtype=float),
+        p_draw=np.array(p_draw, dtype=float),
+        open_matches=np.array(open_matches),
+        p_win=np.array(p_win, dtype=float),
+        p_tie=np.array(p_tie, dtype=float),
+    )
+
+
+def test_known_fixtures_add_exact_points():
+    # Racing always beats Oviedo at home and always draws at Eldense
+    counts, point_totals = simulate(model(p_home=[1.0, 0.0], p_draw=[0.0, 1.0]), 500, seed=1)
+    np.testing.assert_array_equal(point_totals, np.array([14, 9, 1]) * 500)
+    np.testing.assert_array_equal(counts[:, 0], [500, 0, 0])
+    np.testing.assert_array_equal(counts.sum(axis=0), [500, 500, 500])
+
+
+def test_open_matches_add_binomial_points():
+    counts, point_totals = simulate(
+        model([0.0, 0.0], [0.0, 0.0], open_matches=(0, 4, 4), p_win=(0.0, 1.0, 0.0), p_tie=(0.0, 0.0, 1.0)),
+        200, seed=2,
+    )
+    # The away side wins both known fixtures (Oviedo at Racing, Racing at Eldense),
+    # then Oviedo wins and Eldense draws its 4 open matches
+    np.testing.assert_array_equal(point_totals, np.array([10 + 3, 9 + 3 + 12, 0 + 4]) * 200)
+    np.testing.assert_array_equal(counts[1], [200, 0, 0])
+
+
+def test_simulation_is_reproducible_by_seed():
+    season = model([0.5, 0.3], [0.3, 0.3], open_matches=(0, 5, 5), p_win=(0, 0.4, 0.3), p_tie=(0, 0.3, 0.3))
+    first = simulate(season, 300, seed=7)
+    again = simulate(season, 300, seed=7)
+    np.testing.assert_array_equal(first[0], again[0])
+    np.testing.assert_array_equal(first[1], again[1])
+
+
+def test_outcome_probabilities():
+    home_win, draw = outcome_probabilities(np.array([1.4, 3.0]), np.array([1.4, 0.5]))
+    away_win = 1 - home_win - draw
+    # Scorelines past MAX_GOALS are left out, so the symmetry is only approximate
+    assert home_win[0] == pytest.approx(away_win[0], abs=1e-5)
+    assert home_win[1] > 0.8 and 0 < draw[1] < 0.2
+
+
+def test_build_model_counts_remaining_matches():
+    table = [
+        {"team": "Racing", "team_id": "r", "games": 2, "goals_for": 4, "goals_against": 1, "points": 6},
+        {"team": "Oviedo", "team_id": "o", "games": 2, "goals_for": 2, "goals_against": 2, "points": 3},
+        {"team": "Eldense", "team_id": "e", "games": 2, "goals_for": 1, "goals_against": 4, "points": 0},
+    ]
+    remaining = [
+        {"opponent": "Oviedo", "opponentId": "o", "home": True},
+        {"opponent": "Eldense", "home": False},
+        {"opponent": "Nowhere FC", "home": True},
+    ]
+    season = build_model(table, remaining, "r")
+
+    assert season.team == 0
+    assert season.home.tolist() == [0, 2] and season.away.tolist() == [1, 0]
+    # Four games a season each: Oviedo and Eldense have one match left besides Racing's known fixtures
+    assert season.open_matches.tolist() == [0, 1, 1]
+    assert np.all(season.p_home + season.p_draw <= 1)
+    with pytest.raises(ValueError):
+        build_model(table, remaining, "missing")
+
+
+def test_chunks_cover_every_simulation():
+    assert _chunks(10, 4) == [3, 3, 2, 2]
+    assert _chunks(2, 4) == [1, 1]
+
+
+class FakeScraper:
+    def __init__(self):
+        self.state = {
+            "isLive": True,
+            "teamId": "r",
+            "table": [
+                {"team": "Racing", "team_id": "r", "games": 2, "goals_for": 4, "goals_against": 1, "points": 6},
+                {"team": "Oviedo", "team_id": "o", "games": 2, "goals_for": 2, "goals_against": 2, "points": 3},
+                {"team": "Eldense", "team_id": "e", "games": 2, "goals_for": 1, "goals_against": 4, "points": 0},
+            ],
+            "remainingFixtures": [{"opponent": "Oviedo", "opponentId": "o", "home": True}],
+        }
+
+    async def fetch_season_state(self):
+        return self.state
+
+
+def test_projection_is_cached_per_table_version():
+    scraper = FakeScraper()
+    service = SeasonProjectionService(scraper, workers=2)
+    try:
+        first = asyncio.run(service.get_projection(simulations=1000))["data"]
+        assert asyncio.run(service.get_projection(simulations=1000))["data"] is first
+        assert sum(first["positions"].values()) == pytest.approx(1.0)
+        assert first["remainingFixtures"] == 1
+
+        scraper.state["table"][1]["points"] = 4
+        changed = asyncio.run(service.get_projection(simulations=1000))["data"]
+        assert changed["version"] != first["version"]
+        assert list(service._cache) == [(changed["version"], 1000)]
+    finally:
+        service.close()
+
+
+def test_large_runs_are_split_across_processes():
+    service = SeasonProjectionService(FakeScraper(), workers=2, parallel_threshold=100)
+    try:
+        projection = asyncio.run(service.get_projection(simulations=301))["data"]
+        assert service._executor is not None
+        assert projection["simulations"] == 301
+        assert sum(projection["positions"].values()) == pytest.approx(1.0)
+    finally:
+        service.close()
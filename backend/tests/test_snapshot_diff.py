@@ -0,0 +1,82 @@
+from services import snapshot_diff
+from services.scrape_archive import ScrapeArchive
+from services.snapshot_diff import SnapshotDiffService, diff_records
+
+CLUB = "dee3bbc8"
+# Scrape times (ms) in August 2024
+T1, T2, T3 = 1723939200000, 1724025600000, 1724112000000
+
+
+def test_diff_records():
+    before = {("Aspas",): {"name": "Aspas", "goals": 1}, ("Borja",): {"name": "Borja", "goals": 0},
+              ("Cano",): {"name": "Cano", "goals": 2}}
+    after = {("Aspas",): {"name": "Aspas", "goals": 2, "assists": 1}, ("Cano",): {"name": "Cano", "goals": 2},
+             ("Diaz",): {"name": "Diaz", "goals": 0}}
+    diff = diff_records(before, after, ("name",))
+    assert diff["added"] == [{"name": "Diaz", "goals": 0}]
+    assert diff["removed"] == [{"name": "Borja", "goals": 0}]
+    assert diff["changed"] == [{"key": {"name": "Aspas"},
+                                "fields": {"goals": {"from": 1, "to": 2}, "assists": {"from": None, "to": 1}}}]
+    assert diff["unchanged"] == 1
+
+
+def archive(tmp_path):
+    scrapes = ScrapeArchive(str(tmp_path))
+    scrapes.append("players", CLUB, [{"name": "Aspas", "goals": 1, "xg": 0.5},
+                                     {"name": "Borja", "goals": 0, "xg": None}], T1)
+    scrapes.append("players", CLUB, [{"name": "Aspas", "goals": 2, "xg": 0.5},
+                                     {"name": "Borja", "goals": 0, "xg": None}], T2)
+    scrapes.append("players", CLUB, [{"name": "Aspas", "goals": 3, "xg": 0.9}], T3)
+    scrapes.append("players", "0049d422", [{"name": "Other", "goals": 9, "xg": 1.0}], T2)
+    scrapes.append("fixtures", CLUB, [{"date": "2024-08-11", "homeTeam": "Burgos", "awayTeam": "Racing",
+                                       "homeScore": 0, "awayScore": 1},
+                                      {"date": "2024-08-18", "homeTeam": "Racing", "awayTeam": "Oviedo",
+                                       "homeScore": None, "awayScore": None}], T1)
+    scrapes.append("fixtures", CLUB, [{"date": "2024-08-18", "homeTeam": "Racing", "awayTeam": "Oviedo",
+                                       "homeScore": 2, "awayScore": 0},
+                                      {"date": "2024-08-25", "homeTeam": "Eldense", "awayTeam": "Racing",
+                                       "homeScore": None, "awayScore": None}], T2)
+    return scrapes
+
+
+def test_versions_resolve_to_the_latest_scrape_at_or_before(tmp_path):
+    service = SnapshotDiffService(archive(tmp_path), CLUB)
+    result = service.get_diff("players", since=T1 + 1, until=T2 + 1)
+    assert result["data"]["from"] == T1 and result["data"]["to"] == T2
+    assert result["data"]["changed"] == [{"key": {"name": "Aspas"}, "fields": {"goals": {"from": 1, "to": 2}}}]
+    # A missing value (NaN in the archive) compares equal as None
+    assert result["data"]["unchanged"] == 1
+
+    latest = service.get_diff("players", since=T1)["data"]
+    assert latest["to"] == T3
+    assert [row["name"] for row in latest["removed"]] == ["Borja"]
+    assert latest["changed"][0]["fields"]["xg"] == {"from": 0.5, "to": 0.9}
+
+
+def test_fixture_versions_merge_every_partition_up_to_them(tmp_path):
+    service = SnapshotDiffService(archive(tmp_path), CLUB)
+    diff = service.get_diff("fixtures", since=T1, until=T2)["data"]
+    assert [row["date"] for row in diff["added"]] == ["2024-08-25"]
+    # The first match is only in the T1 partition, and still at T2
+    assert diff["removed"] == [] and diff["unchanged"] == 1
+    assert diff["changed"] == [{
+        "key": {"date": "2024-08-18", "homeTeam": "Racing", "awayTeam": "Oviedo"},
+        "fields": {"homeScore": {"from": None, "to": 2}, "awayScore": {"from": None, "to": 0}},
+    }]
+
+
+def test_diffs_are_cached_by_resolved_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_diff, "CACHE_SIZE", 1)
+    service = SnapshotDiffService(archive(tmp_path), CLUB)
+    first = service.get_diff("players", since=T1, until=T2)["data"]
+    assert service.get_diff("players", since=T1 + 5, until=T2 + 5)["data"] is first
+    service.get_diff("players", since=T2, until=T3)
+    assert list(service._cache) == [("players", T2, T3)]
+
+
+def test_errors(tmp_path):
+    service = SnapshotDiffService(archive(tmp_path), CLUB)
+    assert service.get_diff("ratings", since=T1)["bad_request"]
+    assert service.get_diff("players", since=T1 - 1)["not_found"]
+    assert service.get_diff("standings", since=T3)["not_found"]
+    assert "ARCHIVE_DIR" in SnapshotDiffService(None, CLUB).get_diff("players", since=T1)["error"]
@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+
+from services.snapshot_history import (
+    SeriesFile, SnapshotHistory, SnapshotHistoryService, downsample, series_response,
+)
+
+STANDING = {"position": 5, "points": 20, "played": 10, "won": 6, "drawn": 2, "lost": 2, "goalDifference": 7}
+
+
+def test_downsample_keeps_the_last_change_per_bucket():
+    times = np.arange(0, 100, 10)
+    values = np.arange(10)[:, None]
+    sampled_times, sampled_values = downsample(times, values, 0, 90, 3)
+    assert sampled_times.tolist() == [30, 60, 90]
+    assert sampled_values[:, 0].tolist() == [3, 6, 9]
+    # Already small enough
+    assert downsample(times, values, 0, 90, 20)[0] is times
+
+
+def test_series_stores_only_changes(tmp_path):
+    series = SeriesFile(str(tmp_path / "series.bin"), ("goals", "assists"))
+    assert series.append(1000, [0, 0])
+    assert not series.append(2000, [0, 0])
+    assert series.append(3000, [2, -1])
+    assert not series.append(2500, [5, 5])
+    assert not series.append(3000, [5, 5])
+    assert os.path.getsize(series.path) == 2 * series.dtype.itemsize
+
+    times, values = series.read()
+    assert times.tolist() == [1000, 3000]
+    assert values.tolist() == [[0, 0], [2, -1]]
+
+
+def test_series_reopens_from_disk(tmp_path):
+    path = str(tmp_path / "series.bin")
+    SeriesFile(path, ("goals",)).append(1000, [3])
+    reopened = SeriesFile(path, ("goals",))
+    assert not reopened.append(2000, [3])
+    assert reopened.append(2000, [4])
+    assert reopened.read()[1][:, 0].tolist() == [3, 4]
+
+
+def test_missing_series_reads_empty(tmp_path):
+    times, values = SeriesFile(str(tmp_path / "none.bin"), ("goals",)).read()
+    assert len(times) == 0 and values.shape == (0, 1)
+
+
+def test_history_records_standings_and_players(tmp_path):
+    history = SnapshotHistory(str(tmp_path))
+    assert history.record_standings(STANDING, 1000)
+    assert not history.record_standings(STANDING, 2000)
+    assert not history.record_standings({**STANDING, "points": None}, 3000)
+
+    squad = [{"name": "Íñigo Vicente", "matches": 10, "goals": 4, "assists": 3}, {"name": None}]
+    assert history.record_players(squad, 1000) == 1
+    assert history.record_players(squad, 2000) == 0
+    assert history.players() == ["Íñigo Vicente"]
+    assert os.path.basename(history.player("Íñigo Vicente").path).startswith("igo-vicente-")
+
+    # Player file names survive a restart
+    reopened = SnapshotHistory(str(tmp_path))
+    assert reopened.players() == ["Íñigo Vicente"]
+    assert reopened.player("Íñigo Vicente").read()[1].tolist() == [[10, 4, 3]]
+    assert reopened.player("Unknown") is None
+
+
+def test_series_response_cuts_the_range(tmp_path):
+    series = SeriesFile(str(tmp_path / "series.bin"), ("goals",))
+    for step in range(10):
+        series.append(step * 10, [step])
+    response = series_response(series, since=20, until=60, points=200)
+    assert response == {"stored": 5, "returned": 5, "times": [20, 30, 40, 50, 60], "goals": [2, 3, 4, 5, 6]}
+    downsampled = series_response(series, since=None, until=None, points=3)
+    assert downsampled["stored"] == 10 and downsampled["times"] == [30, 60, 90]
+    assert series_response(series, since=1000, until=None, points=3)["stored"] == 0
+
+
+def test_service(tmp_path):
+    history = SnapshotHistory(str(tmp_path))
+    history.record_standings(STANDING, 1000)
+    service = SnapshotHistoryService(history)
+    assert service.get_standings()["data"]["points"] == [20]
+    assert service.get_player("Unknown")["not_found"]
+
+    disabled = SnapshotHistoryService(None)
+    assert "HISTORY_DIR" in disabled.get_standings()["error"]
+    assert not disabled.get_player("Unknown")["success"]
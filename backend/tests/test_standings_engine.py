@@ -0,0 +1,102 @@
+import asyncio
+
+from benchmarks.memory_db import InMemoryDatabaseService
+from services.standings_engine import StandingsEngine, StandingsService, season_of
+from services.team_ratings import Result
+
+
+def teams(table):
+    return [row["team"] for row in table["table"]]
+
+
+# A and B finish the second match day level on points; B has the better goal
+# difference but lost to A. B wins the rematch on the fourth day.
+RESULTS = [
+    Result("2024-08-18", "A", "B", 1, 0),
+    Result("2024-08-25", "B", "C", 5, 0),
+    Result("2024-09-01", "C", "A", 2, 0),
+    Result("2024-09-08", "B", "A", 1, 0),
+]
+
+
+def engine():
+    standings = StandingsEngine()
+    standings.apply_all(RESULTS)
+    return standings
+
+
+def test_season_of():
+    assert season_of("2024-08-18") == "2024-2025"
+    assert season_of("2025-06-30") == "2024-2025"
+    assert season_of("2025-07-01") == "2025-2026"
+
+
+def test_live_table_counters():
+    table = engine().table()
+    assert table["asOf"] == "2024-09-08"
+    assert teams(table) == ["B", "C", "A"]
+    b = table["table"][0]
+    assert (b["played"], b["won"], b["lost"], b["goalsFor"], b["goalsAgainst"], b["points"]) == (3, 2, 1, 6, 1, 6)
+    assert [row["position"] for row in table["table"]] == [1, 2, 3]
+
+
+def test_head_to_head_beats_goal_difference():
+    table = engine().table(as_of="2024-08-25")
+    assert [(row["team"], row["points"], row["goalDifference"]) for row in table["table"]] == [
+        ("A", 3, 1), ("B", 3, 4), ("C", 0, -5),
+    ]
+
+
+def test_three_way_tie_uses_the_mini_league_goal_difference():
+    # A, B and C all on 3 points, each beat one of the others
+    table = engine().table(as_of="2024-09-01")
+    assert teams(table) == ["B", "A", "C"]
+
+
+def test_level_on_everything_falls_back_to_name():
+    standings = StandingsEngine()
+    standings.apply_all([Result("2024-08-18", "Zamora", "Burgos", 1, 1)])
+    assert teams(standings.table()) == ["Burgos", "Zamora"]
+
+
+def test_as_of_uses_the_last_match_day_on_or_before():
+    standings = engine()
+    table = standings.table(as_of="2024-08-20")
+    assert table["asOf"] == "2024-08-18"
+    assert teams(table) == ["A", "B"]
+    assert standings.table(as_of="2024-08-01") == {"asOf": None, "table": []}
+    assert standings.snapshot_dates == ["2024-08-18", "2024-08-25", "2024-09-01", "2024-09-08"]
+
+
+def test_skips_repeated_old_and_other_competition_results():
+    standings = engine()
+    assert standings.apply_all(RESULTS) == 0
+    assert not standings.apply(Result("2024-09-08", "C", "D", 1, 0, competition="Copa del Rey"))
+    assert standings.apply(Result("2024-09-08", "C", "D", 1, 0, competition="Segunda División"))
+    assert standings.table()["table"][0]["played"] == 3
+    assert "D" in teams(standings.table())
+
+
+def test_service_splits_seasons():
+    db = InMemoryDatabaseService()
+    db.seed("fixtures", [
+        {"id": 1, "fixture_date": "2024-05-26", "home_team": "A", "away_team": "B", "home_score": 0, "away_score": 2},
+        {"id": 2, "fixture_date": "2024-08-18", "home_team": "A", "away_team": "B", "home_score": 1, "away_score": 0},
+        {"id": 3, "fixture_date": None, "home_team": "B", "away_team": "A", "home_score": None, "away_score": None},
+    ])
+    service = StandingsService(db, scraper_service=None)
+
+    latest = asyncio.run(service.get_table())
+    assert latest["data"]["season"] == "2024-2025"
+    assert latest["data"]["seasons"] == ["2023-2024", "2024-2025"]
+    assert teams(latest["data"]) == ["A", "B"]
+    assert latest["data"]["table"][0]["played"] == 1
+
+    earlier = asyncio.run(service.get_table(as_of="2024-06-01"))
+    assert earlier["data"]["season"] == "2023-2024"
+    assert teams(earlier["data"]) == ["B", "A"]
+    assert asyncio.run(service.get_table(season="1999-2000"))["not_found"]
+
+    assert service.record([{"fixture_date": "2024-08-25", "home_team": "B", "away_team": "A",
+                            "home_score": 3, "away_score": 0}]) == 1
+    assert teams(asyncio.run(service.get_table())["data"]) == ["B", "A"]
@@ -0,0 +1,55 @@
+import pytest
+
+from services.html_stream import make_tree
+from services.table_schema import HREF, LINK, LINK_OR_TEXT, Column, TableSchema, comma_int, compile_schema, leading_int
+
+PLAYERS = TableSchema("stats_players", (
+    Column("name", "player", source=LINK, required=True),
+    Column("href", "player", source=HREF),
+    Column("position", "position"),
+    Column("age", "age", parse=leading_int),
+    Column("minutes", ("minutes", "min"), parse=comma_int, default=0),
+    Column("club", "team", source=LINK_OR_TEXT, exclude=frozenset({"Squad Total"})),
+), index_key="row")
+
+ROWS = """
+<tr><th data-stat="player"><a href="/en/players/1/Ana">Ana</a></th><td data-stat="position">MF</td>
+    <td data-stat="age">23-117</td><td data-stat="minutes">1,234</td><td data-stat="team"><a>Racing</a></td></tr>
+<tr class="thead"><th data-stat="player">Player</th></tr>
+<tr><th data-stat="player"><a href="/en/players/2/Bea">Bea</a></th><td data-stat="position">GK</td>
+    <td data-stat="age"></td><td data-stat="min">90</td><td data-stat="team">Loan</td></tr>
+<tr><th data-stat="player">Unlinked</th><td data-stat="position">DF</td></tr>
+<tr><th data-stat="player"><a href="/x">Total</a></th><td data-stat="team">Squad Total</td></tr>
+"""
+
+
+def _page(table_html: str) -> str:
+    return f"<html><body>{table_html}</body></html>"
+
+
+def test_columns_read_parse_and_drop_rows_as_declared():
+    root = make_tree(_page(f'<table id="stats_players"><tbody>{ROWS}</tbody></table>'))
+    assert compile_schema(PLAYERS)(root) == [
+        {"name": "Ana", "href": "/en/players/1/Ana", "position": "MF", "age": 23, "minutes": 1234,
+         "club": "Racing", "row": 0},
+        # Unparseable age -> default, alternative data-stat for minutes, plain text club
+        {"name": "Bea", "href": "/en/players/2/Bea", "position": "GK", "age": None, "minutes": 90,
+         "club": "Loan", "row": 2},
+    ]
+
+
+def test_commented_out_tables_are_found():
+    root = make_tree(_page(f'<div><!-- <table id="stats_players"><tbody>{ROWS}</tbody></table> --></div>'))
+    assert [row["name"] for row in compile_schema(PLAYERS)(root)] == ["Ana", "Bea"]
+
+
+def test_alternates_are_searched_in_comments_too():
+    seasonal = TableSchema("players", PLAYERS.columns, alternates=("_players",))
+    root = make_tree(_page(f'<div><!-- <table id="2024-2025_players"><tbody>{ROWS}</tbody></table> --></div>'))
+    assert [row["name"] for row in compile_schema(seasonal)(root)] == ["Ana", "Bea"]
+
+
+def test_missing_table_and_unknown_source():
+    assert compile_schema(PLAYERS)(make_tree(_page("<p>No stats</p>"))) == []
+    with pytest.raises(ValueError):
+        compile_schema(TableSchema("t", (Column("name", "player", source="title"),)))
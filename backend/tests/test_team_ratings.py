@@ -0,0 +1,142 @@
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.memory_db import InMemoryDatabaseService
+from services import team_ratings
+from services.team_ratings import (
+    EloRatings, Result, TeamRatingsService, expected_score, margin_multiplier, result_from_fixture,
+)
+
+
+def fixture(played_on, home, away, home_score, away_score):
+    return {"fixture_date": played_on, "home_team": home, "away_team": away,
+            "home_score": home_score, "away_score": away_score}
+
+
+RESULTS = [
+    Result("2024-08-18", "Racing", "Oviedo", 2, 0),
+    Result("2024-08-18", "Eldense", "Burgos", 1, 1),
+    Result("2024-08-25", "Oviedo", "Eldense", 0, 3),
+]
+
+
+def test_margin_multiplier_and_expected_score():
+    assert [margin_multiplier(diff) for diff in (0, -1, 2, -3, 5)] == [1.0, 1.0, 1.5, 14 / 8, 16 / 8]
+    assert expected_score(1500, 1500) == 0.5
+    assert expected_score(1600, 1500) + expected_score(1500, 1600) == pytest.approx(1.0)
+
+
+def test_apply_moves_both_ratings_by_the_same_amount():
+    ratings = EloRatings()
+    assert ratings.apply(RESULTS[0])
+    change = 20 * 1.5 * (1 - expected_score(1560, 1500))
+    assert ratings.rating("Racing") == pytest.approx(1500 + change)
+    assert ratings.rating("Oviedo") == pytest.approx(1500 - change)
+    assert ratings.history["Racing"] == [("2024-08-18", ratings.rating("Racing"), "Oviedo")]
+    assert ratings.rating("Unknown") == 1500
+
+
+def test_apply_skips_already_applied_and_older_results():
+    ratings = EloRatings()
+    assert ratings.apply_all(RESULTS) == 3
+    before = ratings.to_state()
+
+    # The last day re-sent, and a day before it
+    assert not ratings.apply(RESULTS[2])
+    assert not ratings.apply(RESULTS[0])
+    assert ratings.apply_all(RESULTS) == 0
+    assert ratings.to_state() == before
+
+    # A new result on the last day still counts
+    assert ratings.apply(Result("2024-08-25", "Burgos", "Racing", 1, 0))
+    assert ratings.matches["Racing"] == 2
+
+
+def test_rebuild_matches_applying_in_order():
+    applied = EloRatings()
+    applied.apply_all(reversed(RESULTS))
+    rebuilt = EloRatings()
+    rebuilt.apply(Result("2024-01-01", "Racing", "Burgos", 5, 0))
+    assert rebuilt.rebuild(RESULTS) == 3
+    assert rebuilt.ratings == applied.ratings
+    assert [row["team"] for row in rebuilt.table()][0] == "Eldense"
+
+
+def test_state_round_trips_through_json():
+    ratings = EloRatings(k_factor=30)
+    ratings.apply_all(RESULTS)
+    restored = EloRatings.from_state(json.loads(json.dumps(ratings.to_state())))
+    assert restored.to_state() == ratings.to_state()
+    assert not restored.apply(RESULTS[2])
+
+
+def test_result_from_fixture():
+    assert result_from_fixture(fixture("2024-08-18", "Racing", "Oviedo", 2, 0)) == RESULTS[0]
+    scraped = {"date": "2024-08-18T00:00:00Z", "homeTeam": "Racing", "awayTeam": "Oviedo", "homeScore": 2, "awayScore": 0}
+    assert result_from_fixture(scraped) == RESULTS[0]
+    assert result_from_fixture(fixture("2024-08-18", "Racing", "Oviedo", None, None)) is None
+    assert result_from_fixture(fixture(None, "Racing", "Oviedo", 2, 0)) is None
+
+
+def test_service_journals_and_reloads(tmp_path):
+    state_file = str(tmp_path / "ratings.json")
+    service = TeamRatingsService(InMemoryDatabaseService(), state_file)
+    assert service.record([fixture("2024-08-18", "Racing", "Oviedo", 2, 0)]) == 1
+    assert service.record([fixture("2024-08-18", "Racing", "Oviedo", 2, 0),
+                           fixture("2024-08-25", "Oviedo", "Eldense", 0, 3)]) == 1
+    service.close()
+
+    with open(f"{state_file}.journal", encoding="utf-8") as handle:
+        assert len(handle.readlines()) == 2
+    reloaded = TeamRatingsService(InMemoryDatabaseService(), state_file)
+    assert reloaded.ratings.to_state() == service.ratings.to_state()
+    reloaded.close()
+
+
+def test_service_compacts_the_journal(tmp_path, monkeypatch):
+    monkeypatch.setattr(team_ratings, "COMPACT_AFTER", 2)
+    state_file = str(tmp_path / "ratings.json")
+    service = TeamRatingsService(InMemoryDatabaseService(), state_file)
+    service.record([fixture("2024-08-18", "Racing", "Oviedo", 2, 0)])
+    service.record([fixture("2024-08-25", "Oviedo", "Eldense", 0, 3)])
+    service.close()
+
+    with open(f"{state_file}.journal", encoding="utf-8") as handle:
+        assert handle.read() == ""
+    with open(state_file, encoding="utf-8") as handle:
+        assert json.load(handle)["last_date"] == "2024-08-25"
+    reloaded = TeamRatingsService(InMemoryDatabaseService(), state_file)
+    assert reloaded.ratings.ratings == service.ratings.ratings
+    reloaded.close()
+
+
+def test_service_skips_a_truncated_journal_line(tmp_path):
+    state_file = str(tmp_path / "ratings.json")
+    with open(f"{state_file}.journal", "w", encoding="utf-8") as handle:
+        handle.write(json.dumps({"played_on": "2024-08-18", "home": "Racing", "away": "Oviedo",
+                                 "home_goals": 2, "away_goals": 0}) + "\n")
+        handle.write('{"played_on": "2024-08-25", "ho')
+    service = TeamRatingsService(InMemoryDatabaseService(), state_file)
+    assert service.ratings.last_date == "2024-08-18"
+    service.close()
+
+
+def test_service_without_state_file_builds_from_fixtures():
+    db = InMemoryDatabaseService()
+    db.seed("fixtures", [
+        {"id": 1, **fixture("2024-08-18", "Racing", "Oviedo", 2, 0)},
+        {"id": 2, **fixture("2024-08-25", "Oviedo", "Eldense", 0, 3)},
+        {"id": 3, **fixture(None, "Racing", "Eldense", None, None)},
+    ])
+    service = TeamRatingsService(db, "")
+    result = asyncio.run(service.get_ratings())
+    assert result["success"]
+    assert result["data"]["lastFixture"] == "2024-08-25"
+    assert {row["team"] for row in result["data"]["ratings"]} == {"Racing", "Oviedo", "Eldense"}
+
+    history = asyncio.run(service.get_history("Oviedo"))
+    assert [point["opponent"] for point in history["data"]["history"]] == ["Racing", "Eldense"]
+    assert asyncio.run(service.get_history("Burgos"))["not_found"]
+    service.close()
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from monitoring.trace_tools import format_trace, load_spans
+from monitoring.tracing import configure_tracing, request_id_var, shutdown_tracing, span, traced, tracing_enabled
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    configure_tracing("jsonl", str(path))
+    yield path
+    shutdown_tracing()
+
+
+def _spans(path):
+    shutdown_tracing()  # flushes the exporter thread
+    return {s["name"]: s for s in load_spans(str(path))}
+
+
+def test_spans_nest_and_record_failures(trace_file):
+    with span("refresh", data_type="fixtures") as root:
+        root.set("rows", 3)
+        with pytest.raises(RuntimeError):
+            with span("fetch"):
+                raise RuntimeError("proxy down")
+
+    spans = _spans(trace_file)
+    assert spans["fetch"]["parent_id"] == spans["refresh"]["span_id"]
+    assert spans["fetch"]["trace_id"] == spans["refresh"]["trace_id"]
+    assert spans["fetch"]["status"] == "error"
+    assert spans["fetch"]["error"] == "RuntimeError: proxy down"
+    assert spans["refresh"]["attributes"] == {"data_type": "fixtures", "rows": 3}
+
+
+def test_background_tasks_keep_the_request_id_and_parent(trace_file):
+    @traced("parse")
+    async def parse():
+        await asyncio.sleep(0)
+
+    async def handle_request():
+        request_id_var.set("req-1")
+        with span("http.request"):
+            task = asyncio.create_task(parse())
+        await task
+
+    asyncio.run(handle_request())
+
+    spans = _spans(trace_file)
+    assert spans["http.request"]["trace_id"] == "req-1"
+    assert spans["parse"]["trace_id"] == "req-1"
+    assert spans["parse"]["parent_id"] == spans["http.request"]["span_id"]
+    lines = format_trace(list(spans.values()))
+    assert [line.split()[-1] for line in lines] == ["http.request", "parse"]
+
+
+def test_tracing_is_off_without_an_exporter():
+    configure_tracing("none")
+    assert not tracing_enabled()
+    with span("ignored") as noop:
+        noop.set("key", "value")
+    with pytest.raises(ValueError):
+        configure_tracing("jsonl")
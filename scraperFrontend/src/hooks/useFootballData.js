@@ -23,6 +23,13 @@ const ENDPOINTS = {
   },
 };
 
+// Delta sync (?since=<version>): the list each data type keeps and its record key
+const DELTA_LISTS = { players: "squad", fixtures: "pastFixtures" };
+const DELTA_KEYS = {
+  players: ["name"],
+  fixtures: ["date", "homeTeam", "awayTeam"],
+};
+
 class RacingFootballDataV3 {
   constructor() {
     // Data cache - now only for client-side storage, server handles DB caching
@@ -61,8 +68,113 @@ class RacingFootballDataV3 {
     return now - cacheInfo.lastFetch < this.clientCacheDuration;
   }
 
+  // Client-side copy of one data type
+  getCached(dataType) {
+    return {
+      players: this.playersData,
+      fixtures: this.fixturesData,
+      standings: this.standingsData,
+    }[dataType];
+  }
+
+  // Store the fetch time and data
+  setCached(dataType, data) {
+    const now = Date.now();
+    if (dataType === "players") {
+      this.playersData = data;
+      this.playersLastFetch = now;
+    } else if (dataType === "fixtures") {
+      this.fixturesData = data;
+      this.fixturesLastFetch = now;
+    } else if (dataType === "standings") {
+      this.standingsData = data;
+      this.standingsLastFetch = now;
+    }
+  }
+
+  // Merge a "changes since version N" response into the cached data
+  applyChanges(dataType, cached, changes) {
+    const merged = {
+      ...cached,
+      version: changes.version,
+      isLive: changes.isLive,
+      lastUpdated: changes.lastUpdated,
+    };
+
+    if (dataType === "standings") {
+      merged.leaguePosition = changes.upserted[0] || null;
+      return merged;
+    }
+
+    const listName = DELTA_LISTS[dataType];
+    const keyOf = (record) =>
+      DELTA_KEYS[dataType].map((field) => record[field]).join("|");
+    const records = new Map(
+      (changes.reset ? [] : cached[listName] || []).map((record) => [
+        keyOf(record),
+        record,
+      ])
+    );
+    changes.removed.forEach((key) => records.delete(keyOf(key)));
+    changes.upserted.forEach((record) => records.set(keyOf(record), record));
+
+    merged[listName] = [...records.values()];
+    if (dataType === "fixtures") {
+      // Newest first, like the full endpoint
+      merged.pastFixtures.sort((a, b) => (b.date || "").localeCompare(a.date || ""));
+    }
+    return merged;
+  }
+
+  // Poll for what changed since the cached version; null if the delta request failed
+  async fetchChanges(endpoint, dataType, cached) {
+    try {
+      const response = await fetch(`${endpoint}?since=${cached.version}`, {
+        method: "GET",
+        headers: { Accept: "application/json" },
+        signal: AbortSignal.timeout(10000),
+      });
+
+      if (response.status === 204) {
+        console.log(`✅ ${dataType} unchanged since version ${cached.version}`);
+        this.setCached(dataType, cached);
+        return cached;
+      }
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+
+      const result = await response.json();
+      if (!result.success || !result.data) {
+        throw new Error(`Invalid changes response from ${dataType} endpoint`);
+      }
+
+      const changes = result.data;
+      console.log(
+        `🔁 ${dataType}: ${changes.upserted.length} changed, ${changes.removed.length} removed` +
+          (changes.reset ? " (full reset)" : "")
+      );
+      const merged = this.applyChanges(dataType, cached, changes);
+      this.setCached(dataType, merged);
+      return merged;
+    } catch (error) {
+      console.warn(`⚠️ ${dataType} delta sync failed, refetching in full:`, error);
+      return null;
+    }
+  }
+
   // Generic fetch method for instant-load endpoints
   async fetchFromInstantEndpoint(endpoint, dataType, forceUpdate = false) {
+    // Only the changes when we hold a versioned copy. The server versions only
+    // complete listings: changes cover the whole table, not one page of it
+    const cached = this.getCached(dataType);
+    if (!forceUpdate && cached && cached.version != null && !cached.nextCursor) {
+      const synced = await this.fetchChanges(endpoint, dataType, cached);
+      if (synced) {
+        return synced;
+      }
+    }
+
     try {
       console.log(
         `🚀 Fetching ${dataType} data instantly from database: ${endpoint}`
@@ -103,18 +215,7 @@ class RacingFootballDataV3 {
       console.log(`📊 Source: ${result.data.source}`);
       console.log(`🔄 Is live: ${result.data.isLive}`);
 
-      // Store the fetch time and data
-      const now = Date.now();
-      if (dataType === "players") {
-        this.playersData = result.data;
-        this.playersLastFetch = now;
-      } else if (dataType === "fixtures") {
-        this.fixturesData = result.data;
-        this.fixturesLastFetch = now;
-      } else if (dataType === "standings") {
-        this.standingsData = result.data;
-        this.standingsLastFetch = now;
-      }
+      this.setCached(dataType, result.data);
 
       return result.data;
     } catch (error) {